@@ -96,6 +96,85 @@ class Settings(BaseSettings):
     CACHE_TTL_SECONDS: int = 300
     MAX_CONNECTIONS_POOL: int = 20
     POOL_RECYCLE_SECONDS: int = 3600
+    # Lectures chaudes via AsyncSession/asyncpg (app.db.async_base) — opt-in, défaut sync.
+    DB_ASYNC_ENABLED: bool = False
+    # Executor dédié run_db_bound (app.core.runtime) : 0 = pool_size + max_overflow.
+    DB_EXECUTOR_MAX_WORKERS: int = Field(default=0, ge=0)
+    # Appels en attente au-delà desquels run_db_bound lève 503 (0 = non borné).
+    DB_EXECUTOR_MAX_QUEUE: int = Field(default=200, ge=0)
+    # Flux DB (run_db_stream) : lignes par paquet lu au curseur serveur et paquets
+    # en file entre le thread DB et la réponse streamée (mémoire par flux bornée).
+    DB_STREAM_CHUNK_ROWS: int = Field(default=2000, ge=1)
+    DB_STREAM_QUEUE_CHUNKS: int = Field(default=4, ge=1)
+    # Soumission de réponse : effets de bord (progression, points, badges, streak…)
+    # différés dans la file post-commit (app.core.post_commit) — opt-in, défaut inline.
+    SUBMIT_SIDE_EFFECTS_ASYNC: bool = False
+    POST_COMMIT_WORKERS: int = Field(default=2, ge=1)
+    # Jobs en attente au-delà desquels l'enqueue est refusé (ligne reprise au balayage).
+    POST_COMMIT_MAX_QUEUE: int = Field(default=1000, ge=0)
+    # Balayage des lignes outbox pending (app.core.post_commit) : période, puis délai
+    # avant reprise d'une ligne jamais traitée / après un échec (doublé à chaque échec).
+    POST_COMMIT_SWEEP_SECONDS: float = Field(default=30.0, gt=0)
+    ATTEMPT_SIDE_EFFECTS_RETRY_SECONDS: float = Field(default=30.0, gt=0)
+    # Emails transactionnels (vérification, reset) : les handlers écrivent dans
+    # email_outbox, un thread d'envoi draine par lots (app.services.communication.email_outbox).
+    EMAIL_OUTBOX_ENABLED: bool = False
+    EMAIL_OUTBOX_BATCH_SIZE: int = Field(default=50, ge=1)
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = Field(default=5, ge=1)
+    # Backoff exponentiel entre deux essais : base * 2^(essai-1), plafonné.
+    EMAIL_OUTBOX_BACKOFF_SECONDS: int = Field(default=30, ge=1)
+    EMAIL_OUTBOX_MAX_BACKOFF_SECONDS: int = Field(default=3600, ge=1)
+    EMAIL_OUTBOX_POLL_SECONDS: float = Field(default=5.0, gt=0)
+    # Suppression de compte : DELETE ensemblistes par paquets, dans l'ordre des
+    # dépendances (app.services.users.account_deletion). ASYNC : la requête désactive
+    # le compte et écrit un job repris par un thread (sinon suppression inline).
+    ACCOUNT_DELETION_ASYNC: bool = False
+    ACCOUNT_DELETION_CHUNK_ROWS: int = Field(default=5000, ge=1)
+    ACCOUNT_DELETION_MAX_TRIES: int = Field(default=5, ge=1)
+    ACCOUNT_DELETION_POLL_SECONDS: float = Field(default=30.0, gt=0)
+    # Analytics EdTech admin : jours clos servis par les rollups quotidiens
+    # (edtech_daily_rollups), compactés à la première lecture. False = tout agréger
+    # en SQL sur edtech_events (diagnostic).
+    EDTECH_ANALYTICS_ROLLUP_ENABLED: bool = True
+    # Ingestion EdTech (app.services.analytics.edtech_ingest) : buffer mémoire par
+    # worker, vidé par COPY tous les FLUSH_EVENTS événements ou FLUSH_MS ms.
+    # Buffer plein : événements refusés et comptés (503 si rien n'est accepté).
+    # False = COPY + commit dans la requête.
+    EDTECH_INGEST_BUFFERED: bool = True
+    EDTECH_INGEST_CAPACITY: int = Field(default=20000, ge=1)
+    EDTECH_INGEST_FLUSH_EVENTS: int = Field(default=500, ge=1)
+    EDTECH_INGEST_FLUSH_MS: int = Field(default=250, ge=1)
+    # Taille max d'un lot POST /api/analytics/events.
+    EDTECH_BATCH_MAX_EVENTS: int = Field(default=100, ge=1)
+    # Index catalogue exercices en mémoire (app.services.exercises.exercise_catalog_index) :
+    # construit au startup, mis à jour au commit ; relecture delta des autres workers.
+    EXERCISE_CATALOG_INDEX_ENABLED: bool = False
+    EXERCISE_CATALOG_INDEX_REFRESH_SECONDS: float = Field(default=30.0, gt=0)
+    # Inventaire de défis IA pré-générés (app.services.challenges.challenge_inventory) :
+    # une demande sans prompt libre est servie depuis le stock du seau ; un thread par
+    # worker le recomplète jusqu'à TARGET dès qu'il passe sous LOW_WATERMARK — opt-in.
+    CHALLENGE_INVENTORY_ENABLED: bool = False
+    CHALLENGE_INVENTORY_TARGET: int = Field(default=3, ge=1)
+    CHALLENGE_INVENTORY_LOW_WATERMARK: int = Field(default=1, ge=0)
+    CHALLENGE_INVENTORY_POLL_SECONDS: float = Field(default=60.0, gt=0)
+    # Inventaire d'exercices IA pré-générés (app.services.exercises.exercise_inventory) :
+    # seaux (type × âge × bande pédagogique × locale), même refill que les défis.
+    EXERCISE_INVENTORY_ENABLED: bool = False
+    EXERCISE_INVENTORY_TARGET: int = Field(default=5, ge=1)
+    EXERCISE_INVENTORY_LOW_WATERMARK: int = Field(default=2, ge=0)
+    EXERCISE_INVENTORY_POLL_SECONDS: float = Field(default=60.0, gt=0)
+    # Recommandations (app.services.recommendation.recommendation_refresh) : régénération
+    # différée (debounce par utilisateur) hors requête via la file post-commit — opt-in ;
+    # désactivé, GET /api/recommendations génère en ligne si aucune reco active.
+    RECOMMENDATION_REFRESH_ASYNC: bool = False
+    RECOMMENDATION_REFRESH_DEBOUNCE_SECONDS: float = Field(default=30.0, ge=0)
+    # Délai maximal depuis le premier changement (activité continue).
+    RECOMMENDATION_REFRESH_MAX_DELAY_SECONDS: float = Field(default=300.0, ge=0)
+    # Recommandations générées il y a plus longtemps : signalées « stale ».
+    RECOMMENDATION_STALE_AFTER_SECONDS: int = Field(default=86400, ge=1)
+    # Cache mémoire (par worker) de la liste API formatée ; 0 = désactivé.
+    RECOMMENDATION_READ_CACHE_TTL_SECONDS: float = Field(default=0.0, ge=0)
+    RECOMMENDATION_READ_CACHE_MAX_ENTRIES: int = Field(default=10_000, ge=1)
 
     RATE_LIMIT_PER_MINUTE: int = 60
     MAX_CONTENT_LENGTH: int = 16_777_216
@@ -124,6 +203,16 @@ class Settings(BaseSettings):
             "Si False (defaut conservateur): ignorer X-Forwarded-For et utiliser uniquement request.client.host."
         ),
     )
+    # Snapshot process-wide de la table settings (maintenance_mode, etc.).
+    # Invalidation explicite à l'écriture + pub/sub Redis si REDIS_URL ; TTL = borne de convergence.
+    SETTINGS_SNAPSHOT_TTL_SECONDS: float = Field(default=5.0, ge=0)
+    # Caches auth (app.utils.auth_cache) : 0 = désactivé.
+    AUTH_TOKEN_CACHE_MAX_ENTRIES: int = Field(default=10_000, ge=0)
+    USER_PAYLOAD_CACHE_TTL_SECONDS: float = Field(default=15.0, ge=0)
+    # Totaux des listings exercices / défis par combinaison de filtres
+    # (app.utils.catalog_sampling) : 0 = désactivé.
+    CATALOG_TOTALS_CACHE_TTL_SECONDS: float = Field(default=30.0, ge=0)
+    CATALOG_TOTALS_CACHE_MAX_ENTRIES: int = Field(default=1024, ge=0)
     SECURE_HEADERS: bool = True
 
     ENABLE_METRICS: bool = True
@@ -168,6 +257,12 @@ class Settings(BaseSettings):
         description="Override ops : modèle appelé si le stream défis o-series renvoie un contenu vide. "
         "Vide = défaut policy (challenge_ai_model_policy). Allowlist = EXERCISES_AI_ALLOWED_MODEL_IDS.",
     )
+    # Transport HTTP partagé des clients OpenAI (app.core.openai_clients) : connexions
+    # keep-alive réutilisées entre générations ; HTTP/2 si le paquet h2 est installé.
+    OPENAI_HTTP2: bool = True
+    OPENAI_HTTP_MAX_CONNECTIONS: int = Field(default=100, ge=1)
+    OPENAI_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = Field(default=20, ge=0)
+    OPENAI_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = Field(default=60.0, gt=0)
 
     @model_validator(mode="after")
     def build_computed_and_validate(self):
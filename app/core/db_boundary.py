@@ -12,6 +12,14 @@ Contrat:
 Chaine active:
     Handler -> run_db_bound -> sync_func (threadpool) -> sync_db_session -> Session -> DB
 
+Contrat lecture (opt-in DB_ASYNC_ENABLED):
+    Handler (async) -> run_db_read(read_func, *args, **kwargs)
+    read_func(db: Session, *args, **kwargs) reçoit la session en premier argument,
+    ne commit pas et n'ouvre pas d'autre session.
+    - DB_ASYNC_ENABLED=true : async_db_session() -> AsyncSession.run_sync(read_func)
+      sur une connexion asyncpg, sans hop threadpool (concurrence = event loop).
+    - sinon : run_db_bound -> sync_db_session -> read_func (chemin historique).
+
 Usage:
     # Depuis un handler:
     from app.core.db_boundary import run_db_bound
@@ -21,14 +29,41 @@ Usage:
     from app.core.db_boundary import sync_db_session
     with sync_db_session() as db:
         ...
+
+    # Lecture chaude (même fonction service dans les deux modes):
+    from app.core.db_boundary import run_db_read
+    rows = await run_db_read(UserService.get_leaderboard_for_api, user_id, limit=50)
+
+Contrat flux (exports volumineux):
+    Handler (async) -> run_db_stream(iter_func, *args, **kwargs) -> async for chunk
+    iter_func(db: Session, *args, **kwargs) est un générateur sync de paquets de
+    lignes, exécuté dans run_db_bound (une connexion pour tout le flux) ;
+    iter_result_chunks lit un SELECT par curseur serveur (yield_per). Les paquets
+    passent par une file bornée (DB_STREAM_QUEUE_CHUNKS) : le thread DB attend que le
+    client consomme, la mémoire reste constante quel que soit le volume.
 """
 
-from typing import Callable, TypeVar
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Callable, Iterator, List, TypeVar
+
+from sqlalchemy import Executable, Row
+from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.runtime import run_db_bound
-from app.utils.db_utils import sync_db_session
+from app.utils.db_utils import async_db_session, sync_db_session
 
-__all__ = ["run_db_bound", "sync_db_session", "DbBoundSyncCallable"]
+__all__ = [
+    "run_db_bound",
+    "run_db_read",
+    "run_db_stream",
+    "iter_result_chunks",
+    "sync_db_session",
+    "async_db_session",
+    "DbBoundSyncCallable",
+    "DbReadCallable",
+]
 
 T = TypeVar("T")
 
@@ -37,3 +72,118 @@ DbBoundSyncCallable = Callable[..., T]
 Type alias pour les fonctions sync exécutées via run_db_bound.
 Ces fonctions doivent utiliser sync_db_session() en interne pour tout accès DB.
 """
+
+DbReadCallable = Callable[..., T]
+"""
+Type alias pour les lectures exécutées via run_db_read : ``func(db: Session, ...)``.
+"""
+
+
+def _read_in_sync_session(func: Callable[..., T], args: tuple, kwargs: dict) -> T:
+    with sync_db_session() as db:
+        return func(db, *args, **kwargs)
+
+
+def async_reads_enabled() -> bool:
+    """True si run_db_read passe par AsyncSession (opt-in actif et asyncpg disponible)."""
+    from app.db.async_base import get_async_sessionmaker
+
+    return get_async_sessionmaker() is not None
+
+
+async def run_db_read(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Exécute une lecture ``func(db, *args, **kwargs)`` selon le mode DB actif.
+
+    Args:
+        func: Fonction sync prenant la Session en premier argument (lecture seule)
+        *args: Arguments positionnels après db
+        **kwargs: Arguments nommés
+
+    Returns:
+        Le resultat de func(db, *args, **kwargs)
+    """
+    if not async_reads_enabled():
+        return await run_db_bound(_read_in_sync_session, func, args, kwargs)
+
+    def _call(db: Session) -> T:
+        return func(db, *args, **kwargs)
+
+    async with async_db_session() as db:
+        return await db.run_sync(_call)
+
+
+def iter_result_chunks(
+    db: Session, statement: Executable, chunk_size: int
+) -> Iterator[List[Row]]:
+    """Paquets de lignes (tuples de colonnes) d'un SELECT lu par curseur serveur."""
+    result = db.execute(
+        statement.execution_options(stream_results=True, yield_per=chunk_size)
+    )
+    try:
+        yield from result.partitions(chunk_size)
+    finally:
+        result.close()
+
+
+def _stream_in_sync_session(
+    func: Callable[..., Iterator[T]],
+    args: tuple,
+    kwargs: dict,
+    put: Callable[[T], bool],
+) -> None:
+    with sync_db_session() as db:
+        for chunk in func(db, *args, **kwargs):
+            if not put(chunk):
+                return
+
+
+async def run_db_stream(
+    func: Callable[..., Iterator[T]], *args: Any, **kwargs: Any
+) -> AsyncIterator[T]:
+    """
+    Itère les paquets de ``func(db, *args, **kwargs)`` produits dans l'executor DB.
+
+    File bornée entre le thread DB et la loop : au plus DB_STREAM_QUEUE_CHUNKS paquets
+    en mémoire. Fermeture anticipée (client déconnecté) : le thread s'arrête au
+    paquet suivant et libère sa connexion ; une erreur du thread est relevée ici.
+    """
+    loop = asyncio.get_running_loop()
+    chunks: asyncio.Queue = asyncio.Queue(maxsize=settings.DB_STREAM_QUEUE_CHUNKS)
+    closed = threading.Event()
+
+    def _put(chunk: T) -> bool:
+        if closed.is_set():
+            return False
+        try:
+            asyncio.run_coroutine_threadsafe(chunks.put(chunk), loop).result()
+        except RuntimeError:
+            return False  # loop arrêtée
+        return not closed.is_set()
+
+    producer = asyncio.ensure_future(
+        run_db_bound(_stream_in_sync_session, func, args, kwargs, _put)
+    )
+    try:
+        while True:
+            if not chunks.empty():
+                yield chunks.get_nowait()
+                continue
+            if producer.done():
+                producer.result()
+                return
+            getter = asyncio.ensure_future(chunks.get())
+            await asyncio.wait({getter, producer}, return_when=asyncio.FIRST_COMPLETED)
+            if getter.done():
+                yield getter.result()
+            else:
+                getter.cancel()
+    finally:
+        if not producer.done():
+            closed.set()
+            # Débloque un put en attente sur la file pleine.
+            while not chunks.empty():
+                chunks.get_nowait()
+            producer.add_done_callback(
+                lambda task: task.cancelled() or task.exception()
+            )
@@ -458,3 +458,19 @@ def exercise_tier_filter_expression(user_tier: Optional[int], target_difficulty:
         and_(Exercise.difficulty_tier.is_(None), Exercise.difficulty == td),
         Exercise.difficulty_tier.between(lo, hi),
     )
+
+
+def exercise_tier_matches(
+    user_tier: Optional[int],
+    target_difficulty: str,
+    exercise_tier: Optional[int],
+    exercise_difficulty: Optional[str],
+) -> bool:
+    """Équivalent en mémoire de ``exercise_tier_filter_expression`` (index catalogue)."""
+    if user_tier is None:
+        return exercise_difficulty == target_difficulty
+    if exercise_tier is None:
+        return exercise_difficulty == target_difficulty
+    lo = max(DIFFICULTY_TIER_MIN, user_tier - 1)
+    hi = min(DIFFICULTY_TIER_MAX, user_tier + 1)
+    return lo <= exercise_tier <= hi
@@ -1,11 +1,15 @@
 """
 Périodes du classement par points (agrégation sur ``point_events``).
 
-``month`` = fenêtre glissante de 30 jours (pas mois calendaire).
+``month`` = fenêtre glissante de 30 jours (pas mois calendaire), à la journée UTC
+(scores matérialisés, voir app.services.gamification.leaderboard_scores).
+
+Pagination keyset : ``LeaderboardCursor`` = dernière ligne servie (score, user_id, rang).
 """
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from enum import StrEnum
 from typing import Optional
@@ -53,3 +57,43 @@ def leaderboard_period_cutoff_utc(period: LeaderboardPeriod) -> Optional[datetim
     if period is LeaderboardPeriod.MONTH:
         return now - timedelta(days=LEADERBOARD_PERIOD_MONTH_ROLLING_DAYS)
     raise AssertionError(f"Unhandled period: {period!r}")
+
+
+@dataclass(frozen=True)
+class LeaderboardCursor:
+    """Position keyset dans le classement : la page suivante commence après cette ligne."""
+
+    score: Optional[int]  # None : total_points NULL (période all, triés en dernier)
+    user_id: int
+    rank: int
+
+
+def encode_leaderboard_cursor(cursor: LeaderboardCursor) -> str:
+    score = "" if cursor.score is None else str(cursor.score)
+    return f"{score}:{cursor.user_id}:{cursor.rank}"
+
+
+def parse_leaderboard_cursor(raw: Optional[str]) -> Optional[LeaderboardCursor]:
+    """
+    Parse le paramètre ``cursor`` (``score:user_id:rank``).
+
+    Raises:
+        ValueError: si la valeur est mal formée.
+    """
+    if raw is None or raw == "":
+        return None
+    parts = raw.split(":")
+    if len(parts) != 3:
+        raise ValueError(f"Invalid leaderboard cursor: {raw!r}")
+    score_raw, user_id_raw, rank_raw = parts
+    try:
+        cursor = LeaderboardCursor(
+            score=int(score_raw) if score_raw else None,
+            user_id=int(user_id_raw),
+            rank=int(rank_raw),
+        )
+    except ValueError as exc:
+        raise ValueError(f"Invalid leaderboard cursor: {raw!r}") from exc
+    if cursor.rank < 1:
+        raise ValueError(f"Invalid leaderboard cursor: {raw!r}")
+    return cursor
@@ -14,7 +14,7 @@ thread+import, CPython #125037). Pas de thread de contournement : ça déplace l
 import os
 import sys
 import time
-from typing import Any
+from typing import Any, Dict, Optional
 
 from app.core.logging_config import get_logger
 
@@ -26,11 +26,36 @@ _CONTENT_TYPE_LATEST = None
 _REGISTRY = None
 _Counter = None
 _Histogram = None
+_Gauge = None
 _generate_latest = None
 
 # Métriques Prometheus (créées à l'init)
 HTTP_REQUESTS_TOTAL: Any = None
 HTTP_REQUEST_DURATION: Any = None
+SETTINGS_SNAPSHOT_LOOKUPS: Any = None
+DB_EXECUTOR_QUEUED: Any = None
+DB_EXECUTOR_RUNNING: Any = None
+DB_EXECUTOR_WAIT: Any = None
+DB_EXECUTOR_REJECTED: Any = None
+POST_COMMIT_QUEUED: Any = None
+POST_COMMIT_JOBS: Any = None
+POST_COMMIT_DURATION: Any = None
+EMAIL_OUTBOX_MESSAGES: Any = None
+EMAIL_OUTBOX_BATCH_DURATION: Any = None
+EXERCISE_CATALOG_INDEX_ENTRIES: Any = None
+EXERCISE_CATALOG_INDEX_BYTES: Any = None
+CHALLENGE_INVENTORY_SERVES: Any = None
+CHALLENGE_INVENTORY_REFILLS: Any = None
+EXERCISE_INVENTORY_ITEMS: Any = None
+EXERCISE_INVENTORY_SERVES: Any = None
+EXERCISE_INVENTORY_REFILLS: Any = None
+EXERCISE_INVENTORY_REFILL_LAG: Any = None
+OPENAI_HTTP_REQUESTS: Any = None
+OPENAI_HTTP_CONNECTIONS_OPENED: Any = None
+ACCOUNT_DELETION_ROWS: Any = None
+ACCOUNT_DELETION_JOBS: Any = None
+EDTECH_INGEST_EVENTS: Any = None
+EDTECH_INGEST_BUFFERED: Any = None
 _monitoring_init_attempted = False
 _monitoring_initialized = False
 
@@ -40,7 +65,7 @@ def _load_prometheus_client():
     Import prometheus_client. Désactivé sur Windows : l'import peut bloquer indéfiniment
     (deadlock thread+import). Pas de thread de contournement — ça déplace le blocage.
     """
-    global _prometheus_available, _CONTENT_TYPE_LATEST, _REGISTRY, _Counter, _Histogram, _generate_latest
+    global _prometheus_available, _CONTENT_TYPE_LATEST, _REGISTRY, _Counter, _Histogram, _Gauge, _generate_latest
 
     if _prometheus_available:
         return True
@@ -56,6 +81,7 @@ def _load_prometheus_client():
             CONTENT_TYPE_LATEST,
             REGISTRY,
             Counter,
+            Gauge,
             Histogram,
             generate_latest,
         )
@@ -64,6 +90,7 @@ def _load_prometheus_client():
         _REGISTRY = REGISTRY
         _Counter = Counter
         _Histogram = Histogram
+        _Gauge = Gauge
         _generate_latest = generate_latest
         _prometheus_available = True
         return True
@@ -98,7 +125,17 @@ def init_monitoring() -> bool:
     Returns:
         True si au moins une partie du monitoring est active.
     """
-    global HTTP_REQUESTS_TOTAL, HTTP_REQUEST_DURATION
+    global HTTP_REQUESTS_TOTAL, HTTP_REQUEST_DURATION, SETTINGS_SNAPSHOT_LOOKUPS
+    global DB_EXECUTOR_QUEUED, DB_EXECUTOR_RUNNING, DB_EXECUTOR_WAIT, DB_EXECUTOR_REJECTED
+    global POST_COMMIT_QUEUED, POST_COMMIT_JOBS, POST_COMMIT_DURATION
+    global EMAIL_OUTBOX_MESSAGES, EMAIL_OUTBOX_BATCH_DURATION
+    global EXERCISE_CATALOG_INDEX_ENTRIES, EXERCISE_CATALOG_INDEX_BYTES
+    global CHALLENGE_INVENTORY_SERVES, CHALLENGE_INVENTORY_REFILLS
+    global EXERCISE_INVENTORY_ITEMS, EXERCISE_INVENTORY_SERVES
+    global EXERCISE_INVENTORY_REFILLS, EXERCISE_INVENTORY_REFILL_LAG
+    global OPENAI_HTTP_REQUESTS, OPENAI_HTTP_CONNECTIONS_OPENED
+    global ACCOUNT_DELETION_ROWS, ACCOUNT_DELETION_JOBS
+    global EDTECH_INGEST_EVENTS, EDTECH_INGEST_BUFFERED
     global _monitoring_init_attempted, _monitoring_initialized
 
     if _monitoring_init_attempted:
@@ -169,6 +206,7 @@ def init_monitoring() -> bool:
         and HTTP_REQUESTS_TOTAL is None
         and _Counter is not None
         and _Histogram is not None
+        and _Gauge is not None
     ):
         try:
             HTTP_REQUESTS_TOTAL = _Counter(
@@ -182,6 +220,121 @@ def init_monitoring() -> bool:
                 ["method", "path"],
                 buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
             )
+            SETTINGS_SNAPSHOT_LOOKUPS = _Counter(
+                "mathakine_settings_snapshot_lookups_total",
+                "Lectures du snapshot settings (hit = mémoire, miss = rechargement DB)",
+                ["result"],
+            )
+            DB_EXECUTOR_QUEUED = _Gauge(
+                "mathakine_db_executor_queued",
+                "Appels run_db_bound en attente d'un thread DB",
+            )
+            DB_EXECUTOR_RUNNING = _Gauge(
+                "mathakine_db_executor_running",
+                "Appels run_db_bound en cours d'exécution",
+            )
+            DB_EXECUTOR_WAIT = _Histogram(
+                "mathakine_db_executor_wait_seconds",
+                "Attente en file avant exécution d'un appel run_db_bound",
+                buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+            )
+            DB_EXECUTOR_REJECTED = _Counter(
+                "mathakine_db_executor_rejected_total",
+                "Appels run_db_bound rejetés (file saturée, 503)",
+            )
+            POST_COMMIT_QUEUED = _Gauge(
+                "mathakine_post_commit_queued",
+                "Jobs post-commit en attente (file en mémoire)",
+            )
+            POST_COMMIT_JOBS = _Counter(
+                "mathakine_post_commit_jobs_total",
+                "Jobs post-commit traités",
+                ["job", "result"],
+            )
+            POST_COMMIT_DURATION = _Histogram(
+                "mathakine_post_commit_job_seconds",
+                "Durée d'exécution d'un job post-commit",
+                ["job"],
+                buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+            )
+            EMAIL_OUTBOX_MESSAGES = _Counter(
+                "mathakine_email_outbox_messages_total",
+                "Messages email_outbox traités par le thread d'envoi",
+                ["result"],
+            )
+            EMAIL_OUTBOX_BATCH_DURATION = _Histogram(
+                "mathakine_email_outbox_batch_seconds",
+                "Durée d'envoi d'un lot email_outbox (connexion réutilisée)",
+                buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+            )
+            EXERCISE_CATALOG_INDEX_ENTRIES = _Gauge(
+                "mathakine_exercise_catalog_index_entries",
+                "Exercices éligibles présents dans l'index catalogue du worker",
+            )
+            EXERCISE_CATALOG_INDEX_BYTES = _Gauge(
+                "mathakine_exercise_catalog_index_bytes",
+                "Mémoire estimée de l'index catalogue du worker (octets)",
+            )
+            CHALLENGE_INVENTORY_SERVES = _Counter(
+                "mathakine_challenge_inventory_serves_total",
+                "Demandes de défi IA éligibles à l'inventaire (hit = servi du stock)",
+                ["challenge_type", "result"],
+            )
+            CHALLENGE_INVENTORY_REFILLS = _Counter(
+                "mathakine_challenge_inventory_refills_total",
+                "Générations du thread de refill de l'inventaire défis",
+                ["challenge_type", "result"],
+            )
+            EXERCISE_INVENTORY_ITEMS = _Gauge(
+                "mathakine_exercise_inventory_items",
+                "Exercices IA en stock par seau (dernier comptage du thread de refill)",
+                ["exercise_type", "age_group", "pedagogical_band", "locale"],
+            )
+            EXERCISE_INVENTORY_SERVES = _Counter(
+                "mathakine_exercise_inventory_serves_total",
+                "Demandes d'exercice IA éligibles à l'inventaire (hit = servi)",
+                ["exercise_type", "result"],
+            )
+            EXERCISE_INVENTORY_REFILLS = _Counter(
+                "mathakine_exercise_inventory_refills_total",
+                "Générations du thread de refill de l'inventaire exercices",
+                ["exercise_type", "result"],
+            )
+            EXERCISE_INVENTORY_REFILL_LAG = _Histogram(
+                "mathakine_exercise_inventory_refill_lag_seconds",
+                "Délai entre la première demande sur un seau bas et sa recomplétion",
+                buckets=(1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0),
+            )
+            OPENAI_HTTP_REQUESTS = _Counter(
+                "mathakine_openai_http_requests_total",
+                "Requêtes HTTP envoyées à OpenAI par profil de client partagé",
+                ["profile"],
+            )
+            OPENAI_HTTP_CONNECTIONS_OPENED = _Counter(
+                "mathakine_openai_http_connections_opened_total",
+                "Connexions TCP ouvertes vers OpenAI (le reste = keep-alive réutilisé)",
+                ["profile"],
+            )
+            ACCOUNT_DELETION_ROWS = _Counter(
+                "mathakine_account_deletion_rows_total",
+                "Lignes supprimées par le plan de suppression de compte, par table",
+                ["table"],
+            )
+            ACCOUNT_DELETION_JOBS = _Counter(
+                "mathakine_account_deletion_jobs_total",
+                "Jobs de suppression de compte traités par le thread",
+                ["result"],
+            )
+            EDTECH_INGEST_EVENTS = _Counter(
+                "mathakine_edtech_ingest_events_total",
+                "Événements EdTech reçus (accepted / dropped / invalid) et écrits "
+                "(flushed / failed)",
+                ["result"],
+            )
+            EDTECH_INGEST_BUFFERED = _Gauge(
+                "mathakine_edtech_ingest_buffered",
+                "Événements EdTech en mémoire en attente d'écriture",
+            )
             logger.info("Métriques Prometheus enregistrées")
             initialized = True
         except ValueError as e:
@@ -194,6 +347,151 @@ def init_monitoring() -> bool:
     return initialized
 
 
+def record_settings_snapshot_lookup(hit: bool) -> None:
+    """Compte un hit/miss du snapshot settings (no-op si Prometheus inactif)."""
+    if SETTINGS_SNAPSHOT_LOOKUPS is not None:
+        SETTINGS_SNAPSHOT_LOOKUPS.labels(result="hit" if hit else "miss").inc()
+
+
+def record_db_executor_depth(queued: int, running: int) -> None:
+    """Publie la profondeur de l'executor DB (no-op si Prometheus inactif)."""
+    if DB_EXECUTOR_QUEUED is not None:
+        DB_EXECUTOR_QUEUED.set(queued)
+        DB_EXECUTOR_RUNNING.set(running)
+
+
+def record_db_executor_wait(seconds: float) -> None:
+    """Observe le temps passé en file par un appel run_db_bound."""
+    if DB_EXECUTOR_WAIT is not None:
+        DB_EXECUTOR_WAIT.observe(seconds)
+
+
+def record_db_executor_rejection() -> None:
+    """Compte un appel run_db_bound délesté (503)."""
+    if DB_EXECUTOR_REJECTED is not None:
+        DB_EXECUTOR_REJECTED.inc()
+
+
+def record_post_commit_depth(queued: int) -> None:
+    """Publie la profondeur de la file post-commit (no-op si Prometheus inactif)."""
+    if POST_COMMIT_QUEUED is not None:
+        POST_COMMIT_QUEUED.set(queued)
+
+
+def record_post_commit_job(job: str, result: str, seconds: float) -> None:
+    """Compte un job post-commit (result = done / skipped / failed) et sa durée."""
+    if POST_COMMIT_JOBS is not None:
+        POST_COMMIT_JOBS.labels(job=job, result=result).inc()
+        POST_COMMIT_DURATION.labels(job=job).observe(seconds)
+
+
+def record_email_outbox_batch(results: Dict[str, int], seconds: float) -> None:
+    """Compte les messages d'un lot (sent / retry / failed) et sa durée d'envoi."""
+    if EMAIL_OUTBOX_MESSAGES is not None:
+        for result, count in results.items():
+            if count:
+                EMAIL_OUTBOX_MESSAGES.labels(result=result).inc(count)
+        EMAIL_OUTBOX_BATCH_DURATION.observe(seconds)
+
+
+def record_exercise_catalog_index(entries: int, nbytes: int) -> None:
+    """Publie la taille de l'index catalogue exercices (no-op si Prometheus inactif)."""
+    if EXERCISE_CATALOG_INDEX_ENTRIES is not None:
+        EXERCISE_CATALOG_INDEX_ENTRIES.set(entries)
+        EXERCISE_CATALOG_INDEX_BYTES.set(nbytes)
+
+
+def record_challenge_inventory_serve(challenge_type: str, result: str) -> None:
+    """Compte une demande éligible à l'inventaire défis (``hit`` / ``miss``)."""
+    if CHALLENGE_INVENTORY_SERVES is not None:
+        CHALLENGE_INVENTORY_SERVES.labels(
+            challenge_type=challenge_type, result=result
+        ).inc()
+
+
+def record_challenge_inventory_refill(challenge_type: str, result: str) -> None:
+    """Compte une génération de refill (``stocked`` / ``failed``)."""
+    if CHALLENGE_INVENTORY_REFILLS is not None:
+        CHALLENGE_INVENTORY_REFILLS.labels(
+            challenge_type=challenge_type, result=result
+        ).inc()
+
+
+def record_exercise_inventory_level(
+    exercise_type: str,
+    age_group: str,
+    pedagogical_band: Optional[str],
+    locale: str,
+    count: int,
+) -> None:
+    """Publie le stock d'un seau de l'inventaire exercices (santé du pool)."""
+    if EXERCISE_INVENTORY_ITEMS is not None:
+        EXERCISE_INVENTORY_ITEMS.labels(
+            exercise_type=exercise_type,
+            age_group=age_group,
+            pedagogical_band=pedagogical_band or "legacy",
+            locale=locale,
+        ).set(count)
+
+
+def record_exercise_inventory_serve(exercise_type: str, result: str) -> None:
+    """Compte une demande éligible à l'inventaire exercices (``hit`` / ``miss``)."""
+    if EXERCISE_INVENTORY_SERVES is not None:
+        EXERCISE_INVENTORY_SERVES.labels(
+            exercise_type=exercise_type, result=result
+        ).inc()
+
+
+def record_exercise_inventory_refill(exercise_type: str, result: str) -> None:
+    """Compte une génération de refill exercices (``stocked`` / ``failed``)."""
+    if EXERCISE_INVENTORY_REFILLS is not None:
+        EXERCISE_INVENTORY_REFILLS.labels(
+            exercise_type=exercise_type, result=result
+        ).inc()
+
+
+def record_exercise_inventory_refill_lag(seconds: float) -> None:
+    """Observe le délai de recomplétion d'un seau exercices demandé."""
+    if EXERCISE_INVENTORY_REFILL_LAG is not None:
+        EXERCISE_INVENTORY_REFILL_LAG.observe(seconds)
+
+
+def record_openai_http_request(profile: str) -> None:
+    """Compte une requête HTTP OpenAI d'un client partagé (no-op si Prometheus inactif)."""
+    if OPENAI_HTTP_REQUESTS is not None:
+        OPENAI_HTTP_REQUESTS.labels(profile=profile).inc()
+
+
+def record_openai_http_connection(profile: str) -> None:
+    """Compte une nouvelle connexion TCP vers OpenAI (non réutilisée)."""
+    if OPENAI_HTTP_CONNECTIONS_OPENED is not None:
+        OPENAI_HTTP_CONNECTIONS_OPENED.labels(profile=profile).inc()
+
+
+def record_account_deletion_rows(table: str, count: int) -> None:
+    """Compte les lignes d'un paquet de suppression de compte."""
+    if ACCOUNT_DELETION_ROWS is not None and count:
+        ACCOUNT_DELETION_ROWS.labels(table=table).inc(count)
+
+
+def record_account_deletion_job(result: str) -> None:
+    """Compte un job de suppression de compte (done / retry / failed)."""
+    if ACCOUNT_DELETION_JOBS is not None:
+        ACCOUNT_DELETION_JOBS.labels(result=result).inc()
+
+
+def record_edtech_ingest(result: str, count: int = 1) -> None:
+    """Compte des événements EdTech par issue (accepted, dropped, flushed...)."""
+    if EDTECH_INGEST_EVENTS is not None and count:
+        EDTECH_INGEST_EVENTS.labels(result=result).inc(count)
+
+
+def record_edtech_buffer_depth(buffered: int) -> None:
+    """Publie le nombre d'événements EdTech en attente dans le buffer."""
+    if EDTECH_INGEST_BUFFERED is not None:
+        EDTECH_INGEST_BUFFERED.set(buffered)
+
+
 async def metrics_endpoint(request):
     """Endpoint GET /metrics pour Prometheus."""
     from starlette.responses import PlainTextResponse, Response
@@ -0,0 +1,242 @@
+"""
+Transport HTTP partagé des clients OpenAI (exercices, défis, assistant chat).
+
+Chaque génération construisait un ``AsyncOpenAI`` neuf, donc un pool httpx neuf :
+nouvelle connexion TCP + TLS avant le premier token. Le registre garde un pool
+httpx long-lived par (event loop, base URL, profil, timeout) :
+
+- les services instancient toujours ``openai.AsyncOpenAI`` (objet léger, patché
+  par les tests) mais sur ce transport : les connexions keep-alive sont réutilisées
+  d'une requête à l'autre, en HTTP/2 si ``OPENAI_HTTP2`` et le paquet ``h2`` ;
+- le SDK ferme un stream SSE dès ``[DONE]`` sans lire la fin du corps HTTP/1.1 :
+  httpcore jetterait alors la connexion. Le transport lit ce reliquat (borné en
+  octets et en temps) avant de rendre la connexion au pool ;
+- limites : OPENAI_HTTP_MAX_CONNECTIONS / _MAX_KEEPALIVE_CONNECTIONS /
+  _KEEPALIVE_EXPIRY_SECONDS ;
+- métriques par profil : requêtes envoyées et connexions TCP ouvertes (l'écart
+  est la réutilisation), exposées aussi par ``stats()`` ;
+- un pool httpx est lié à l'event loop qui l'a ouvert : les pools d'une loop
+  fermée (``asyncio.run`` d'un script) sont simplement oubliés ;
+- cycle de vie : ``server.app`` appelle ``start()`` au démarrage et
+  ``await aclose()`` à l'arrêt ; ``aclose()`` ne ferme que les pools de la loop
+  appelante (chaque thread à event loop propre ferme les siens).
+
+Usage:
+    client = openai_client(
+        api_key=settings.OPENAI_API_KEY, profile="exercises", timeout=60
+    )
+"""
+
+import asyncio
+import importlib.util
+import threading
+from typing import Any, AsyncIterator, Dict, NamedTuple, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.core.monitoring import (
+    record_openai_http_connection,
+    record_openai_http_request,
+)
+
+logger = get_logger(__name__)
+
+# Événement httpcore émis à l'ouverture d'une connexion (jamais en réutilisation).
+_NEW_CONNECTION_EVENT = "connection.connect_tcp.complete"
+# Reliquat lu à la fermeture d'une réponse interrompue ; au-delà, connexion jetée.
+_DRAIN_MAX_BYTES = 64 * 1024
+_DRAIN_TIMEOUT_SEC = 0.25
+
+
+class _PoolKey(NamedTuple):
+    loop: asyncio.AbstractEventLoop
+    base_url: Optional[str]
+    profile: str
+    timeout: Optional[float]
+
+
+def http2_available() -> bool:
+    """HTTP/2 demandé par la config et paquet ``h2`` (optionnel) installé."""
+    return settings.OPENAI_HTTP2 and importlib.util.find_spec("h2") is not None
+
+
+class _DrainOnCloseStream(httpx.AsyncByteStream):
+    """Corps de réponse qui lit son reliquat avant fermeture (connexion rendue)."""
+
+    def __init__(self, stream: httpx.AsyncByteStream):
+        self._stream = stream
+        self._iterator: Optional[AsyncIterator[bytes]] = None
+        self._exhausted = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        self._iterator = self._stream.__aiter__()
+        async for chunk in self._iterator:
+            yield chunk
+        self._exhausted = True
+
+    async def aclose(self) -> None:
+        if self._iterator is not None and not self._exhausted:
+            try:
+                await asyncio.wait_for(self._drain(), _DRAIN_TIMEOUT_SEC)
+            except (asyncio.TimeoutError, httpx.HTTPError):
+                pass
+        await self._stream.aclose()
+
+    async def _drain(self) -> None:
+        remaining = _DRAIN_MAX_BYTES
+        async for chunk in self._iterator:
+            remaining -= len(chunk)
+            if remaining < 0:
+                return
+        self._exhausted = True
+
+
+class _DrainingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self._transport.handle_async_request(request)
+        response.stream = _DrainOnCloseStream(response.stream)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class OpenAIClientRegistry:
+    """Pools httpx partagés par profil de client OpenAI, instrumentés."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools: Dict[_PoolKey, httpx.AsyncClient] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def start(self) -> None:
+        """Hook de démarrage : journalise le transport effectif."""
+        logger.info(
+            "Clients OpenAI : pool partagé http2={} max_connections={} "
+            "max_keepalive={} keepalive_expiry={}s",
+            http2_available(),
+            settings.OPENAI_HTTP_MAX_CONNECTIONS,
+            settings.OPENAI_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            settings.OPENAI_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        )
+        if settings.OPENAI_HTTP2 and not http2_available():
+            logger.warning(
+                "OPENAI_HTTP2 actif mais paquet h2 absent : HTTP/1.1 keep-alive"
+            )
+
+    def http_client(
+        self,
+        *,
+        profile: str,
+        timeout: Optional[float] = None,
+        base_url: Optional[str] = None,
+    ) -> httpx.AsyncClient:
+        """Pool httpx du profil pour l'event loop courante (créé au premier appel)."""
+        loop = asyncio.get_running_loop()
+        key = _PoolKey(
+            loop, base_url, profile, None if timeout is None else float(timeout)
+        )
+        with self._lock:
+            client = self._pools.get(key)
+            if client is None or client.is_closed:
+                self._forget_closed_loops()
+                client = self._build(profile, timeout)
+                self._pools[key] = client
+            return client
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Compteurs process par profil : ``requests`` et ``connections_opened``."""
+        with self._lock:
+            return {profile: dict(counts) for profile, counts in self._stats.items()}
+
+    async def aclose(self) -> None:
+        """
+        Hook d'arrêt : ferme les pools de la loop courante. Ceux des autres loops
+        (threads de réassort) restent en place : chacune ferme les siens.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pools = [self._pools.pop(k) for k in list(self._pools) if k.loop is loop]
+            self._forget_closed_loops()
+        for client in pools:
+            await client.aclose()
+
+    def clear(self) -> None:
+        """Oublie pools et compteurs sans I/O (tests)."""
+        with self._lock:
+            self._pools.clear()
+            self._stats.clear()
+
+    def _forget_closed_loops(self) -> None:
+        for key in [k for k in self._pools if k.loop.is_closed()]:
+            del self._pools[key]
+
+    def _count(self, profile: str, field: str) -> None:
+        with self._lock:
+            counts = self._stats.setdefault(
+                profile, {"requests": 0, "connections_opened": 0}
+            )
+            counts[field] += 1
+
+    def _build(self, profile: str, timeout: Optional[float]) -> httpx.AsyncClient:
+        from openai import DefaultAsyncHttpxClient
+
+        async def _trace(event: str, _info: Dict[str, Any]) -> None:
+            if event == _NEW_CONNECTION_EVENT:
+                self._count(profile, "connections_opened")
+                record_openai_http_connection(profile)
+
+        async def _on_request(request: httpx.Request) -> None:
+            self._count(profile, "requests")
+            record_openai_http_request(profile)
+            request.extensions["trace"] = _trace
+
+        limits = httpx.Limits(
+            max_connections=settings.OPENAI_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENAI_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.OPENAI_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        )
+        transport = httpx.AsyncHTTPTransport(http2=http2_available(), limits=limits)
+        kwargs: Dict[str, Any] = {
+            "transport": _DrainingTransport(transport),
+            "event_hooks": {"request": [_on_request]},
+        }
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        return DefaultAsyncHttpxClient(**kwargs)
+
+
+openai_client_registry = OpenAIClientRegistry()
+
+
+def openai_client(
+    *,
+    api_key: str,
+    profile: str,
+    timeout: Optional[float] = None,
+    base_url: Optional[str] = None,
+) -> Any:
+    """
+    ``openai.AsyncOpenAI`` sur le transport partagé du profil.
+
+    ``timeout`` None = timeout par défaut du SDK. ``openai.AsyncOpenAI`` est résolu
+    à l'appel : les tests qui le patchent interceptent toujours la construction.
+    """
+    import openai
+
+    kwargs: Dict[str, Any] = {
+        "api_key": api_key,
+        "http_client": openai_client_registry.http_client(
+            profile=profile, timeout=timeout, base_url=base_url
+        ),
+    }
+    if timeout is not None:
+        kwargs["timeout"] = timeout
+    if base_url is not None:
+        kwargs["base_url"] = base_url
+    return openai.AsyncOpenAI(**kwargs)
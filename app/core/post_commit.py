@@ -0,0 +1,267 @@
+"""
+File de travail post-commit : effets de bord différés après le commit d'une requête.
+
+Contrat :
+- ``enqueue_post_commit(job, key)`` s'appelle APRÈS le commit qui a persisté la
+  ligne outbox du job (ex. ``attempt_side_effects``) ; le handler enregistré pour
+  ``job`` reçoit ``key`` dans un thread dédié.
+- Les handlers sont idempotents par clé (ex. attempt_id) : la file peut livrer
+  deux fois (re-enqueue au démarrage, plusieurs workers uvicorn).
+- ``InProcessPostCommitQueue`` n'est pas durable : la durabilité vient de la ligne
+  outbox écrite dans la transaction métier. Le balayage périodique
+  (``start_post_commit_sweeper``) re-planifie les lignes restées ``pending`` :
+  job en échec (backoff), refusé file pleine, perdu à l'arrêt. Une implémentation
+  durable (worker dédié lisant l'outbox) se branche via ``set_post_commit_queue``.
+"""
+
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.core.monitoring import record_post_commit_depth, record_post_commit_job
+
+logger = get_logger(__name__)
+
+# handler(key) -> True si le travail a été fait, False si déjà traité / ignoré.
+PostCommitHandler = Callable[[Any], bool]
+
+# sweep() -> nombre de clés re-planifiées (lignes outbox échues du job).
+PostCommitSweep = Callable[[], int]
+
+_handlers: Dict[str, PostCommitHandler] = {}
+_sweeps: Dict[str, PostCommitSweep] = {}
+
+
+def register_post_commit_handler(job: str, handler: PostCommitHandler) -> None:
+    """Associe un nom de job à son handler (appelé à l'import du service métier)."""
+    _handlers[job] = handler
+
+
+def register_post_commit_sweep(job: str, sweep: PostCommitSweep) -> None:
+    """Associe à ``job`` la re-planification de ses lignes outbox échues."""
+    _sweeps[job] = sweep
+
+
+def run_post_commit_job(job: str, key: Any) -> str:
+    """Exécute un job et retourne ``done`` / ``skipped`` / ``failed`` (jamais d'exception)."""
+    started = time.perf_counter()
+    handler = _handlers.get(job)
+    if handler is None:
+        logger.error("Job post-commit inconnu: {}", job)
+        result = "failed"
+    else:
+        try:
+            result = "done" if handler(key) else "skipped"
+        except Exception:
+            logger.exception("Job post-commit {} en échec (clé {})", job, key)
+            result = "failed"
+    record_post_commit_job(job, result, time.perf_counter() - started)
+    return result
+
+
+class PostCommitQueue(ABC):
+    """Interface minimale d'une file post-commit."""
+
+    @abstractmethod
+    def enqueue(self, job: str, key: Any) -> bool:
+        """Planifie ``job(key)`` ; False si refusé (file pleine ou arrêtée)."""
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Arrête la consommation (no-op par défaut)."""
+
+
+class InProcessPostCommitQueue(PostCommitQueue):
+    """File mémoire consommée par ``workers`` threads démarrés au premier enqueue."""
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self._queue: "queue.Queue[Optional[Tuple[str, Any]]]" = queue.Queue(
+            maxsize=max_queue
+        )
+        self._lock = threading.Lock()
+        self._pending: Set[Tuple[str, Any]] = set()
+        self._threads: List[threading.Thread] = []
+        self._stopped = False
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def _ensure_started(self) -> None:
+        if self._threads:
+            return
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._worker,
+                name=f"mathakine-post-commit-{index}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def enqueue(self, job: str, key: Any) -> bool:
+        item = (job, key)
+        with self._lock:
+            if self._stopped:
+                return False
+            if item in self._pending:
+                return True
+            self._ensure_started()
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                logger.warning(
+                    "File post-commit saturée : {} ({}) laissé au balayage", job, key
+                )
+                return False
+            self._pending.add(item)
+        record_post_commit_depth(self._queue.qsize())
+        return True
+
+    def _worker(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                run_post_commit_job(*item)
+            finally:
+                if item is not None:
+                    with self._lock:
+                        self._pending.discard(item)
+                    record_post_commit_depth(self._queue.qsize())
+                self._queue.task_done()
+
+    def drain(self, timeout: float = 5.0) -> bool:
+        """Attend que tous les jobs en file soient traités (tests, arrêt propre)."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def shutdown(self, wait: bool = True, timeout: float = 5.0) -> None:
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            threads = list(self._threads)
+        if wait:
+            self.drain(timeout)
+        for _ in threads:
+            self._queue.put(None)
+        if wait:
+            for thread in threads:
+                thread.join(timeout)
+
+
+_post_commit_queue: Optional[PostCommitQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_post_commit_queue() -> PostCommitQueue:
+    """File post-commit du process (créée à la demande)."""
+    global _post_commit_queue
+    if _post_commit_queue is None:
+        with _queue_lock:
+            if _post_commit_queue is None:
+                _post_commit_queue = InProcessPostCommitQueue(
+                    workers=settings.POST_COMMIT_WORKERS,
+                    max_queue=settings.POST_COMMIT_MAX_QUEUE,
+                )
+    return _post_commit_queue
+
+
+def set_post_commit_queue(post_commit_queue: Optional[PostCommitQueue]) -> None:
+    """Remplace la file du process (implémentation durable, tests)."""
+    global _post_commit_queue
+    with _queue_lock:
+        _post_commit_queue = post_commit_queue
+
+
+def enqueue_post_commit(job: str, key: Any) -> bool:
+    """
+    Planifie ``job(key)`` ; à n'appeler qu'après le commit de la ligne outbox.
+    False si la file refuse le job : la ligne reste ``pending`` pour le balayage.
+    """
+    return get_post_commit_queue().enqueue(job, key)
+
+
+def run_post_commit_sweeps() -> int:
+    """Un passage de balayage (tous les jobs) ; retourne le nombre re-planifié."""
+    requeued = 0
+    for job, sweep in list(_sweeps.items()):
+        try:
+            count = sweep()
+        except Exception:
+            logger.exception("Balayage post-commit {} en échec", job)
+            continue
+        if count:
+            logger.info("Post-commit {} : {} clé(s) re-planifiée(s)", job, count)
+        requeued += count
+    return requeued
+
+
+class PostCommitSweeper:
+    """Balaye au démarrage, puis toutes les ``poll_seconds`` secondes."""
+
+    def __init__(self, poll_seconds: float):
+        self.poll_seconds = poll_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="mathakine-post-commit-sweeper", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            run_post_commit_sweeps()
+            self._stop.wait(self.poll_seconds)
+
+
+_sweeper: Optional[PostCommitSweeper] = None
+
+
+def start_post_commit_sweeper() -> PostCommitSweeper:
+    """Démarre le balayage des jobs enregistrés (startup, effets de bord async)."""
+    global _sweeper
+    with _queue_lock:
+        if _sweeper is None:
+            _sweeper = PostCommitSweeper(settings.POST_COMMIT_SWEEP_SECONDS)
+            _sweeper.start()
+        return _sweeper
+
+
+def stop_post_commit_sweeper() -> None:
+    """Arrête le balayage (no-op s'il ne tourne pas)."""
+    global _sweeper
+    with _queue_lock:
+        sweeper, _sweeper = _sweeper, None
+    if sweeper is not None:
+        sweeper.stop()
+
+
+def shutdown_post_commit_queue() -> None:
+    """Arrête le balayage, draine puis arrête la file (shutdown de l'application)."""
+    global _post_commit_queue
+    stop_post_commit_sweeper()
+    with _queue_lock:
+        post_commit_queue, _post_commit_queue = _post_commit_queue, None
+    if post_commit_queue is not None:
+        post_commit_queue.shutdown()
@@ -4,24 +4,160 @@ Helper unique pour executer du code sync (DB, use cases) hors de l'event loop.
 Modele d'execution LOT A1:
 - Handlers Starlette restent async
 - DB et use cases restent sync
-- Les appels DB/metier sync passent par run_db_bound() (threadpool)
+- Les appels DB/metier sync passent par run_db_bound() (threadpool dedie)
 
 Contrat boundary (F5): les sync_func passées à run_db_bound doivent utiliser
 sync_db_session() en interne. Voir app.core.db_boundary pour la formalisation.
 
+Executor DB dedie (pas le default executor de la loop, partage avec tout
+asyncio.to_thread) :
+- workers = pool_size + max_overflow du moteur SQLAlchemy (app.db.base) : un thread
+  de plus que de connexions disponibles ne ferait qu'attendre pool_timeout.
+- file d'attente bornee (DB_EXECUTOR_MAX_QUEUE) : au-dela, DbExecutorOverloadedError
+  (503) au lieu d'une latence non bornee sur tous les endpoints. EdgeMiddleware
+  rejette en amont les requetes /api/* tant que la file est saturee.
+- gauges Prometheus queued / running + histogramme du temps d'attente.
+
 Usage:
     result = await run_db_bound(some_sync_func, arg1, arg2, kw=val)
 """
 
 import asyncio
-from typing import Any, Callable, TypeVar
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from app.core.config import settings
+from app.core.monitoring import (
+    record_db_executor_depth,
+    record_db_executor_rejection,
+    record_db_executor_wait,
+)
+from app.exceptions import DbExecutorOverloadedError
 
 T = TypeVar("T")
 
 
+class DbExecutor:
+    """ThreadPoolExecutor borné et instrumenté pour les appels DB sync."""
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="mathakine-db"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    def is_saturated(self) -> bool:
+        """True si la file d'attente a atteint DB_EXECUTOR_MAX_QUEUE (0 = non bornée)."""
+        return self.max_queue > 0 and self._queued >= self.max_queue
+
+    def _publish(self) -> None:
+        record_db_executor_depth(self._queued, self._running)
+
+    def _job_started(self) -> None:
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._publish()
+
+    def _job_finished(self) -> None:
+        with self._lock:
+            self._running -= 1
+            self._publish()
+
+    def _job_cancelled(self, future: Future) -> None:
+        # Annulé avant exécution (client déconnecté) : libère la place en file
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+                self._publish()
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            if self.is_saturated():
+                record_db_executor_rejection()
+                raise DbExecutorOverloadedError()
+            self._queued += 1
+            self._publish()
+
+        ctx = contextvars.copy_context()
+        enqueued_at = time.perf_counter()
+
+        def _job() -> T:
+            self._job_started()
+            record_db_executor_wait(time.perf_counter() - enqueued_at)
+            try:
+                return ctx.run(func, *args, **kwargs)
+            finally:
+                self._job_finished()
+
+        future = self._executor.submit(_job)
+        future.add_done_callback(self._job_cancelled)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_db_executor: Optional[DbExecutor] = None
+_db_executor_lock = threading.Lock()
+
+
+def _default_db_workers() -> int:
+    from app.db.base import engine
+
+    pool = engine.pool
+    size = getattr(pool, "size", None)
+    overflow = getattr(pool, "_max_overflow", 0)
+    if callable(size):
+        return max(1, size() + max(0, overflow))
+    return max(1, settings.MAX_CONNECTIONS_POOL * 3)
+
+
+def get_db_executor() -> DbExecutor:
+    """Executor DB du process, créé au premier appel (taille issue du pool SQLAlchemy)."""
+    global _db_executor
+
+    if _db_executor is None:
+        with _db_executor_lock:
+            if _db_executor is None:
+                workers = settings.DB_EXECUTOR_MAX_WORKERS or _default_db_workers()
+                _db_executor = DbExecutor(workers, settings.DB_EXECUTOR_MAX_QUEUE)
+    return _db_executor
+
+
+def is_db_executor_saturated() -> bool:
+    """Lecture sans création (EdgeMiddleware) : False tant qu'aucun appel DB n'a eu lieu."""
+    return _db_executor is not None and _db_executor.is_saturated()
+
+
+def shutdown_db_executor() -> None:
+    """Arrête l'executor DB (shutdown app) ; recréé paresseusement au prochain appel."""
+    global _db_executor
+
+    with _db_executor_lock:
+        executor, _db_executor = _db_executor, None
+    if executor is not None:
+        executor.shutdown()
+
+
 async def run_db_bound(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
     """
-    Execute une fonction sync dans un threadpool pour ne pas bloquer l'event loop.
+    Execute une fonction sync dans l'executor DB pour ne pas bloquer l'event loop.
 
     Args:
         func: Fonction sync a executer (ex: perform_login, perform_refresh)
@@ -30,5 +166,8 @@ async def run_db_bound(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
 
     Returns:
         Le resultat de func(*args, **kwargs)
+
+    Raises:
+        DbExecutorOverloadedError: file d'attente saturée (503)
     """
-    return await asyncio.to_thread(func, *args, **kwargs)
+    return await get_db_executor().run(func, *args, **kwargs)
@@ -54,6 +54,23 @@ def decode_token(token: str) -> dict:
         raise HTTPException(status_code=401, detail="Token invalide ou expiré")
 
 
+def decode_token_cached(token: str) -> dict:
+    """
+    decode_token() avec cache LRU des payloads déjà vérifiés (clé = sha256 du token).
+
+    Une entrée n'est servie que jusqu'à l'``exp`` du token ; les échecs ne sont
+    jamais mis en cache (même HTTPException 401 que decode_token).
+    """
+    from app.utils.auth_cache import verified_token_cache
+
+    payload = verified_token_cache.get(token)
+    if payload is not None:
+        return payload
+    payload = decode_token(token)
+    verified_token_cache.put(token, payload)
+    return payload
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Crée un token JWT d'accès
@@ -0,0 +1,95 @@
+"""
+Moteur SQLAlchemy async optionnel (asyncpg) — opt-in via DB_ASYNC_ENABLED.
+
+Pendant de app.db.base pour les lectures chaudes servies sans hop threadpool
+(voir app.core.db_boundary.run_db_read). Créé paresseusement : sans opt-in ou
+sans asyncpg installé, get_async_sessionmaker() retourne None et les appelants
+restent sur le chemin sync (run_db_bound + sync_db_session).
+"""
+
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.db.base import redact_database_url_for_log
+
+logger = get_logger(__name__)
+
+_async_engine: Any = None
+_async_sessionmaker: Any = None
+_async_unavailable = False
+
+
+def to_asyncpg_url(raw_url: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Convertit une URL psycopg2 (postgres:// / postgresql://) en URL asyncpg.
+
+    ``sslmode`` (libpq) n'est pas un argument asyncpg : il est retiré de la query
+    et transmis en ``connect_args["ssl"]``.
+    """
+    parsed = urlparse(raw_url)
+    scheme = parsed.scheme.split("+", 1)[0]
+    if scheme not in ("postgres", "postgresql"):
+        raise ValueError(f"URL non PostgreSQL pour asyncpg: {scheme or '<vide>'}")
+    query = dict(parse_qsl(parsed.query))
+    connect_args: Dict[str, Any] = {}
+    sslmode = query.pop("sslmode", None)
+    if sslmode and sslmode != "disable":
+        connect_args["ssl"] = sslmode
+    url = urlunparse(
+        parsed._replace(scheme="postgresql+asyncpg", query=urlencode(query))
+    )
+    return url, connect_args
+
+
+def get_async_sessionmaker() -> Optional[Any]:
+    """async_sessionmaker configuré, ou None si le mode async est inactif/indisponible."""
+    global _async_engine, _async_sessionmaker, _async_unavailable
+
+    if not settings.DB_ASYNC_ENABLED or _async_unavailable:
+        return None
+    if _async_sessionmaker is not None:
+        return _async_sessionmaker
+
+    try:
+        import asyncpg  # noqa: F401
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    except ImportError:
+        logger.warning(
+            "DB_ASYNC_ENABLED=true mais asyncpg absent — repli sur le chemin sync"
+        )
+        _async_unavailable = True
+        return None
+
+    url, connect_args = to_asyncpg_url(settings.SQLALCHEMY_DATABASE_URL)
+    # Même dimensionnement que le moteur sync (app.db.base)
+    _async_engine = create_async_engine(
+        url,
+        echo=settings.LOG_LEVEL == "DEBUG",
+        pool_pre_ping=True,
+        pool_size=settings.MAX_CONNECTIONS_POOL,
+        max_overflow=settings.MAX_CONNECTIONS_POOL * 2,
+        pool_recycle=settings.POOL_RECYCLE_SECONDS,
+        pool_timeout=30,
+        connect_args=connect_args,
+    )
+    _async_sessionmaker = async_sessionmaker(
+        _async_engine, autoflush=False, expire_on_commit=False
+    )
+    logger.info(
+        "Moteur SQLAlchemy async (asyncpg) créé: {}",
+        redact_database_url_for_log(settings.SQLALCHEMY_DATABASE_URL),
+    )
+    return _async_sessionmaker
+
+
+async def dispose_async_engine() -> None:
+    """Ferme le pool async (shutdown app, fin de test — le pool est lié à la loop)."""
+    global _async_engine, _async_sessionmaker
+
+    engine = _async_engine
+    _async_engine = None
+    _async_sessionmaker = None
+    if engine is not None:
+        await engine.dispose()
@@ -8,6 +8,9 @@ Usage:
 Live : opt-in explicite ``MATHAKINE_AI_EVAL_LIVE=1`` **ou** ``--live`` (voir doc).
 
 Persistance DB (IA8) : opt-in ``--persist`` après écriture des artefacts JSON/MD.
+
+Concurrence : ``--concurrency N`` (cas live en vol / process offline) et
+``--model-budget MODEL=N[/RPM]`` (répétable) pour rester sous les rate limits.
 """
 
 from __future__ import annotations
@@ -18,18 +21,25 @@ import json
 import os
 import subprocess
 import sys
+import time
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
+from app.evaluation.concurrency import (
+    ModelBudget,
+    parse_model_budgets,
+    run_live_cases,
+    run_offline_cases,
+)
 from app.evaluation.corpus_loader import default_corpus_path, iter_cases, load_corpus
 from app.evaluation.reporting import (
     aggregate_from_results,
     build_markdown_summary,
+    order_results_by_cases,
     write_report,
 )
-from app.evaluation.runners import dispatch_live, dispatch_offline
 from app.evaluation.schemas import CaseResult, HarnessReport
 
 
@@ -60,38 +70,106 @@ LIMITATIONS = (
 )
 
 
+def _token_tracker_snapshot() -> Dict[str, Any]:
+    try:
+        from app.utils.token_tracker import token_tracker
+
+        return token_tracker.get_stats(days=1)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _build_harness_report(
+    *,
+    mode: str,
+    target: str,
+    corpus_path: Path,
+    corpus_version: int,
+    cases: List[Dict[str, Any]],
+    results: List[CaseResult],
+    token_tracker_snapshot: Optional[Dict[str, Any]],
+    concurrency: int = 1,
+    wall_clock_ms: Optional[float] = None,
+) -> HarnessReport:
+    ordered = order_results_by_cases(results, cases)
+    n, passed, failed, skipped = aggregate_from_results(ordered)
+    report = HarnessReport(
+        mode=mode,
+        target=target,
+        corpus_path=str(corpus_path),
+        corpus_version=corpus_version,
+        cases_total=len(cases),
+        cases_run=n,
+        cases_passed=passed,
+        cases_failed=failed,
+        cases_skipped=skipped,
+        results=[r.to_dict() for r in ordered],
+        summary_markdown="",
+        token_tracker_snapshot=token_tracker_snapshot,
+        limitations_note=LIMITATIONS,
+        concurrency=max(1, int(concurrency)),
+        wall_clock_ms=wall_clock_ms,
+    )
+    report.summary_markdown = build_markdown_summary(report)
+    return report
+
+
+def split_harness_report(
+    report: HarnessReport,
+    case_ids: Iterable[str],
+    *,
+    target: str,
+) -> HarnessReport:
+    """
+    Sous-rapport restreint à ``case_ids`` (ex. une variante IA11b d'un run groupé).
+
+    La durée murale reste celle du run groupé : les cas ont été exécutés ensemble.
+    """
+    wanted = list(case_ids)
+    by_id = {str(r.get("case_id")): r for r in report.results}
+    results = [CaseResult(**by_id[cid]) for cid in wanted if cid in by_id]
+    return _build_harness_report(
+        mode=report.mode,
+        target=target,
+        corpus_path=Path(report.corpus_path),
+        corpus_version=report.corpus_version,
+        cases=[{"id": cid} for cid in wanted],
+        results=results,
+        token_tracker_snapshot=report.token_tracker_snapshot,
+        concurrency=report.concurrency,
+        wall_clock_ms=report.wall_clock_ms,
+    )
+
+
 def run_offline_harness_report(
     target: str,
     corpus_path: Optional[Path] = None,
+    *,
+    concurrency: int = 1,
 ) -> HarnessReport:
     """
     Exécute le harness **uniquement** en offline (aucun ``dispatch_live``).
 
     Réutilisé par la campagne comparative IA11a et par ``_run_async`` (mode offline).
+    ``concurrency`` > 1 répartit les validations sur un pool de process.
     """
     corpus = corpus_path or default_corpus_path()
     data = load_corpus(corpus)
     version = int(data.get("version", 0))
     cases = iter_cases(data, target=target, mode="offline")
-    results: List[CaseResult] = [dispatch_offline(c) for c in cases]
-    n, passed, failed, skipped = aggregate_from_results(results)
-    report = HarnessReport(
+    t0 = time.perf_counter()
+    results = run_offline_cases(cases, concurrency=concurrency)
+    return _build_harness_report(
         mode="offline",
         target=target,
-        corpus_path=str(corpus),
+        corpus_path=corpus,
         corpus_version=version,
-        cases_total=len(cases),
-        cases_run=n,
-        cases_passed=passed,
-        cases_failed=failed,
-        cases_skipped=skipped,
-        results=[r.to_dict() for r in results],
-        summary_markdown="",
+        cases=cases,
+        results=results,
         token_tracker_snapshot=None,
-        limitations_note=LIMITATIONS,
+        concurrency=concurrency,
+        wall_clock_ms=(time.perf_counter() - t0) * 1000,
     )
-    report.summary_markdown = build_markdown_summary(report)
-    return report
 
 
 def harness_live_opt_in_allowed(*, live_cli_flag: bool = False) -> bool:
@@ -204,92 +282,65 @@ def run_live_harness_for_explicit_cases(
     *,
     corpus_path: Optional[Path] = None,
     report_target: str = "bounded_live",
+    concurrency: int = 1,
+    model_budgets: Optional[Dict[str, ModelBudget]] = None,
 ) -> HarnessReport:
     """
     Exécute ``dispatch_live`` sur une liste de cas **déjà enrichis** (ex. ``eval_model``).
 
     Utilisé par IA11b pour un passage unique par variante sans élargir le corpus.
+    ``concurrency`` / ``model_budgets`` : voir :mod:`app.evaluation.concurrency`.
     """
     corpus = corpus_path or default_corpus_path()
     data = load_corpus(corpus)
     version = int(data.get("version", 0))
 
-    async def _run() -> List[CaseResult]:
-        out: List[CaseResult] = []
-        for c in cases:
-            out.append(await dispatch_live(c))
-        return out
-
-    results = asyncio.run(_run())
-    n, passed, failed, skipped = aggregate_from_results(results)
-    token_snap: Dict[str, Any] | None = None
-    try:
-        from app.utils.token_tracker import token_tracker
-
-        token_snap = token_tracker.get_stats(days=1)
-    except Exception as e:
-        token_snap = {"error": str(e)}
-
-    report = HarnessReport(
+    t0 = time.perf_counter()
+    results = asyncio.run(
+        run_live_cases(cases, concurrency=concurrency, model_budgets=model_budgets)
+    )
+    return _build_harness_report(
         mode="live",
         target=report_target,
-        corpus_path=str(corpus),
+        corpus_path=corpus,
         corpus_version=version,
-        cases_total=len(cases),
-        cases_run=n,
-        cases_passed=passed,
-        cases_failed=failed,
-        cases_skipped=skipped,
-        results=[r.to_dict() for r in results],
-        summary_markdown="",
-        token_tracker_snapshot=token_snap,
-        limitations_note=LIMITATIONS,
+        cases=cases,
+        results=results,
+        token_tracker_snapshot=_token_tracker_snapshot(),
+        concurrency=concurrency,
+        wall_clock_ms=(time.perf_counter() - t0) * 1000,
     )
-    report.summary_markdown = build_markdown_summary(report)
-    return report
 
 
 async def _run_async(
     mode: str,
     target: str,
     corpus_path: Path,
+    *,
+    concurrency: int = 1,
+    model_budgets: Optional[Dict[str, ModelBudget]] = None,
 ) -> HarnessReport:
     if mode == "offline":
-        return run_offline_harness_report(target, corpus_path)
+        return run_offline_harness_report(target, corpus_path, concurrency=concurrency)
 
     data = load_corpus(corpus_path)
     version = int(data.get("version", 0))
     cases = iter_cases(data, target=target, mode=mode)
-    results: List[CaseResult] = []
-    for case in cases:
-        results.append(await dispatch_live(case))
-
-    n, passed, failed, skipped = aggregate_from_results(results)
-    token_snap: Dict[str, Any] | None = None
-    try:
-        from app.utils.token_tracker import token_tracker
-
-        token_snap = token_tracker.get_stats(days=1)
-    except Exception as e:
-        token_snap = {"error": str(e)}
-
-    report = HarnessReport(
+    t0 = time.perf_counter()
+    results = await run_live_cases(
+        cases, concurrency=concurrency, model_budgets=model_budgets
+    )
+    return _build_harness_report(
         mode=mode,
         target=target,
-        corpus_path=str(corpus_path),
+        corpus_path=corpus_path,
         corpus_version=version,
-        cases_total=len(cases),
-        cases_run=n,
-        cases_passed=passed,
-        cases_failed=failed,
-        cases_skipped=skipped,
-        results=[r.to_dict() for r in results],
-        summary_markdown="",
-        token_tracker_snapshot=token_snap,
-        limitations_note=LIMITATIONS,
+        cases=cases,
+        results=results,
+        token_tracker_snapshot=_token_tracker_snapshot(),
+        concurrency=concurrency,
+        wall_clock_ms=(time.perf_counter() - t0) * 1000,
     )
-    report.summary_markdown = build_markdown_summary(report)
-    return report
 
 
 def main(argv: List[str] | None = None) -> int:
@@ -337,6 +388,20 @@ def main(argv: List[str] | None = None) -> int:
         action="store_true",
         help="Autorise le mode live (avec clé OpenAI). Peut être combiné à MATHAKINE_AI_EVAL_LIVE=1.",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Cas live en vol simultanément / process offline (défaut 1 = séquentiel).",
+    )
+    parser.add_argument(
+        "--model-budget",
+        action="append",
+        default=[],
+        metavar="MODEL=N[/RPM]",
+        help="Live : au plus N appels en vol et RPM démarrages/min pour MODEL "
+        "(répétable ; 'default' = modèle produit).",
+    )
     parser.add_argument(
         "--persist",
         action="store_true",
@@ -375,9 +440,26 @@ def main(argv: List[str] | None = None) -> int:
             )
             return 2
 
+    if args.concurrency < 1:
+        print("ERREUR: --concurrency doit être >= 1.", file=sys.stderr)
+        return 2
+    try:
+        model_budgets = parse_model_budgets(args.model_budget)
+    except ValueError as e:
+        print(f"ERREUR: {e}", file=sys.stderr)
+        return 2
+
     corpus = args.corpus or default_corpus_path()
     started_at = datetime.now(timezone.utc)
-    report = asyncio.run(_run_async(args.mode, args.target, corpus))
+    report = asyncio.run(
+        _run_async(
+            args.mode,
+            args.target,
+            corpus,
+            concurrency=args.concurrency,
+            model_budgets=model_budgets,
+        )
+    )
     completed_at = datetime.now(timezone.utc)
 
     if args.persist:
@@ -6,7 +6,7 @@ IA11a :
 
 IA11b (opt-in live explicite, réutilise la matrice offline IA11a comme base) :
     python -m app.evaluation.comparative_campaign --ia11b-bounded-live --live \\
-        --ia11b-campaign ia11b_live_bounded
+        --ia11b-campaign ia11b_live_bounded [--concurrency 4 --model-budget o3=2]
 
 Garanties IA11a :
     - aucun ``dispatch_live`` ni appel OpenAI ;
@@ -30,6 +30,7 @@ from app.evaluation.ai_generation_harness import (
     harness_live_opt_in_allowed,
     run_live_harness_for_explicit_cases,
     run_offline_harness_report,
+    split_harness_report,
 )
 from app.evaluation.campaign_matrix import (
     CampaignSegmentSpec,
@@ -38,6 +39,7 @@ from app.evaluation.campaign_matrix import (
     load_campaign_matrix,
     load_ia11b_bounded_campaign,
 )
+from app.evaluation.concurrency import ModelBudget, parse_model_budgets
 from app.evaluation.corpus_loader import default_corpus_path, load_corpus
 
 
@@ -219,12 +221,16 @@ _WORKLOAD_EXPECTED_LIVE_PIPE: Dict[str, str] = {
 def build_offline_comparative_segments(
     campaign: Dict[str, Any],
     corpus_path: Path | None,
+    *,
+    concurrency: int = 1,
 ) -> Tuple[List[Dict[str, Any]], str]:
     """Construit les segments offline (réutilisé par IA11a et la base offline d’IA11b)."""
     segments_out: List[Dict[str, Any]] = []
     for seg in campaign["segments"]:
         spec = CampaignSegmentSpec.from_dict(seg)
-        report = run_offline_harness_report(spec.harness_target, corpus_path)
+        report = run_offline_harness_report(
+            spec.harness_target, corpus_path, concurrency=concurrency
+        )
         rd = report.to_dict()
         metrics = aggregate_decision_metrics(rd["results"])
         segments_out.append(
@@ -411,9 +417,14 @@ def run_ia11b_bounded_live_campaign(
     ia11b_campaign_id: str,
     corpus_path: Path | None,
     output_dir: Path,
+    concurrency: int = 1,
+    model_budgets: Optional[Dict[str, ModelBudget]] = None,
 ) -> Tuple[Dict[str, Any], Path, Path, str]:
     """
     IA11b : segments offline = matrice IA11a ; live = lignes explicites de la matrice IA11b.
+
+    Toutes les variantes live partent dans un seul run borné par ``concurrency`` et
+    ``model_budgets`` ; chaque variante garde ensuite son propre sous-rapport.
     """
     ib_path = default_ia11b_campaign_path(ia11b_campaign_id)
     ia11b = load_ia11b_bounded_campaign(ib_path)
@@ -422,7 +433,9 @@ def run_ia11b_bounded_live_campaign(
     ia11a = load_campaign_matrix(base_path)
 
     cpath_resolved = corpus_path or default_corpus_path()
-    segments_out, _ = build_offline_comparative_segments(ia11a, corpus_path)
+    segments_out, _ = build_offline_comparative_segments(
+        ia11a, corpus_path, concurrency=concurrency
+    )
 
     data = load_corpus(cpath_resolved)
     case_by_id = {str(c["id"]): c for c in (data.get("cases") or [])}
@@ -431,12 +444,10 @@ def run_ia11b_bounded_live_campaign(
     for row in ia11b["live_executions"]:
         execs_by_wl.setdefault(str(row["workload_key"]), []).append(row)
 
-    iso_note = "token_tracker agrège les appels du processus Python ; non attribuable proprement à une variante."
+    planned: List[Tuple[Dict[str, Any], str, str, Dict[str, Any]]] = []
     for seg in segments_out:
         wl = str(seg["workload_key"])
-        lives = execs_by_wl.get(wl) or []
-        live_variants_out: List[Dict[str, Any]] = []
-        for row in lives:
+        for row in execs_by_wl.get(wl) or []:
             sid = str(row["source_case_id"])
             variant_id = str(row["variant_id"])
             em = str(row["eval_model"])
@@ -457,29 +468,41 @@ def run_ia11b_bounded_live_campaign(
             case_run["rationale"] = (
                 f"{prev_r} [IA11b variant={variant_id} eval_model={em}]".strip()
             )
-            rep = run_live_harness_for_explicit_cases(
-                [case_run],
-                corpus_path=cpath_resolved,
-                report_target=f"{wl}__{variant_id}",
-            )
-            rd = rep.to_dict()
-            metrics = aggregate_decision_metrics(
-                rd["results"],
-                execution_mode="live",
-                token_tracker_isolation_note=iso_note,
-            )
-            live_variants_out.append(
-                {
-                    "variant_id": variant_id,
-                    "source_case_id": sid,
-                    "eval_model": em,
-                    "execution_mode": "live",
-                    "decision_metrics": metrics,
-                    "pipeline_breakdown": _pipeline_breakdown(rd["results"]),
-                    "harness_report": rd,
-                }
-            )
-        seg["live_executed_variants"] = live_variants_out
+            planned.append((seg, sid, variant_id, case_run))
+
+    live_report = run_live_harness_for_explicit_cases(
+        [case_run for *_meta, case_run in planned],
+        corpus_path=cpath_resolved,
+        report_target=ia11b_campaign_id,
+        concurrency=concurrency,
+        model_budgets=model_budgets,
+    )
+
+    iso_note = "token_tracker agrège les appels du processus Python ; non attribuable proprement à une variante."
+    for seg in segments_out:
+        seg["live_executed_variants"] = []
+    for seg, sid, variant_id, case_run in planned:
+        wl = str(seg["workload_key"])
+        rep = split_harness_report(
+            live_report, [case_run["id"]], target=f"{wl}__{variant_id}"
+        )
+        rd = rep.to_dict()
+        metrics = aggregate_decision_metrics(
+            rd["results"],
+            execution_mode="live",
+            token_tracker_isolation_note=iso_note,
+        )
+        seg["live_executed_variants"].append(
+            {
+                "variant_id": variant_id,
+                "source_case_id": sid,
+                "eval_model": case_run["eval_model"],
+                "execution_mode": "live",
+                "decision_metrics": metrics,
+                "pipeline_breakdown": _pipeline_breakdown(rd["results"]),
+                "harness_report": rd,
+            }
+        )
 
     token_snap_global: Dict[str, Any]
     try:
@@ -505,6 +528,8 @@ def run_ia11b_bounded_live_campaign(
         "corpus_path": str(cpath_resolved),
         "honesty_disclaimer": ia11b.get("honesty_disclaimer"),
         "token_tracker_snapshot_post_live": token_snap_global,
+        "live_concurrency": live_report.concurrency,
+        "live_wall_clock_ms": live_report.wall_clock_ms,
         "non_measurable_offline": ia11a.get("non_measurable_offline"),
         "ia11b_recommendation_markdown": rec_md,
         "segments": segments_out,
@@ -526,6 +551,7 @@ def run_comparative_offline_campaign(
     campaign_id: str,
     corpus_path: Path | None,
     output_dir: Path,
+    concurrency: int = 1,
 ) -> Tuple[Dict[str, Any], Path, Path, str]:
     """
     Enchaîne les segments définis dans la matrice JSON (harness offline uniquement).
@@ -536,7 +562,7 @@ def run_comparative_offline_campaign(
     cpath = default_campaign_path(campaign_id)
     campaign = load_campaign_matrix(cpath)
     segments_out, resolved_corpus = build_offline_comparative_segments(
-        campaign, corpus_path
+        campaign, corpus_path, concurrency=concurrency
     )
     payload: Dict[str, Any] = {
         "schema": "mathakine.ai_eval.comparative_campaign.v1",
@@ -627,8 +653,30 @@ def main(argv: List[str] | None = None) -> int:
         action="store_true",
         help="Imprime le payload JSON sur stdout",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Variantes live en vol simultanément / process offline (défaut 1)",
+    )
+    parser.add_argument(
+        "--model-budget",
+        action="append",
+        default=[],
+        metavar="MODEL=N[/RPM]",
+        help="Avec --ia11b-bounded-live : budget d'appels par modèle (répétable)",
+    )
     args = parser.parse_args(argv)
 
+    if args.concurrency < 1:
+        print("ERREUR: --concurrency doit être >= 1.", file=sys.stderr)
+        return 2
+    try:
+        model_budgets = parse_model_budgets(args.model_budget)
+    except ValueError as e:
+        print(f"ERREUR: {e}", file=sys.stderr)
+        return 2
+
     if args.ia11b_bounded_live:
         if not harness_live_opt_in_allowed(live_cli_flag=bool(args.live)):
             print(
@@ -640,6 +688,8 @@ def main(argv: List[str] | None = None) -> int:
             ia11b_campaign_id=args.ia11b_campaign,
             corpus_path=args.corpus,
             output_dir=args.output_dir,
+            concurrency=args.concurrency,
+            model_budgets=model_budgets,
         )
     else:
         if os.environ.get("MATHAKINE_AI_EVAL_LIVE", "").strip():
@@ -653,6 +703,7 @@ def main(argv: List[str] | None = None) -> int:
             campaign_id=args.campaign,
             corpus_path=args.corpus,
             output_dir=args.output_dir,
+            concurrency=args.concurrency,
         )
 
     if args.stdout_json:
@@ -0,0 +1,152 @@
+"""
+Exécution concurrente bornée des cas du harness.
+
+- live : coroutines ``dispatch_live`` bornées par un sémaphore global
+  (``--concurrency``) et, optionnellement, par un budget par modèle
+  (``--model-budget MODEL=N[/RPM]`` : N appels en vol, RPM démarrages / minute) ;
+- offline : validations CPU (générateurs + checks) réparties sur un pool de process.
+
+Les résultats sont toujours rendus dans l'ordre des cas (jamais l'ordre d'arrivée).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+from app.evaluation.runners import LIVE_PIPELINES, dispatch_live, dispatch_offline
+from app.evaluation.schemas import CaseResult
+
+# Clé de budget des cas sans ``eval_model`` (modèle résolu par la politique produit).
+DEFAULT_MODEL_BUDGET_KEY = "default"
+
+
+@dataclass(frozen=True)
+class ModelBudget:
+    """Budget d'appels live d'un modèle (rate limit côté fournisseur)."""
+
+    max_in_flight: int
+    requests_per_minute: Optional[float] = None
+
+
+def parse_model_budgets(specs: Optional[Iterable[str]]) -> Dict[str, ModelBudget]:
+    """
+    Parse ``MODEL=N`` ou ``MODEL=N/RPM`` (flag CLI répétable).
+
+    Raises:
+        ValueError: spécification illisible ou valeurs non positives.
+    """
+    budgets: Dict[str, ModelBudget] = {}
+    for raw in specs or ():
+        model, sep, value = str(raw).partition("=")
+        model = model.strip()
+        if not sep or not model or not value.strip():
+            raise ValueError(
+                f"Budget modèle invalide (attendu MODEL=N[/RPM]) : {raw!r}"
+            )
+        in_flight_s, _, rpm_s = value.partition("/")
+        try:
+            in_flight = int(in_flight_s)
+            rpm = float(rpm_s) if rpm_s.strip() else None
+        except ValueError as e:
+            raise ValueError(f"Budget modèle invalide : {raw!r}") from e
+        if in_flight < 1 or (rpm is not None and rpm <= 0):
+            raise ValueError(f"Budget modèle non positif : {raw!r}")
+        budgets[model] = ModelBudget(max_in_flight=in_flight, requests_per_minute=rpm)
+    return budgets
+
+
+def case_model_key(case: Dict[str, Any]) -> str:
+    """Modèle auquel le budget d'un cas live est imputé."""
+    model = str(case.get("eval_model") or "").strip()
+    return model or DEFAULT_MODEL_BUDGET_KEY
+
+
+class _ModelGate:
+    """Sémaphore + espacement minimal des démarrages pour un modèle."""
+
+    def __init__(self, budget: ModelBudget):
+        self._slots = asyncio.Semaphore(budget.max_in_flight)
+        self._interval = (
+            60.0 / budget.requests_per_minute if budget.requests_per_minute else 0.0
+        )
+        self._pace = asyncio.Lock()
+        self._next_start = 0.0
+
+    @contextlib.asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        async with self._slots:
+            if self._interval:
+                async with self._pace:
+                    delay = self._next_start - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    self._next_start = time.monotonic() + self._interval
+            yield
+
+
+class LiveCaseLimiter:
+    """
+    Bornes partagées par tous les cas live d'un run (ou d'une campagne).
+
+    Le budget du modèle est pris avant le slot global : un modèle saturé
+    n'immobilise pas la concurrence des autres modèles.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 1,
+        model_budgets: Optional[Dict[str, ModelBudget]] = None,
+    ):
+        self.concurrency = max(1, int(concurrency))
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._gates = {
+            model: _ModelGate(budget) for model, budget in (model_budgets or {}).items()
+        }
+
+    @contextlib.asynccontextmanager
+    async def slot(self, model_key: str) -> AsyncIterator[None]:
+        gate = self._gates.get(model_key)
+        async with gate.acquire() if gate else contextlib.nullcontext():
+            async with self._slots:
+                yield
+
+
+async def run_live_cases(
+    cases: List[Dict[str, Any]],
+    *,
+    concurrency: int = 1,
+    model_budgets: Optional[Dict[str, ModelBudget]] = None,
+    limiter: Optional[LiveCaseLimiter] = None,
+) -> List[CaseResult]:
+    """``dispatch_live`` sur chaque cas, au plus ``concurrency`` appels en vol."""
+    gate = limiter or LiveCaseLimiter(concurrency, model_budgets)
+    results: List[Optional[CaseResult]] = [None] * len(cases)
+
+    async def _run(index: int, case: Dict[str, Any]) -> None:
+        if case.get("pipeline") not in LIVE_PIPELINES:
+            results[index] = await dispatch_live(case)
+            return
+        async with gate.slot(case_model_key(case)):
+            results[index] = await dispatch_live(case)
+
+    await asyncio.gather(*(_run(i, c) for i, c in enumerate(cases)))
+    return [r for r in results if r is not None]
+
+
+def run_offline_cases(
+    cases: List[Dict[str, Any]],
+    *,
+    concurrency: int = 1,
+) -> List[CaseResult]:
+    """``dispatch_offline`` sur chaque cas ; pool de process si ``concurrency`` > 1."""
+    workers = min(max(1, int(concurrency)), len(cases))
+    if workers <= 1:
+        return [dispatch_offline(c) for c in cases]
+    chunksize = max(1, len(cases) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(dispatch_offline, cases, chunksize=chunksize))
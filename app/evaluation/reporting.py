@@ -22,6 +22,11 @@ def build_markdown_summary(report: HarnessReport) -> str:
         f"{report.cases_passed} OK, {report.cases_failed} échecs, "
         f"{report.cases_skipped} ignorés"
     )
+    if report.wall_clock_ms is not None:
+        lines.append(
+            f"- **Exécution** : concurrence {report.concurrency}, "
+            f"durée murale {report.wall_clock_ms:.1f} ms"
+        )
     lines.append("")
     by_pipe: Dict[str, List[bool]] = defaultdict(list)
     lat_by_pipe: Dict[str, List[float]] = defaultdict(list)
@@ -77,6 +82,22 @@ def write_report(
     return jpath, mpath
 
 
+def order_results_by_cases(
+    results: List[CaseResult], cases: List[Dict[str, Any]]
+) -> List[CaseResult]:
+    """
+    Ordre stable des résultats : position du cas dans la sélection du corpus.
+
+    Un run concurrent termine ses cas dans un ordre quelconque ; le rapport
+    (JSON, Markdown, persistance) reste identique d'un run à l'autre.
+    """
+    position = {str(c.get("id")): i for i, c in enumerate(cases)}
+    return sorted(
+        results,
+        key=lambda r: (position.get(r.case_id, len(position)), r.case_id),
+    )
+
+
 def aggregate_from_results(results: List[CaseResult]) -> tuple[int, int, int, int]:
     passed = sum(1 for r in results if r.success)
     failed = sum(1 for r in results if not r.success and not r.live_skipped)
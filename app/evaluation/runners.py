@@ -6,8 +6,9 @@ import contextlib
 import json
 import random
 import time
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
 from unittest.mock import patch
 
 from app.evaluation.checks import (
@@ -27,6 +28,22 @@ PEDAGOGICAL_LIMITATION = (
     "Pas de mesure de qualité pédagogique globale (clarté, charge cognitive, biais)."
 )
 
+LIVE_PIPELINES = frozenset({"openai_exercise_stream", "openai_challenge_stream"})
+
+
+class _LiveCaseContext(NamedTuple):
+    eval_model: Optional[str]
+    age_group: str = ""
+
+
+# Contexte du cas live courant : chaque tâche asyncio a sa copie, ce qui permet
+# d'exécuter des cas concurrents (modèles différents) sous les mêmes patches.
+_live_case_context: ContextVar[Optional[_LiveCaseContext]] = ContextVar(
+    "ai_eval_live_case", default=None
+)
+_live_patches: Optional[contextlib.ExitStack] = None
+_live_patch_depth = 0
+
 
 def _normalize_harness_eval_model(
     raw: Optional[str],
@@ -309,6 +326,100 @@ def _parse_sse_chunks(chunks: List[str]) -> List[Dict[str, Any]]:
     return out
 
 
+def _fake_persist_exercise(*_a: Any, **_k: Any) -> int:
+    return 424242
+
+
+def _fake_persist_challenge(
+    normalized_challenge: Dict[str, Any],
+    user_id: Optional[int],
+    challenge_type: str,
+    model: str = "unknown",
+) -> Dict[str, Any]:
+    ctx = _live_case_context.get()
+    return {
+        "id": 424242,
+        "title": normalized_challenge.get("title", ""),
+        "description": normalized_challenge.get("description", ""),
+        "challenge_type": challenge_type,
+        "age_group": ctx.age_group if ctx else "",
+        "question": normalized_challenge.get("question"),
+        "correct_answer": normalized_challenge.get("correct_answer"),
+        "solution_explanation": normalized_challenge.get("solution_explanation"),
+        "hints": normalized_challenge.get("hints") or [],
+        "visual_data": normalized_challenge.get("visual_data") or {},
+        "difficulty_rating": normalized_challenge.get("difficulty_rating", 3.0),
+        "choices": normalized_challenge.get("choices") or [],
+    }
+
+
+def _eval_model_override() -> Optional[str]:
+    ctx = _live_case_context.get()
+    return ctx.eval_model if ctx else None
+
+
+@contextlib.contextmanager
+def _live_case(eval_model: Optional[str], age_group: str = "") -> Iterator[None]:
+    """
+    Isole un cas live : persistance neutralisée et override modèle éventuel.
+
+    Les patches sont posés une seule fois tant qu'au moins un cas est en vol
+    (compteur) ; l'override est lu dans le contexte du cas, jamais dans un patch
+    par cas qui, entrelacé avec un autre, restaurerait la mauvaise valeur.
+    """
+    global _live_patches, _live_patch_depth
+
+    if _live_patch_depth == 0:
+        from app.services.challenges import challenge_ai_model_policy
+        from app.services.exercises import exercise_ai_service
+
+        product_exercise_model = exercise_ai_service.resolve_exercise_ai_model
+        product_challenge_model = challenge_ai_model_policy.resolve_challenge_ai_model
+
+        def _exercise_model() -> str:
+            return _eval_model_override() or product_exercise_model()
+
+        def _challenge_model(challenge_type: str) -> str:
+            return _eval_model_override() or product_challenge_model(challenge_type)
+
+        stack = contextlib.ExitStack()
+        stack.enter_context(
+            patch(
+                "app.services.exercises.exercise_ai_service._persist_exercise_ai_sync",
+                _fake_persist_exercise,
+            )
+        )
+        stack.enter_context(
+            patch(
+                "app.services.exercises.exercise_ai_service.resolve_exercise_ai_model",
+                _exercise_model,
+            )
+        )
+        stack.enter_context(
+            patch(
+                "app.services.challenges.challenge_ai_service._persist_challenge_sync",
+                _fake_persist_challenge,
+            )
+        )
+        stack.enter_context(
+            patch(
+                "app.services.challenges.challenge_ai_model_policy.resolve_challenge_ai_model",
+                _challenge_model,
+            )
+        )
+        _live_patches = stack
+    _live_patch_depth += 1
+    token = _live_case_context.set(_LiveCaseContext(eval_model, age_group))
+    try:
+        yield
+    finally:
+        _live_case_context.reset(token)
+        _live_patch_depth -= 1
+        if _live_patch_depth == 0 and _live_patches is not None:
+            stack, _live_patches = _live_patches, None
+            stack.close()
+
+
 async def run_openai_exercise_stream(
     case: Dict[str, Any],
     model_override: Optional[str] = None,
@@ -339,24 +450,7 @@ async def run_openai_exercise_stream(
     t0 = time.perf_counter()
     chunks: List[str] = []
     try:
-
-        def _fake_persist(*_a: Any, **_k: Any) -> int:
-            return 424242
-
-        with contextlib.ExitStack() as stack:
-            stack.enter_context(
-                patch(
-                    "app.services.exercises.exercise_ai_service._persist_exercise_ai_sync",
-                    _fake_persist,
-                )
-            )
-            if override_norm is not None:
-                stack.enter_context(
-                    patch(
-                        "app.services.exercises.exercise_ai_service.resolve_exercise_ai_model",
-                        lambda: override_norm,
-                    )
-                )
+        with _live_case(override_norm):
             async for event in generate_exercise_stream(
                 exercise_type=ex_t,
                 age_group=ag,
@@ -499,42 +593,8 @@ async def run_openai_challenge_stream(
     t0 = time.perf_counter()
     chunks: List[str] = []
 
-    def _fake_persist_challenge(
-        normalized_challenge: Dict[str, Any],
-        user_id: Optional[int],
-        challenge_type: str,
-        model: str = "unknown",
-    ) -> Dict[str, Any]:
-        return {
-            "id": 424242,
-            "title": normalized_challenge.get("title", ""),
-            "description": normalized_challenge.get("description", ""),
-            "challenge_type": challenge_type,
-            "age_group": ag,
-            "question": normalized_challenge.get("question"),
-            "correct_answer": normalized_challenge.get("correct_answer"),
-            "solution_explanation": normalized_challenge.get("solution_explanation"),
-            "hints": normalized_challenge.get("hints") or [],
-            "visual_data": normalized_challenge.get("visual_data") or {},
-            "difficulty_rating": normalized_challenge.get("difficulty_rating", 3.0),
-            "choices": normalized_challenge.get("choices") or [],
-        }
-
     try:
-        with contextlib.ExitStack() as stack:
-            stack.enter_context(
-                patch(
-                    "app.services.challenges.challenge_ai_service._persist_challenge_sync",
-                    _fake_persist_challenge,
-                )
-            )
-            if override_norm is not None:
-                stack.enter_context(
-                    patch(
-                        "app.services.challenges.challenge_ai_model_policy.resolve_challenge_ai_model",
-                        lambda _challenge_type: override_norm,
-                    )
-                )
+        with _live_case(override_norm, ag):
             async for event in generate_challenge_stream(
                 challenge_type=ct,
                 age_group=ag,
@@ -677,7 +737,7 @@ def dispatch_offline(case: Dict[str, Any]) -> CaseResult:
         return run_fixture_exercise_openai_shape(case)
     if pipe == "fixture_challenge":
         return run_fixture_challenge(case)
-    if pipe in ("openai_exercise_stream", "openai_challenge_stream"):
+    if pipe in LIVE_PIPELINES:
         return CaseResult(
             case_id=case["id"],
             pipeline=pipe,
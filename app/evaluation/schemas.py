@@ -53,6 +53,9 @@ class HarnessReport:
     limitations_note: str = ""
     # Renseigné avant écriture des artefacts si persistance DB (--persist).
     run_uuid: Optional[str] = None
+    # --concurrency du run et durée murale d'exécution des cas (mesure du gain).
+    concurrency: int = 1
+    wall_clock_ms: Optional[float] = None
 
     def to_dict(self) -> Dict[str, Any]:
         d = asdict(self)
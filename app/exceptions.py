@@ -66,3 +66,16 @@ class SpacedRepetitionInputError(ValueError):
     def __init__(self, message: str = "Entrée spaced repetition invalide"):
         self.message = message
         super().__init__(message)
+
+
+class DbExecutorOverloadedError(Exception):
+    """File d'attente de l'executor DB saturée — délestage rapide (503)."""
+
+    status_code = 503
+
+    def __init__(
+        self,
+        message: str = "Service momentanément surchargé. Réessayez dans un instant.",
+    ):
+        self.message = message
+        super().__init__(message)
@@ -0,0 +1,231 @@
+"""
+Génération par lots d'exercices arithmétiques simples (seeding, diagnostics, plans).
+
+``generate_simple_exercises_batch`` produit le même schéma que
+``generate_simple_exercise`` pour ADDITION, SOUSTRACTION, MULTIPLICATION et DIVISION :
+- contexte F42, données de base et titres (mode test inclus) calculés une fois par lot ;
+- opérandes tirés en bloc ; dédoublonnage exact par tirage sans remise dans l'espace
+  des couples quand il est rectangulaire (addition, multiplication, division) ;
+- distracteurs par ``generate_smart_choices`` (mêmes règles de calibrage), calculés
+  une fois par couple d'opérandes distinct du lot.
+
+Les autres types délèguent à ``generate_simple_exercise`` exercice par exercice.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.constants import ExerciseTypes, Tags
+from app.core.messages import ExerciseMessages
+from app.generators.exercise_generation_policy import (
+    SIMPLE_TITLE_ADDITION,
+    SIMPLE_TITLE_DIVISION,
+    SIMPLE_TITLE_MULTIPLICATION,
+    SIMPLE_TITLE_SUBTRACTION,
+    pick_title_variant,
+)
+from app.generators.exercise_generator import generate_simple_exercise
+from app.utils.exercise_generator_helpers import (
+    apply_test_title,
+    build_base_exercise_data,
+    generate_smart_choices,
+    init_exercise_context,
+)
+
+# Tours de tirage complémentaires quand des doublons ont été rejetés (soustraction).
+_MAX_DRAW_ROUNDS = 8
+
+# Type -> (opération smart choices, question, titres, explication).
+_ARITHMETIC_SPECS: Dict[str, Tuple[str, str, Tuple[str, ...], str]] = {
+    ExerciseTypes.ADDITION: (
+        "ADDITION",
+        ExerciseMessages.QUESTION_ADDITION,
+        SIMPLE_TITLE_ADDITION,
+        "Pour additionner {num1} et {num2}, il faut calculer leur somme, "
+        "donc {num1} + {num2} = {result}.",
+    ),
+    ExerciseTypes.SUBTRACTION: (
+        "SOUSTRACTION",
+        ExerciseMessages.QUESTION_SUBTRACTION,
+        SIMPLE_TITLE_SUBTRACTION,
+        "Pour soustraire {num2} de {num1}, il faut calculer leur différence, "
+        "donc {num1} - {num2} = {result}.",
+    ),
+    ExerciseTypes.MULTIPLICATION: (
+        "MULTIPLICATION",
+        ExerciseMessages.QUESTION_MULTIPLICATION,
+        SIMPLE_TITLE_MULTIPLICATION,
+        "Pour multiplier {num1} par {num2}, il faut calculer leur produit, "
+        "donc {num1} × {num2} = {result}.",
+    ),
+    ExerciseTypes.DIVISION: (
+        "DIVISION",
+        ExerciseMessages.QUESTION_DIVISION,
+        SIMPLE_TITLE_DIVISION,
+        "Pour diviser {num1} par {num2}, il faut calculer leur quotient, "
+        "donc {num1} ÷ {num2} = {result}.",
+    ),
+}
+
+
+def _grid_pairs(
+    rng: random.Random,
+    first: Tuple[int, int],
+    second: Tuple[int, int],
+    n: int,
+    unique: bool,
+) -> List[Tuple[int, int]]:
+    """Couples uniformes de [a, b] × [c, d] ; sans remise si ``unique``."""
+    lo1, hi1 = first
+    lo2, hi2 = second
+    width = hi2 - lo2 + 1
+    size = (hi1 - lo1 + 1) * width
+    if size <= 0:
+        return []
+    if unique:
+        indexes = rng.sample(range(size), min(n, size))
+    else:
+        indexes = [int(u * size) for u in (rng.random() for _ in range(n))]
+    return [(lo1 + i // width, lo2 + i % width) for i in indexes]
+
+
+def _subtraction_pairs(
+    rng: random.Random, limits: Dict[str, Any], n: int, unique: bool
+) -> List[Tuple[int, int]]:
+    """Même loi que le générateur unitaire : num1 uniforme, puis num2 < num1."""
+    min1, max1 = limits.get("min1", 5), limits.get("max1", 20)
+    min2, max2 = limits.get("min2", 1), limits.get("max2", 5)
+    if max1 < min1:
+        return []
+    seen = set()
+    pairs: List[Tuple[int, int]] = []
+    for _ in range(_MAX_DRAW_ROUNDS if unique else 1):
+        missing = n - len(pairs)
+        if missing <= 0:
+            break
+        firsts = rng.choices(range(min1, max1 + 1), k=missing)
+        for num1, u in zip(firsts, (rng.random() for _ in range(missing))):
+            high = min(num1 - 1, max2)
+            if high < min2:
+                continue
+            pair = (num1, min2 + int(u * (high - min2 + 1)))
+            if unique:
+                if pair in seen:
+                    continue
+                seen.add(pair)
+            pairs.append(pair)
+    return pairs
+
+
+def _operands(
+    normalized_type: str,
+    limits: Dict[str, Any],
+    rng: random.Random,
+    n: int,
+    unique: bool,
+) -> List[Tuple[int, int, int]]:
+    """(num1, num2, résultat) du lot."""
+    if normalized_type == ExerciseTypes.SUBTRACTION:
+        return [(a, b, a - b) for a, b in _subtraction_pairs(rng, limits, n, unique)]
+    if normalized_type == ExerciseTypes.DIVISION:
+        divisors = (limits.get("min_divisor", 2), limits.get("max_divisor", 5))
+        quotients = (limits.get("min_result", 1), limits.get("max_result", 5))
+        pairs = _grid_pairs(rng, divisors, quotients, n, unique)
+        return [(d * q, d, q) for d, q in pairs]
+    bounds = (limits.get("min", 1), limits.get("max", 10))
+    pairs = _grid_pairs(rng, bounds, bounds, n, unique)
+    if normalized_type == ExerciseTypes.MULTIPLICATION:
+        return [(a, b, a * b) for a, b in pairs]
+    return [(a, b, a + b) for a, b in pairs]
+
+
+def generate_simple_exercises_batch(
+    exercise_type: str,
+    age_group: str,
+    n: int,
+    *,
+    difficulty_override: Optional[str] = None,
+    pedagogical_band_override: Optional[str] = None,
+    unique: bool = True,
+    rng: Optional[random.Random] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Génère ``n`` exercices simples (schéma de ``generate_simple_exercise``).
+
+    ``unique`` : pas deux exercices avec les mêmes opérandes ; le lot peut alors être
+    plus court que ``n`` si l'espace des opérandes du niveau est plus petit.
+    ``rng`` : source des opérandes (reproductibilité) ; les distracteurs suivent
+    ``random`` comme le générateur unitaire.
+    """
+    if n <= 0:
+        return []
+    (
+        normalized_type,
+        normalized_age_group,
+        derived_difficulty,
+        type_limits,
+        f42_profile,
+    ) = init_exercise_context(
+        exercise_type,
+        age_group,
+        difficulty_override=difficulty_override,
+        pedagogical_band_override=pedagogical_band_override,
+    )
+    spec = _ARITHMETIC_SPECS.get(normalized_type)
+    if spec is None:
+        return [
+            generate_simple_exercise(
+                exercise_type,
+                age_group,
+                difficulty_override=difficulty_override,
+                pedagogical_band_override=pedagogical_band_override,
+            )
+            for _ in range(n)
+        ]
+
+    operation, question_template, title_variants, explanation_template = spec
+    base = build_base_exercise_data(
+        normalized_type, normalized_age_group, derived_difficulty, ai_generated=False
+    )
+    base["difficulty_tier"] = f42_profile["difficulty_tier"]
+    base["tags"] = Tags.ALGORITHMIC + "," + Tags.SIMPLE
+    titles = [apply_test_title({"title": title})["title"] for title in title_variants]
+
+    # Distracteurs calculés une fois par couple d'opérandes (lots non dédoublonnés),
+    # ordre des choix retiré pour chaque exercice.
+    choices_by_operands: Dict[Tuple[int, int], List[str]] = {}
+    source = rng or random
+    exercises = []
+    for num1, num2, result in _operands(
+        normalized_type, type_limits, source, n, unique
+    ):
+        choices = choices_by_operands.get((num1, num2))
+        if choices is None:
+            choices = generate_smart_choices(
+                operation,
+                num1,
+                num2,
+                result,
+                normalized_age_group,
+                derived_difficulty=derived_difficulty,
+            )
+            choices_by_operands[(num1, num2)] = choices
+        else:
+            choices = source.sample(choices, len(choices))
+        exercises.append(
+            {
+                **base,
+                "title": pick_title_variant(titles, salt=num1 + num2 + result),
+                "question": question_template.format(num1=num1, num2=num2),
+                "correct_answer": str(result),
+                "choices": choices,
+                "num1": num1,
+                "num2": num2,
+                "explanation": explanation_template.format(
+                    num1=num1, num2=num2, result=result
+                ),
+            }
+        )
+    return exercises
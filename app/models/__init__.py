@@ -3,16 +3,31 @@
 
 # Legacy tables (requis pour Base.metadata complet)
 import app.models.legacy_tables  # noqa: F401
+from app.models.account_deletion_job import AccountDeletionJob
 from app.models.achievement import Achievement, UserAchievement
 from app.models.admin_audit_log import AdminAuditLog
 from app.models.ai_eval_harness_run import AiEvalHarnessCaseResult, AiEvalHarnessRun
 from app.models.attempt import Attempt
+from app.models.attempt_side_effect import AttemptSideEffect
+from app.models.challenge_inventory import ChallengeInventoryItem
 from app.models.challenge_progress import ChallengeProgress
 from app.models.daily_challenge import DailyChallenge
 from app.models.diagnostic_result import DiagnosticResult
+from app.models.edtech_daily_rollup import (
+    EdTechDailyRollup,
+    EdTechDailyUser,
+    EdTechRollupDay,
+)
 from app.models.edtech_event import EdTechEvent
+from app.models.email_outbox import EmailOutbox
 from app.models.exercise import DifficultyLevel, Exercise, ExerciseType
+from app.models.exercise_inventory import ExerciseInventoryItem
 from app.models.feedback_report import FeedbackReport
+from app.models.leaderboard_score import (
+    LeaderboardPeriodScore,
+    LeaderboardPeriodWindow,
+    UserDailyPoints,
+)
 from app.models.logic_challenge import (
     AgeGroup,
     LogicChallenge,
@@ -27,21 +42,33 @@ from app.models.setting import Setting
 from app.models.spaced_repetition_item import SpacedRepetitionItem
 from app.models.user import User, UserRole
 from app.models.user_session import UserSession
+from app.models.user_stats_rollup import UserStatsRollup
 
 __all__ = [
+    "AccountDeletionJob",
     "AdminAuditLog",
     "AiEvalHarnessCaseResult",
     "AiEvalHarnessRun",
     "DailyChallenge",
     "DiagnosticResult",
+    "EdTechDailyRollup",
+    "EdTechDailyUser",
     "EdTechEvent",
+    "EdTechRollupDay",
     "User",
     "UserRole",
     "Exercise",
     "ExerciseType",
+    "ExerciseInventoryItem",
     "FeedbackReport",
+    "LeaderboardPeriodScore",
+    "LeaderboardPeriodWindow",
+    "UserDailyPoints",
     "DifficultyLevel",
     "Attempt",
+    "AttemptSideEffect",
+    "ChallengeInventoryItem",
+    "EmailOutbox",
     "ChallengeProgress",
     "Progress",
     "Setting",
@@ -56,4 +83,5 @@ __all__ = [
     "Notification",
     "PointEvent",
     "UserSession",
+    "UserStatsRollup",
 ]
@@ -0,0 +1,49 @@
+"""
+Suppressions de compte en arrière-plan (ACCOUNT_DELETION_ASYNC).
+
+Une ligne ``pending`` est écrite quand la suppression est demandée (compte désactivé
+dans la même transaction) ; le thread de suppression
+(app.services.users.account_deletion) la réserve avec un bail, exécute le plan par
+paquets en enregistrant l'étape et les lignes supprimées après chaque paquet, puis la
+passe à ``done``. Un job interrompu reprend à son étape au bail expiré.
+"""
+
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String, Text
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+DELETION_PENDING = "pending"
+DELETION_DONE = "done"
+DELETION_FAILED = "failed"
+
+
+class AccountDeletionJob(Base):
+    """Progression d'une suppression de compte (pas de FK : le compte disparaît)."""
+
+    __tablename__ = "account_deletion_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    requested_by = Column(Integer, nullable=True)
+    status = Column(String(16), nullable=False, default=DELETION_PENDING)
+    # Étape courante du plan (nom de table) ; NULL tant que rien n'est supprimé.
+    step = Column(String(64), nullable=True)
+    rows_deleted = Column(Integer, nullable=False, default=0)
+    # Lignes supprimées par étape : {"attempts": 120000, ...}
+    progress = Column(JSON, nullable=True)
+    tries = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+
+Index(
+    "ix_account_deletion_jobs_pending",
+    AccountDeletionJob.next_attempt_at,
+    postgresql_where=AccountDeletionJob.status == DELETION_PENDING,
+)
@@ -0,0 +1,60 @@
+"""
+Outbox des effets de bord différés d'une tentative d'exercice.
+
+Une ligne ``pending`` est écrite dans la transaction de la tentative quand
+SUBMIT_SIDE_EFFECTS_ASYNC est actif ; le job post-commit (clé = attempt_id) la
+passe à ``done`` avec le résultat exposé au client (nouveaux badges, notification
+de progression). Après un échec, ``next_attempt_at`` porte le backoff avant la
+reprise par le balayage post-commit.
+Voir app.services.exercises.exercise_attempt_service.
+"""
+
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+SIDE_EFFECTS_PENDING = "pending"
+SIDE_EFFECTS_DONE = "done"
+SIDE_EFFECTS_FAILED = "failed"
+
+
+class AttemptSideEffect(Base):
+    """État du traitement post-commit d'une tentative."""
+
+    __tablename__ = "attempt_side_effects"
+
+    attempt_id = Column(
+        Integer,
+        ForeignKey("attempts.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    status = Column(String(16), nullable=False, default=SIDE_EFFECTS_PENDING)
+    result = Column(JSON, nullable=True)
+    tries = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+
+Index(
+    "ix_attempt_side_effects_pending",
+    AttemptSideEffect.created_at,
+    postgresql_where=AttemptSideEffect.status == SIDE_EFFECTS_PENDING,
+)
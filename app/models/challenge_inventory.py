@@ -0,0 +1,41 @@
+"""
+Inventaire de défis IA pré-générés, validés et jamais servis.
+
+Un seau = (challenge_type, age_group, difficulty_tier, locale). Le thread de refill
+(app.services.challenges.challenge_inventory) le complète sous le seuil bas ; une
+demande sans prompt libre réserve une ligne (FOR UPDATE SKIP LOCKED), crée le
+LogicChallenge de l'utilisateur et supprime la ligne dans la même transaction.
+"""
+
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class ChallengeInventoryItem(Base):
+    """Défi normalisé et validé en attente d'un demandeur (payload SSE complet)."""
+
+    __tablename__ = "challenge_inventory"
+
+    id = Column(Integer, primary_key=True, index=True)
+    challenge_type = Column(String(32), nullable=False)
+    age_group = Column(String(32), nullable=False)
+    # Tier F42 effectif de la génération (NULL = sans personnalisation).
+    difficulty_tier = Column(Integer, nullable=True)
+    locale = Column(String(8), nullable=False, default="fr")
+    payload = Column(JSON, nullable=False)
+    # ChallengeStreamPersonalizationMeta du prompt (audit + refill du seau).
+    personalization = Column(JSON, nullable=True)
+    model = Column(String(64), nullable=False, default="unknown")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+Index(
+    "ix_challenge_inventory_bucket",
+    ChallengeInventoryItem.challenge_type,
+    ChallengeInventoryItem.age_group,
+    ChallengeInventoryItem.difficulty_tier,
+    ChallengeInventoryItem.locale,
+    ChallengeInventoryItem.id,
+)
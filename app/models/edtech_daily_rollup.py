@@ -0,0 +1,50 @@
+"""
+Agrégats quotidiens des événements EdTech (tableau de bord admin analytics).
+
+- ``edtech_daily_rollups`` : par jour UTC, événement, type (exercise / challenge /
+  interleaved, '' sinon) et clic guidé — nombre d'événements, somme et nombre des
+  temps vers la 1re tentative retenus (>= 0).
+- ``edtech_daily_users`` : utilisateurs distincts par (jour, événement) ; les
+  utilisateurs uniques d'une fenêtre se comptent par UNION, sans relire les
+  événements.
+- ``edtech_rollup_days`` : jours clos déjà compactés (voir
+  app.services.analytics.edtech_rollup).
+"""
+
+from sqlalchemy import Boolean, Column, Date, DateTime, Float, Integer, String
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class EdTechDailyRollup(Base):
+    """Compteurs d'un (jour, événement, type, guidé)."""
+
+    __tablename__ = "edtech_daily_rollups"
+
+    day = Column(Date, primary_key=True)
+    event = Column(String(50), primary_key=True)
+    target_type = Column(String(20), primary_key=True)
+    guided = Column(Boolean, primary_key=True)
+    events = Column(Integer, nullable=False, default=0)
+    ttfa_sum_ms = Column(Float, nullable=False, default=0)
+    ttfa_count = Column(Integer, nullable=False, default=0)
+
+
+class EdTechDailyUser(Base):
+    """Utilisateur ayant émis ``event`` au jour ``day`` (sans FK : historique)."""
+
+    __tablename__ = "edtech_daily_users"
+
+    day = Column(Date, primary_key=True)
+    event = Column(String(50), primary_key=True)
+    user_id = Column(Integer, primary_key=True, index=True)
+
+
+class EdTechRollupDay(Base):
+    """Jour UTC clos dont les événements sont compactés."""
+
+    __tablename__ = "edtech_rollup_days"
+
+    day = Column(Date, primary_key=True)
+    rolled_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -2,7 +2,7 @@
 Modèle pour les événements analytiques EdTech (CTR Quick Start, temps vers 1er attempt, conversion).
 """
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -27,4 +27,11 @@ class EdTechEvent(Base):
     )  # type, guided, targetId, timeToFirstAttemptMs
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # created_at : bords de fenêtre des agrégats admin (index de la migration
+    # 20260225) ; (event, created_at) : liste admin filtrée par événement.
+    __table_args__ = (
+        Index("ix_edtech_events_created_at", "created_at"),
+        Index("ix_edtech_events_event_created_at", "event", "created_at"),
+    )
+
     user = relationship("User", foreign_keys=[user_id])
@@ -0,0 +1,51 @@
+"""
+Outbox des emails transactionnels (vérification, réinitialisation de mot de passe).
+
+Les handlers n'écrivent qu'une ligne ``pending`` ; le thread d'envoi
+(app.services.communication.email_outbox) la réserve par lots, envoie sur une
+connexion SMTP réutilisée et la passe à ``sent`` — ou la replanifie avec backoff,
+jusqu'à ``failed`` après EMAIL_OUTBOX_MAX_ATTEMPTS essais.
+"""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+EMAIL_PENDING = "pending"
+EMAIL_SENT = "sent"
+EMAIL_FAILED = "failed"
+
+
+class EmailOutbox(Base):
+    """Message à envoyer ; le contenu est effacé une fois envoyé (liens à token)."""
+
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
+    )
+    kind = Column(String(32), nullable=False)
+    to_email = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=False)
+    html_content = Column(Text, nullable=True)
+    text_content = Column(Text, nullable=True)
+    status = Column(String(16), nullable=False, default=EMAIL_PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+
+Index(
+    "ix_email_outbox_pending",
+    EmailOutbox.next_attempt_at,
+    postgresql_where=EmailOutbox.status == EMAIL_PENDING,
+)
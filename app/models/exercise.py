@@ -5,7 +5,9 @@ from sqlalchemy import (
     Boolean,
     Column,
     DateTime,
+    Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -45,6 +47,16 @@ class Exercise(Base):
 
     __tablename__ = "exercises"
 
+    # Tirage aléatoire par keyset sur sample_key (app.utils.catalog_sampling)
+    __table_args__ = (
+        Index("ix_exercises_sample_key", "sample_key"),
+        Index("ix_exercises_type_sample_key", "exercise_type", "sample_key"),
+        # Relecture delta de l'index catalogue (exercise_catalog_index)
+        Index("ix_exercises_updated_at", "updated_at"),
+        # Suppression de compte : contenu créé par le compte (account_deletion)
+        Index("ix_exercises_creator_id", "creator_id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
 
     # Métadonnées
@@ -83,6 +95,8 @@ class Exercise(Base):
     is_active = Column(Boolean, default=True)
     is_archived = Column(Boolean, default=False)
     view_count = Column(Integer, default=0)
+    # Clé de tirage uniforme [0, 1) fixée à l'insertion (random() côté PostgreSQL)
+    sample_key = Column(Float, nullable=False, server_default=func.random())
 
     # Horodatage
     created_at = Column(DateTime(timezone=True), default=func.now())
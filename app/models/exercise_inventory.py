@@ -0,0 +1,38 @@
+"""
+Inventaire d'exercices IA pré-générés, validés et jamais servis.
+
+Un seau = (exercise_type, age_group, pedagogical_band, locale). Le thread de refill
+(app.services.exercises.exercise_inventory) le complète sous le seuil bas ; une
+demande sans prompt libre réserve une ligne (FOR UPDATE SKIP LOCKED), crée
+l'Exercise servi et supprime la ligne dans la même transaction.
+"""
+
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class ExerciseInventoryItem(Base):
+    """Exercice normalisé et validé en attente d'un demandeur (payload SSE complet)."""
+
+    __tablename__ = "exercise_inventory"
+
+    id = Column(Integer, primary_key=True, index=True)
+    exercise_type = Column(String(32), nullable=False)
+    age_group = Column(String(32), nullable=False)
+    # Bande F42 issue de la maîtrise (NULL = dérivation historique âge → bande).
+    pedagogical_band = Column(String(32), nullable=True)
+    locale = Column(String(8), nullable=False, default="fr")
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+Index(
+    "ix_exercise_inventory_bucket",
+    ExerciseInventoryItem.exercise_type,
+    ExerciseInventoryItem.age_group,
+    ExerciseInventoryItem.pedagogical_band,
+    ExerciseInventoryItem.locale,
+    ExerciseInventoryItem.id,
+)
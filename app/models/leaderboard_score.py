@@ -0,0 +1,62 @@
+"""
+Scores de classement matérialisés (périodes week / month).
+
+- ``user_daily_points`` : points gagnés par utilisateur et par jour UTC, incrémentés
+  par GamificationService.apply_points (source des fenêtres glissantes).
+- ``leaderboard_period_scores`` : score courant par (période, utilisateur), index
+  (period, score DESC, user_id) → top N et rang sans agréger ``point_events``.
+- ``leaderboard_period_windows`` : premier jour inclus de chaque fenêtre ; la
+  bascule quotidienne retranche les jours sortis (voir
+  app.services.gamification.leaderboard_scores).
+"""
+
+from sqlalchemy import Column, Date, ForeignKey, Index, Integer, String
+
+from app.db.base import Base
+
+
+class UserDailyPoints(Base):
+    """Points gagnés par un utilisateur sur un jour UTC."""
+
+    __tablename__ = "user_daily_points"
+
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    day = Column(Date, primary_key=True)
+    points = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (Index("ix_user_daily_points_day", "day"),)
+
+
+class LeaderboardPeriodScore(Base):
+    """Score d'un utilisateur sur une fenêtre glissante (``LeaderboardPeriod``)."""
+
+    __tablename__ = "leaderboard_period_scores"
+
+    period = Column(String(10), primary_key=True)
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    score = Column(Integer, nullable=False, default=0)
+
+
+Index(
+    "ix_leaderboard_period_scores_rank",
+    LeaderboardPeriodScore.period,
+    LeaderboardPeriodScore.score.desc(),
+    LeaderboardPeriodScore.user_id,
+)
+
+
+class LeaderboardPeriodWindow(Base):
+    """Premier jour UTC inclus dans les scores matérialisés d'une période."""
+
+    __tablename__ = "leaderboard_period_windows"
+
+    period = Column(String(10), primary_key=True)
+    window_start = Column(Date, nullable=False)
@@ -76,6 +76,9 @@ class LogicChallenge(Base):
     __table_args__ = (
         Index("ix_challenges_type_age", "challenge_type", "age_group"),
         Index("ix_challenges_archived_type", "is_archived", "challenge_type"),
+        # Tirage aléatoire par keyset sur sample_key (app.utils.catalog_sampling)
+        Index("ix_challenges_sample_key", "sample_key"),
+        Index("ix_challenges_type_sample_key", "challenge_type", "sample_key"),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -124,6 +127,8 @@ class LogicChallenge(Base):
     difficulty_rating = Column(Float, default=3.0)  # Échelle 1-5
     estimated_time_minutes = Column(Integer, default=15)  # Temps estimé en minutes
     success_rate = Column(Float, default=0.0)  # Pourcentage de réussite
+    # Clé de tirage uniforme [0, 1) fixée à l'insertion (random() côté PostgreSQL)
+    sample_key = Column(Float, nullable=False, server_default=func.random())
 
     # Métadonnées du contenu
     image_url = Column(String, nullable=True)  # URL de l'image associée
@@ -15,9 +15,10 @@ from sqlalchemy import (
     Integer,
     String,
     Text,
+    true,
 )
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from sqlalchemy.types import TypeDecorator
 
@@ -49,6 +50,16 @@ class JSONEncodedDict(TypeDecorator):
         return value
 
 
+def leaderboard_visibility_from_settings(settings) -> bool:
+    """``privacy_settings.show_in_leaderboards`` (défaut visible) depuis accessibility_settings."""
+    if not isinstance(settings, dict):
+        return True
+    privacy = settings.get("privacy_settings")
+    if not isinstance(privacy, dict):
+        return True
+    return privacy.get("show_in_leaderboards") is not False
+
+
 class User(Base):
     """Modèle de données pour les utilisateurs de Mathakine"""
 
@@ -105,6 +116,10 @@ class User(Base):
     # Préférences d'interface
     preferred_theme = Column(String(50))
     accessibility_settings = Column(JSONEncodedDict)
+    # Dénormalisé depuis accessibility_settings.privacy_settings (filtre SQL classement)
+    show_in_leaderboards = Column(
+        Boolean, nullable=False, default=True, server_default=true()
+    )
 
     # Colonnes de gamification (système de badges)
     pinned_badge_ids = Column(JSONB, nullable=True)  # A-4: max 3 badge IDs épinglés
@@ -169,5 +184,19 @@ class User(Base):
         "SpacedRepetitionItem", back_populates="user", cascade="all, delete-orphan"
     )
 
+    @validates("accessibility_settings")
+    def _sync_show_in_leaderboards(self, _key, value):
+        self.show_in_leaderboards = leaderboard_visibility_from_settings(value)
+        return value
+
     def __repr__(self):
         return f"<User {self.username}, Role: {self.role}>"
+
+
+# Classement "all" : parcours (total_points DESC, id) des seuls comptes actifs et visibles
+Index(
+    "ix_users_leaderboard_visible",
+    User.total_points.desc().nulls_last(),
+    User.id,
+    postgresql_where=User.is_active.is_(True) & User.show_in_leaderboards.is_(True),
+)
@@ -0,0 +1,71 @@
+"""
+Agrégats de stats par utilisateur pour l'évaluation des badges.
+
+Une ligne par utilisateur, maintenue dans la transaction de chaque tentative
+(exercice ou défi logique) par app.services.badges.user_stats_rollup :
+check_and_award_badges lit cette ligne au lieu d'agréger ``attempts`` et
+``logic_challenge_attempts`` à chaque soumission.
+"""
+
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Column,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+)
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+# Nombre de jours couverts par ``activity_bitmap`` (bit i = last_activity_day - i).
+ACTIVITY_BITMAP_DAYS = 35
+
+
+class UserStatsRollup(Base):
+    """Compteurs incrémentaux d'un utilisateur (tentatives, séries, activité)."""
+
+    __tablename__ = "user_stats_rollup"
+
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    attempts_total = Column(Integer, nullable=False, default=0)
+    attempts_correct = Column(Integer, nullable=False, default=0)
+    logic_correct_count = Column(Integer, nullable=False, default=0)
+
+    # {type_exercice_minuscule: n} — réassignés (jamais mutés en place).
+    per_type_attempts = Column(JSON, nullable=False, default=dict)
+    per_type_correct = Column(JSON, nullable=False, default=dict)
+    # Série courante de réussites par type (remise à 0 sur un échec du même type).
+    consecutive_by_type = Column(JSON, nullable=False, default=dict)
+
+    # Plus petit time_spent parmi les tentatives correctes.
+    min_fast_time = Column(Float, nullable=True)
+
+    # Jours UTC avec au moins une tentative d'exercice.
+    last_activity_day = Column(Date, nullable=True)
+    activity_bitmap = Column(BigInteger, nullable=False, default=0)
+
+    # Totaux du jour UTC ``today_day`` (journée parfaite).
+    today_day = Column(Date, nullable=True)
+    today_total = Column(Integer, nullable=False, default=0)
+    today_correct = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+    def __repr__(self):
+        return (
+            f"<UserStatsRollup user={self.user_id} "
+            f"attempts={self.attempts_total}/{self.attempts_correct}>"
+        )
@@ -14,6 +14,7 @@ from app.core.logging_config import get_logger
 from app.models.attempt import Attempt
 from app.models.exercise import Exercise
 from app.models.progress import Progress
+from app.services.badges.user_stats_rollup import record_exercise_attempt_stats
 from app.utils.json_utils import safe_parse_json
 
 logger = get_logger(__name__)
@@ -79,9 +80,15 @@ def _row_to_submit_dict(row: Any) -> Dict[str, Any]:
     }
 
 
-def create_attempt(db: Session, attempt_data: Dict[str, Any]) -> Optional[Attempt]:
+def create_attempt(
+    db: Session, attempt_data: Dict[str, Any], *, exercise_type: Optional[str] = None
+) -> Optional[Attempt]:
     """
-    Crée une tentative. Aucun side effect (pas de mise à jour progression).
+    Crée une tentative et met à jour le rollup stats badges dans la même transaction
+    (pas de mise à jour progression).
+
+    Args:
+        exercise_type: type de l'exercice si déjà connu (évite une lecture).
 
     Returns:
         La tentative créée ou None en cas d'erreur.
@@ -90,6 +97,19 @@ def create_attempt(db: Session, attempt_data: Dict[str, Any]) -> Optional[Attemp
         attempt = Attempt(**attempt_data)
         db.add(attempt)
         db.flush()
+        if exercise_type is None:
+            exercise_type = (
+                db.query(cast(Exercise.exercise_type, String))
+                .filter(Exercise.id == attempt.exercise_id)
+                .scalar()
+            )
+        record_exercise_attempt_stats(
+            db,
+            attempt.user_id,
+            exercise_type,
+            bool(attempt.is_correct),
+            attempt.time_spent,
+        )
         return attempt
     except SQLAlchemyError as err:
         logger.error("Erreur create_attempt: %s", err)
@@ -39,6 +39,12 @@ class AdminUserMutationResult(BaseModel):
     is_active: bool | None = None
 
 
+class AdminUserDeleteResult(AdminActionSuccess):
+    """Résultat DELETE /api/admin/users/{user_id} (job_id si planifiée)."""
+
+    job_id: int | None = None
+
+
 class AdminResendVerificationResult(BaseModel):
     """Résultat POST /api/admin/users/{user_id}/resend-verification."""
 
@@ -47,10 +53,9 @@ class AdminResendVerificationResult(BaseModel):
 
 
 class AdminExportDataResult(BaseModel):
-    """Données pour export CSV (headers + rows)."""
+    """Export CSV démarré : en-têtes (les lignes sont streamées par paquets)."""
 
     headers: List[str]
-    rows: List[List[Any]]
 
 
 # ── Résultats internes service (D4) ───────────────────────────────────────────
@@ -71,6 +76,12 @@ class AdminResendVerificationServiceResult(AdminActionResult):
     already_verified: bool = False
 
 
+class AdminUserDeleteServiceResult(AdminActionResult):
+    """Résultat interne delete_user : job_id si ACCOUNT_DELETION_ASYNC."""
+
+    job_id: int | None = None
+
+
 class AdminContentMutationResult(BaseModel):
     """
     Résultat mutation admin content (badge, exercise, challenge) — I3.
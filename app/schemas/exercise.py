@@ -327,6 +327,21 @@ class SubmitAnswerResponse(BaseModel):
     new_badges: Optional[List[Any]] = None
     badges_earned: Optional[int] = None
     progress_notification: Optional[Dict[str, Any]] = None
+    # "pending" : effets de bord différés — résultat via
+    # GET /api/exercises/attempts/{attempt_id}/side-effects (ou /stream en SSE).
+    side_effects_status: Optional[str] = None
+
+    model_config = ConfigDict(extra="ignore")
+
+
+class AttemptSideEffectsResponse(BaseModel):
+    """Réponse GET /api/exercises/attempts/{attempt_id}/side-effects."""
+
+    attempt_id: int
+    status: str
+    new_badges: Optional[List[Any]] = None
+    badges_earned: Optional[int] = None
+    progress_notification: Optional[Dict[str, Any]] = None
 
     model_config = ConfigDict(extra="ignore")
 
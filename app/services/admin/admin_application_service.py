@@ -10,17 +10,22 @@ LOT A6 : sync + sync_db_session, exécuté via run_db_bound() depuis les handler
 LOT B2 : contrats explicites (AdminError, result models) à la place des tuples.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
 from app.core.db_boundary import sync_db_session
 from app.schemas.admin import (
     AdminActionSuccess,
     AdminError,
     AdminExportDataResult,
     AdminResendVerificationResult,
+    AdminUserDeleteResult,
     AdminUserMutationResult,
 )
 from app.services.admin.admin_service import AdminService
+from app.services.users.account_deletion import get_account_deletion_job_for_api
 
 
 class AdminApplicationService:
@@ -87,10 +92,10 @@ class AdminApplicationService:
             )
 
     @staticmethod
-    def delete_user(user_id: int, admin_user_id: int) -> AdminActionSuccess:
+    def delete_user(user_id: int, admin_user_id: int) -> AdminUserDeleteResult:
         """
-        DELETE /api/admin/users/{user_id} — suppression définitive.
-        Lève AdminError en cas d'erreur.
+        DELETE /api/admin/users/{user_id} — suppression définitive (ou planifiée
+        si ACCOUNT_DELETION_ASYNC). Lève AdminError en cas d'erreur.
         """
         with sync_db_session() as db:
             result = AdminService.delete_user_for_admin(
@@ -101,7 +106,24 @@ class AdminApplicationService:
                     result.error or "Erreur lors de la suppression.",
                     result.status_code,
                 )
-            return AdminActionSuccess(message="Utilisateur supprimé.")
+            if result.job_id is not None:
+                return AdminUserDeleteResult(
+                    message="Suppression de l'utilisateur planifiée.",
+                    job_id=result.job_id,
+                )
+            return AdminUserDeleteResult(message="Utilisateur supprimé.")
+
+    @staticmethod
+    def get_account_deletion_job(job_id: int) -> Dict[str, Any]:
+        """
+        GET /api/admin/users/deletions/{job_id} — progression d'une suppression
+        planifiée. Lève AdminError (404) si le job est inconnu.
+        """
+        with sync_db_session() as db:
+            job = get_account_deletion_job_for_api(db, job_id)
+            if job is None:
+                raise AdminError("Suppression introuvable.", 404)
+            return job
 
     # ── Content (LOT 6) ───────────────────────────────────────────────────
 
@@ -280,17 +302,31 @@ class AdminApplicationService:
             return result
 
     @staticmethod
-    def export_csv_data_for_admin(
+    def start_export_for_admin(
         export_type: str,
         period: str,
         admin_user_id: Optional[int],
     ) -> AdminExportDataResult:
-        """GET /api/admin/export — préparation métier (headers + rows)."""
+        """GET /api/admin/export — journalisation + en-têtes (lignes via iter)."""
         with sync_db_session() as db:
-            headers, rows = AdminService.export_csv_data_for_admin(
+            headers = AdminService.log_export_for_admin(
                 db,
                 export_type=export_type,
                 period=period,
                 admin_user_id=admin_user_id,
             )
-            return AdminExportDataResult(headers=headers, rows=rows)
+            return AdminExportDataResult(headers=headers)
+
+    @staticmethod
+    def iter_export_rows_for_admin(
+        db: Session,
+        export_type: str,
+        period: str,
+    ) -> Iterator[List[List[Any]]]:
+        """GET /api/admin/export — paquets de lignes, à consommer via run_db_stream."""
+        return AdminService.iter_export_rows_for_admin(
+            db,
+            export_type=export_type,
+            period=period,
+            chunk_size=settings.DB_STREAM_CHUNK_ROWS,
+        )
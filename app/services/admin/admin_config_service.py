@@ -17,6 +17,7 @@ from app.services.admin.admin_helpers import (
     parse_setting_value,
     serialize_value,
 )
+from app.utils.settings_reader import invalidate_settings_snapshot
 
 
 class AdminConfigService:
@@ -96,3 +97,5 @@ class AdminConfigService:
             {"updated_keys": list(settings_in.keys())},
         )
         db.commit()
+        # Après commit : les lecteurs (middleware maintenance, inscription) rechargent
+        invalidate_settings_snapshot()
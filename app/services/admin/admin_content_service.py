@@ -6,11 +6,12 @@ Phase 3, item 3.3a — audit architecture 03/2026.
 """
 
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from sqlalchemy import case, func
+from sqlalchemy import case, func, select
 from sqlalchemy.orm import Session
 
+from app.core.db_boundary import iter_result_chunks
 from app.core.user_roles import serialize_user_role
 from app.models.achievement import Achievement, UserAchievement
 from app.models.attempt import Attempt
@@ -31,6 +32,37 @@ from app.services.admin.admin_badge_create_flow import (
 from app.services.admin.admin_helpers import log_admin_action
 from app.services.badges.badge_requirement_validation import validate_badge_requirements
 
+# En-têtes CSV par type d'export (ordre des colonnes de iter_export_rows_for_admin).
+_EXPORT_HEADERS: Dict[str, Tuple[str, ...]] = {
+    "users": (
+        "id",
+        "username",
+        "email",
+        "full_name",
+        "role",
+        "is_active",
+        "created_at",
+    ),
+    "exercises": (
+        "id",
+        "title",
+        "exercise_type",
+        "difficulty",
+        "age_group",
+        "is_archived",
+        "created_at",
+    ),
+    "attempts": (
+        "id",
+        "user_id",
+        "exercise_id",
+        "is_correct",
+        "time_spent",
+        "created_at",
+    ),
+    "overview": ("metric", "value", "period"),
+}
+
 
 class AdminContentService:
     """Opérations CRUD admin pour exercices, défis, badges et export."""
@@ -835,20 +867,14 @@ class AdminContentService:
     # ── Export CSV ─────────────────────────────────────────────────────────
 
     @staticmethod
-    def export_csv_data_for_admin(
+    def log_export_for_admin(
         db: Session,
         *,
         export_type: str,
         period: str,
         admin_user_id: Optional[int] = None,
-    ) -> Tuple[List[str], List[List[Any]]]:
-        since = None
-        if period == "7d":
-            since = datetime.now(timezone.utc) - timedelta(days=7)
-        elif period == "30d":
-            since = datetime.now(timezone.utc) - timedelta(days=30)
-
-        MAX_ROWS = 10_000
+    ) -> List[str]:
+        """Journalise l'export (commit) et retourne les en-têtes CSV du type."""
         log_admin_action(
             db,
             admin_user_id,
@@ -858,93 +884,135 @@ class AdminContentService:
             {"type": export_type, "period": period},
         )
         db.commit()
+        return list(_EXPORT_HEADERS.get(export_type, _EXPORT_HEADERS["overview"]))
+
+    @staticmethod
+    def iter_export_rows_for_admin(
+        db: Session,
+        *,
+        export_type: str,
+        period: str,
+        chunk_size: int,
+    ) -> Iterator[List[List[Any]]]:
+        """
+        Lignes de l'export par paquets de ``chunk_size``, sans limite de volume.
+
+        Tuples de colonnes lus par curseur serveur (pas d'entités ORM en identity map) :
+        mémoire constante, à consommer via run_db_stream.
+        """
+        since = None
+        if period == "7d":
+            since = datetime.now(timezone.utc) - timedelta(days=7)
+        elif period == "30d":
+            since = datetime.now(timezone.utc) - timedelta(days=30)
 
         if export_type == "users":
-            q = db.query(User)
+            stmt = select(
+                User.id,
+                User.username,
+                User.email,
+                User.full_name,
+                User.role,
+                User.is_active,
+                User.created_at,
+            )
             if since:
-                q = q.filter(User.created_at >= since)
-            rows = q.order_by(User.created_at.desc()).limit(MAX_ROWS).all()
-            rows_data = [
-                [
-                    u.id,
-                    u.username or "",
-                    u.email or "",
-                    u.full_name or "",
-                    serialize_user_role(getattr(u, "role", None)) or "",
-                    u.is_active,
-                    u.created_at.isoformat() if u.created_at else "",
+                stmt = stmt.where(User.created_at >= since)
+            stmt = stmt.order_by(User.created_at.desc())
+            for chunk in iter_result_chunks(db, stmt, chunk_size):
+                yield [
+                    [
+                        uid,
+                        username or "",
+                        email or "",
+                        full_name or "",
+                        serialize_user_role(role) or "",
+                        is_active,
+                        created_at.isoformat() if created_at else "",
+                    ]
+                    for (
+                        uid,
+                        username,
+                        email,
+                        full_name,
+                        role,
+                        is_active,
+                        created_at,
+                    ) in chunk
                 ]
-                for u in rows
-            ]
-            headers = [
-                "id",
-                "username",
-                "email",
-                "full_name",
-                "role",
-                "is_active",
-                "created_at",
-            ]
         elif export_type == "exercises":
-            q = db.query(Exercise)
+            stmt = select(
+                Exercise.id,
+                Exercise.title,
+                Exercise.exercise_type,
+                Exercise.difficulty,
+                Exercise.age_group,
+                Exercise.is_archived,
+                Exercise.created_at,
+            )
             if since:
-                q = q.filter(Exercise.created_at >= since)
-            rows = q.order_by(Exercise.created_at.desc()).limit(MAX_ROWS).all()
-            rows_data = [
-                [
-                    e.id,
-                    (e.title or "").replace("\n", " "),
-                    e.exercise_type or "",
-                    e.difficulty or "",
-                    e.age_group or "",
-                    e.is_archived,
-                    e.created_at.isoformat() if e.created_at else "",
+                stmt = stmt.where(Exercise.created_at >= since)
+            stmt = stmt.order_by(Exercise.created_at.desc())
+            for chunk in iter_result_chunks(db, stmt, chunk_size):
+                yield [
+                    [
+                        eid,
+                        (title or "").replace("\n", " "),
+                        exercise_type or "",
+                        difficulty or "",
+                        age_group or "",
+                        is_archived,
+                        created_at.isoformat() if created_at else "",
+                    ]
+                    for (
+                        eid,
+                        title,
+                        exercise_type,
+                        difficulty,
+                        age_group,
+                        is_archived,
+                        created_at,
+                    ) in chunk
                 ]
-                for e in rows
-            ]
-            headers = [
-                "id",
-                "title",
-                "exercise_type",
-                "difficulty",
-                "age_group",
-                "is_archived",
-                "created_at",
-            ]
         elif export_type == "attempts":
-            q = db.query(Attempt)
+            stmt = select(
+                Attempt.id,
+                Attempt.user_id,
+                Attempt.exercise_id,
+                Attempt.is_correct,
+                Attempt.time_spent,
+                Attempt.created_at,
+            )
             if since:
-                q = q.filter(Attempt.created_at >= since)
-            rows = q.order_by(Attempt.created_at.desc()).limit(MAX_ROWS).all()
-            rows_data = [
-                [
-                    a.id,
-                    a.user_id,
-                    a.exercise_id,
-                    a.is_correct,
-                    a.time_spent or "",
-                    a.created_at.isoformat() if a.created_at else "",
+                stmt = stmt.where(Attempt.created_at >= since)
+            stmt = stmt.order_by(Attempt.created_at.desc())
+            for chunk in iter_result_chunks(db, stmt, chunk_size):
+                yield [
+                    [
+                        aid,
+                        user_id,
+                        exercise_id,
+                        is_correct,
+                        time_spent or "",
+                        created_at.isoformat() if created_at else "",
+                    ]
+                    for (
+                        aid,
+                        user_id,
+                        exercise_id,
+                        is_correct,
+                        time_spent,
+                        created_at,
+                    ) in chunk
                 ]
-                for a in rows
-            ]
-            headers = [
-                "id",
-                "user_id",
-                "exercise_id",
-                "is_correct",
-                "time_spent",
-                "created_at",
-            ]
         else:
             total_users = db.query(func.count(User.id)).scalar() or 0
             total_exercises = db.query(func.count(Exercise.id)).scalar() or 0
             total_challenges = db.query(func.count(LogicChallenge.id)).scalar() or 0
             total_attempts = db.query(func.count(Attempt.id)).scalar() or 0
-            headers = ["metric", "value", "period"]
-            rows_data = [
+            yield [
                 ["total_users", total_users, period],
                 ["total_exercises", total_exercises, period],
                 ["total_challenges", total_challenges, period],
                 ["total_attempts", total_attempts, period],
             ]
-        return headers, rows_data
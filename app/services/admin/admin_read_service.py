@@ -15,6 +15,7 @@ from app.core.db_boundary import sync_db_session
 from app.schemas.admin import AdminError
 from app.services.admin.admin_service import AdminService
 from app.services.analytics.analytics_service import AnalyticsService
+from app.services.analytics.edtech_ingest import flush_edtech_events
 from app.services.feedback.feedback_service import FeedbackService
 from app.services.users.user_service import UserService
 
@@ -180,22 +181,6 @@ def get_reports_for_api(*, period: str = "7d") -> Dict[str, Any]:
         return AdminService.get_reports_for_api(db, period=period)
 
 
-def export_csv_data_for_admin(
-    *,
-    export_type: str,
-    period: str,
-    admin_user_id: Optional[int] = None,
-):
-    """GET /api/admin/export — headers + rows pour stream CSV. Déprécié: utiliser AdminApplicationService.export_csv_data_for_admin."""
-    with sync_db_session() as db:
-        return AdminService.export_csv_data_for_admin(
-            db,
-            export_type=export_type,
-            period=period,
-            admin_user_id=admin_user_id,
-        )
-
-
 def get_edtech_analytics_for_admin(
     *,
     period: str = "7d",
@@ -208,6 +193,8 @@ def get_edtech_analytics_for_admin(
         since -= timedelta(days=30)
     else:
         since -= timedelta(days=7)
+    # Événements encore tamponnés par ce worker : visibles dès la lecture suivante.
+    flush_edtech_events()
     with sync_db_session() as db:
         return AnalyticsService.get_edtech_analytics_for_admin(
             db,
@@ -60,4 +60,5 @@ class AdminService:
     duplicate_challenge_for_admin = AdminContentService.duplicate_challenge_for_admin
     patch_challenge_for_admin = AdminContentService.patch_challenge_for_admin
 
-    export_csv_data_for_admin = AdminContentService.export_csv_data_for_admin
+    log_export_for_admin = AdminContentService.log_export_for_admin
+    iter_export_rows_for_admin = AdminContentService.iter_export_rows_for_admin
@@ -23,9 +23,11 @@ from app.models.user import User, UserRole
 from app.schemas.admin import (
     AdminActionResult,
     AdminResendVerificationServiceResult,
+    AdminUserDeleteServiceResult,
 )
 from app.services.admin.admin_helpers import log_admin_action
 from app.services.communication.email_service import EmailService
+from app.services.users.account_deletion import request_account_deletion
 from app.services.users.user_service import UserService
 from app.utils.email_verification import generate_verification_token
 
@@ -198,6 +200,7 @@ class AdminUserService:
             username=user.username,
             reset_token=reset_token,
             frontend_url=settings.FRONTEND_URL,
+            user_id=user.id,
         )
         if not email_sent:
             return AdminActionResult(
@@ -233,6 +236,7 @@ class AdminUserService:
             username=user.username,
             verification_token=verification_token,
             frontend_url=settings.FRONTEND_URL,
+            user_id=user.id,
         )
         if not email_sent:
             return AdminResendVerificationServiceResult(
@@ -248,14 +252,15 @@ class AdminUserService:
     @staticmethod
     def delete_user_for_admin(
         db: Session, user_id: int, admin_user_id: int
-    ) -> AdminActionResult:
+    ) -> AdminUserDeleteServiceResult:
         """
         Supprime définitivement un utilisateur (cascade sur toutes les données liées).
         Un admin ne peut pas supprimer son propre compte.
-        Retourne AdminActionResult (D4).
+        Avec ACCOUNT_DELETION_ASYNC : compte désactivé et job planifié (job_id).
+        Retourne AdminUserDeleteServiceResult (D4).
         """
         if user_id == admin_user_id:
-            return AdminActionResult(
+            return AdminUserDeleteServiceResult(
                 success=False,
                 error="Vous ne pouvez pas supprimer votre propre compte.",
                 status_code=400,
@@ -263,7 +268,7 @@ class AdminUserService:
 
         user = UserService.get_user(db, user_id)
         if not user:
-            return AdminActionResult(
+            return AdminUserDeleteServiceResult(
                 success=False,
                 error="Utilisateur non trouvé.",
                 status_code=404,
@@ -277,5 +282,8 @@ class AdminUserService:
             user_id,
             {"username": user.username},
         )
+        if settings.ACCOUNT_DELETION_ASYNC:
+            job_id = request_account_deletion(db, user_id, requested_by=admin_user_id)
+            return AdminUserDeleteServiceResult(success=True, job_id=job_id)
         UserService.delete_user(db, user_id, auto_commit=True)
-        return AdminActionResult(success=True)
+        return AdminUserDeleteServiceResult(success=True)
@@ -2,21 +2,44 @@
 Service pour les evenements analytiques EdTech.
 """
 
-from collections import defaultdict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.db_boundary import sync_db_session
 from app.core.logging_config import get_logger
 from app.models.edtech_event import EdTechEvent
+from app.services.analytics.edtech_ingest import write_edtech_batch
+from app.services.analytics.edtech_rollup import edtech_aggregates
 
 logger = get_logger(__name__)
 
 VALID_EVENTS = frozenset({"quick_start_click", "first_attempt"})
 
 
+def _strip_nul(value: Any) -> Any:
+    """Retire les caractères NUL (refusés par jsonb) des chaînes, clés comprises."""
+    if isinstance(value, str):
+        return value.replace("\x00", "")
+    if isinstance(value, dict):
+        return {_strip_nul(k): _strip_nul(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_strip_nul(v) for v in value]
+    return value
+
+
+def normalize_edtech_event(
+    event: Any, payload: Any = None
+) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """(event, payload) normalisés, ou None si l'événement est invalide."""
+    event = (event if isinstance(event, str) else "").strip().lower()
+    if event not in VALID_EVENTS:
+        return None
+    return event, _strip_nul(payload) if isinstance(payload, dict) else {}
+
+
 def record_edtech_event_sync(
     *,
     event: str,
@@ -33,6 +56,15 @@ def record_edtech_event_sync(
         )
 
 
+def record_edtech_events_sync(rows: List[Dict[str, Any]]) -> int:
+    """
+    Use case sync (EDTECH_INGEST_BUFFERED désactivé) : écrit des événements déjà
+    normalisés en un seul COPY ; retourne le nombre écrit (lignes rejetées par la
+    base écartées). Execute via run_db_bound().
+    """
+    return write_edtech_batch(rows)
+
+
 class AnalyticsService:
     """Service pour les analytics EdTech."""
 
@@ -50,15 +82,12 @@ class AnalyticsService:
         Returns:
             True si enregistre, False si event invalide (non persisted)
         """
-        event = (event or "").strip().lower()
-        if event not in VALID_EVENTS:
+        normalized = normalize_edtech_event(event, payload)
+        if normalized is None:
             return False
 
-        record = EdTechEvent(
-            user_id=user_id,
-            event=event,
-            payload=payload if isinstance(payload, dict) else {},
-        )
+        event, payload = normalized
+        record = EdTechEvent(user_id=user_id, event=event, payload=payload)
         db.add(record)
         db.commit()
         return True
@@ -76,70 +105,25 @@ class AnalyticsService:
         """
         limit = min(limit, 500)
         event_filter = (event_filter or "").strip().lower()
+        if event_filter not in VALID_EVENTS:
+            event_filter = ""
+
+        # Agrégats en SQL : jours clos lus dans les rollups quotidiens, bords de la
+        # fenêtre agrégés directement (GROUP BY + opérateurs JSONB). Avant la liste :
+        # le rattrapage des rollups peut committer, ce qui expirerait les événements
+        # chargés (un SELECT de rechargement par ligne).
+        summary = edtech_aggregates(
+            db,
+            since=since,
+            event_filter=event_filter,
+            use_rollup=settings.EDTECH_ANALYTICS_ROLLUP_ENABLED,
+        )
 
         q = db.query(EdTechEvent).filter(EdTechEvent.created_at >= since)
-        if event_filter and event_filter in VALID_EVENTS:
+        if event_filter:
             q = q.filter(EdTechEvent.event == event_filter)
         events = q.order_by(EdTechEvent.created_at.desc()).limit(limit).all()
 
-        q_all = db.query(EdTechEvent).filter(EdTechEvent.created_at >= since)
-        if event_filter and event_filter in VALID_EVENTS:
-            q_all = q_all.filter(EdTechEvent.event == event_filter)
-        events_all = q_all.all()
-
-        aggregates = defaultdict(lambda: {"count": 0, "time_to_first_attempt_ms": []})
-        ctr_guided = 0
-        ctr_total = 0
-        unique_user_ids = set()
-        clicks_by_type = {"exercise": 0, "challenge": 0, "interleaved": 0}
-        attempts_by_type = {"exercise": 0, "challenge": 0, "interleaved": 0}
-
-        for e in events_all:
-            if e.user_id:
-                unique_user_ids.add(e.user_id)
-            aggregates[e.event]["count"] += 1
-            if e.event == "first_attempt" and e.payload:
-                t = e.payload.get("timeToFirstAttemptMs")
-                if t is not None:
-                    try:
-                        val = float(t)
-                        # Ignorer les valeurs negatives (decalage horaire, donnees de test)
-                        if val >= 0:
-                            aggregates[e.event]["time_to_first_attempt_ms"].append(val)
-                    except (TypeError, ValueError):
-                        pass
-                typ = (e.payload.get("type") or "").lower()
-                if typ in attempts_by_type:
-                    attempts_by_type[typ] += 1
-            if e.event == "quick_start_click":
-                ctr_total += 1
-                if e.payload and e.payload.get("guided"):
-                    ctr_guided += 1
-                typ = (e.payload.get("type") or "").lower()
-                if typ in clicks_by_type:
-                    clicks_by_type[typ] += 1
-
-        agg_result = {}
-        for evt, data in aggregates.items():
-            times = data["time_to_first_attempt_ms"]
-            avg_ms = round(sum(times) / len(times), 0) if times else None
-            agg_result[evt] = {
-                "count": data["count"],
-                "avg_time_to_first_attempt_ms": avg_ms,
-            }
-
-        ctr_summary = {}
-        if ctr_total > 0:
-            ctr_summary = {
-                "total_clicks": ctr_total,
-                "guided_clicks": ctr_guided,
-                "guided_rate_pct": round(100 * ctr_guided / ctr_total, 1),
-                "by_type": dict(clicks_by_type),
-            }
-
-        if aggregates.get("first_attempt"):
-            agg_result["first_attempt"]["by_type"] = dict(attempts_by_type)
-
         events_data: List[Dict[str, Any]] = [
             {
                 "id": e.id,
@@ -153,8 +137,8 @@ class AnalyticsService:
 
         return {
             "since": since.isoformat(),
-            "aggregates": dict(agg_result),
-            "ctr_summary": ctr_summary,
-            "unique_users": len(unique_user_ids),
+            "aggregates": summary["aggregates"],
+            "ctr_summary": summary["ctr_summary"],
+            "unique_users": summary["unique_users"],
             "events": events_data,
         }
@@ -0,0 +1,293 @@
+"""
+Agrégats EdTech calculés en SQL pour GET /api/admin/analytics/edtech.
+
+Une fenêtre ``[since, maintenant]`` se découpe en :
+- jours UTC clos entièrement couverts → ``edtech_daily_rollups`` et
+  ``edtech_daily_users``, compactés paresseusement à la première lecture qui en a
+  besoin (un INSERT … SELECT GROUP BY par jour, réservé dans ``edtech_rollup_days``) ;
+- bords (début du premier jour, jour courant) → GROUP BY direct sur ``edtech_events``
+  avec opérateurs JSONB, au plus ~2 jours d'événements relus.
+
+Le coût d'une lecture ne dépend donc plus du volume de la fenêtre. Sémantique
+identique à l'agrégation Python historique : ``guided`` vrai au sens JSON (ni null,
+false, 0, "" ni vide), temps vers la 1re tentative numériques et >= 0 seulement,
+types hors exercise / challenge / interleaved comptés sans ventilation.
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import (
+    Float,
+    and_,
+    case,
+    cast,
+    distinct,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.logging_config import get_logger
+from app.models.edtech_daily_rollup import (
+    EdTechDailyRollup,
+    EdTechDailyUser,
+    EdTechRollupDay,
+)
+from app.models.edtech_event import EdTechEvent
+
+logger = get_logger(__name__)
+
+EDTECH_TARGET_TYPES = ("exercise", "challenge", "interleaved")
+
+# Un jour n'est compacté qu'après ce délai : marge pour les événements écrits avec
+# un léger retard (ingestion par lots).
+ROLLUP_GRACE = timedelta(minutes=10)
+
+_NUMBER_PATTERN = r"^\s*-?[0-9]+(\.[0-9]+)?([eE][-+]?[0-9]+)?\s*$"
+_JSON_FALSY = ("", "false", "0", "[]", "{}")
+
+_type_text = func.lower(func.coalesce(EdTechEvent.payload["type"].astext, ""))
+_target_type = case((_type_text.in_(EDTECH_TARGET_TYPES), _type_text), else_="")
+_guided = and_(
+    EdTechEvent.event == "quick_start_click",
+    func.coalesce(EdTechEvent.payload["guided"].astext, "").notin_(_JSON_FALSY),
+)
+_ttfa_text = EdTechEvent.payload["timeToFirstAttemptMs"].astext
+_ttfa = case(
+    (
+        and_(
+            EdTechEvent.event == "first_attempt",
+            _ttfa_text.regexp_match(_NUMBER_PATTERN),
+        ),
+        cast(_ttfa_text, Float),
+    )
+)
+
+Range = Tuple[datetime, Optional[datetime]]
+
+
+def day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def _in_ranges(ranges: List[Range]):
+    conditions = []
+    for start, end in ranges:
+        condition = EdTechEvent.created_at >= start
+        if end is not None:
+            condition = and_(condition, EdTechEvent.created_at < end)
+        conditions.append(condition)
+    return or_(*conditions)
+
+
+def _bucket_columns() -> List[Any]:
+    """Colonnes (event, target_type, guided, events, ttfa_sum_ms, ttfa_count)."""
+    return [
+        EdTechEvent.event,
+        _target_type.label("target_type"),
+        _guided.label("guided"),
+        func.count().label("events"),
+        func.coalesce(func.sum(_ttfa).filter(_ttfa >= 0), 0).label("ttfa_sum_ms"),
+        func.count(_ttfa).filter(_ttfa >= 0).label("ttfa_count"),
+    ]
+
+
+_BUCKET_KEYS = (EdTechEvent.event, _target_type, _guided)
+
+
+def _raw_buckets(db: Session, ranges: List[Range], event_filter: str) -> List[Any]:
+    """Buckets lus directement sur ``edtech_events`` (bords de la fenêtre)."""
+    stmt = select(*_bucket_columns()).where(_in_ranges(ranges)).group_by(*_BUCKET_KEYS)
+    if event_filter:
+        stmt = stmt.where(EdTechEvent.event == event_filter)
+    return list(db.execute(stmt))
+
+
+def _rollup_buckets(
+    db: Session, first_day: date, last_day: date, event_filter: str
+) -> List[Any]:
+    stmt = (
+        select(
+            EdTechDailyRollup.event,
+            EdTechDailyRollup.target_type,
+            EdTechDailyRollup.guided,
+            func.sum(EdTechDailyRollup.events).label("events"),
+            func.sum(EdTechDailyRollup.ttfa_sum_ms).label("ttfa_sum_ms"),
+            func.sum(EdTechDailyRollup.ttfa_count).label("ttfa_count"),
+        )
+        .where(EdTechDailyRollup.day.between(first_day, last_day))
+        .group_by(
+            EdTechDailyRollup.event,
+            EdTechDailyRollup.target_type,
+            EdTechDailyRollup.guided,
+        )
+    )
+    if event_filter:
+        stmt = stmt.where(EdTechDailyRollup.event == event_filter)
+    return list(db.execute(stmt))
+
+
+def _unique_users(
+    db: Session,
+    ranges: List[Range],
+    rolled: Optional[Tuple[date, date]],
+    event_filter: str,
+) -> int:
+    raw = select(EdTechEvent.user_id).where(
+        _in_ranges(ranges), EdTechEvent.user_id.is_not(None)
+    )
+    if event_filter:
+        raw = raw.where(EdTechEvent.event == event_filter)
+    parts = [raw]
+    if rolled is not None:
+        daily = select(EdTechDailyUser.user_id).where(
+            EdTechDailyUser.day.between(*rolled)
+        )
+        if event_filter:
+            daily = daily.where(EdTechDailyUser.event == event_filter)
+        parts.append(daily)
+    users = union_all(*parts).subquery()
+    return db.execute(select(func.count(distinct(users.c.user_id)))).scalar() or 0
+
+
+def roll_up_closed_days(db: Session, first_day: date, last_day: date) -> int:
+    """
+    Compacte les jours de ``[first_day, last_day]`` pas encore compactés (sans
+    commit) ; retourne le nombre de jours traités. Un jour est réservé par INSERT
+    ON CONFLICT DO NOTHING : une lecture concurrente attend puis le saute.
+    """
+    done = set(
+        db.execute(
+            select(EdTechRollupDay.day).where(
+                EdTechRollupDay.day.between(first_day, last_day)
+            )
+        ).scalars()
+    )
+    rolled = 0
+    day = first_day
+    while day <= last_day:
+        if day not in done and _claim_day(db, day):
+            _roll_up_day(db, day)
+            rolled += 1
+        day += timedelta(days=1)
+    if rolled:
+        logger.info("Analytics EdTech : {} jour(s) compacté(s)", rolled)
+    return rolled
+
+
+def _claim_day(db: Session, day: date) -> bool:
+    stmt = (
+        pg_insert(EdTechRollupDay)
+        .values(day=day)
+        .on_conflict_do_nothing(index_elements=["day"])
+        .returning(EdTechRollupDay.day)
+    )
+    return db.execute(stmt).scalar() is not None
+
+
+def _roll_up_day(db: Session, day: date) -> None:
+    in_day = [(day_start(day), day_start(day + timedelta(days=1)))]
+    buckets = (
+        select(literal(day).label("day"), *_bucket_columns())
+        .where(_in_ranges(in_day))
+        .group_by(*_BUCKET_KEYS)
+    )
+    db.execute(
+        insert(EdTechDailyRollup).from_select(
+            [column.name for column in EdTechDailyRollup.__table__.columns],
+            buckets,
+        )
+    )
+    users = (
+        select(literal(day).label("day"), EdTechEvent.event, EdTechEvent.user_id)
+        .where(_in_ranges(in_day), EdTechEvent.user_id.is_not(None))
+        .distinct()
+    )
+    db.execute(insert(EdTechDailyUser).from_select(["day", "event", "user_id"], users))
+
+
+def edtech_aggregates(
+    db: Session,
+    *,
+    since: datetime,
+    event_filter: str = "",
+    use_rollup: bool = True,
+    now: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """
+    ``aggregates``, ``ctr_summary`` et ``unique_users`` de la fenêtre ``since`` →
+    maintenant (format de la réponse admin). Compacte au passage les jours clos
+    manquants et commit. Un ``now`` explicite (tests, fenêtre passée) borne aussi la
+    fin de la fenêtre.
+    """
+    end = now
+    now = now or datetime.now(timezone.utc)
+    first_full_day = since.astimezone(timezone.utc).date() + timedelta(days=1)
+    last_closed_day = (now - ROLLUP_GRACE).date() - timedelta(days=1)
+    if use_rollup and first_full_day <= last_closed_day:
+        if roll_up_closed_days(db, first_full_day, last_closed_day):
+            db.commit()
+        rolled = (first_full_day, last_closed_day)
+        ranges: List[Range] = [
+            (since, day_start(first_full_day)),
+            (day_start(last_closed_day + timedelta(days=1)), end),
+        ]
+        buckets = _rollup_buckets(db, *rolled, event_filter)
+    else:
+        rolled = None
+        ranges = [(since, end)]
+        buckets = []
+    buckets += _raw_buckets(db, ranges, event_filter)
+    return {
+        **_fold_buckets(buckets),
+        "unique_users": _unique_users(db, ranges, rolled, event_filter),
+    }
+
+
+def _fold_buckets(buckets: List[Any]) -> Dict[str, Any]:
+    """Agrège les quelques lignes (événement, type, guidé) au format de la réponse."""
+    counts: Dict[str, int] = {}
+    ttfa_sum = 0.0
+    ttfa_count = 0
+    guided_clicks = 0
+    by_type: Dict[str, Dict[str, int]] = {
+        event: dict.fromkeys(EDTECH_TARGET_TYPES, 0)
+        for event in ("quick_start_click", "first_attempt")
+    }
+    for row in buckets:
+        counts[row.event] = counts.get(row.event, 0) + int(row.events)
+        if row.event == "first_attempt":
+            ttfa_sum += float(row.ttfa_sum_ms or 0)
+            ttfa_count += int(row.ttfa_count or 0)
+        if row.event == "quick_start_click" and row.guided:
+            guided_clicks += int(row.events)
+        if row.event in by_type and row.target_type:
+            by_type[row.event][row.target_type] += int(row.events)
+
+    aggregates: Dict[str, Dict[str, Any]] = {
+        event: {"count": count, "avg_time_to_first_attempt_ms": None}
+        for event, count in counts.items()
+        if count
+    }
+    if "first_attempt" in aggregates:
+        if ttfa_count:
+            avg_ms = round(ttfa_sum / ttfa_count, 0)
+            aggregates["first_attempt"]["avg_time_to_first_attempt_ms"] = avg_ms
+        aggregates["first_attempt"]["by_type"] = by_type["first_attempt"]
+
+    ctr_summary: Dict[str, Any] = {}
+    total_clicks = counts.get("quick_start_click", 0)
+    if total_clicks:
+        ctr_summary = {
+            "total_clicks": total_clicks,
+            "guided_clicks": guided_clicks,
+            "guided_rate_pct": round(100 * guided_clicks / total_clicks, 1),
+            "by_type": by_type["quick_start_click"],
+        }
+    return {"aggregates": aggregates, "ctr_summary": ctr_summary}
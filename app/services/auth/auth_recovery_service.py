@@ -131,13 +131,15 @@ def perform_resend_verification(email: str) -> ResendVerificationResult:
         verification_token = resend_verification_token(db, user)
         to_email = user.email
         username = user.username
+        user_id = user.id
 
-    # Envoi email hors session (EmailService n'a pas besoin de DB)
+    # Envoi (ou mise en file email_outbox) hors session métier
     email_sent = EmailService.send_verification_email(
         to_email=to_email,
         username=username,
         verification_token=verification_token,
         frontend_url=settings.FRONTEND_URL,
+        user_id=user_id,
     )
 
     if not email_sent:
@@ -177,12 +179,14 @@ def perform_forgot_password(email: str) -> ForgotPasswordResult:
         reset_token = initiate_password_reset(db, user)
         to_email = user.email
         username = user.username
+        user_id = user.id
 
     email_sent = EmailService.send_password_reset_email(
         to_email=to_email,
         username=username,
         reset_token=reset_token,
         frontend_url=settings.FRONTEND_URL,
+        user_id=user_id,
     )
 
     if not email_sent:
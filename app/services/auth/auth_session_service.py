@@ -6,7 +6,10 @@ Pas d'accès DB direct dans les handlers — tout passe par ce service.
 """
 
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional
+from types import SimpleNamespace
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.db_boundary import sync_db_session
@@ -25,6 +28,7 @@ from app.services.gamification.compute import (
     canonicalize_progression_rank_bucket,
     compute_state_from_total_points,
 )
+from app.utils.auth_cache import user_payload_cache
 
 logger = get_logger(__name__)
 
@@ -154,70 +158,120 @@ def get_current_user_payload(username: str, payload: dict) -> Optional[Dict[str,
 
     Returns:
         Dictionnaire user serialisable ou None si non trouve / revoque
+
+    Perf : servi depuis user_payload_cache (TTL court, invalidé au commit d'un User) ;
+    la révocation par reset password reste vérifiée à chaque appel.
     """
+    hit, user_payload = _get_cached_current_user_payload(username, payload)
+    if hit:
+        return user_payload
     with sync_db_session() as db:
-        user = get_user_by_username(db, username)
-        if user is None:
-            return None
-        if not getattr(user, "is_active", True):
-            return None
-        if _is_token_revoked_by_password_reset(payload, user):
-            return None
-        from app.services.users.user_service import UserService
-        from app.utils.unverified_access import get_unverified_access_scope
-
-        access_scope = get_unverified_access_scope(user)
-        is_email_verified = getattr(user, "is_email_verified", True)
-        total_pts = int(getattr(user, "total_points", None) or 0)
-        _, syn_level, syn_xp, _ = compute_state_from_total_points(total_pts)
-        rank_bucket = canonicalize_progression_rank_bucket(
-            user.jedi_rank if hasattr(user, "jedi_rank") else None,
-            syn_level,
-        )
-        return {
-            "id": user.id,
-            "username": user.username,
-            "email": user.email if hasattr(user, "email") else None,
-            "is_authenticated": True,
-            "is_email_verified": is_email_verified,
-            "access_scope": access_scope,
-            "role": serialize_user_role(getattr(user, "role", None)),
-            "full_name": user.full_name if hasattr(user, "full_name") else None,
-            "grade_level": user.grade_level if hasattr(user, "grade_level") else None,
-            "grade_system": getattr(user, "grade_system", None),
-            "age_group": getattr(user, "age_group", None),
-            "learning_style": (
-                user.learning_style if hasattr(user, "learning_style") else None
-            ),
-            "preferred_difficulty": (
-                user.preferred_difficulty
-                if hasattr(user, "preferred_difficulty")
-                else None
-            ),
-            "onboarding_completed_at": (
-                user.onboarding_completed_at.isoformat()
-                if getattr(user, "onboarding_completed_at", None)
-                else None
-            ),
-            "learning_goal": getattr(user, "learning_goal", None),
-            "practice_rhythm": getattr(user, "practice_rhythm", None),
-            "preferred_theme": (
-                user.preferred_theme if hasattr(user, "preferred_theme") else None
-            ),
-            "accessibility_settings": (
-                user.accessibility_settings
-                if hasattr(user, "accessibility_settings")
-                else None
-            ),
-            "created_at": (
-                user.created_at.isoformat()
-                if hasattr(user, "created_at") and user.created_at
-                else None
-            ),
-            "total_points": total_pts,
-            "current_level": syn_level,
-            "experience_points": syn_xp,
-            "jedi_rank": rank_bucket,
-            "progression_rank": rank_bucket,
-            "gamification_level": UserService.build_gamification_level_for_api(user),
-        }
+        return _load_current_user_payload(db, username, payload)
+
+
+def resolve_current_user_payload(
+    db: Session, username: str, payload: dict
+) -> Optional[Dict[str, Any]]:
+    """
+    Variante lecture de get_current_user_payload sur une session fournie.
+    Utilisée via run_db_read() (AsyncSession opt-in ou sync_db_session).
+    """
+    hit, user_payload = _get_cached_current_user_payload(username, payload)
+    if hit:
+        return user_payload
+    return _load_current_user_payload(db, username, payload)
+
+
+def _get_cached_current_user_payload(
+    username: str, payload: dict
+) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """(hit, payload) depuis user_payload_cache ; hit révoqué -> (True, None)."""
+    cached = user_payload_cache.get(username)
+    if cached is None:
+        return False, None
+    user_payload, password_changed_at = cached
+    revocation_probe = SimpleNamespace(password_changed_at=password_changed_at)
+    if _is_token_revoked_by_password_reset(payload, revocation_probe):
+        return True, None
+    return True, user_payload
+
+
+def _load_current_user_payload(
+    db: Session, username: str, payload: dict
+) -> Optional[Dict[str, Any]]:
+    generation = user_payload_cache.generation
+    user = get_user_by_username(db, username)
+    if user is None:
+        return None
+    if not getattr(user, "is_active", True):
+        return None
+    if _is_token_revoked_by_password_reset(payload, user):
+        return None
+    user_payload = _build_current_user_payload(user)
+    user_payload_cache.put(
+        username,
+        user_payload,
+        getattr(user, "password_changed_at", None),
+        generation=generation,
+    )
+    return user_payload
+
+
+def _build_current_user_payload(user) -> Dict[str, Any]:
+    """Payload /me (is_authenticated, préférences, gamification) d'un User chargé."""
+    from app.services.users.user_service import UserService
+    from app.utils.unverified_access import get_unverified_access_scope
+
+    access_scope = get_unverified_access_scope(user)
+    is_email_verified = getattr(user, "is_email_verified", True)
+    total_pts = int(getattr(user, "total_points", None) or 0)
+    _, syn_level, syn_xp, _ = compute_state_from_total_points(total_pts)
+    rank_bucket = canonicalize_progression_rank_bucket(
+        user.jedi_rank if hasattr(user, "jedi_rank") else None,
+        syn_level,
+    )
+    return {
+        "id": user.id,
+        "username": user.username,
+        "email": user.email if hasattr(user, "email") else None,
+        "is_authenticated": True,
+        "is_email_verified": is_email_verified,
+        "access_scope": access_scope,
+        "role": serialize_user_role(getattr(user, "role", None)),
+        "full_name": user.full_name if hasattr(user, "full_name") else None,
+        "grade_level": user.grade_level if hasattr(user, "grade_level") else None,
+        "grade_system": getattr(user, "grade_system", None),
+        "age_group": getattr(user, "age_group", None),
+        "learning_style": (
+            user.learning_style if hasattr(user, "learning_style") else None
+        ),
+        "preferred_difficulty": (
+            user.preferred_difficulty if hasattr(user, "preferred_difficulty") else None
+        ),
+        "onboarding_completed_at": (
+            user.onboarding_completed_at.isoformat()
+            if getattr(user, "onboarding_completed_at", None)
+            else None
+        ),
+        "learning_goal": getattr(user, "learning_goal", None),
+        "practice_rhythm": getattr(user, "practice_rhythm", None),
+        "preferred_theme": (
+            user.preferred_theme if hasattr(user, "preferred_theme") else None
+        ),
+        "accessibility_settings": (
+            user.accessibility_settings
+            if hasattr(user, "accessibility_settings")
+            else None
+        ),
+        "created_at": (
+            user.created_at.isoformat()
+            if hasattr(user, "created_at") and user.created_at
+            else None
+        ),
+        "total_points": total_pts,
+        "current_level": syn_level,
+        "experience_points": syn_xp,
+        "jedi_rank": rank_bucket,
+        "progression_rank": rank_bucket,
+        "gamification_level": UserService.build_gamification_level_for_api(user),
+    }
@@ -0,0 +1,407 @@
+"""
+Rollup incrémental des stats badges par utilisateur (table ``user_stats_rollup``).
+
+Écriture : ``record_exercise_attempt_stats`` / ``record_logic_attempt_stats`` sont
+appelés dans la transaction qui crée la tentative (ligne verrouillée FOR UPDATE).
+Une ligne absente est initialisée depuis les tables brutes — la tentative
+courante, déjà flushée, y est comptée.
+
+Lecture : ``build_stats_cache`` (badge_stats_cache) convertit la ligne en
+stats_cache ; ``check_user_stats_rollup`` compare la ligne aux tables brutes
+(voir scripts/user_stats_rollup.py pour le backfill et la vérification).
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.logging_config import get_logger
+from app.models.user_stats_rollup import ACTIVITY_BITMAP_DAYS, UserStatsRollup
+
+logger = get_logger(__name__)
+
+_BITMAP_MASK = (1 << ACTIVITY_BITMAP_DAYS) - 1
+_FLOAT_TOLERANCE = 1e-6
+
+
+def _utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def normalize_exercise_type(exercise_type: Any) -> str:
+    """Clé de type homogène avec ``LOWER(exercise_type::text)`` côté SQL."""
+    return str(getattr(exercise_type, "value", exercise_type) or "").lower()
+
+
+# ---------------------------------------------------------------------------
+# Bitmap d'activité (bit i = last_activity_day - i jours)
+# ---------------------------------------------------------------------------
+
+
+def mark_activity_day(
+    bitmap: int, last_day: Optional[date], day: date
+) -> Tuple[int, date]:
+    """Marque ``day`` comme actif ; retourne (bitmap, last_activity_day)."""
+    if last_day is None:
+        return 1, day
+    shift = (day - last_day).days
+    if shift >= 0:
+        return ((bitmap << shift) | 1) & _BITMAP_MASK, day
+    if -shift < ACTIVITY_BITMAP_DAYS:
+        return bitmap | (1 << -shift), last_day
+    return bitmap, last_day
+
+
+def activity_dates_from_bitmap(bitmap: int, last_day: Optional[date]) -> List[date]:
+    """Jours actifs, du plus récent au plus ancien (format ``activity_dates``)."""
+    if last_day is None:
+        return []
+    return [
+        last_day - timedelta(days=i)
+        for i in range(ACTIVITY_BITMAP_DAYS)
+        if bitmap >> i & 1
+    ]
+
+
+def _bitmap_from_days(days: Iterable[date]) -> Tuple[int, Optional[date]]:
+    ordered = sorted(set(days), reverse=True)
+    if not ordered:
+        return 0, None
+    last_day = ordered[0]
+    bitmap = 0
+    for day in ordered:
+        offset = (last_day - day).days
+        if offset < ACTIVITY_BITMAP_DAYS:
+            bitmap |= 1 << offset
+    return bitmap, last_day
+
+
+# ---------------------------------------------------------------------------
+# Recalcul depuis les tables brutes (initialisation, backfill, vérification)
+# ---------------------------------------------------------------------------
+
+
+def compute_user_stats_from_raw(
+    db: Session, user_id: int, today: Optional[date] = None
+) -> Dict[str, Any]:
+    """Valeurs des colonnes du rollup recalculées depuis attempts / logic_challenge_attempts."""
+    today = today or _utc_today()
+    params = {"uid": user_id}
+
+    totals = db.execute(
+        text("""
+            SELECT COUNT(*), COUNT(CASE WHEN is_correct THEN 1 END),
+                   MIN(CASE WHEN is_correct THEN time_spent END)
+            FROM attempts WHERE user_id = :uid
+        """),
+        params,
+    ).fetchone()
+    logic_correct = db.execute(
+        text(
+            "SELECT COUNT(*) FROM logic_challenge_attempts "
+            "WHERE user_id = :uid AND is_correct = true"
+        ),
+        params,
+    ).scalar()
+    per_type_rows = db.execute(
+        text("""
+            SELECT LOWER(e.exercise_type::text), COUNT(*),
+                   COUNT(CASE WHEN a.is_correct THEN 1 END)
+            FROM attempts a JOIN exercises e ON a.exercise_id = e.id
+            WHERE a.user_id = :uid
+            GROUP BY LOWER(e.exercise_type::text)
+        """),
+        params,
+    ).fetchall()
+    # Série courante par type : réussites postérieures (ordre d'insertion) au dernier échec.
+    streak_rows = db.execute(
+        text("""
+            SELECT ex_type, COUNT(*) FROM (
+                SELECT LOWER(e.exercise_type::text) AS ex_type, a.id, a.is_correct,
+                       MAX(CASE WHEN NOT a.is_correct THEN a.id END)
+                           OVER (PARTITION BY LOWER(e.exercise_type::text)) AS last_wrong
+                FROM attempts a JOIN exercises e ON a.exercise_id = e.id
+                WHERE a.user_id = :uid
+            ) s
+            WHERE is_correct AND (last_wrong IS NULL OR id > last_wrong)
+            GROUP BY ex_type
+        """),
+        params,
+    ).fetchall()
+    day_rows = db.execute(
+        text("""
+            SELECT DISTINCT (created_at AT TIME ZONE 'UTC')::date AS day FROM attempts
+            WHERE user_id = :uid ORDER BY day DESC LIMIT :limit
+        """),
+        {"uid": user_id, "limit": ACTIVITY_BITMAP_DAYS},
+    ).fetchall()
+    today_row = db.execute(
+        text("""
+            SELECT COUNT(*), COUNT(CASE WHEN is_correct THEN 1 END) FROM attempts
+            WHERE user_id = :uid AND (created_at AT TIME ZONE 'UTC')::date = :today
+        """),
+        {"uid": user_id, "today": today},
+    ).fetchone()
+
+    bitmap, last_day = _bitmap_from_days(r[0] for r in day_rows)
+    return {
+        "attempts_total": int(totals[0] or 0),
+        "attempts_correct": int(totals[1] or 0),
+        "logic_correct_count": int(logic_correct or 0),
+        "per_type_attempts": {str(r[0]).lower(): int(r[1]) for r in per_type_rows},
+        "per_type_correct": {
+            str(r[0]).lower(): int(r[2]) for r in per_type_rows if r[2]
+        },
+        "consecutive_by_type": {str(r[0]).lower(): int(r[1]) for r in streak_rows},
+        "min_fast_time": float(totals[2]) if totals[2] is not None else None,
+        "last_activity_day": last_day,
+        "activity_bitmap": bitmap,
+        "today_day": today,
+        "today_total": int(today_row[0] or 0),
+        "today_correct": int(today_row[1] or 0),
+    }
+
+
+def rebuild_user_stats_rollup(
+    db: Session, user_id: int, today: Optional[date] = None
+) -> UserStatsRollup:
+    """Écrase (ou crée) la ligne rollup depuis les tables brutes (sans commit)."""
+    values = compute_user_stats_from_raw(db, user_id, today)
+    rollup = db.get(UserStatsRollup, user_id)
+    if rollup is None:
+        rollup = UserStatsRollup(user_id=user_id, **values)
+        db.add(rollup)
+    else:
+        for key, value in values.items():
+            setattr(rollup, key, value)
+    db.flush()
+    return rollup
+
+
+def _lock_or_create(db: Session, user_id: int) -> Optional[UserStatsRollup]:
+    """
+    Ligne rollup verrouillée (FOR UPDATE), ou None si elle vient d'être créée
+    depuis les tables brutes (la tentative courante y est alors déjà comptée).
+    """
+    rollup = (
+        db.query(UserStatsRollup)
+        .filter(UserStatsRollup.user_id == user_id)
+        .with_for_update()
+        .populate_existing()
+        .first()
+    )
+    if rollup is not None:
+        return rollup
+
+    values = compute_user_stats_from_raw(db, user_id)
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        created = db.execute(
+            pg_insert(UserStatsRollup)
+            .values(user_id=user_id, **values)
+            .on_conflict_do_nothing(index_elements=["user_id"])
+        ).rowcount
+        if created:
+            return None
+        # Création concurrente : l'autre transaction n'a pas vu notre tentative.
+        return (
+            db.query(UserStatsRollup)
+            .filter(UserStatsRollup.user_id == user_id)
+            .with_for_update()
+            .populate_existing()
+            .one()
+        )
+
+    db.add(UserStatsRollup(user_id=user_id, **values))
+    db.flush()
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Mise à jour incrémentale (même transaction que la tentative)
+# ---------------------------------------------------------------------------
+
+
+def record_exercise_attempt_stats(
+    db: Session,
+    user_id: int,
+    exercise_type: Any,
+    is_correct: bool,
+    time_spent: Optional[float],
+    *,
+    day: Optional[date] = None,
+) -> None:
+    """Applique une tentative d'exercice au rollup (à appeler après le flush de l'Attempt)."""
+    rollup = _lock_or_create(db, user_id)
+    if rollup is None:
+        return
+
+    ex_type = normalize_exercise_type(exercise_type)
+    day = day or _utc_today()
+
+    rollup.attempts_total = (rollup.attempts_total or 0) + 1
+    per_type_attempts = dict(rollup.per_type_attempts or {})
+    per_type_attempts[ex_type] = per_type_attempts.get(ex_type, 0) + 1
+    rollup.per_type_attempts = per_type_attempts
+
+    consecutive = dict(rollup.consecutive_by_type or {})
+    if is_correct:
+        rollup.attempts_correct = (rollup.attempts_correct or 0) + 1
+        per_type_correct = dict(rollup.per_type_correct or {})
+        per_type_correct[ex_type] = per_type_correct.get(ex_type, 0) + 1
+        rollup.per_type_correct = per_type_correct
+        consecutive[ex_type] = consecutive.get(ex_type, 0) + 1
+        if time_spent is not None and (
+            rollup.min_fast_time is None or float(time_spent) < rollup.min_fast_time
+        ):
+            rollup.min_fast_time = float(time_spent)
+    else:
+        consecutive[ex_type] = 0
+    rollup.consecutive_by_type = consecutive
+
+    rollup.activity_bitmap, rollup.last_activity_day = mark_activity_day(
+        rollup.activity_bitmap or 0, rollup.last_activity_day, day
+    )
+    if rollup.today_day != day:
+        rollup.today_day, rollup.today_total, rollup.today_correct = day, 0, 0
+    rollup.today_total += 1
+    if is_correct:
+        rollup.today_correct += 1
+    db.flush()
+
+
+def record_logic_attempt_stats(db: Session, user_id: int, is_correct: bool) -> None:
+    """Applique une tentative de défi logique au rollup (après flush de la tentative)."""
+    if not is_correct:
+        return
+    rollup = _lock_or_create(db, user_id)
+    if rollup is None:
+        return
+    rollup.logic_correct_count = (rollup.logic_correct_count or 0) + 1
+    db.flush()
+
+
+# ---------------------------------------------------------------------------
+# Lecture et vérification
+# ---------------------------------------------------------------------------
+
+
+def fetch_active_exercise_types(db: Session) -> List[str]:
+    """Types d'exercices actifs du catalogue (minuscules)."""
+    rows = db.execute(
+        text(
+            "SELECT DISTINCT LOWER(exercise_type::text) FROM exercises "
+            "WHERE is_active = true AND is_archived = false"
+        )
+    ).fetchall()
+    return [str(r[0]).lower() for r in rows]
+
+
+def _today_totals(values: Dict[str, Any], today: date) -> Tuple[int, int]:
+    if values.get("today_day") != today:
+        return 0, 0
+    return int(values.get("today_total") or 0), int(values.get("today_correct") or 0)
+
+
+def _rollup_values(rollup: UserStatsRollup) -> Dict[str, Any]:
+    return {column.name: getattr(rollup, column.name) for column in rollup.__table__.c}
+
+
+def stats_cache_from_values(
+    values: Dict[str, Any], exercise_types: List[str], today: Optional[date] = None
+) -> Dict[str, Any]:
+    """Construit le stats_cache attendu par badge_requirement_engine."""
+    today = today or _utc_today()
+    consecutive = values.get("consecutive_by_type") or {}
+    return {
+        "attempts_count": values.get("attempts_total") or 0,
+        "attempts_total": values.get("attempts_total") or 0,
+        "attempts_correct": values.get("attempts_correct") or 0,
+        "logic_correct_count": values.get("logic_correct_count") or 0,
+        "exercise_types": list(exercise_types),
+        "per_type_correct": dict(values.get("per_type_correct") or {}),
+        "user_exercise_types": set(values.get("per_type_attempts") or {}),
+        "activity_dates": activity_dates_from_bitmap(
+            values.get("activity_bitmap") or 0, values.get("last_activity_day")
+        ),
+        "min_fast_time": values.get("min_fast_time"),
+        "perfect_day_today": _today_totals(values, today),
+        "consecutive_by_type": {t: int(consecutive.get(t, 0)) for t in exercise_types},
+    }
+
+
+def load_user_stats_values(db: Session, user_id: int) -> Dict[str, Any]:
+    """Valeurs du rollup, ou recalcul brut (non persisté) si la ligne est absente."""
+    rollup = db.get(UserStatsRollup, user_id)
+    if rollup is None:
+        return compute_user_stats_from_raw(db, user_id)
+    return _rollup_values(rollup)
+
+
+def check_user_stats_rollup(
+    db: Session, user_id: int, today: Optional[date] = None
+) -> Dict[str, Tuple[Any, Any]]:
+    """
+    Compare la ligne rollup aux tables brutes.
+
+    Returns:
+        {champ: (valeur_rollup, valeur_brute)} pour chaque écart ; vide si cohérent.
+        Une ligne absente n'est pas un écart (recalcul brut à la lecture).
+    """
+    today = today or _utc_today()
+    rollup = db.get(UserStatsRollup, user_id)
+    if rollup is None:
+        return {}
+    stored = _rollup_values(rollup)
+    raw = compute_user_stats_from_raw(db, user_id, today)
+
+    def _non_zero(mapping: Optional[Dict[str, int]]) -> Dict[str, int]:
+        return {k: int(v) for k, v in (mapping or {}).items() if v}
+
+    comparisons = {
+        "attempts_total": (stored["attempts_total"], raw["attempts_total"]),
+        "attempts_correct": (stored["attempts_correct"], raw["attempts_correct"]),
+        "logic_correct_count": (
+            stored["logic_correct_count"],
+            raw["logic_correct_count"],
+        ),
+        "per_type_attempts": (
+            _non_zero(stored["per_type_attempts"]),
+            raw["per_type_attempts"],
+        ),
+        "per_type_correct": (
+            _non_zero(stored["per_type_correct"]),
+            raw["per_type_correct"],
+        ),
+        "consecutive_by_type": (
+            _non_zero(stored["consecutive_by_type"]),
+            raw["consecutive_by_type"],
+        ),
+        "activity_dates": (
+            activity_dates_from_bitmap(
+                stored["activity_bitmap"] or 0, stored["last_activity_day"]
+            ),
+            activity_dates_from_bitmap(
+                raw["activity_bitmap"], raw["last_activity_day"]
+            ),
+        ),
+        "perfect_day_today": (
+            _today_totals(stored, today),
+            _today_totals(raw, today),
+        ),
+    }
+    mismatches = {
+        field: pair for field, pair in comparisons.items() if pair[0] != pair[1]
+    }
+
+    stored_min, raw_min = stored["min_fast_time"], raw["min_fast_time"]
+    if (stored_min is None) != (raw_min is None) or (
+        stored_min is not None and abs(stored_min - raw_min) > _FLOAT_TOLERANCE
+    ):
+        mismatches["min_fast_time"] = (stored_min, raw_min)
+    return mismatches
@@ -6,9 +6,18 @@ Extrait la logique de gÃ©nÃ©ration streaming depuis challenge_handlers.
 import json
 import traceback
 from datetime import datetime
-from typing import TYPE_CHECKING, Any, AsyncGenerator, Dict, Literal, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    Callable,
+    Dict,
+    Literal,
+    Optional,
+)
 
 from openai import APIError, APITimeoutError, AsyncOpenAI, RateLimitError
+from sqlalchemy.orm import Session
 from tenacity import (
     retry,
     retry_if_exception_type,
@@ -20,6 +29,7 @@ from app.core.ai_config import AIConfig
 from app.core.config import settings
 from app.core.db_boundary import sync_db_session
 from app.core.logging_config import get_logger
+from app.core.openai_clients import openai_client
 from app.core.runtime import run_db_bound
 from app.services.challenges import challenge_service
 from app.services.challenges.challenge_ai_model_policy import (
@@ -368,72 +378,86 @@ def _persist_challenge_sync(
     Retourne challenge_dict si succÃ¨s, None sinon.
     """
     with sync_db_session() as db:
-        created_challenge = challenge_service.create_challenge(
-            db=db,
-            title=normalized_challenge["title"],
-            description=normalized_challenge["description"],
-            challenge_type=normalized_challenge["challenge_type"],
+        return create_generated_challenge(
+            db,
+            normalized_challenge,
+            user_id,
+            challenge_type,
+            model=model,
+            f42_personalization=f42_personalization,
+        )
+
+
+def create_generated_challenge(
+    db: Session,
+    normalized_challenge: Dict[str, Any],
+    user_id: Optional[int],
+    challenge_type: str,
+    *,
+    model: str = "unknown",
+    f42_personalization: Optional[Dict[str, Any]] = None,
+) -> Optional[Dict[str, Any]]:
+    """Crée le défi dans la session fournie (commit inclus) et retourne son dict SSE."""
+    created_challenge = challenge_service.create_challenge(
+        db=db,
+        title=normalized_challenge["title"],
+        description=normalized_challenge["description"],
+        challenge_type=normalized_challenge["challenge_type"],
+        age_group=normalized_challenge["age_group"],
+        question=normalized_challenge.get("question"),
+        correct_answer=normalized_challenge["correct_answer"],
+        solution_explanation=normalized_challenge["solution_explanation"],
+        hints=normalized_challenge.get("hints", []),
+        visual_data=normalized_challenge.get("visual_data", {}),
+        difficulty_rating=normalized_challenge.get("difficulty_rating", 3.0),
+        estimated_time_minutes=normalized_challenge.get("estimated_time_minutes", 10),
+        tags=normalized_challenge.get("tags", "ai,generated"),
+        creator_id=user_id,
+        choices=normalized_challenge.get("choices"),
+        generation_parameters=_build_ai_generation_parameters(
+            challenge_type=challenge_type,
             age_group=normalized_challenge["age_group"],
-            question=normalized_challenge.get("question"),
-            correct_answer=normalized_challenge["correct_answer"],
-            solution_explanation=normalized_challenge["solution_explanation"],
-            hints=normalized_challenge.get("hints", []),
-            visual_data=normalized_challenge.get("visual_data", {}),
-            difficulty_rating=normalized_challenge.get("difficulty_rating", 3.0),
-            estimated_time_minutes=normalized_challenge.get(
-                "estimated_time_minutes", 10
+            model=model,
+            difficulty_calibration=normalized_challenge.get("difficulty_calibration"),
+            response_mode=normalized_challenge.get("response_mode"),
+            f42_personalization=f42_personalization,
+        ),
+        difficulty_tier=normalized_challenge.get("difficulty_tier"),
+    )
+    if (
+        created_challenge
+        and hasattr(created_challenge, "title")
+        and created_challenge.title
+    ):
+        return {
+            "id": created_challenge.id,
+            "title": created_challenge.title,
+            "description": created_challenge.description,
+            "challenge_type": (
+                str(created_challenge.challenge_type)
+                if hasattr(created_challenge.challenge_type, "value")
+                else created_challenge.challenge_type
             ),
-            tags=normalized_challenge.get("tags", "ai,generated"),
-            creator_id=user_id,
-            choices=normalized_challenge.get("choices"),
-            generation_parameters=_build_ai_generation_parameters(
-                challenge_type=challenge_type,
-                age_group=normalized_challenge["age_group"],
-                model=model,
-                difficulty_calibration=normalized_challenge.get(
-                    "difficulty_calibration"
-                ),
-                response_mode=normalized_challenge.get("response_mode"),
-                f42_personalization=f42_personalization,
+            "age_group": normalize_age_group_for_frontend(created_challenge.age_group),
+            "question": created_challenge.question,
+            "correct_answer": created_challenge.correct_answer,
+            "solution_explanation": created_challenge.solution_explanation,
+            "hints": created_challenge.hints or [],
+            "visual_data": created_challenge.visual_data or {},
+            "difficulty_rating": created_challenge.difficulty_rating,
+            "difficulty_tier": created_challenge.difficulty_tier,
+            "estimated_time_minutes": created_challenge.estimated_time_minutes,
+            "tags": created_challenge.tags,
+            "is_active": created_challenge.is_active,
+            "created_at": (
+                created_challenge.created_at.isoformat()
+                if created_challenge.created_at
+                else None
             ),
-            difficulty_tier=normalized_challenge.get("difficulty_tier"),
-        )
-        if (
-            created_challenge
-            and hasattr(created_challenge, "title")
-            and created_challenge.title
-        ):
-            return {
-                "id": created_challenge.id,
-                "title": created_challenge.title,
-                "description": created_challenge.description,
-                "challenge_type": (
-                    str(created_challenge.challenge_type)
-                    if hasattr(created_challenge.challenge_type, "value")
-                    else created_challenge.challenge_type
-                ),
-                "age_group": normalize_age_group_for_frontend(
-                    created_challenge.age_group
-                ),
-                "question": created_challenge.question,
-                "correct_answer": created_challenge.correct_answer,
-                "solution_explanation": created_challenge.solution_explanation,
-                "hints": created_challenge.hints or [],
-                "visual_data": created_challenge.visual_data or {},
-                "difficulty_rating": created_challenge.difficulty_rating,
-                "difficulty_tier": created_challenge.difficulty_tier,
-                "estimated_time_minutes": created_challenge.estimated_time_minutes,
-                "tags": created_challenge.tags,
-                "is_active": created_challenge.is_active,
-                "created_at": (
-                    created_challenge.created_at.isoformat()
-                    if created_challenge.created_at
-                    else None
-                ),
-                "choices": created_challenge.choices or [],
-                "response_mode": normalized_challenge.get("response_mode"),
-            }
-        return None
+            "choices": created_challenge.choices or [],
+            "response_mode": normalized_challenge.get("response_mode"),
+        }
+    return None
 
 
 async def generate_challenge_stream(
@@ -444,9 +468,13 @@ async def generate_challenge_stream(
     locale: str = "fr",
     *,
     personalization: Optional["ChallengeStreamPersonalizationMeta"] = None,
+    persist: Optional[Callable[..., Optional[Dict[str, Any]]]] = None,
 ) -> AsyncGenerator[str, None]:
     """
     GÃ©nÃ©rateur async qui produit des Ã©vÃ©nements SSE (f"data: {json.dumps(...)}\n\n").
+
+    ``persist`` remplace ``_persist_challenge_sync`` (même signature) : le refill de
+    l'inventaire (challenge_inventory) y stocke le défi validé au lieu de le publier.
     """
     start_time = datetime.now()
     validation_passed = True
@@ -480,7 +508,7 @@ async def generate_challenge_stream(
             )
 
         try:
-            from openai import AsyncOpenAI
+            import openai  # noqa: F401
         except ImportError:
             yield sse_error_message("Bibliothèque OpenAI non installée")
             yield f"data: {json.dumps({'type': 'done'})}\n\n"
@@ -492,8 +520,9 @@ async def generate_challenge_stream(
             return
 
         ai_params = AIConfig.get_openai_params(challenge_type)
-        client = AsyncOpenAI(
+        client = openai_client(
             api_key=settings.OPENAI_API_KEY,
+            profile="challenges",
             timeout=ai_params["timeout"],
         )
 
@@ -732,8 +761,9 @@ async def generate_challenge_stream(
             )
             fallback_model = resolve_challenge_ai_fallback_model(challenge_type)
             try:
-                fallback_client = AsyncOpenAI(
+                fallback_client = openai_client(
                     api_key=settings.OPENAI_API_KEY,
+                    profile="challenges_fallback",
                     timeout=ai_params.get("timeout", 120),
                 )
                 fallback_resp = await fallback_client.chat.completions.create(
@@ -1074,7 +1104,7 @@ async def generate_challenge_stream(
                 else None
             )
             challenge_dict = await run_db_bound(
-                _persist_challenge_sync,
+                persist or _persist_challenge_sync,
                 normalized_challenge,
                 user_id,
                 challenge_type,
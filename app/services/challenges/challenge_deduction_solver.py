@@ -1,4 +1,4 @@
-"""Conservative uniqueness checks for small DEDUCTION logic grids.
+"""Conservative uniqueness checks for DEDUCTION logic grids.
 
 The solver intentionally supports only machine-checkable constraints. If a clue
 cannot be parsed safely, callers should fail open and keep the existing
@@ -15,14 +15,24 @@ kinds: they are not negated same-row (``entity_not_value``) nor the bilateral
 
 from __future__ import annotations
 
-import itertools
-import math
+import operator
 import re
 import unicodedata
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
-MAX_DEDUCTION_SOLVER_COMBINATIONS = 50_000
+# Branching decisions after which the solver gives up (callers fail open).
+MAX_DEDUCTION_SOLVER_NODES = 20_000
 UNIQUE_SOLUTION_TARGET = 1
 
 CONSTRAINT_ENTITY_VALUE = "entity_value"
@@ -566,15 +576,229 @@ def _expected_answer_signature(
     )
 
 
-def _total_search_space(model: _DeductionModel) -> int:
-    per_category = math.factorial(len(model.first_values))
-    return per_category ** len(model.secondary_categories)
+# CSP coordinates: every label maps to the rank of its row in the pivot category
+# (the day category when the grid has one, else the primary category). The pivot
+# is a bijection with the rows, so "same row" is "same coordinate" and every
+# supported constraint kind becomes a binary relation between two labels.
+_Var = Tuple[str, str]
+_Predicate = Callable[[int, int], bool]
+
+
+def _immediately_before(left: int, right: int) -> bool:
+    return right - left == 1
+
+
+def _not_adjacent(left: int, right: int) -> bool:
+    return abs(left - right) != 1
+
+
+def _not_immediately_before(left: int, right: int) -> bool:
+    return right - left != 1
+
+
+def _not_immediately_after(left: int, right: int) -> bool:
+    return left - right != 1
+
+
+_COORDINATE_PREDICATES: Dict[str, _Predicate] = {
+    CONSTRAINT_ENTITY_VALUE: operator.eq,
+    CONSTRAINT_ENTITY_NOT_VALUE: operator.ne,
+    CONSTRAINT_SAME_ROW: operator.eq,
+    CONSTRAINT_ENTITY_BEFORE_ENTITY: operator.lt,
+    CONSTRAINT_ENTITY_AFTER_ENTITY: operator.gt,
+    CONSTRAINT_ENTITY_IMMEDIATELY_BEFORE_ENTITY: _immediately_before,
+    CONSTRAINT_VALUE_BEFORE_VALUE: operator.lt,
+    CONSTRAINT_ENTITY_NOT_ADJACENT_VALUE: _not_adjacent,
+    CONSTRAINT_ENTITY_NOT_IMMEDIATELY_BEFORE_VALUE: _not_immediately_before,
+    CONSTRAINT_ENTITY_NOT_IMMEDIATELY_AFTER_VALUE: _not_immediately_after,
+}
+_DAY_CONSTRAINT_KINDS = frozenset(
+    {
+        CONSTRAINT_ENTITY_BEFORE_ENTITY,
+        CONSTRAINT_ENTITY_AFTER_ENTITY,
+        CONSTRAINT_ENTITY_IMMEDIATELY_BEFORE_ENTITY,
+        CONSTRAINT_VALUE_BEFORE_VALUE,
+        CONSTRAINT_ENTITY_NOT_ADJACENT_VALUE,
+        CONSTRAINT_ENTITY_NOT_IMMEDIATELY_BEFORE_VALUE,
+        CONSTRAINT_ENTITY_NOT_IMMEDIATELY_AFTER_VALUE,
+    }
+)
+_PRIMARY_LEFT_ONLY_KINDS = frozenset(
+    {
+        CONSTRAINT_ENTITY_NOT_ADJACENT_VALUE,
+        CONSTRAINT_ENTITY_NOT_IMMEDIATELY_BEFORE_VALUE,
+        CONSTRAINT_ENTITY_NOT_IMMEDIATELY_AFTER_VALUE,
+    }
+)
+
+
+class _SearchBudgetExceeded(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class _DeductionCsp:
+    size: int
+    domains: Dict[_Var, FrozenSet[int]]
+    # arcs[x] = ((y, pred), ...) where pred(coordinate of x, coordinate of y)
+    arcs: Dict[_Var, Tuple[Tuple[_Var, _Predicate], ...]]
+    groups: Tuple[Tuple[_Var, ...], ...]
+    group_of: Dict[_Var, int]
+
+
+def _flipped(predicate: _Predicate) -> _Predicate:
+    return lambda left, right: predicate(right, left)
+
+
+def _build_csp(
+    model: _DeductionModel, constraints: Sequence[_Constraint]
+) -> Optional[_DeductionCsp]:
+    """Translate the grid into a binary CSP; None when a constraint can never hold."""
+    size = len(model.first_values)
+    pivot = model.day_category or model.first_category
+    pivot_rank = {
+        value: rank for rank, value in enumerate(model.values_by_category[pivot])
+    }
+    domains: Dict[_Var, FrozenSet[int]] = {}
+    groups: List[Tuple[_Var, ...]] = []
+    group_of: Dict[_Var, int] = {}
+    for category in model.category_order:
+        group = tuple((category, value) for value in model.values_by_category[category])
+        for var in group:
+            domains[var] = (
+                frozenset({pivot_rank[var[1]]})
+                if category == pivot
+                else frozenset(range(size))
+            )
+            group_of[var] = len(groups)
+        groups.append(group)
+
+    arcs: Dict[_Var, List[Tuple[_Var, _Predicate]]] = {var: [] for var in domains}
+    for constraint in constraints:
+        left, right = constraint.left, constraint.right
+        if right is None:
+            return None
+        if constraint.kind in _DAY_CONSTRAINT_KINDS and model.day_category is None:
+            return None
+        if (
+            constraint.kind in _PRIMARY_LEFT_ONLY_KINDS
+            and left.category != model.first_category
+        ):
+            return None
+        predicate = _COORDINATE_PREDICATES[constraint.kind]
+        x, y = (left.category, left.value), (right.category, right.value)
+        if x == y:
+            domains[x] = frozenset(a for a in domains[x] if predicate(a, a))
+            continue
+        arcs[x].append((y, predicate))
+        arcs[y].append((x, _flipped(predicate)))
+
+    return _DeductionCsp(
+        size=size,
+        domains=domains,
+        arcs={var: tuple(var_arcs) for var, var_arcs in arcs.items()},
+        groups=tuple(groups),
+        group_of=group_of,
+    )
+
+
+def _propagate(
+    domains: Dict[_Var, FrozenSet[int]], csp: _DeductionCsp, changed: Iterable[_Var]
+) -> bool:
+    """Arc consistency plus all-different pruning (singletons, hidden singles).
+
+    Returns False as soon as a domain becomes empty.
+    """
+    pending = list(changed)
+    while pending:
+        var = pending.pop()
+        domain = domains[var]
+        if not domain:
+            return False
+        for other, predicate in csp.arcs[var]:
+            other_domain = domains[other]
+            kept = frozenset(
+                b for b in other_domain if any(predicate(a, b) for a in domain)
+            )
+            if kept != other_domain:
+                if not kept:
+                    return False
+                domains[other] = kept
+                pending.append(other)
+
+        group = csp.groups[csp.group_of[var]]
+        if len(domain) == 1:
+            for other in group:
+                if other != var and domain <= domains[other]:
+                    reduced = domains[other] - domain
+                    if not reduced:
+                        return False
+                    domains[other] = reduced
+                    pending.append(other)
+        for coordinate in range(csp.size):
+            holders = [other for other in group if coordinate in domains[other]]
+            if not holders:
+                return False
+            if len(holders) == 1 and len(domains[holders[0]]) > 1:
+                domains[holders[0]] = frozenset({coordinate})
+                pending.append(holders[0])
+    return True
+
+
+def _solve_csp(csp: _DeductionCsp, limit: int, max_nodes: int) -> List[Dict[_Var, int]]:
+    """Most-constrained-variable backtracking; stops after ``limit`` solutions."""
+    solutions: List[Dict[_Var, int]] = []
+    nodes = 0
+
+    def backtrack(domains: Dict[_Var, FrozenSet[int]]) -> bool:
+        nonlocal nodes
+        open_vars = [var for var, domain in domains.items() if len(domain) > 1]
+        if not open_vars:
+            solutions.append({var: min(domain) for var, domain in domains.items()})
+            return len(solutions) >= limit
+        var = min(open_vars, key=lambda v: (len(domains[v]), -len(csp.arcs[v])))
+        for coordinate in sorted(domains[var]):
+            nodes += 1
+            if nodes > max_nodes:
+                raise _SearchBudgetExceeded
+            trial = dict(domains)
+            trial[var] = frozenset({coordinate})
+            if _propagate(trial, csp, [var]) and backtrack(trial):
+                return True
+        return False
+
+    initial = dict(csp.domains)
+    if _propagate(initial, csp, list(initial)):
+        backtrack(initial)
+    return solutions
+
+
+def _assignment_from_coordinates(
+    coordinates: Dict[_Var, int], model: _DeductionModel
+) -> Dict[str, Dict[str, str]]:
+    value_at: Dict[Tuple[str, int], str] = {
+        (category, coordinate): value
+        for (category, value), coordinate in coordinates.items()
+    }
+    assignment: Dict[str, Dict[str, str]] = {}
+    for entity in model.first_values:
+        coordinate = coordinates[(model.first_category, entity)]
+        assignment[entity] = {
+            category: value_at[(category, coordinate)]
+            for category in model.secondary_categories
+        }
+    return assignment
 
 
 def analyze_deduction_uniqueness(
     visual_data: Dict[str, Any], correct_answer: str
 ) -> DeductionUniquenessResult:
-    """Return a uniqueness verdict when the grid is small and constraints are parseable."""
+    """Return a uniqueness verdict when constraints are parseable.
+
+    Backtracking with arc consistency over the clue coordinates; the search stops
+    at two solutions and gives up (``search_space_too_large``) past
+    ``MAX_DEDUCTION_SOLVER_NODES`` branching decisions.
+    """
     model = _build_model(visual_data)
     if model is None:
         return DeductionUniquenessResult(False, 0, "unsupported_model")
@@ -583,30 +807,23 @@ def analyze_deduction_uniqueness(
     if constraints is None or not constraints:
         return DeductionUniquenessResult(False, 0, constraint_source)
 
-    search_space = _total_search_space(model)
-    if search_space > MAX_DEDUCTION_SOLVER_COMBINATIONS:
-        return DeductionUniquenessResult(False, 0, "search_space_too_large")
-
-    permutations_by_category = [
-        tuple(itertools.permutations(model.values_by_category[category]))
-        for category in model.secondary_categories
-    ]
-
     solution_signatures: List[str] = []
-    for permutation_combo in itertools.product(*permutations_by_category):
-        assignment: Dict[str, Dict[str, str]] = {
-            entity: {} for entity in model.first_values
-        }
-        for category, permutation in zip(model.secondary_categories, permutation_combo):
-            for entity, value in zip(model.first_values, permutation):
-                assignment[entity][category] = value
-        if all(
-            _constraint_matches(assignment, model, constraint)
-            for constraint in constraints
-        ):
-            solution_signatures.append(_assignment_signature(assignment, model))
-            if len(solution_signatures) > UNIQUE_SOLUTION_TARGET:
-                break
+    csp = _build_csp(model, constraints)
+    if csp is not None:
+        try:
+            solutions = _solve_csp(
+                csp, UNIQUE_SOLUTION_TARGET + 1, MAX_DEDUCTION_SOLVER_NODES
+            )
+        except _SearchBudgetExceeded:
+            return DeductionUniquenessResult(False, 0, "search_space_too_large")
+        for coordinates in solutions:
+            assignment = _assignment_from_coordinates(coordinates, model)
+            # Safety net: re-check each solution against the reference semantics.
+            if all(
+                _constraint_matches(assignment, model, constraint)
+                for constraint in constraints
+            ):
+                solution_signatures.append(_assignment_signature(assignment, model))
 
     expected_signature = _expected_answer_signature(correct_answer, model)
     expected_matches: Optional[bool] = None
@@ -0,0 +1,181 @@
+"""
+Inventaire de défis IA pré-générés : seaux (type × âge × tier F42 × locale).
+
+- ``serve_challenge_stream`` : point d'entrée du handler SSE. Une demande sans
+  prompt libre réserve le plus ancien défi du seau (FOR UPDATE SKIP LOCKED), le crée
+  pour l'utilisateur et retire la ligne dans la même transaction : un aller-retour
+  DB au lieu du pipeline complet. Seau vide ou prompt libre : génération à la
+  demande inchangée (``generate_challenge_stream``).
+- ``challenge_stock`` : inventaire générique (app.services.core.content_inventory)
+  et son thread de refill (CHALLENGE_INVENTORY_ENABLED). Le refill passe par le
+  pipeline complet (OpenAI, auto-correction, validation, réparation échecs) ;
+  chaque génération tire son propre seed de variété (challenge_variety_seeds), le
+  défi validé est stocké au lieu d'être publié. La personnalisation F42 du défi le
+  plus récent d'un seau sert de contexte à son refill.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.monitoring import (
+    record_challenge_inventory_refill,
+    record_challenge_inventory_serve,
+)
+from app.models.challenge_inventory import ChallengeInventoryItem
+from app.schemas.logic_challenge import (
+    ChallengeStreamPersonalizationMeta,
+    GenerateChallengeStreamQuery,
+)
+from app.services.challenges import challenge_ai_service
+from app.services.core.content_inventory import ContentInventory, sse_payloads
+
+
+@dataclass(frozen=True)
+class ChallengeInventoryBucket:
+    """Clé de stock : mêmes prompts système et utilisateur pour tout le seau."""
+
+    challenge_type: str
+    age_group: str
+    difficulty_tier: Optional[int]
+    locale: str = "fr"
+
+
+def inventory_bucket_for(
+    query: GenerateChallengeStreamQuery,
+) -> Optional[ChallengeInventoryBucket]:
+    """Seau d'une demande ; None si prompt libre (génération sur mesure)."""
+    if (query.prompt or "").strip():
+        return None
+    personalization = query.personalization
+    return ChallengeInventoryBucket(
+        challenge_type=query.challenge_type,
+        age_group=query.age_group,
+        difficulty_tier=(
+            personalization.resolved_target_tier if personalization else None
+        ),
+        locale=query.locale or "fr",
+    )
+
+
+def _publish_challenge(
+    db: Session,
+    row: ChallengeInventoryItem,
+    bucket: ChallengeInventoryBucket,
+    user_id: Optional[int],
+) -> Optional[Dict[str, Any]]:
+    """Crée le LogicChallenge de ``user_id`` à partir de la ligne réservée."""
+    return challenge_ai_service.create_generated_challenge(
+        db,
+        row.payload,
+        user_id,
+        bucket.challenge_type,
+        model=row.model,
+        f42_personalization=row.personalization,
+    )
+
+
+def stock_challenge_persist(
+    bucket: ChallengeInventoryBucket,
+) -> Callable[..., Optional[Dict[str, Any]]]:
+    """Persistance de substitution pour ``generate_challenge_stream`` : stock."""
+
+    def _stock(
+        normalized_challenge: Dict[str, Any],
+        user_id: Optional[int],
+        challenge_type: str,
+        model: str = "unknown",
+        f42_personalization: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        inventory_id = challenge_stock.stock(
+            bucket,
+            normalized_challenge,
+            personalization=f42_personalization,
+            model=model,
+        )
+        return {"inventory_id": inventory_id, "title": normalized_challenge["title"]}
+
+    return _stock
+
+
+async def generate_inventory_challenge(
+    bucket: ChallengeInventoryBucket,
+    personalization: Optional[Dict[str, Any]] = None,
+) -> bool:
+    """Génère un défi pour le seau par le pipeline complet ; True s'il a été stocké."""
+    meta = (
+        ChallengeStreamPersonalizationMeta(**personalization)
+        if personalization
+        else None
+    )
+    stocked = False
+    async for event in challenge_ai_service.generate_challenge_stream(
+        bucket.challenge_type,
+        bucket.age_group,
+        "",
+        None,
+        bucket.locale,
+        personalization=meta,
+        persist=stock_challenge_persist(bucket),
+    ):
+        for payload in sse_payloads(event):
+            if payload.get("type") == "challenge" and "warning" not in payload:
+                stocked = True
+    record_challenge_inventory_refill(
+        bucket.challenge_type, "stocked" if stocked else "failed"
+    )
+    return stocked
+
+
+challenge_stock: ContentInventory[ChallengeInventoryBucket] = ContentInventory(
+    name="challenge",
+    label="défis",
+    model=ChallengeInventoryItem,
+    bucket_cls=ChallengeInventoryBucket,
+    settings_prefix="CHALLENGE_INVENTORY",
+    publish=_publish_challenge,
+    generate=generate_inventory_challenge,
+    record_serve=lambda bucket, result: record_challenge_inventory_serve(
+        bucket.challenge_type, result
+    ),
+    context_column="personalization",
+)
+
+
+async def serve_challenge_stream(
+    query: GenerateChallengeStreamQuery,
+) -> AsyncGenerator[str, None]:
+    """Flux SSE d'une demande de défi : stock du seau si possible, sinon génération."""
+    bucket = (
+        inventory_bucket_for(query) if settings.CHALLENGE_INVENTORY_ENABLED else None
+    )
+    if bucket is not None:
+        challenge = await challenge_stock.serve_from_stock(
+            bucket,
+            query.user_id,
+            (
+                query.personalization.model_dump(exclude_none=True)
+                if query.personalization is not None
+                else None
+            ),
+        )
+        if challenge is not None:
+            event = {"type": "challenge", "challenge": challenge}
+            yield f"data: {json.dumps(event)}\n\n"
+            yield f"data: {json.dumps({'type': 'done'})}\n\n"
+            return
+
+    async for event in challenge_ai_service.generate_challenge_stream(
+        challenge_type=query.challenge_type,
+        age_group=query.age_group,
+        prompt=query.prompt,
+        user_id=query.user_id,
+        locale=query.locale,
+        personalization=query.personalization,
+    ):
+        yield event
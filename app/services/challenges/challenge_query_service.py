@@ -6,6 +6,8 @@ LOT B1 : retours typés (ChallengeListResponse, ChallengeHintResponse).
 import json
 from typing import Any, Dict, List, Optional
 
+from sqlalchemy.orm import Session
+
 from app.core.db_boundary import sync_db_session
 from app.core.logging_config import get_logger
 from app.exceptions import ChallengeNotFoundError
@@ -53,35 +55,66 @@ def list_challenges_for_api(
     Returns:
         ChallengeListResponse typé
     """
-    exclude_ids: List[int] = []
     with sync_db_session() as db:
-        if hide_completed and user_id:
-            exclude_ids = challenge_service.get_user_completed_challenges(db, user_id)
-
-        total = challenge_service.count_challenges(
-            db=db,
-            challenge_type=challenge_type,
-            age_group=age_group_db,
-            search=search,
-            exclude_ids=exclude_ids if exclude_ids else None,
-            active_only=active_only,
-        )
-        challenges = challenge_service.list_challenges(
-            db=db,
+        return query_challenges_list_for_api(
+            db,
             challenge_type=challenge_type,
-            age_group=age_group_db,
+            age_group_db=age_group_db,
             search=search,
+            skip=skip,
             limit=limit,
-            offset=skip,
-            order=order,
-            exclude_ids=exclude_ids if exclude_ids else None,
-            total=total if order == "random" else None,
             active_only=active_only,
+            order=order,
+            hide_completed=hide_completed,
+            user_id=user_id,
         )
-        challenges_list = [
-            ChallengeListItem.model_validate(challenge_service.challenge_to_api_dict(c))
-            for c in challenges
-        ]
+
+
+def query_challenges_list_for_api(
+    db: Session,
+    *,
+    challenge_type: Optional[str] = None,
+    age_group_db: Optional[object] = None,
+    search: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 20,
+    active_only: bool = True,
+    order: str = "random",
+    hide_completed: bool = False,
+    user_id: Optional[int] = None,
+) -> ChallengeListResponse:
+    """
+    Corps de list_challenges_for_api sur une session fournie (lecture seule).
+    Utilisé via run_db_read() depuis le handler.
+    """
+    exclude_ids: List[int] = []
+    if hide_completed and user_id:
+        exclude_ids = challenge_service.get_user_completed_challenges(db, user_id)
+
+    total = challenge_service.count_challenges(
+        db=db,
+        challenge_type=challenge_type,
+        age_group=age_group_db,
+        search=search,
+        exclude_ids=exclude_ids if exclude_ids else None,
+        active_only=active_only,
+    )
+    challenges = challenge_service.list_challenges(
+        db=db,
+        challenge_type=challenge_type,
+        age_group=age_group_db,
+        search=search,
+        limit=limit,
+        offset=skip,
+        order=order,
+        exclude_ids=exclude_ids if exclude_ids else None,
+        total=total if order == "random" else None,
+        active_only=active_only,
+    )
+    challenges_list = [
+        ChallengeListItem.model_validate(challenge_service.challenge_to_api_dict(c))
+        for c in challenges
+    ]
 
     data = format_paginated_response(challenges_list, total, skip, limit)
     return ChallengeListResponse.model_validate(data)
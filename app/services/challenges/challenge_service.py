@@ -8,7 +8,6 @@ Créé : Phase 4 (20 Nov 2025)
 I4 : mapping API extrait vers challenge_api_mapper, age_group vers challenge_age_group.
 """
 
-import random
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
@@ -23,6 +22,7 @@ from app.core.difficulty_tier import (
 from app.core.logging_config import get_logger
 from app.core.types import ChallengeStatsDict
 from app.models.logic_challenge import LogicChallenge, LogicChallengeAttempt
+from app.services.badges.user_stats_rollup import record_logic_attempt_stats
 from app.services.challenges.challenge_age_group import (
     normalize_age_group_for_db,
     normalize_age_group_for_frontend,
@@ -32,6 +32,10 @@ from app.services.challenges.challenge_api_mapper import (
     challenge_to_list_item,
 )
 from app.services.challenges.logic_challenge_service import LogicChallengeService
+from app.services.recommendation.recommendation_refresh import (
+    notify_progress_changed,
+)
+from app.utils.catalog_sampling import catalog_totals_cache, sample_by_key
 from app.utils.db_helpers import adapt_enum_for_db
 
 logger = get_logger(__name__)
@@ -313,15 +317,16 @@ def _execute_list_with_ordering(
 
     Étapes métier :
     1. Ordre "recent" : tri par date décroissante
-    2. Ordre "random" avec total fourni : random_offset O(1) (B4.1)
-    3. Ordre "random" sans total : count() puis même chemin random_offset O(1) (pas de ORDER BY RANDOM)
+    2. Ordre "random" : tirage par keyset sur sample_key (index), sans OFFSET ni
+       ORDER BY RANDOM() ni count() ; ``total`` fourni ne sert qu'à court-circuiter
+       une page au-delà du total.
 
     Args:
         query: Requête SQLAlchemy déjà filtrée
         order: "random" ou "recent"
         limit: Nombre max de résultats
         offset: Décalage pagination
-        total: Total des items (pour optim random_offset)
+        total: Total des items s'il est déjà connu (optionnel)
 
     Returns:
         Liste de LogicChallenge
@@ -337,31 +342,9 @@ def _execute_list_with_ordering(
             .all()
         )
 
-    use_random_offset = total is not None and total > 0
-    if use_random_offset:
-        max_offset_val = max(0, total - limit - offset)
-        random_offset_val = (
-            random.randint(0, max_offset_val) if max_offset_val > 0 else 0
-        )
-        return (
-            query.order_by(LogicChallenge.id)
-            .offset(offset + random_offset_val)
-            .limit(limit)
-            .all()
-        )
-
-    # Fallback : count pour obtenir total et emprunter le chemin O(1) index-friendly
-    computed_total = query.count()
-    if computed_total == 0:
+    if total is not None and offset >= total:
         return []
-    max_offset_val = max(0, computed_total - limit - offset)
-    random_offset_val = random.randint(0, max_offset_val) if max_offset_val > 0 else 0
-    return (
-        query.order_by(LogicChallenge.id)
-        .offset(offset + random_offset_val)
-        .limit(limit)
-        .all()
-    )
+    return sample_by_key(query, LogicChallenge.sample_key, limit)
 
 
 def list_challenges(
@@ -453,7 +436,22 @@ def count_challenges(
         active_only=active_only,
     )
 
-    return query.count()
+    if exclude_ids:
+        return query.count()
+    return catalog_totals_cache.get_or_count(
+        db,
+        (
+            "logic_challenges",
+            challenge_type,
+            age_group,
+            difficulty_min,
+            difficulty_max,
+            tags,
+            search,
+            active_only,
+        ),
+        query.count,
+    )
 
 
 def update_challenge(
@@ -565,6 +563,8 @@ def record_attempt(
     )
 
     db.add(attempt)
+    db.flush()
+    record_logic_attempt_stats(db, user_id, is_correct)
 
     # Mettre à jour le taux de réussite du challenge (sur chaque tentative, pas seulement les correctes)
     challenge = get_challenge(db, challenge_id)
@@ -588,6 +588,7 @@ def record_attempt(
         )
 
     db.commit()
+    notify_progress_changed(user_id)
     db.refresh(attempt)
 
     logger.info(
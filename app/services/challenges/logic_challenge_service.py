@@ -21,6 +21,7 @@ from app.models.logic_challenge import (
     LogicChallengeAttempt,
     LogicChallengeType,
 )
+from app.services.badges.user_stats_rollup import record_logic_attempt_stats
 from app.utils.db_helpers import adapt_enum_for_db, get_enum_value
 
 
@@ -309,6 +310,7 @@ class LogicChallengeService:
             attempt = LogicChallengeAttempt(**attempt_data)
             db.add(attempt)
             db.flush()
+            record_logic_attempt_stats(db, attempt.user_id, bool(attempt.is_correct))
 
             # Log de l'action
             is_correct = attempt_data.get("is_correct", False)
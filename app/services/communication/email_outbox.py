@@ -0,0 +1,291 @@
+"""
+Outbox des emails transactionnels : mise en file côté handlers, envoi en arrière-plan.
+
+- ``enqueue_email`` : écrit une ligne ``pending`` (transaction courte) et réveille
+  le thread d'envoi ; aucun appel SMTP dans la requête HTTP.
+- ``send_pending_emails`` : réserve un lot (FOR UPDATE SKIP LOCKED + bail), l'envoie
+  sur un transport unique (connexion SMTP réutilisée), puis marque ``sent`` ou
+  replanifie avec backoff exponentiel jusqu'à EMAIL_OUTBOX_MAX_ATTEMPTS.
+- ``EmailOutboxSender`` : thread démarré au startup si EMAIL_OUTBOX_ENABLED. Un
+  thread par worker uvicorn : SKIP LOCKED répartit les lots entre process, et le
+  bail rend un lot réservé par un process arrêté à nouveau éligible.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.core.monitoring import record_email_outbox_batch
+from app.db.base import SessionLocal
+from app.models.email_outbox import (
+    EMAIL_FAILED,
+    EMAIL_PENDING,
+    EMAIL_SENT,
+    EmailOutbox,
+)
+from app.services.communication.email_service import (
+    EmailService,
+    EmailTransport,
+    _mask_email,
+)
+
+logger = get_logger(__name__)
+
+# Durée pendant laquelle un lot réservé reste invisible aux autres process.
+CLAIM_LEASE = timedelta(minutes=5)
+
+# (id, to_email, subject, html_content, text_content, attempts)
+_ClaimedEmail = Tuple[int, str, str, str, Optional[str], int]
+
+
+def retry_delay_seconds(attempts: int) -> int:
+    """Backoff après ``attempts`` essais : base * 2^(essais-1), plafonné."""
+    delay = settings.EMAIL_OUTBOX_BACKOFF_SECONDS * 2 ** max(attempts - 1, 0)
+    return min(delay, settings.EMAIL_OUTBOX_MAX_BACKOFF_SECONDS)
+
+
+def enqueue_email(
+    *,
+    kind: str,
+    to_email: str,
+    subject: str,
+    html_content: str,
+    text_content: Optional[str] = None,
+    user_id: Optional[int] = None,
+) -> bool:
+    """Met un email en file ; False seulement si l'écriture en base échoue."""
+    db = SessionLocal()
+    try:
+        db.add(
+            EmailOutbox(
+                user_id=user_id,
+                kind=kind,
+                to_email=to_email,
+                subject=subject,
+                html_content=html_content,
+                text_content=text_content,
+                status=EMAIL_PENDING,
+                attempts=0,
+                next_attempt_at=datetime.now(timezone.utc),
+            )
+        )
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        logger.exception("Mise en file email {} impossible", kind)
+        return False
+    finally:
+        db.close()
+    logger.info("[Email] {} mis en file pour {}", kind, _mask_email(to_email))
+    wake_email_sender()
+    return True
+
+
+def claim_email_batch(
+    db: Session, batch_size: int, now: datetime
+) -> List[_ClaimedEmail]:
+    """Réserve jusqu'à ``batch_size`` messages échus (essai compté, bail posé) et commit."""
+    rows = (
+        db.query(EmailOutbox)
+        .filter(
+            EmailOutbox.status == EMAIL_PENDING,
+            EmailOutbox.next_attempt_at <= now,
+        )
+        .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    claimed = []
+    for row in rows:
+        row.attempts = (row.attempts or 0) + 1
+        row.next_attempt_at = now + CLAIM_LEASE
+        claimed.append(
+            (
+                row.id,
+                row.to_email,
+                row.subject,
+                row.html_content,
+                row.text_content,
+                row.attempts,
+            )
+        )
+    db.commit()
+    return claimed
+
+
+def _record_outcome(
+    db: Session, email_id: int, attempts: int, sent: bool, now: datetime
+) -> str:
+    row = db.get(EmailOutbox, email_id)
+    if row is None:
+        return "skipped"
+    if sent:
+        row.status = EMAIL_SENT
+        row.sent_at = now
+        row.last_error = None
+        # Le contenu porte des liens à token : inutile de le conserver après envoi.
+        row.html_content = None
+        row.text_content = None
+        return "sent"
+    row.last_error = f"Échec d'envoi (essai {attempts})"
+    if attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        row.status = EMAIL_FAILED
+        return "failed"
+    row.next_attempt_at = now + timedelta(seconds=retry_delay_seconds(attempts))
+    return "retry"
+
+
+def send_pending_emails(
+    transport: Optional[EmailTransport] = None,
+    *,
+    batch_size: Optional[int] = None,
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> Dict[str, int]:
+    """
+    Envoie un lot de messages échus et retourne les compteurs
+    ``{"sent", "retry", "failed"}`` ({} si rien à envoyer).
+
+    ``transport`` permet de réutiliser une connexion sur plusieurs lots ; sinon un
+    transport est ouvert puis fermé pour ce lot.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    db = session_factory()
+    try:
+        claimed = claim_email_batch(db, batch_size, datetime.now(timezone.utc))
+        if not claimed:
+            return {}
+
+        started = time.perf_counter()
+        outcomes = []
+        own_transport = transport is None
+        if own_transport:
+            transport = EmailService.open_transport()
+        try:
+            for email_id, to_email, subject, html, text, attempts in claimed:
+                try:
+                    sent = transport.send(to_email, subject, html or "", text)
+                except Exception:
+                    logger.exception("Envoi email_outbox #{} en échec", email_id)
+                    sent = False
+                outcomes.append((email_id, attempts, sent))
+        finally:
+            if own_transport:
+                transport.close()
+        elapsed = time.perf_counter() - started
+
+        now = datetime.now(timezone.utc)
+        results = {"sent": 0, "retry": 0, "failed": 0}
+        for email_id, attempts, sent in outcomes:
+            outcome = _record_outcome(db, email_id, attempts, sent, now)
+            results[outcome] = results.get(outcome, 0) + 1
+        db.commit()
+        record_email_outbox_batch(results, elapsed)
+        if results["failed"]:
+            logger.warning(
+                "{} email(s) abandonné(s) après {} essais",
+                results["failed"],
+                settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+            )
+        return results
+    except SQLAlchemyError:
+        db.rollback()
+        logger.exception("Lot email_outbox interrompu (erreur DB)")
+        return {}
+    finally:
+        db.close()
+
+
+class EmailOutboxSender:
+    """Thread d'envoi : draine la file au réveil (enqueue) ou toutes les ``poll_seconds``."""
+
+    def __init__(
+        self,
+        poll_seconds: float,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        self.poll_seconds = poll_seconds
+        self._session_factory = session_factory
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="mathakine-email-outbox", daemon=True
+        )
+        self._thread.start()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def drain(self) -> Dict[str, int]:
+        """Envoie les lots échus sur un même transport tant qu'ils sont pleins."""
+        batch_size = settings.EMAIL_OUTBOX_BATCH_SIZE
+        totals: Dict[str, int] = {}
+        with EmailService.open_transport() as transport:
+            while not self._stop.is_set():
+                results = send_pending_emails(
+                    transport,
+                    batch_size=batch_size,
+                    session_factory=self._session_factory,
+                )
+                for key, count in results.items():
+                    totals[key] = totals.get(key, 0) + count
+                if sum(results.values()) < batch_size:
+                    break
+        return totals
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.drain()
+            except Exception:
+                logger.exception("Thread email_outbox : drain en échec")
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+
+
+_sender: Optional[EmailOutboxSender] = None
+_sender_lock = threading.Lock()
+
+
+def start_email_sender() -> EmailOutboxSender:
+    """Démarre le thread d'envoi du process (startup, EMAIL_OUTBOX_ENABLED)."""
+    global _sender
+    with _sender_lock:
+        if _sender is None:
+            _sender = EmailOutboxSender(settings.EMAIL_OUTBOX_POLL_SECONDS)
+            _sender.start()
+        return _sender
+
+
+def wake_email_sender() -> None:
+    """Réveille le thread d'envoi (no-op s'il ne tourne pas dans ce process)."""
+    sender = _sender
+    if sender is not None:
+        sender.wake()
+
+
+def stop_email_sender() -> None:
+    """Arrête le thread d'envoi (shutdown de l'application)."""
+    global _sender
+    with _sender_lock:
+        sender, _sender = _sender, None
+    if sender is not None:
+        sender.stop()
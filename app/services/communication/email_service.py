@@ -5,9 +5,10 @@ Support SMTP et SendGrid (optionnel)
 
 import os
 import smtplib
+from abc import ABC, abstractmethod
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from typing import Optional
+from typing import Optional, Tuple
 
 from app.core.logging_config import get_logger
 
@@ -21,6 +22,9 @@ from app.utils.email_templates import (
     verification_email_text,
 )
 
+# Délai réseau d'une opération SMTP (connexion, commande) avant abandon.
+SMTP_TIMEOUT_SECONDS = 30
+
 
 def _mask_email(email: str) -> str:
     """Masque un email pour les logs : user@domain.com → u***@domain.com"""
@@ -107,15 +111,17 @@ class EmailService:
         subject: str,
         html_content: str,
         text_content: Optional[str] = None,
+        client=None,
     ) -> bool:
-        """Envoie un email via SendGrid API"""
+        """Envoie un email via SendGrid API (``client`` réutilisé s'il est fourni)"""
         try:
-            sendgrid_api_key = os.getenv("SENDGRID_API_KEY")
-            if not sendgrid_api_key:
-                logger.error("SENDGRID_API_KEY non configurée")
-                return False
-
-            sg = sendgrid.SendGridAPIClient(api_key=sendgrid_api_key)
+            sg = client
+            if sg is None:
+                sendgrid_api_key = os.getenv("SENDGRID_API_KEY")
+                if not sendgrid_api_key:
+                    logger.error("SENDGRID_API_KEY non configurée")
+                    return False
+                sg = sendgrid.SendGridAPIClient(api_key=sendgrid_api_key)
             from_email = Email(
                 os.getenv("SENDGRID_FROM_EMAIL", "noreply@mathakine.com")
             )
@@ -165,96 +171,73 @@ class EmailService:
         html_content: str,
         text_content: Optional[str] = None,
     ) -> bool:
-        """Envoie un email via SMTP"""
-        try:
-            # Configuration SMTP depuis les variables d'environnement
-            smtp_host = os.getenv("SMTP_HOST", "smtp.gmail.com")
-            smtp_port = int(os.getenv("SMTP_PORT", "587"))
-            smtp_user = os.getenv("SMTP_USER", "")
-            smtp_password = os.getenv("SMTP_PASSWORD", "")
-            smtp_from_email = os.getenv(
-                "SMTP_FROM_EMAIL", smtp_user or "noreply@mathakine.com"
-            )
-            smtp_use_tls = os.getenv("SMTP_USE_TLS", "true").lower() == "true"
-
-            # Si SMTP non configuré, logger et retourner False
-            if not smtp_user or not smtp_password:
-                logger.warning("SMTP non configuré - Email non envoyé")
-                logger.warning(
-                    "SMTP_USER=%s, SMTP_PASSWORD=%s",
-                    "configuré" if smtp_user else "MANQUANT",
-                    "configuré" if smtp_password else "MANQUANT",
-                )
-                logger.info(
-                    "Email qui aurait été envoyé à %s: %s",
-                    _mask_email(to_email),
-                    subject,
-                )
-                # En développement, on peut simuler l'envoi
-                if os.getenv("ENVIRONMENT", "").lower() != "production":
-                    logger.info("Mode développement: Email simulé")
-                    return True
-                return False
+        """Envoie un email via SMTP (connexion ouverte pour ce seul message)"""
+        with SmtpSession() as session:
+            return session.send(to_email, subject, html_content, text_content)
 
-            logger.info(
-                "Tentative d'envoi email SMTP à %s via %s:%s",
-                _mask_email(to_email),
-                smtp_host,
-                smtp_port,
-            )
+    @staticmethod
+    def open_transport() -> "EmailTransport":
+        """
+        Ouvre un transport pour un lot d'envois (thread email_outbox) : une seule
+        connexion SMTP, ou un seul client SendGrid, pour tous les messages du lot.
+        """
+        if os.getenv("TESTING", "false").lower() == "true":
+            return SimulatedTransport()
+        sendgrid_api_key = os.getenv("SENDGRID_API_KEY")
+        if sendgrid_api_key and SENDGRID_AVAILABLE:
+            return SendGridTransport(sendgrid_api_key)
+        return SmtpSession()
 
-            # Créer le message
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = subject
-            msg["From"] = smtp_from_email
-            msg["To"] = to_email
+    @staticmethod
+    def build_verification_email(
+        username: str, verification_token: str, frontend_url: Optional[str] = None
+    ) -> Tuple[str, str, str]:
+        """Sujet, HTML et texte de l'email de vérification."""
+        if not frontend_url:
+            frontend_url = settings.FRONTEND_URL
+        verification_link = f"{frontend_url}/verify-email?token={verification_token}"
+        return (
+            "Bienvenue ! Active ton compte Mathakine",
+            verification_email_html(username, verification_link),
+            verification_email_text(username, verification_link),
+        )
 
-            # Ajouter le contenu texte si fourni
-            if text_content:
-                part_text = MIMEText(text_content, "plain")
-                msg.attach(part_text)
-
-            # Ajouter le contenu HTML
-            part_html = MIMEText(html_content, "html")
-            msg.attach(part_html)
-
-            # Envoyer l'email
-            logger.debug("Connexion SMTP à %s:%s", smtp_host, smtp_port)
-            with smtplib.SMTP(smtp_host, smtp_port) as server:
-                logger.debug("Connexion établie, démarrage TLS: %s", smtp_use_tls)
-                if smtp_use_tls:
-                    server.starttls()
-                logger.debug("Authentification avec %s", _mask_user(smtp_user))
-                server.login(smtp_user, smtp_password)
-                logger.debug("Envoi du message à %s", _mask_email(to_email))
-                server.send_message(msg)
+    @staticmethod
+    def build_password_reset_email(
+        username: str, reset_token: str, frontend_url: Optional[str] = None
+    ) -> Tuple[str, str, str]:
+        """Sujet, HTML et texte de l'email de réinitialisation."""
+        if not frontend_url:
+            frontend_url = settings.FRONTEND_URL
+        reset_link = f"{frontend_url}/reset-password?token={reset_token}"
+        return (
+            "Réinitialisation de ton mot de passe — Mathakine",
+            password_reset_email_html(username, reset_link),
+            password_reset_email_text(username, reset_link),
+        )
 
-            logger.info(
-                "✅ Email envoyé via SMTP à %s depuis %s",
-                _mask_email(to_email),
-                _mask_email(smtp_from_email),
-            )
-            return True
+    @staticmethod
+    def _deliver(
+        kind: str,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str],
+        user_id: Optional[int],
+    ) -> bool:
+        """Envoi direct, ou mise en file email_outbox si EMAIL_OUTBOX_ENABLED."""
+        if settings.EMAIL_OUTBOX_ENABLED:
+            from app.services.communication.email_outbox import enqueue_email
 
-        except smtplib.SMTPAuthenticationError as smtp_auth_error:
-            logger.error("❌ Erreur d'authentification SMTP: %s", smtp_auth_error)
-            logger.error(
-                "Vérifiez SMTP_USER (%s) et SMTP_PASSWORD", _mask_user(smtp_user)
-            )
-            return False
-        except smtplib.SMTPException as smtp_error:
-            logger.error("❌ Erreur SMTP: %s", smtp_error)
-            return False
-        except Exception as smtp_general_error:
-            logger.error(
-                "❌ Erreur lors de l'envoi via SMTP: %s: %s",
-                type(smtp_general_error).__name__,
-                smtp_general_error,
+            return enqueue_email(
+                kind=kind,
+                to_email=to_email,
+                subject=subject,
+                html_content=html_content,
+                text_content=text_content,
+                user_id=user_id,
             )
-            import traceback
-
-            logger.debug(traceback.format_exc())
-            return False
+        return EmailService.send_email(to_email, subject, html_content, text_content)
 
     @staticmethod
     def send_verification_email(
@@ -262,18 +245,19 @@ class EmailService:
         username: str,
         verification_token: str,
         frontend_url: Optional[str] = None,
+        user_id: Optional[int] = None,
     ) -> bool:
         """
         Envoie un email de vérification à l'inscription.
         Template thème Jedi, ergonomique et accessible.
+        Avec EMAIL_OUTBOX_ENABLED, True signifie « mis en file ».
         """
-        if not frontend_url:
-            frontend_url = settings.FRONTEND_URL
-        verification_link = f"{frontend_url}/verify-email?token={verification_token}"
-        subject = "Bienvenue ! Active ton compte Mathakine"
-        html_content = verification_email_html(username, verification_link)
-        text_content = verification_email_text(username, verification_link)
-        return EmailService.send_email(to_email, subject, html_content, text_content)
+        subject, html_content, text_content = EmailService.build_verification_email(
+            username, verification_token, frontend_url
+        )
+        return EmailService._deliver(
+            "verification", to_email, subject, html_content, text_content, user_id
+        )
 
     @staticmethod
     def send_password_reset_email(
@@ -281,15 +265,188 @@ class EmailService:
         username: str,
         reset_token: str,
         frontend_url: Optional[str] = None,
+        user_id: Optional[int] = None,
     ) -> bool:
         """
         Envoie un email de réinitialisation de mot de passe.
         Template thème Jedi, ergonomique et accessible.
+        Avec EMAIL_OUTBOX_ENABLED, True signifie « mis en file ».
         """
-        if not frontend_url:
-            frontend_url = settings.FRONTEND_URL
-        reset_link = f"{frontend_url}/reset-password?token={reset_token}"
-        subject = "Réinitialisation de ton mot de passe — Mathakine"
-        html_content = password_reset_email_html(username, reset_link)
-        text_content = password_reset_email_text(username, reset_link)
-        return EmailService.send_email(to_email, subject, html_content, text_content)
+        subject, html_content, text_content = EmailService.build_password_reset_email(
+            username, reset_token, frontend_url
+        )
+        return EmailService._deliver(
+            "password_reset", to_email, subject, html_content, text_content, user_id
+        )
+
+
+class EmailTransport(ABC):
+    """Canal d'envoi réutilisable pour plusieurs messages (voir open_transport)."""
+
+    @abstractmethod
+    def send(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None,
+    ) -> bool:
+        """Envoie un message ; True si le fournisseur l'a accepté."""
+
+    def close(self) -> None:
+        """Libère la connexion (no-op par défaut)."""
+
+    def __enter__(self) -> "EmailTransport":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class SimulatedTransport(EmailTransport):
+    """Mode TESTING : aucun envoi réel."""
+
+    def send(self, to_email, subject, html_content, text_content=None) -> bool:
+        logger.debug("[Email] Mode test : envoi simulé vers {}", _mask_email(to_email))
+        return True
+
+
+class SendGridTransport(EmailTransport):
+    """Client SendGrid partagé par les messages d'un lot."""
+
+    def __init__(self, api_key: str):
+        self._client = sendgrid.SendGridAPIClient(api_key=api_key)
+
+    def send(self, to_email, subject, html_content, text_content=None) -> bool:
+        return EmailService._send_via_sendgrid(
+            to_email, subject, html_content, text_content, client=self._client
+        )
+
+
+class SmtpSession(EmailTransport):
+    """
+    Connexion SMTP ouverte au premier message puis réutilisée (STARTTLS et login
+    une seule fois). Une déconnexion serveur entre deux messages déclenche une
+    reconnexion et un seul nouvel essai.
+    """
+
+    def __init__(self) -> None:
+        # Configuration SMTP depuis les variables d'environnement
+        self.host = os.getenv("SMTP_HOST", "smtp.gmail.com")
+        self.port = int(os.getenv("SMTP_PORT", "587"))
+        self.user = os.getenv("SMTP_USER", "")
+        self.password = os.getenv("SMTP_PASSWORD", "")
+        self.from_email = os.getenv(
+            "SMTP_FROM_EMAIL", self.user or "noreply@mathakine.com"
+        )
+        self.use_tls = os.getenv("SMTP_USE_TLS", "true").lower() == "true"
+        self.connections = 0
+        self._server: Optional[smtplib.SMTP] = None
+
+    def _build_message(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str],
+    ) -> MIMEMultipart:
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = subject
+        msg["From"] = self.from_email
+        msg["To"] = to_email
+        if text_content:
+            msg.attach(MIMEText(text_content, "plain"))
+        msg.attach(MIMEText(html_content, "html"))
+        return msg
+
+    def _connect(self) -> smtplib.SMTP:
+        logger.debug("Connexion SMTP à {}:{}", self.host, self.port)
+        server = smtplib.SMTP(self.host, self.port, timeout=SMTP_TIMEOUT_SECONDS)
+        try:
+            if self.use_tls:
+                server.starttls()
+            logger.debug("Authentification avec {}", _mask_user(self.user))
+            server.login(self.user, self.password)
+        except Exception:
+            server.close()
+            raise
+        self.connections += 1
+        self._server = server
+        return server
+
+    def _drop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+    def close(self) -> None:
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        self._drop()
+
+    def _send_not_configured(self, to_email: str, subject: str) -> bool:
+        logger.warning("SMTP non configuré - Email non envoyé")
+        logger.warning(
+            "SMTP_USER={}, SMTP_PASSWORD={}",
+            "configuré" if self.user else "MANQUANT",
+            "configuré" if self.password else "MANQUANT",
+        )
+        logger.info(
+            "Email qui aurait été envoyé à {}: {}", _mask_email(to_email), subject
+        )
+        # En développement, on peut simuler l'envoi
+        if os.getenv("ENVIRONMENT", "").lower() != "production":
+            logger.info("Mode développement: Email simulé")
+            return True
+        return False
+
+    def send(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None,
+    ) -> bool:
+        """Envoie un message sur la connexion courante ; False en cas d'échec."""
+        if not self.user or not self.password:
+            return self._send_not_configured(to_email, subject)
+
+        msg = self._build_message(to_email, subject, html_content, text_content)
+        try:
+            server = self._server or self._connect()
+            try:
+                server.send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                # Connexion fermée côté serveur (inactivité) : on rouvre une fois.
+                self._drop()
+                self._connect().send_message(msg)
+            logger.info(
+                "✅ Email envoyé via SMTP à {} depuis {}",
+                _mask_email(to_email),
+                _mask_email(self.from_email),
+            )
+            return True
+
+        except smtplib.SMTPAuthenticationError as smtp_auth_error:
+            logger.error("❌ Erreur d'authentification SMTP: {}", smtp_auth_error)
+            logger.error(
+                "Vérifiez SMTP_USER ({}) et SMTP_PASSWORD", _mask_user(self.user)
+            )
+            self._drop()
+            return False
+        except smtplib.SMTPResponseException as smtp_error:
+            # Refus du message (destinataire, contenu) : la connexion reste utilisable.
+            logger.error("❌ Erreur SMTP: {}", smtp_error)
+            return False
+        except Exception as smtp_error:
+            logger.error(
+                "❌ Erreur lors de l'envoi via SMTP: {}: {}",
+                type(smtp_error).__name__,
+                smtp_error,
+            )
+            self._drop()
+            return False
@@ -0,0 +1,344 @@
+"""
+Inventaire générique de contenus IA pré-générés (défis, exercices).
+
+Un ``ContentInventory`` décrit le stock d'un domaine : modèle SQLAlchemy des lignes,
+dataclass de seau (ses champs sont les colonnes de clé du modèle), publication d'une
+ligne réservée et générateur de refill. Il fournit :
+
+- ``claim`` : réserve le plus ancien élément du seau (FOR UPDATE SKIP LOCKED), le
+  publie et retire la ligne dans la même transaction ;
+- ``serve_from_stock`` : réservation depuis un handler async + signal de demande ;
+- ``stock`` / ``count`` / ``load_known_buckets`` ;
+- ``InventoryRefiller`` : thread par worker (``<PRÉFIXE>_ENABLED``). Tout seau connu
+  passé sous ``<PRÉFIXE>_LOW_WATERMARK`` est recomplété jusqu'à ``<PRÉFIXE>_TARGET``,
+  une génération à la fois. Seaux connus : demandes vues par le worker + seaux
+  présents en base au démarrage. Le stock est recompté avant chaque génération :
+  plusieurs workers dépassent la cible d'au plus une génération chacun.
+
+Les modules de domaine (challenge_inventory, exercise_inventory) ne gardent que leur
+seau, leur publication et leur générateur.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import json
+import threading
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Query, Session
+
+from app.core.config import settings
+from app.core.db_boundary import run_db_bound, sync_db_session
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Seaux lus en base au démarrage du thread (plus récents d'abord).
+_KNOWN_BUCKETS_SCAN_LIMIT = 1000
+
+BucketT = TypeVar("BucketT")
+# Contexte de génération propre au seau (ex. personnalisation F42 des défis).
+Context = Optional[Dict[str, Any]]
+
+
+def sse_payloads(event: str) -> List[Dict[str, Any]]:
+    """Objets JSON des lignes ``data:`` d'un événement SSE (invalides ignorées)."""
+    payloads = []
+    for line in event.splitlines():
+        if line.startswith("data: "):
+            try:
+                payloads.append(json.loads(line[6:]))
+            except json.JSONDecodeError:
+                continue
+    return payloads
+
+
+class ContentInventory(Generic[BucketT]):
+    """
+    Stock d'un domaine. ``publish(db, row, bucket, user_id)`` est appelée après
+    ``db.delete(row)`` dans la transaction de réservation (elle lit la ligne avant
+    tout commit) ; ``generate(bucket, context)`` stocke un élément, True si réussi.
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        label: str,
+        model: Type[Any],
+        bucket_cls: Type[BucketT],
+        settings_prefix: str,
+        publish: Callable[
+            [Session, Any, BucketT, Optional[int]], Optional[Dict[str, Any]]
+        ],
+        generate: Callable[[BucketT, Context], Awaitable[bool]],
+        record_serve: Callable[[BucketT, str], None],
+        context_column: Optional[str] = None,
+        record_level: Optional[Callable[[BucketT, int], None]] = None,
+        record_refill_lag: Optional[Callable[[float], None]] = None,
+    ):
+        self.name = name
+        self.label = label
+        self.model = model
+        self.bucket_cls = bucket_cls
+        self.settings_prefix = settings_prefix
+        self.publish = publish
+        self.generate = generate
+        self.record_serve = record_serve
+        self.context_column = context_column
+        self.record_level = record_level
+        self.record_refill_lag = record_refill_lag
+        self.key_columns = [field.name for field in dataclasses.fields(bucket_cls)]
+        self._refiller: Optional[InventoryRefiller[BucketT]] = None
+        self._refiller_lock = threading.Lock()
+
+    def setting(self, suffix: str) -> Any:
+        """Réglage ``<PRÉFIXE>_<suffix>`` lu à l'appel (patchable par les tests)."""
+        return getattr(settings, f"{self.settings_prefix}_{suffix}")
+
+    def _key(self, bucket: BucketT) -> Dict[str, Any]:
+        return {column: getattr(bucket, column) for column in self.key_columns}
+
+    def bucket_query(self, db: Session, bucket: BucketT) -> Query:
+        filters = []
+        for column, value in self._key(bucket).items():
+            attr = getattr(self.model, column)
+            filters.append(attr.is_(None) if value is None else attr == value)
+        return db.query(self.model).filter(*filters)
+
+    def count(self, db: Session, bucket: BucketT) -> int:
+        """Éléments en stock dans le seau (lignes réservées ailleurs incluses)."""
+        return self.bucket_query(db, bucket).count()
+
+    def count_sync(self, bucket: BucketT) -> int:
+        with sync_db_session() as db:
+            return self.count(db, bucket)
+
+    def claim(
+        self, db: Session, bucket: BucketT, user_id: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Sert le plus ancien élément du seau (un seul commit) ; None si seau vide."""
+        row = (
+            self.bucket_query(db, bucket)
+            .order_by(self.model.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if row is None:
+            return None
+        db.delete(row)
+        return self.publish(db, row, bucket, user_id)
+
+    def claim_sync(
+        self, bucket: BucketT, user_id: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        with sync_db_session() as db:
+            return self.claim(db, bucket, user_id)
+
+    def stock(self, bucket: BucketT, payload: Dict[str, Any], **columns: Any) -> int:
+        """Stocke un élément validé dans le seau ; retourne l'id de la ligne."""
+        with sync_db_session() as db:
+            row = self.model(**self._key(bucket), payload=payload, **columns)
+            db.add(row)
+            db.commit()
+            return row.id
+
+    def load_known_buckets(self, db: Session) -> Dict[BucketT, Context]:
+        """Seaux présents en base, avec le contexte de leur élément le plus récent."""
+        columns = [getattr(self.model, column) for column in self.key_columns]
+        if self.context_column is not None:
+            columns.append(getattr(self.model, self.context_column))
+        rows = (
+            db.query(*columns)
+            .order_by(self.model.id.desc())
+            .limit(_KNOWN_BUCKETS_SCAN_LIMIT)
+            .all()
+        )
+        size = len(self.key_columns)
+        buckets: Dict[BucketT, Context] = {}
+        for row in rows:
+            context = row[size] if self.context_column is not None else None
+            buckets.setdefault(self.bucket_cls(*row[:size]), context)
+        return buckets
+
+    async def serve_from_stock(
+        self,
+        bucket: BucketT,
+        user_id: Optional[int] = None,
+        context: Context = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Réserve un élément (None = à générer), signale la demande."""
+        item = None
+        try:
+            item = await run_db_bound(self.claim_sync, bucket, user_id)
+        except (SQLAlchemyError, ValueError):
+            logger.exception("Inventaire {} : réservation impossible", self.label)
+        self.record_serve(bucket, "hit" if item else "miss")
+        self.track_demand(bucket, context)
+        return item
+
+    def start_refiller(self) -> InventoryRefiller[BucketT]:
+        """Démarre le thread de refill du process (startup, ``<PRÉFIXE>_ENABLED``)."""
+        with self._refiller_lock:
+            if self._refiller is None:
+                self._refiller = InventoryRefiller(self, self.setting("POLL_SECONDS"))
+                self._refiller.start()
+            return self._refiller
+
+    def track_demand(self, bucket: BucketT, context: Context = None) -> None:
+        """Signale une demande sur le seau (no-op si le thread ne tourne pas ici)."""
+        refiller = self._refiller
+        if refiller is not None:
+            refiller.track(bucket, context)
+
+    def stop_refiller(self) -> None:
+        """Arrête le thread de refill (shutdown de l'application)."""
+        with self._refiller_lock:
+            refiller, self._refiller = self._refiller, None
+        if refiller is not None:
+            refiller.stop()
+
+
+@dataclasses.dataclass
+class _TrackedBucket:
+    context: Context = None
+    # Instant (monotonic) de la première demande non encore soldée.
+    demand_since: Optional[float] = None
+
+
+class InventoryRefiller(Generic[BucketT]):
+    """Thread de refill : seaux sous le seuil bas, au réveil ou toutes les N s."""
+
+    def __init__(self, inventory: ContentInventory[BucketT], poll_seconds: float):
+        self.inventory = inventory
+        self.poll_seconds = poll_seconds
+        self._buckets: Dict[BucketT, _TrackedBucket] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"mathakine-{self.inventory.name}-inventory",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def track(
+        self, bucket: BucketT, context: Context = None, demand: bool = True
+    ) -> None:
+        """Enregistre le seau (contexte, demande en attente) et réveille le thread."""
+        with self._lock:
+            tracked = self._buckets.setdefault(bucket, _TrackedBucket())
+            if context is not None:
+                tracked.context = context
+            if demand and tracked.demand_since is None:
+                tracked.demand_since = time.monotonic()
+        self._wake.set()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def buckets(self) -> List[Tuple[BucketT, Context]]:
+        with self._lock:
+            return [(bucket, t.context) for bucket, t in self._buckets.items()]
+
+    def _settle_demand(self, bucket: BucketT, refilled: bool) -> None:
+        with self._lock:
+            tracked = self._buckets.setdefault(bucket, _TrackedBucket())
+            since, tracked.demand_since = tracked.demand_since, None
+        record_lag = self.inventory.record_refill_lag
+        if refilled and since is not None and record_lag is not None:
+            record_lag(time.monotonic() - since)
+
+    async def refill_bucket(self, bucket: BucketT, context: Context = None) -> int:
+        """
+        Recomplète le seau jusqu'à la cible s'il est sous le seuil bas ; retourne le
+        nombre d'éléments stockés. S'arrête au premier échec (reprise au cycle
+        suivant, demande en attente conservée pour la mesure du délai).
+        """
+        inventory = self.inventory
+        stocked = 0
+        while not self._stop.is_set():
+            count = inventory.count_sync(bucket)
+            if inventory.record_level is not None:
+                inventory.record_level(bucket, count)
+            if count >= inventory.setting("TARGET") or (
+                not stocked and count >= inventory.setting("LOW_WATERMARK")
+            ):
+                self._settle_demand(bucket, refilled=stocked > 0)
+                break
+            if not await inventory.generate(bucket, context):
+                logger.warning(
+                    "Inventaire {} : refill {} en échec", inventory.label, bucket
+                )
+                break
+            stocked += 1
+        return stocked
+
+    async def refill_once(self) -> int:
+        """Un cycle sur les seaux connus ; retourne le nombre d'éléments stockés."""
+        total = 0
+        for bucket, context in self.buckets():
+            if self._stop.is_set():
+                break
+            try:
+                total += await self.refill_bucket(bucket, context)
+            except SQLAlchemyError:
+                logger.exception(
+                    "Inventaire {} : refill {} interrompu", self.inventory.label, bucket
+                )
+        return total
+
+    def _run(self) -> None:
+        label = self.inventory.label
+        # Une loop pour toute la vie du thread : pools OpenAI partagés réutilisés.
+        loop = asyncio.new_event_loop()
+        try:
+            try:
+                with sync_db_session() as db:
+                    known = self.inventory.load_known_buckets(db)
+                for bucket, context in known.items():
+                    self.track(bucket, context, demand=False)
+            except SQLAlchemyError:
+                logger.exception("Inventaire {} : lecture des seaux impossible", label)
+            while not self._stop.is_set():
+                self._wake.clear()
+                try:
+                    stocked = loop.run_until_complete(self.refill_once())
+                    if stocked:
+                        logger.info(
+                            "Inventaire {} : {} élément(s) stocké(s)", label, stocked
+                        )
+                except Exception:
+                    logger.exception("Thread inventaire {} : cycle en échec", label)
+                self._wake.wait(self.poll_seconds)
+        finally:
+            from app.core.openai_clients import openai_client_registry
+
+            loop.run_until_complete(openai_client_registry.aclose())
+            loop.close()
@@ -6,8 +6,9 @@ Extrait la logique de generate_ai_exercise_stream depuis exercise_handlers.
 import json
 import traceback
 from datetime import datetime
-from typing import Any, AsyncGenerator, Dict, Optional
+from typing import Any, AsyncGenerator, Callable, Dict, Optional
 
+from sqlalchemy.orm import Session
 from tenacity import (
     retry,
     retry_if_exception_type,
@@ -32,6 +33,7 @@ from app.core.difficulty_tier import (
     cognitive_guidance_kind_for_exercise_type,
 )
 from app.core.logging_config import get_logger
+from app.core.openai_clients import openai_client
 from app.core.runtime import run_db_bound
 from app.services.core.enhanced_server_adapter import EnhancedServerAdapter
 from app.services.exercises.exercise_ai_validation import (
@@ -183,6 +185,34 @@ def _non_triviality_hint(exercise_type: str, derived_difficulty: str) -> str:
     return ""
 
 
+def create_generated_ai_exercise(
+    db: Session,
+    normalized_exercise: Dict[str, Any],
+    locale: str = "fr",
+) -> Optional[int]:
+    """
+    Crée l'exercice IA normalisé dans la session ``db`` (commit inclus).
+    Retourne l'id de l'exercice créé ou None.
+    """
+    created = EnhancedServerAdapter.create_generated_exercise(
+        db=db,
+        exercise_type=normalized_exercise["exercise_type"],
+        age_group=normalized_exercise["age_group"],
+        difficulty=normalized_exercise["difficulty"],
+        difficulty_tier=normalized_exercise.get("difficulty_tier"),
+        title=normalized_exercise["title"],
+        question=normalized_exercise["question"],
+        correct_answer=normalized_exercise["correct_answer"],
+        choices=normalized_exercise["choices"],
+        explanation=normalized_exercise["explanation"],
+        hint=normalized_exercise.get("hint"),
+        tags=normalized_exercise.get("tags", "ai,generated"),
+        ai_generated=True,
+        locale=locale,
+    )
+    return created.get("id") if created else None
+
+
 def _persist_exercise_ai_sync(
     normalized_exercise: Dict[str, Any],
     locale: str = "fr",
@@ -192,23 +222,7 @@ def _persist_exercise_ai_sync(
     Retourne l'id de l'exercice créé ou None.
     """
     with sync_db_session() as db:
-        created = EnhancedServerAdapter.create_generated_exercise(
-            db=db,
-            exercise_type=normalized_exercise["exercise_type"],
-            age_group=normalized_exercise["age_group"],
-            difficulty=normalized_exercise["difficulty"],
-            difficulty_tier=normalized_exercise.get("difficulty_tier"),
-            title=normalized_exercise["title"],
-            question=normalized_exercise["question"],
-            correct_answer=normalized_exercise["correct_answer"],
-            choices=normalized_exercise["choices"],
-            explanation=normalized_exercise["explanation"],
-            hint=normalized_exercise.get("hint"),
-            tags=normalized_exercise.get("tags", "ai,generated"),
-            ai_generated=True,
-            locale=locale,
-        )
-        return created.get("id") if created else None
+        return create_generated_ai_exercise(db, normalized_exercise, locale)
 
 
 def _has_custom_theme(prompt: str) -> bool:
@@ -342,9 +356,13 @@ async def generate_exercise_stream(
     pedagogical_band_override: Optional[str] = None,
     locale: str = "fr",
     user_id: Optional[int] = None,
+    persist: Optional[Callable[[Dict[str, Any], str], Optional[int]]] = None,
 ) -> AsyncGenerator[str, None]:
     """
     Générateur async qui produit des événements SSE (f"data: {json.dumps(...)}\n\n").
+
+    ``persist`` remplace la persistance de l'exercice validé (inventaire : stock
+    au lieu de publication) ; défaut ``_persist_exercise_ai_sync``.
     """
     start_time = datetime.now()
     metrics_key = _exercise_ai_metrics_key(exercise_type)
@@ -355,7 +373,7 @@ async def generate_exercise_stream(
 
     try:
         try:
-            from openai import APIError, APITimeoutError, AsyncOpenAI, RateLimitError
+            from openai import APIError, APITimeoutError, RateLimitError
         except ImportError:
             generation_metrics.record_generation(
                 challenge_type=metrics_key,
@@ -378,8 +396,9 @@ async def generate_exercise_stream(
             yield sse_error_message("OpenAI API key non configurée")
             return
 
-        client = AsyncOpenAI(
+        client = openai_client(
             api_key=settings.OPENAI_API_KEY,
+            profile="exercises",
             timeout=AIConfig.DEFAULT_TIMEOUT,
         )
 
@@ -744,7 +763,7 @@ async def generate_exercise_stream(
         persist_error: Optional[str] = None
         try:
             exercise_id = await run_db_bound(
-                _persist_exercise_ai_sync,
+                persist or _persist_exercise_ai_sync,
                 normalized_exercise,
                 locale,
             )
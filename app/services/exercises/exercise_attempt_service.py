@@ -3,16 +3,39 @@ Service applicatif pour l'orchestration de la soumission de réponse.
 
 Responsabilité : validation réponse, correction, orchestration badges/streak/daily,
 transaction, construction SubmitAnswerResponse.
+
+SUBMIT_SIDE_EFFECTS_ASYNC : seuls le verdict et l'insert de la tentative restent dans
+la requête ; une ligne outbox ``attempt_side_effects`` est commitée avec la tentative
+puis ``process_attempt_side_effects`` (job post-commit idempotent, clé attempt_id)
+applique les effets de bord. Le client lit le résultat via
+``get_attempt_side_effects_for_user`` (polling ou SSE). Les lignes restées
+``pending`` (échec, file pleine, arrêt) sont re-planifiées par le balayage
+post-commit avec backoff.
 """
 
-from typing import Any, Dict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
 
+from sqlalchemy import and_, or_
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.db_boundary import sync_db_session
 from app.core.logging_config import get_logger
+from app.core.post_commit import (
+    enqueue_post_commit,
+    register_post_commit_handler,
+    register_post_commit_sweep,
+)
 from app.exceptions import ExerciseNotFoundError, ExerciseSubmitError
+from app.models.attempt import Attempt
+from app.models.attempt_side_effect import (
+    SIDE_EFFECTS_DONE,
+    SIDE_EFFECTS_FAILED,
+    SIDE_EFFECTS_PENDING,
+    AttemptSideEffect,
+)
 from app.models.exercise import ExerciseType
 from app.models.user import User
 from app.repositories.exercise_attempt_repository import (
@@ -24,6 +47,9 @@ from app.schemas.exercise import SubmitAnswerResponse
 from app.services.gamification.gamification_service import GamificationService
 from app.services.gamification.point_source import PointEventSourceType
 from app.services.progress.streak_service import update_user_streak
+from app.services.recommendation.recommendation_refresh import (
+    notify_progress_changed,
+)
 from app.services.spaced_repetition.spaced_repetition_service import (
     record_exercise_attempt_for_spaced_repetition,
 )
@@ -34,6 +60,10 @@ logger = get_logger(__name__)
 
 POINTS_PER_CORRECT_EXERCISE = 10
 
+ATTEMPT_SIDE_EFFECTS_JOB = "exercise_attempt_side_effects"
+# Échecs consécutifs au-delà desquels la ligne outbox passe en ``failed``.
+ATTEMPT_SIDE_EFFECTS_MAX_TRIES = 3
+
 
 def _check_answer_correct(exercise: Dict[str, Any], selected_answer: Any) -> bool:
     """
@@ -57,73 +87,23 @@ def _check_answer_correct(exercise: Dict[str, Any], selected_answer: Any) -> boo
     return answers_equivalent_numeric_tolerant(selected, correct)
 
 
-def submit_answer(
+def _apply_attempt_side_effects(
     db: Session,
-    exercise_id: int,
+    *,
     user_id: int,
-    selected_answer: Any,
-    time_spent: float = 0,
-) -> SubmitAnswerResponse:
+    exercise_id: int,
+    exercise_type: str,
+    difficulty: str,
+    is_correct: bool,
+    time_spent: float,
+    attempt_id: int,
+    attempt_created_at: Optional[datetime],
+) -> Tuple[List[Any], Optional[Dict[str, Any]]]:
     """
-    Traite la soumission d'une réponse : validation, enregistrement, progression,
-    badges, streak, daily challenge.
-    Retourne SubmitAnswerResponse pour la réponse HTTP.
-    Lève ExerciseNotFoundError (404) ou ExerciseSubmitError (500) en cas d'erreur métier.
+    Effets de bord d'une tentative enregistrée : progression, spaced repetition,
+    points, badges, streak, daily challenge (chacun isolé par un savepoint).
+    Ne commit pas. Retourne (nouveaux badges, notification de progression).
     """
-    exercise = get_exercise_for_submit_validation(db, exercise_id)
-    if not exercise:
-        raise ExerciseNotFoundError()
-
-    correct_answer = exercise.get("correct_answer")
-    if not correct_answer:
-        logger.error("ERREUR: L'exercice %s n'a pas de correct_answer", exercise_id)
-        raise ExerciseSubmitError(
-            500, "L'exercice n'a pas de réponse correcte définie."
-        )
-
-    is_correct = _check_answer_correct(exercise, selected_answer)
-    logger.debug(
-        "Réponse correcte? %s (selected: '%s', correct: '%s')",
-        is_correct,
-        selected_answer,
-        correct_answer,
-    )
-
-    attempt_data = {
-        "user_id": user_id,
-        "exercise_id": exercise_id,
-        "user_answer": selected_answer,
-        "is_correct": is_correct,
-        "time_spent": time_spent,
-    }
-
-    attempt_obj = create_attempt(db, attempt_data)
-    if not attempt_obj:
-        logger.error("ERREUR: La tentative n'a pas été enregistrée correctement")
-        raise ExerciseSubmitError(
-            500, "Erreur lors de l'enregistrement de la tentative"
-        )
-
-    logger.info("Tentative enregistrée avec succès")
-
-    exercise_type = exercise.get("exercise_type", "")
-    tier_val = exercise.get("difficulty_tier")
-    tier_absent = 1 if tier_val is None else 0
-    tier_token = "none" if tier_val is None else str(int(tier_val))
-    outcome = "correct" if is_correct else "incorrect"
-    # F43-A1 — structured observability: grep ``f43_exercise_attempt`` ; aggregate by
-    # difficulty_tier / tier_absent / outcome (no schema change).
-    logger.info(
-        "f43_exercise_attempt: user_id=%%s exercise_id=%%s exercise_type=%%s difficulty_tier=%%s tier_absent=%%s outcome=%%s",
-        user_id,
-        exercise_id,
-        exercise_type,
-        tier_token,
-        tier_absent,
-        outcome,
-    )
-    difficulty = exercise.get("difficulty", "")
-
     user_for_progress = db.query(User).filter(User.id == user_id).first()
 
     try:
@@ -157,7 +137,7 @@ def submit_answer(
             exercise_id=exercise_id,
             is_correct=is_correct,
             time_spent_seconds=float(time_spent or 0),
-            attempt_id=int(attempt_obj.id),
+            attempt_id=attempt_id,
         )
         sr_savepoint.commit()
     except SQLAlchemyError as sr_err:
@@ -198,7 +178,7 @@ def submit_answer(
             "time_spent": time_spent,
             "exercise_id": exercise_id,
             "created_at": (
-                attempt_obj.created_at.isoformat() if attempt_obj.created_at else None
+                attempt_created_at.isoformat() if attempt_created_at else None
             ),
         }
         new_badges = badge_service.check_and_award_badges(user_id, attempt_for_badges)
@@ -221,7 +201,17 @@ def submit_answer(
 
     try:
         streak_savepoint = db.begin_nested()
-        update_user_streak(db, user_id, auto_commit=False)
+        # Jour de la tentative (et non du traitement, différé si SUBMIT_SIDE_EFFECTS_ASYNC).
+        update_user_streak(
+            db,
+            user_id,
+            auto_commit=False,
+            today=(
+                attempt_created_at.astimezone(timezone.utc).date()
+                if attempt_created_at
+                else None
+            ),
+        )
         streak_savepoint.commit()
     except SQLAlchemyError:
         if "streak_savepoint" in locals() and streak_savepoint.is_active:
@@ -255,7 +245,107 @@ def submit_answer(
         except (SQLAlchemyError, TypeError, ValueError):
             logger.debug("Badge progress notification skipped", exc_info=True)
 
+    return new_badges, progress_notif
+
+
+def submit_answer(
+    db: Session,
+    exercise_id: int,
+    user_id: int,
+    selected_answer: Any,
+    time_spent: float = 0,
+) -> SubmitAnswerResponse:
+    """
+    Traite la soumission d'une réponse : validation, enregistrement, progression,
+    badges, streak, daily challenge (différés en post-commit si
+    SUBMIT_SIDE_EFFECTS_ASYNC, ``side_effects_status="pending"``).
+    Retourne SubmitAnswerResponse pour la réponse HTTP.
+    Lève ExerciseNotFoundError (404) ou ExerciseSubmitError (500) en cas d'erreur métier.
+    """
+    exercise = get_exercise_for_submit_validation(db, exercise_id)
+    if not exercise:
+        raise ExerciseNotFoundError()
+
+    correct_answer = exercise.get("correct_answer")
+    if not correct_answer:
+        logger.error("ERREUR: L'exercice %s n'a pas de correct_answer", exercise_id)
+        raise ExerciseSubmitError(
+            500, "L'exercice n'a pas de réponse correcte définie."
+        )
+
+    is_correct = _check_answer_correct(exercise, selected_answer)
+    logger.debug(
+        "Réponse correcte? %s (selected: '%s', correct: '%s')",
+        is_correct,
+        selected_answer,
+        correct_answer,
+    )
+
+    attempt_data = {
+        "user_id": user_id,
+        "exercise_id": exercise_id,
+        "user_answer": selected_answer,
+        "is_correct": is_correct,
+        "time_spent": time_spent,
+    }
+
+    attempt_obj = create_attempt(
+        db, attempt_data, exercise_type=exercise.get("exercise_type")
+    )
+    if not attempt_obj:
+        logger.error("ERREUR: La tentative n'a pas été enregistrée correctement")
+        raise ExerciseSubmitError(
+            500, "Erreur lors de l'enregistrement de la tentative"
+        )
+
+    logger.info("Tentative enregistrée avec succès")
+
+    exercise_type = exercise.get("exercise_type", "")
+    tier_val = exercise.get("difficulty_tier")
+    tier_absent = 1 if tier_val is None else 0
+    tier_token = "none" if tier_val is None else str(int(tier_val))
+    outcome = "correct" if is_correct else "incorrect"
+    # F43-A1 — structured observability: grep ``f43_exercise_attempt`` ; aggregate by
+    # difficulty_tier / tier_absent / outcome (no schema change).
+    logger.info(
+        "f43_exercise_attempt: user_id=%%s exercise_id=%%s exercise_type=%%s difficulty_tier=%%s tier_absent=%%s outcome=%%s",
+        user_id,
+        exercise_id,
+        exercise_type,
+        tier_token,
+        tier_absent,
+        outcome,
+    )
+    difficulty = exercise.get("difficulty", "")
+
+    if settings.SUBMIT_SIDE_EFFECTS_ASYNC:
+        attempt_id = int(attempt_obj.id)
+        db.add(AttemptSideEffect(attempt_id=attempt_id, user_id=user_id))
+        db.commit()
+        enqueue_post_commit(ATTEMPT_SIDE_EFFECTS_JOB, attempt_id)
+        notify_progress_changed(user_id)
+        return SubmitAnswerResponse(
+            is_correct=is_correct,
+            correct_answer=correct_answer,
+            explanation=exercise.get("explanation") or "",
+            attempt_id=attempt_id,
+            side_effects_status=SIDE_EFFECTS_PENDING,
+        )
+
+    new_badges, progress_notif = _apply_attempt_side_effects(
+        db,
+        user_id=user_id,
+        exercise_id=exercise_id,
+        exercise_type=exercise_type,
+        difficulty=difficulty,
+        is_correct=is_correct,
+        time_spent=time_spent,
+        attempt_id=int(attempt_obj.id),
+        attempt_created_at=attempt_obj.created_at,
+    )
+
     db.commit()
+    notify_progress_changed(user_id)
     db.refresh(attempt_obj)
     return SubmitAnswerResponse(
         is_correct=is_correct,
@@ -281,3 +371,168 @@ def submit_answer_sync(
     """
     with sync_db_session() as db:
         return submit_answer(db, exercise_id, user_id, selected_answer, time_spent)
+
+
+def _side_effects_result(
+    new_badges: List[Any], progress_notif: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    return {
+        "new_badges": make_json_serializable(new_badges) if new_badges else None,
+        "badges_earned": len(new_badges) if new_badges else None,
+        "progress_notification": make_json_serializable(progress_notif),
+    }
+
+
+def _record_side_effects_failure(attempt_id: int, error: Exception) -> None:
+    with sync_db_session() as db:
+        outbox = db.get(AttemptSideEffect, attempt_id)
+        if outbox is None or outbox.status != SIDE_EFFECTS_PENDING:
+            return
+        now = datetime.now(timezone.utc)
+        outbox.tries = (outbox.tries or 0) + 1
+        outbox.last_error = f"{type(error).__name__}: {error}"[:2000]
+        if outbox.tries >= ATTEMPT_SIDE_EFFECTS_MAX_TRIES:
+            outbox.status = SIDE_EFFECTS_FAILED
+            outbox.completed_at = now
+        else:
+            backoff = settings.ATTEMPT_SIDE_EFFECTS_RETRY_SECONDS * 2 ** (
+                outbox.tries - 1
+            )
+            outbox.next_attempt_at = now + timedelta(seconds=backoff)
+        db.commit()
+
+
+def process_attempt_side_effects(attempt_id: int) -> bool:
+    """
+    Job post-commit : applique les effets de bord d'une tentative.
+
+    Idempotent : la ligne outbox est verrouillée (FOR UPDATE SKIP LOCKED) et n'est
+    traitée que si elle est encore ``pending`` ; effets et passage à ``done`` sont
+    commités ensemble. Retourne False si rien n'était à faire.
+    """
+    try:
+        with sync_db_session() as db:
+            outbox = (
+                db.query(AttemptSideEffect)
+                .filter(
+                    AttemptSideEffect.attempt_id == attempt_id,
+                    AttemptSideEffect.status == SIDE_EFFECTS_PENDING,
+                )
+                .with_for_update(skip_locked=True)
+                .first()
+            )
+            if outbox is None:
+                return False
+
+            attempt = db.get(Attempt, attempt_id)
+            exercise = (
+                get_exercise_for_submit_validation(db, attempt.exercise_id)
+                if attempt is not None
+                else None
+            )
+            new_badges: List[Any] = []
+            progress_notif = None
+            if exercise is not None:
+                new_badges, progress_notif = _apply_attempt_side_effects(
+                    db,
+                    user_id=attempt.user_id,
+                    exercise_id=attempt.exercise_id,
+                    exercise_type=exercise.get("exercise_type", ""),
+                    difficulty=exercise.get("difficulty", ""),
+                    is_correct=bool(attempt.is_correct),
+                    time_spent=attempt.time_spent or 0,
+                    attempt_id=attempt_id,
+                    attempt_created_at=attempt.created_at,
+                )
+            outbox.status = SIDE_EFFECTS_DONE
+            outbox.result = _side_effects_result(new_badges, progress_notif)
+            outbox.completed_at = datetime.now(timezone.utc)
+            db.commit()
+            if attempt is not None:
+                notify_progress_changed(attempt.user_id)
+            return True
+    except Exception as err:
+        _record_side_effects_failure(attempt_id, err)
+        raise
+
+
+register_post_commit_handler(ATTEMPT_SIDE_EFFECTS_JOB, process_attempt_side_effects)
+
+
+def requeue_pending_attempt_side_effects(
+    limit: int = 500, now: Optional[datetime] = None
+) -> int:
+    """
+    Balayage : re-planifie les lignes outbox ``pending`` échues — backoff écoulé
+    après un échec, ou jamais traitées depuis ATTEMPT_SIDE_EFFECTS_RETRY_SECONDS
+    (file pleine, arrêt du worker). S'arrête au premier refus de la file.
+    """
+    now = now or datetime.now(timezone.utc)
+    grace = timedelta(seconds=settings.ATTEMPT_SIDE_EFFECTS_RETRY_SECONDS)
+    with sync_db_session() as db:
+        attempt_ids = [
+            row[0]
+            for row in db.query(AttemptSideEffect.attempt_id)
+            .filter(
+                AttemptSideEffect.status == SIDE_EFFECTS_PENDING,
+                AttemptSideEffect.tries < ATTEMPT_SIDE_EFFECTS_MAX_TRIES,
+                or_(
+                    AttemptSideEffect.next_attempt_at <= now,
+                    and_(
+                        AttemptSideEffect.next_attempt_at.is_(None),
+                        AttemptSideEffect.created_at <= now - grace,
+                    ),
+                ),
+            )
+            .order_by(AttemptSideEffect.created_at)
+            .limit(limit)
+            .all()
+        ]
+    requeued = 0
+    for attempt_id in attempt_ids:
+        if not enqueue_post_commit(ATTEMPT_SIDE_EFFECTS_JOB, attempt_id):
+            break
+        requeued += 1
+    return requeued
+
+
+register_post_commit_sweep(
+    ATTEMPT_SIDE_EFFECTS_JOB, requeue_pending_attempt_side_effects
+)
+
+
+def get_attempt_side_effects_for_user(
+    db: Session, attempt_id: int, user_id: int
+) -> Optional[Dict[str, Any]]:
+    """
+    État des effets de bord d'une tentative de ``user_id`` (None si inconnue).
+
+    Une tentative sans ligne outbox a été traitée inline : statut ``done``, le
+    résultat figurait déjà dans la réponse de soumission.
+    """
+    owned = (
+        db.query(Attempt.id)
+        .filter(Attempt.id == attempt_id, Attempt.user_id == user_id)
+        .first()
+    )
+    if owned is None:
+        return None
+    outbox = db.get(AttemptSideEffect, attempt_id)
+    payload: Dict[str, Any] = {
+        "attempt_id": attempt_id,
+        "status": outbox.status if outbox is not None else SIDE_EFFECTS_DONE,
+        "new_badges": None,
+        "badges_earned": None,
+        "progress_notification": None,
+    }
+    if outbox is not None and outbox.result:
+        payload.update(outbox.result)
+    return payload
+
+
+def get_attempt_side_effects_sync(
+    attempt_id: int, user_id: int
+) -> Optional[Dict[str, Any]]:
+    """Point d'entrée sync (run_db_bound) de get_attempt_side_effects_for_user."""
+    with sync_db_session() as db:
+        return get_attempt_side_effects_for_user(db, attempt_id, user_id)
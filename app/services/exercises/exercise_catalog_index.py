@@ -0,0 +1,316 @@
+"""
+Index catalogue des exercices en mémoire (un par worker).
+
+Sélection des candidats de recommandation sans requête filtrée sur ``exercises``
+(``LOWER(exercise_type)``, alias d'âge, fenêtre de tier : aucun index ne s'y
+prête). Les ids éligibles — actifs, non archivés, type et difficulté valides —
+sont rangés dans des ``array('i')`` triés, un par seau
+(type normalisé, âge en minuscules, difficulty_tier, difficulté). Une sélection
+est l'union des seaux retenus moins les ids exclus, parcourue par id décroissant
+jusqu'à ``limit`` ; seule la lecture des lignes retenues touche la base (par PK).
+
+- Construit au startup si EXERCISE_CATALOG_INDEX_ENABLED.
+- Tenu à jour au commit de toute création / modification / archivage /
+  suppression ORM d'un Exercise (events de session, comme app.utils.auth_cache).
+- Écritures des autres workers (et SQL brut) : relecture delta sur ``updated_at``
+  toutes les EXERCISE_CATALOG_INDEX_REFRESH_SECONDS.
+- Index froid (désactivé ou pas encore construit) : ``select_candidate_ids``
+  retourne None et l'appelant garde sa requête SQL.
+
+Les seaux sont en copie à l'écriture : un lecteur parcourt un instantané sans
+verrou. Mémoire : 4 octets par id + un en-tête par seau (``memory_bytes``),
+soit ~2 Mo pour 500k exercices.
+"""
+
+import heapq
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Collection, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.core.monitoring import record_exercise_catalog_index
+from app.db.base import SessionLocal
+from app.models.exercise import DifficultyLevel, Exercise, ExerciseType
+
+logger = get_logger(__name__)
+
+_SESSION_INFO_KEY = "exercise_catalog_changes"
+_VALID_TYPES = frozenset(t.value for t in ExerciseType)
+_VALID_DIFFICULTIES = frozenset(d.value for d in DifficultyLevel)
+# Colonnes qui déterminent le seau d'un exercice.
+_BUCKET_COLUMNS = (
+    "exercise_type",
+    "age_group",
+    "difficulty_tier",
+    "difficulty",
+    "is_active",
+    "is_archived",
+)
+# Une transaction ouverte avant le passage delta peut committer des lignes
+# horodatées avant lui : on relit avec ce recouvrement (ré-application idempotente).
+_DELTA_OVERLAP = timedelta(minutes=5)
+
+
+class CatalogBucket(NamedTuple):
+    exercise_type: str  # minuscules (aligné func.lower côté SQL)
+    age_group: str  # minuscules, "" si absent
+    difficulty_tier: Optional[int]
+    difficulty: str
+
+
+def _value(raw) -> Optional[str]:
+    if raw is None:
+        return None
+    return str(getattr(raw, "value", raw))
+
+
+def catalog_bucket(
+    exercise_type,
+    age_group,
+    difficulty_tier: Optional[int],
+    difficulty,
+    is_active: Optional[bool],
+    is_archived: Optional[bool],
+) -> Optional[CatalogBucket]:
+    """Seau d'un exercice, ou None s'il n'est pas recommandable."""
+    ex_type = _value(exercise_type)
+    diff = _value(difficulty)
+    if (
+        is_active is not True
+        or is_archived is not False
+        or ex_type not in _VALID_TYPES
+        or diff not in _VALID_DIFFICULTIES
+    ):
+        return None
+    return CatalogBucket(
+        ex_type.lower(), (_value(age_group) or "").lower(), difficulty_tier, diff
+    )
+
+
+_CATALOG_COLUMNS = (
+    Exercise.id,
+    Exercise.exercise_type,
+    Exercise.age_group,
+    Exercise.difficulty_tier,
+    Exercise.difficulty,
+    Exercise.is_active,
+    Exercise.is_archived,
+)
+
+
+class ExerciseCatalogIndex:
+    """Ids d'exercices éligibles par seau, sélection par union / exclusion en mémoire."""
+
+    def __init__(self):
+        self._buckets: Dict[CatalogBucket, array] = {}
+        self._lock = threading.Lock()
+        self._ready = False
+        self._watermark: Optional[datetime] = None
+        self._refreshed_at = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def build(self, db: Session) -> int:
+        """(Re)construit l'index depuis la base ; retourne le nombre d'exercices indexés."""
+        started = datetime.now(timezone.utc)
+        grouped: Dict[CatalogBucket, List[int]] = {}
+        rows = (
+            db.query(*_CATALOG_COLUMNS)
+            .filter(
+                Exercise.is_active.is_(True),
+                Exercise.is_archived.is_(False),
+                Exercise.exercise_type.in_(_VALID_TYPES),
+                Exercise.difficulty.in_(_VALID_DIFFICULTIES),
+            )
+            .yield_per(10_000)
+        )
+        for row in rows:
+            key = catalog_bucket(*row[1:])
+            if key is not None:
+                grouped.setdefault(key, []).append(row[0])
+        buckets = {key: array("i", sorted(ids)) for key, ids in grouped.items()}
+        with self._lock:
+            self._buckets = buckets
+            self._watermark = started
+            self._refreshed_at = time.monotonic()
+            self._ready = True
+        self._publish()
+        return len(self)
+
+    def apply(self, changes: Dict[int, Optional[CatalogBucket]]) -> None:
+        """Place chaque id dans son seau (None = retiré de l'index)."""
+        if not changes or not self._ready:
+            return
+        with self._lock:
+            buckets = dict(self._buckets)
+            copied = set()
+
+            def _writable(key: CatalogBucket) -> array:
+                if key not in copied:
+                    buckets[key] = array("i", buckets.get(key, ()))
+                    copied.add(key)
+                return buckets[key]
+
+            for exercise_id, target in changes.items():
+                already_placed = False
+                for key, ids in list(buckets.items()):
+                    pos = bisect_left(ids, exercise_id)
+                    if pos == len(ids) or ids[pos] != exercise_id:
+                        continue
+                    if key == target:
+                        already_placed = True
+                        continue
+                    del _writable(key)[pos]
+                    if not buckets[key]:
+                        del buckets[key]
+                        copied.discard(key)
+                if target is not None and not already_placed:
+                    insort(_writable(target), exercise_id)
+            self._buckets = buckets
+        self._publish()
+
+    def refresh_if_stale(self, db: Session) -> None:
+        """Relit les exercices modifiés depuis le dernier passage (autres workers, SQL brut)."""
+        if (
+            not self._ready
+            or time.monotonic() - self._refreshed_at
+            < settings.EXERCISE_CATALOG_INDEX_REFRESH_SECONDS
+        ):
+            return
+        started = datetime.now(timezone.utc)
+        since = self._watermark - _DELTA_OVERLAP
+        rows = db.query(*_CATALOG_COLUMNS).filter(Exercise.updated_at >= since).all()
+        self.apply({row[0]: catalog_bucket(*row[1:]) for row in rows})
+        with self._lock:
+            self._watermark = started
+            self._refreshed_at = time.monotonic()
+
+    def candidate_ids(
+        self,
+        match: Callable[[CatalogBucket], bool],
+        *,
+        exclude_ids: Collection[int] = (),
+        limit: int,
+    ) -> List[int]:
+        """Jusqu'à ``limit`` ids des seaux retenus par ``match``, décroissants, hors ``exclude_ids``."""
+        buckets = self._buckets
+        selected = [ids for key, ids in buckets.items() if match(key)]
+        picked: List[int] = []
+        for exercise_id in heapq.merge(*map(reversed, selected), reverse=True):
+            if exercise_id in exclude_ids:
+                continue
+            picked.append(exercise_id)
+            if len(picked) >= limit:
+                break
+        return picked
+
+    def memory_bytes(self) -> int:
+        """Estimation de la mémoire occupée (dict, clés, arrays et leurs données)."""
+        buckets = self._buckets
+        total = sys.getsizeof(buckets)
+        for key, ids in buckets.items():
+            total += sys.getsizeof(key) + sum(sys.getsizeof(part) for part in key)
+            total += sys.getsizeof(ids)
+        return total
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets = {}
+            self._ready = False
+            self._watermark = None
+
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self._buckets.values())
+
+    def _publish(self) -> None:
+        record_exercise_catalog_index(len(self), self.memory_bytes())
+
+
+exercise_catalog_index = ExerciseCatalogIndex()
+
+
+def build_exercise_catalog_index(
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> int:
+    """Construit l'index du worker (startup) ; retourne le nombre d'exercices indexés."""
+    db = session_factory()
+    try:
+        started = time.perf_counter()
+        count = exercise_catalog_index.build(db)
+        logger.info(
+            "Index catalogue exercices : {} exercice(s), {:.0f} Kio, {:.0f} ms",
+            count,
+            exercise_catalog_index.memory_bytes() / 1024,
+            (time.perf_counter() - started) * 1000,
+        )
+        return count
+    finally:
+        db.close()
+
+
+def select_candidate_ids(
+    db: Session,
+    match: Callable[[CatalogBucket], bool],
+    *,
+    exclude_ids: Collection[int] = (),
+    limit: int,
+) -> Optional[List[int]]:
+    """Ids candidats depuis l'index du worker, ou None si l'index est froid."""
+    if not exercise_catalog_index.ready:
+        return None
+    exercise_catalog_index.refresh_if_stale(db)
+    return exercise_catalog_index.candidate_ids(
+        match, exclude_ids=exclude_ids, limit=limit
+    )
+
+
+# ─── Mise à jour post-commit (events ORM) ─────────────────────────────────────
+
+
+def _bucket_of(obj: Exercise) -> Optional[CatalogBucket]:
+    return catalog_bucket(*(getattr(obj, name) for name in _BUCKET_COLUMNS))
+
+
+def _bucket_columns_changed(obj: Exercise) -> bool:
+    attrs = inspect(obj).attrs
+    return any(attrs[name].history.has_changes() for name in _BUCKET_COLUMNS)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_exercise_catalog_changes(session, _flush_context) -> None:
+    if not exercise_catalog_index.ready:
+        return
+    changes: Dict[int, Optional[CatalogBucket]] = {}
+    for obj in session.new:
+        if isinstance(obj, Exercise):
+            changes[obj.id] = _bucket_of(obj)
+    for obj in session.dirty:
+        if isinstance(obj, Exercise) and _bucket_columns_changed(obj):
+            changes[obj.id] = _bucket_of(obj)
+    for obj in session.deleted:
+        if isinstance(obj, Exercise):
+            changes[obj.id] = None
+    if changes:
+        session.info.setdefault(_SESSION_INFO_KEY, {}).update(changes)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed_exercise_catalog_changes(session) -> None:
+    changes = session.info.pop(_SESSION_INFO_KEY, None)
+    if changes:
+        exercise_catalog_index.apply(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_exercise_catalog_changes(session) -> None:
+    session.info.pop(_SESSION_INFO_KEY, None)
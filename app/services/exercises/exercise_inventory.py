@@ -0,0 +1,169 @@
+"""
+Inventaire d'exercices IA pré-générés : seaux (type × âge × bande pédagogique × locale).
+
+- ``serve_exercise_stream`` : point d'entrée du handler SSE. Une demande sans prompt
+  libre réserve le plus ancien exercice du seau (FOR UPDATE SKIP LOCKED), le publie
+  et retire la ligne dans la même transaction : le clic « exercice suivant » ne paie
+  plus l'appel OpenAI. Seau vide ou prompt libre : génération à la demande inchangée
+  (``generate_exercise_stream``).
+- ``exercise_stock`` : inventaire générique (app.services.core.content_inventory)
+  et son thread de refill (EXERCISE_INVENTORY_ENABLED), qui recomplète les seaux
+  par le pipeline complet (OpenAI, validation métier), un exercice à la fois : les
+  pics de demande sont lissés côté OpenAI.
+- Métriques : stock par seau, hit/miss, générations de refill et délai entre la
+  première demande sur un seau bas et sa recomplétion.
+
+Les générateurs locaux (``generate_simple_exercise``) ne passent pas par l'inventaire :
+ils produisent un exercice en quelques dizaines de µs, moins qu'une réservation en
+base.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.monitoring import (
+    record_exercise_inventory_level,
+    record_exercise_inventory_refill,
+    record_exercise_inventory_refill_lag,
+    record_exercise_inventory_serve,
+)
+from app.models.exercise_inventory import ExerciseInventoryItem
+from app.schemas.exercise import GenerateExerciseStreamContext
+from app.services.core.content_inventory import ContentInventory, sse_payloads
+from app.services.exercises import exercise_ai_service
+from app.utils.exercise_generator_validators import (
+    normalize_and_validate_exercise_params,
+)
+
+
+@dataclass(frozen=True)
+class ExerciseInventoryBucket:
+    """Clé de stock : mêmes prompts système et utilisateur pour tout le seau."""
+
+    exercise_type: str
+    age_group: str
+    pedagogical_band: Optional[str]
+    locale: str = "fr"
+
+
+def inventory_bucket_for(
+    context: GenerateExerciseStreamContext,
+) -> Optional[ExerciseInventoryBucket]:
+    """Seau d'une demande ; None si prompt libre (génération sur mesure)."""
+    if (context.prompt or "").strip():
+        return None
+    return ExerciseInventoryBucket(
+        exercise_type=context.exercise_type,
+        age_group=context.age_group,
+        pedagogical_band=context.pedagogical_band,
+        locale=context.locale or "fr",
+    )
+
+
+def _publish_exercise(
+    db: Session,
+    row: ExerciseInventoryItem,
+    bucket: ExerciseInventoryBucket,
+    user_id: Optional[int],
+) -> Dict[str, Any]:
+    """Crée l'Exercise servi à partir de la ligne réservée."""
+    exercise = dict(row.payload)
+    exercise_id = exercise_ai_service.create_generated_ai_exercise(
+        db, exercise, bucket.locale
+    )
+    if not exercise_id:
+        raise ValueError("Persistance exercice échouée (aucun id retourné)")
+    exercise["id"] = exercise_id
+    return exercise
+
+
+def stock_exercise_persist(
+    bucket: ExerciseInventoryBucket,
+) -> Callable[[Dict[str, Any], str], Optional[int]]:
+    """Persistance de substitution pour ``generate_exercise_stream`` : stock."""
+
+    def _stock(normalized_exercise: Dict[str, Any], locale: str = "fr") -> int:
+        return exercise_stock.stock(bucket, normalized_exercise)
+
+    return _stock
+
+
+async def generate_inventory_exercise(
+    bucket: ExerciseInventoryBucket, context: Optional[Dict[str, Any]] = None
+) -> bool:
+    """Génère un exercice du seau par le pipeline complet ; True s'il est stocké."""
+    _, age_group, derived_difficulty = normalize_and_validate_exercise_params(
+        bucket.exercise_type, bucket.age_group
+    )
+    stocked = False
+    async for event in exercise_ai_service.generate_exercise_stream(
+        bucket.exercise_type,
+        age_group,
+        derived_difficulty,
+        "",
+        pedagogical_band_override=bucket.pedagogical_band,
+        locale=bucket.locale,
+        persist=stock_exercise_persist(bucket),
+    ):
+        for payload in sse_payloads(event):
+            if payload.get("type") == "exercise":
+                stocked = True
+    record_exercise_inventory_refill(
+        bucket.exercise_type, "stocked" if stocked else "failed"
+    )
+    return stocked
+
+
+exercise_stock: ContentInventory[ExerciseInventoryBucket] = ContentInventory(
+    name="exercise",
+    label="exercices",
+    model=ExerciseInventoryItem,
+    bucket_cls=ExerciseInventoryBucket,
+    settings_prefix="EXERCISE_INVENTORY",
+    publish=_publish_exercise,
+    generate=generate_inventory_exercise,
+    record_serve=lambda bucket, result: record_exercise_inventory_serve(
+        bucket.exercise_type, result
+    ),
+    record_level=lambda bucket, count: record_exercise_inventory_level(
+        bucket.exercise_type,
+        bucket.age_group,
+        bucket.pedagogical_band,
+        bucket.locale,
+        count,
+    ),
+    record_refill_lag=record_exercise_inventory_refill_lag,
+)
+
+
+async def serve_exercise_stream(
+    context: GenerateExerciseStreamContext,
+) -> AsyncGenerator[str, None]:
+    """Flux SSE d'une demande d'exercice IA : stock du seau, sinon génération."""
+    bucket = (
+        inventory_bucket_for(context) if settings.EXERCISE_INVENTORY_ENABLED else None
+    )
+    if bucket is not None:
+        exercise = await exercise_stock.serve_from_stock(bucket)
+        if exercise is not None:
+            event = {"type": "exercise", "exercise": exercise}
+            yield f"data: {json.dumps(event)}\n\n"
+            yield f"data: {json.dumps({'type': 'done'})}\n\n"
+            return
+
+    async for event in exercise_ai_service.generate_exercise_stream(
+        exercise_type=context.exercise_type,
+        age_group=context.age_group,
+        derived_difficulty=context.derived_difficulty,
+        pedagogical_band_override=context.pedagogical_band,
+        prompt=context.prompt,
+        locale=context.locale,
+        user_id=context.user_id,
+    ):
+        yield event
@@ -9,6 +9,8 @@ Modèle A4 : fonctions sync exécutées via run_db_bound() depuis les handlers.
 
 from typing import Any, Dict, List, Optional
 
+from sqlalchemy.orm import Session
+
 from app.core.db_boundary import sync_db_session
 from app.schemas.exercise import (
     ExerciseListQuery,
@@ -38,17 +40,29 @@ def get_exercises_list_for_api_sync(
     Sync, exécuté via run_db_bound().
     """
     with sync_db_session() as db:
-        return ExerciseService.get_exercises_list_for_api(
-            db,
-            limit=query.limit,
-            skip=query.skip,
-            exercise_type=query.exercise_type,
-            age_group=query.age_group,
-            search=query.search,
-            order=query.order,
-            hide_completed=query.hide_completed,
-            user_id=user_id,
-        )
+        return query_exercises_list_for_api(db, query, user_id)
+
+
+def query_exercises_list_for_api(
+    db: Session,
+    query: ExerciseListQuery,
+    user_id: Optional[int] = None,
+) -> ExerciseListResponse:
+    """
+    Liste des exercices sur une session fournie (lecture seule).
+    Utilisé via run_db_read() depuis le handler.
+    """
+    return ExerciseService.get_exercises_list_for_api(
+        db,
+        limit=query.limit,
+        skip=query.skip,
+        exercise_type=query.exercise_type,
+        age_group=query.age_group,
+        search=query.search,
+        order=query.order,
+        hide_completed=query.hide_completed,
+        user_id=user_id,
+    )
 
 
 def get_interleaved_plan_for_api_sync(
@@ -3,7 +3,6 @@ Service pour la gestion des exercices mathématiques.
 Implémente les opérations métier liées aux exercices et utilise le transaction manager.
 """
 
-import random
 from typing import Any, Dict, List, Optional
 
 from sqlalchemy import String, cast
@@ -19,6 +18,8 @@ from app.schemas.exercise import (
     ExerciseListItem,
     ExerciseListResponse,
 )
+from app.services.badges.user_stats_rollup import record_exercise_attempt_stats
+from app.utils.catalog_sampling import catalog_totals_cache, sample_by_key
 from app.utils.json_utils import safe_parse_json
 from app.utils.response_formatters import format_paginated_response
 
@@ -355,7 +356,14 @@ class ExerciseService:
             search,
             completed_ids_to_exclude,
         )
-        total = count_query.count()
+        if completed_ids_to_exclude:
+            total = count_query.count()
+        else:
+            total = catalog_totals_cache.get_or_count(
+                db,
+                ("exercises", exercise_type, age_group, search),
+                count_query.count,
+            )
 
         # Requête select avec les mêmes filtres
         exercises_query = db.query(
@@ -385,22 +393,17 @@ class ExerciseService:
         )
 
         if order == "recent":
-            exercises_query = (
+            rows = (
                 exercises_query.order_by(Exercise.created_at.desc())
                 .limit(limit)
                 .offset(skip)
+                .all()
             )
+        elif skip >= total:
+            rows = []
         else:
-            # Optimisation: random_offset au lieu de ORDER BY RANDOM() (O(1) vs O(n))
-            max_offset = max(0, total - limit - skip)
-            random_offset_val = random.randint(0, max_offset) if max_offset > 0 else 0
-            exercises_query = (
-                exercises_query.order_by(Exercise.id)
-                .offset(skip + random_offset_val)
-                .limit(limit)
-            )
-
-        rows = exercises_query.all()
+            # Tirage par keyset sur sample_key (index) : ni OFFSET ni ORDER BY RANDOM()
+            rows = sample_by_key(exercises_query, Exercise.sample_key, limit)
 
         items = [
             ExerciseListItem(
@@ -610,6 +613,13 @@ class ExerciseService:
             db.add(attempt)
             db.flush()
             logger.info("Tentative créée avec ID: %s", attempt.id)
+            record_exercise_attempt_stats(
+                db,
+                attempt.user_id,
+                exercise.exercise_type,
+                bool(attempt.is_correct),
+                attempt.time_spent,
+            )
 
             # Log de l'action
             is_correct = attempt_data.get("is_correct", False)
@@ -70,19 +70,33 @@ def cumulative_points_at_level_start(level: int) -> int:
     if level <= 1:
         return 0
     total = 0
-    for L in range(1, level):
-        total += cost_to_advance_from_level(L)
-    return int(total)
+    lower = 1
+    for level_max, cost in LEVEL_UP_COST_SEGMENTS:
+        upper = min(level - 1, level_max)
+        if upper >= lower:
+            total += (upper - lower + 1) * cost
+        if level - 1 <= level_max:
+            return int(total)
+        lower = level_max + 1
+    return int(total + (level - lower) * LEVEL_UP_COST_SEGMENTS[-1][1])
 
 
 def level_and_xp_from_total_points(total_points: int) -> Tuple[int, int]:
     """Déduit (niveau, xp_dans_le_niveau) à partir de ``total_points`` (>= 0)."""
-    total = max(0, int(total_points))
+    # Parcours par palier (O(nb paliers)) : un solde de plusieurs millions de
+    # points ne doit pas coûter un niveau à la fois dans le classement.
+    remaining = max(0, int(total_points))
     level = 1
-    while cumulative_points_at_level_start(level + 1) <= total:
-        level += 1
-    xp = total - cumulative_points_at_level_start(level)
-    return int(level), int(xp)
+    for level_max, cost in LEVEL_UP_COST_SEGMENTS:
+        span = level_max - level + 1
+        if span <= 0:
+            continue
+        steps = min(span, remaining // cost)
+        level += steps
+        remaining -= steps * cost
+        if steps < span:
+            break
+    return int(level), int(remaining)
 
 
 def points_to_gain_next_level(current_level: int) -> int:
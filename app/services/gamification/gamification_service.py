@@ -21,6 +21,9 @@ from app.services.gamification.exceptions import (
     GamificationUserNotFoundError,
     InvalidGamificationPointsDeltaError,
 )
+from app.services.gamification.leaderboard_scores import (
+    record_points as record_leaderboard_points,
+)
 from app.services.gamification.point_source import PointEventSourceType
 
 logger = get_logger(__name__)
@@ -113,6 +116,7 @@ class GamificationService:
         )
         db.add(event)
         db.flush()
+        record_leaderboard_points(db, user_id, points_delta)
 
         payload = GamificationService.build_level_indicator_payload(user)
         logger.info(
@@ -0,0 +1,277 @@
+"""
+Scores de classement matérialisés pour les périodes ``week`` / ``month``.
+
+Écriture : ``record_points`` (appelé par GamificationService.apply_points dans la même
+transaction) incrémente le bucket du jour et le score de chaque période.
+
+Fenêtres glissantes à la journée UTC : ``week`` = aujourd'hui + 6 jours précédents,
+``month`` = aujourd'hui + 29. ``roll_leaderboard_windows`` retranche les jours sortis
+de la fenêtre (au plus une fois par jour et par période, verrou sur la ligne fenêtre) ;
+``rebuild_leaderboard_scores`` recalcule tout depuis ``point_events`` (backfill,
+réparation).
+"""
+
+from __future__ import annotations
+
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import and_, delete, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from app.core.leaderboard_period import (
+    LEADERBOARD_PERIOD_MONTH_ROLLING_DAYS,
+    LEADERBOARD_PERIOD_WEEK_DAYS,
+    LeaderboardPeriod,
+)
+from app.core.logging_config import get_logger
+from app.models.leaderboard_score import (
+    LeaderboardPeriodScore,
+    LeaderboardPeriodWindow,
+    UserDailyPoints,
+)
+from app.models.point_event import PointEvent
+
+logger = get_logger(__name__)
+
+PERIOD_WINDOW_DAYS: Dict[LeaderboardPeriod, int] = {
+    LeaderboardPeriod.WEEK: LEADERBOARD_PERIOD_WEEK_DAYS,
+    LeaderboardPeriod.MONTH: LEADERBOARD_PERIOD_MONTH_ROLLING_DAYS,
+}
+_MAX_WINDOW_DAYS = max(PERIOD_WINDOW_DAYS.values())
+
+_rolled_on: Optional[date] = None
+_rolled_lock = threading.Lock()
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def period_window_start(period: LeaderboardPeriod, today: date) -> date:
+    """Premier jour UTC inclus dans la fenêtre de ``period``."""
+    return today - timedelta(days=PERIOD_WINDOW_DAYS[period] - 1)
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _upsert_increment(db: Session, model, keys: Dict, column: str, delta: int) -> None:
+    """INSERT … ON CONFLICT DO UPDATE column = column + delta (repli ORM hors PostgreSQL)."""
+    if _is_postgres(db):
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        table = model.__table__
+        stmt = pg_insert(table).values(**keys, **{column: delta})
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={column: table.c[column] + stmt.excluded[column]},
+        )
+        db.execute(stmt)
+        return
+
+    row = db.get(model, tuple(keys.values()))
+    if row is None:
+        db.add(model(**keys, **{column: delta}))
+    else:
+        setattr(row, column, int(getattr(row, column) or 0) + delta)
+
+
+def record_points(
+    db: Session, user_id: int, points_delta: int, *, day: Optional[date] = None
+) -> None:
+    """Ajoute ``points_delta`` au bucket du jour et aux scores week / month (sans commit)."""
+    day = day or utc_today()
+    _upsert_increment(
+        db, UserDailyPoints, {"user_id": user_id, "day": day}, "points", points_delta
+    )
+    for period in PERIOD_WINDOW_DAYS:
+        _upsert_increment(
+            db,
+            LeaderboardPeriodScore,
+            {"period": str(period), "user_id": user_id},
+            "score",
+            points_delta,
+        )
+
+
+def _rebuild_period_from_buckets(
+    db: Session, period: LeaderboardPeriod, window_start: date
+) -> None:
+    db.execute(
+        delete(LeaderboardPeriodScore).where(
+            LeaderboardPeriodScore.period == str(period)
+        )
+    )
+    totals = (
+        select(
+            literal(str(period)),
+            UserDailyPoints.user_id,
+            func.sum(UserDailyPoints.points),
+        )
+        .where(UserDailyPoints.day >= window_start)
+        .group_by(UserDailyPoints.user_id)
+        .having(func.sum(UserDailyPoints.points) > 0)
+    )
+    db.execute(
+        insert(LeaderboardPeriodScore).from_select(
+            ["period", "user_id", "score"], totals
+        )
+    )
+
+
+def _claim_window(
+    db: Session, period: LeaderboardPeriod, window_start: date
+) -> Optional[LeaderboardPeriodWindow]:
+    """
+    Ligne fenêtre verrouillée (FOR UPDATE), ou None si elle vient d'être créée —
+    la création est atomique (ON CONFLICT DO NOTHING) : un seul process reconstruit.
+    """
+    if _is_postgres(db):
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        created = db.execute(
+            pg_insert(LeaderboardPeriodWindow)
+            .values(period=str(period), window_start=window_start)
+            .on_conflict_do_nothing(index_elements=["period"])
+        ).rowcount
+        if created:
+            return None
+        return (
+            db.query(LeaderboardPeriodWindow)
+            .filter(LeaderboardPeriodWindow.period == str(period))
+            .with_for_update()
+            .one()
+        )
+
+    window = db.get(LeaderboardPeriodWindow, str(period))
+    if window is None:
+        db.add(LeaderboardPeriodWindow(period=str(period), window_start=window_start))
+        db.flush()
+    return window
+
+
+def roll_leaderboard_windows(db: Session, today: Optional[date] = None) -> None:
+    """
+    Avance les fenêtres week / month jusqu'à ``today`` (sans commit).
+
+    Les jours sortis sont retranchés en un UPDATE … FROM agrégé sur les buckets
+    concernés ; une fenêtre encore absente est reconstruite depuis les buckets.
+    """
+    today = today or utc_today()
+    for period in PERIOD_WINDOW_DAYS:
+        new_start = period_window_start(period, today)
+        window = _claim_window(db, period, new_start)
+        if window is None:
+            _rebuild_period_from_buckets(db, period, new_start)
+            logger.info("Classement {} initialisé depuis {}", period, new_start)
+            continue
+        if window.window_start >= new_start:
+            continue
+
+        expired = (
+            select(
+                UserDailyPoints.user_id.label("uid"),
+                func.sum(UserDailyPoints.points).label("pts"),
+            )
+            .where(
+                UserDailyPoints.day >= window.window_start,
+                UserDailyPoints.day < new_start,
+            )
+            .group_by(UserDailyPoints.user_id)
+            .subquery()
+        )
+        db.execute(
+            update(LeaderboardPeriodScore)
+            .where(
+                and_(
+                    LeaderboardPeriodScore.period == str(period),
+                    LeaderboardPeriodScore.user_id == expired.c.uid,
+                )
+            )
+            .values(score=LeaderboardPeriodScore.score - expired.c.pts)
+            .execution_options(synchronize_session=False)
+        )
+        db.execute(
+            delete(LeaderboardPeriodScore)
+            .where(
+                LeaderboardPeriodScore.period == str(period),
+                LeaderboardPeriodScore.score <= 0,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        logger.info(
+            "Classement {} : fenêtre {} → {}", period, window.window_start, new_start
+        )
+        window.window_start = new_start
+
+    db.execute(
+        delete(UserDailyPoints)
+        .where(UserDailyPoints.day < today - timedelta(days=_MAX_WINDOW_DAYS - 1))
+        .execution_options(synchronize_session=False)
+    )
+    db.flush()
+
+
+def rebuild_leaderboard_scores(db: Session, today: Optional[date] = None) -> None:
+    """
+    Recalcule buckets + scores depuis ``point_events`` (sans commit).
+
+    Backfill initial et réparation après modification directe du ledger.
+    """
+    today = today or utc_today()
+    oldest = today - timedelta(days=_MAX_WINDOW_DAYS - 1)
+    oldest_ts = datetime.combine(oldest, datetime.min.time(), tzinfo=timezone.utc)
+
+    db.execute(delete(UserDailyPoints).execution_options(synchronize_session=False))
+    if _is_postgres(db):
+        event_day = func.date(func.timezone("UTC", PointEvent.created_at))
+    else:
+        event_day = func.date(PointEvent.created_at)
+    db.execute(
+        insert(UserDailyPoints).from_select(
+            ["user_id", "day", "points"],
+            select(PointEvent.user_id, event_day, func.sum(PointEvent.points_delta))
+            .where(PointEvent.created_at >= oldest_ts)
+            .group_by(PointEvent.user_id, event_day),
+        )
+    )
+    for period in PERIOD_WINDOW_DAYS:
+        start = period_window_start(period, today)
+        _rebuild_period_from_buckets(db, period, start)
+        window = db.get(LeaderboardPeriodWindow, str(period))
+        if window is None:
+            db.add(LeaderboardPeriodWindow(period=str(period), window_start=start))
+        else:
+            window.window_start = start
+    db.flush()
+
+
+def ensure_leaderboard_windows_current() -> None:
+    """
+    Bascule quotidienne paresseuse, appelée avant les lectures week / month.
+
+    Mémorisée par process : au plus une transaction par jour UTC et par worker.
+    """
+    global _rolled_on
+
+    today = utc_today()
+    if _rolled_on == today:
+        return
+    from app.utils.db_utils import sync_db_session
+
+    with _rolled_lock:
+        if _rolled_on == today:
+            return
+        with sync_db_session() as db:
+            roll_leaderboard_windows(db, today)
+            db.commit()
+        _rolled_on = today
+
+
+def reset_leaderboard_roll_marker() -> None:
+    """Force la prochaine vérification de fenêtre (tests, après rebuild)."""
+    global _rolled_on
+    _rolled_on = None
@@ -1,10 +1,18 @@
 """
 Service de calcul de la série d'entraînement (streak).
 
-Jours consécutifs avec au moins une activité (exercice ou défi).
+Jours consécutifs (UTC) avec au moins une activité (exercice ou défi).
+
+- ``update_user_streak`` : mise à jour O(1) à chaque tentative, à partir de
+  ``users.last_activity_date`` / ``current_streak`` / ``best_streak``.
+  ``current_streak`` est la série arrêtée au dernier jour d'activité.
+- ``check_user_streak`` / ``reconcile_user_streak`` : recalcul depuis l'historique
+  (attempts + logic_challenge_attempts) pour détecter et corriger une dérive
+  (scripts/reconcile_user_streaks.py).
 """
 
 from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
 
 from sqlalchemy import func
 from sqlalchemy.orm import Session
@@ -17,23 +25,26 @@ from app.models.user import User
 logger = get_logger(__name__)
 
 
+def _utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
 def _activity_dates_for_user(db: Session, user_id: int) -> set[date]:
     """Retourne l'ensemble des dates (UTC) où l'utilisateur a eu une activité."""
     dates = set()
 
     # Dates des tentatives exercices
+    attempt_day = func.date(func.timezone("UTC", Attempt.created_at))
     for (d,) in (
-        db.query(func.date(Attempt.created_at))
-        .filter(Attempt.user_id == user_id)
-        .distinct()
-        .all()
+        db.query(attempt_day).filter(Attempt.user_id == user_id).distinct().all()
     ):
         if d:
             dates.add(d)
 
     # Dates des tentatives défis
+    challenge_day = func.date(func.timezone("UTC", LogicChallengeAttempt.created_at))
     for (d,) in (
-        db.query(func.date(LogicChallengeAttempt.created_at))
+        db.query(challenge_day)
         .filter(LogicChallengeAttempt.user_id == user_id)
         .distinct()
         .all()
@@ -60,32 +71,106 @@ def compute_streak(activity_dates: set[date], reference_date: date) -> int:
     return count
 
 
+def compute_best_streak(activity_dates: set[date]) -> int:
+    """Plus longue série de jours consécutifs de l'historique."""
+    best = 0
+    for d in activity_dates:
+        # Ne compter qu'à partir du dernier jour de chaque série.
+        if d + timedelta(days=1) not in activity_dates:
+            best = max(best, compute_streak(activity_dates, d))
+    return best
+
+
+def advance_streak(
+    current: int, best: int, last_activity: Optional[date], today: date
+) -> Tuple[int, int]:
+    """
+    Série après une activité le jour ``today`` (O(1)).
+
+    Même jour : inchangée ; lendemain du dernier jour actif : +1 ; sinon repart à 1.
+    """
+    if last_activity == today:
+        current = max(current, 1)
+    elif last_activity is not None and today - last_activity == timedelta(days=1):
+        current += 1
+    else:
+        current = 1
+    return current, max(best, current)
+
+
 def update_user_streak(
-    db: Session, user_id: int, *, auto_commit: bool = True
+    db: Session,
+    user_id: int,
+    *,
+    auto_commit: bool = True,
+    today: Optional[date] = None,
 ) -> tuple[int, int]:
     """
-    Recalcule et met à jour le streak de l'utilisateur.
+    Met à jour le streak après une activité du jour (sans relire l'historique).
     Retourne (current_streak, best_streak).
     """
-    today = date.today()
-    activity_dates = _activity_dates_for_user(db, user_id)
-    current = compute_streak(activity_dates, today)
-
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         return (0, 0)
 
-    prev_best = user.best_streak or 0
-    best = max(prev_best, current)
+    today = today or _utc_today()
+    last_activity = user.last_activity_date
+    if last_activity is not None and last_activity > today:
+        # Horloge revenue en arrière : ne pas réécrire une date future.
+        return (user.current_streak or 0, user.best_streak or 0)
 
+    current, best = advance_streak(
+        user.current_streak or 0, user.best_streak or 0, last_activity, today
+    )
     user.current_streak = current
     user.best_streak = best
-    user.last_activity_date = (
-        today if today in activity_dates else user.last_activity_date
-    )
+    user.last_activity_date = today
     if auto_commit:
         db.commit()
     else:
         db.flush()
 
     return (current, best)
+
+
+def streak_from_history(db: Session, user_id: int) -> Dict[str, Any]:
+    """Valeurs de streak recalculées depuis l'historique complet (référence)."""
+    activity_dates = _activity_dates_for_user(db, user_id)
+    if not activity_dates:
+        return {"current_streak": 0, "best_streak": 0, "last_activity_date": None}
+    last_activity = max(activity_dates)
+    return {
+        "current_streak": compute_streak(activity_dates, last_activity),
+        "best_streak": compute_best_streak(activity_dates),
+        "last_activity_date": last_activity,
+    }
+
+
+def check_user_streak(db: Session, user_id: int) -> Dict[str, Tuple[Any, Any]]:
+    """Écarts ``{champ: (stocké, recalculé)}`` entre users et l'historique ({} si cohérent)."""
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        return {}
+    stored = {
+        "current_streak": user.current_streak or 0,
+        "best_streak": user.best_streak or 0,
+        "last_activity_date": user.last_activity_date,
+    }
+    computed = streak_from_history(db, user_id)
+    return {
+        field: (stored[field], computed[field])
+        for field in stored
+        if stored[field] != computed[field]
+    }
+
+
+def reconcile_user_streak(db: Session, user_id: int) -> Dict[str, Tuple[Any, Any]]:
+    """Réaligne le streak stocké sur l'historique (flush, sans commit) ; retourne les écarts."""
+    mismatches = check_user_streak(db, user_id)
+    if mismatches:
+        user = db.query(User).filter(User.id == user_id).first()
+        for field, (_stored, computed) in mismatches.items():
+            setattr(user, field, computed)
+        db.flush()
+        logger.info("Streak utilisateur {} réaligné: {}", user_id, sorted(mismatches))
+    return mismatches
@@ -0,0 +1,389 @@
+"""
+Rafraîchissement des recommandations hors requête HTTP.
+
+- ``notify_progress_changed(user_id)`` : appelé après le commit d'une tentative
+  (exercice ou défi). Invalide le cache de lecture du worker et, si
+  RECOMMENDATION_REFRESH_ASYNC, planifie une régénération différée.
+- ``RecommendationRefreshScheduler`` : debounce par utilisateur (un lot de
+  tentatives rapprochées = une seule régénération), borné par
+  RECOMMENDATION_REFRESH_MAX_DELAY_SECONDS ; à l'échéance le job est confié à la
+  file post-commit (threads du worker).
+- ``RecommendationReadCache`` : liste API formatée par utilisateur, TTL
+  RECOMMENDATION_READ_CACHE_TTL_SECONDS (0 = désactivé), par worker.
+- ``get_recommendation_freshness`` : métadonnées de fraîcheur (date de
+  génération, âge, stale, régénération en attente).
+- ``refresh_active_users`` : régénération de tous les utilisateurs actifs
+  répartie sur un pool de process (job nocturne, scripts/refresh_recommendations.py).
+
+Planification en mémoire, non durable : une régénération perdue (arrêt du worker)
+se voit comme ``stale`` et est rattrapée par le job nocturne.
+"""
+
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.core.post_commit import enqueue_post_commit, register_post_commit_handler
+from app.models.progress import Progress
+from app.models.recommendation import Recommendation
+from app.models.user import User
+
+logger = get_logger(__name__)
+
+RECOMMENDATION_REFRESH_JOB = "recommendation_refresh"
+_RUNNING_TIMEOUT_SECONDS = 300.0
+
+
+class RecommendationReadCache:
+    """Liste API formatée par (utilisateur, limite), expirée après ``ttl_sec``."""
+
+    def __init__(self, ttl_sec: float, max_entries: int):
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # (user_id, limit) -> (expire_at, result, displayed_ids)
+        self._entries: Dict[Tuple[int, int], Tuple[float, List[dict], List[int]]] = {}
+
+    def get(self, user_id: int, limit: int) -> Optional[Tuple[List[dict], List[int]]]:
+        if self.ttl_sec <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get((user_id, limit))
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[(user_id, limit)]
+                return None
+            return entry[1], entry[2]
+
+    def set(
+        self, user_id: int, limit: int, result: List[dict], displayed_ids: List[int]
+    ) -> None:
+        if self.ttl_sec <= 0:
+            return
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                # Plus ancienne insertion d'abord (ordre du dict).
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[(user_id, limit)] = (
+                time.monotonic() + self.ttl_sec,
+                result,
+                displayed_ids,
+            )
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+recommendation_read_cache = RecommendationReadCache(
+    ttl_sec=settings.RECOMMENDATION_READ_CACHE_TTL_SECONDS,
+    max_entries=settings.RECOMMENDATION_READ_CACHE_MAX_ENTRIES,
+)
+
+
+class RecommendationRefreshScheduler:
+    """Debounce par utilisateur ; les échéances sont confiées à la file post-commit."""
+
+    def __init__(self, debounce_sec: float, max_delay_sec: float):
+        self.debounce_sec = debounce_sec
+        self.max_delay_sec = max_delay_sec
+        self._cond = threading.Condition()
+        # user_id -> (premier changement, échéance), en temps monotone
+        self._due: Dict[int, Tuple[float, float]] = {}
+        # user_id -> instant de remise à la file (job en attente ou en cours)
+        self._running: Dict[int, float] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def schedule(self, user_id: int) -> None:
+        """(Re)planifie la régénération ; chaque appel repousse l'échéance du debounce."""
+        now = time.monotonic()
+        with self._cond:
+            if self._stopped:
+                return
+            first = self._due.get(user_id, (now, now))[0]
+            self._due[user_id] = (
+                first,
+                min(now + self.debounce_sec, first + self.max_delay_sec),
+            )
+            self._ensure_started()
+            self._cond.notify()
+
+    def is_pending(self, user_id: int) -> bool:
+        """Régénération planifiée ou en cours dans ce worker."""
+        with self._cond:
+            return user_id in self._due or self._is_running(user_id, time.monotonic())
+
+    def _is_running(self, user_id: int, now: float) -> bool:
+        # Un job perdu (file post-commit saturée) ne bloque pas indéfiniment.
+        started = self._running.get(user_id)
+        return started is not None and now - started < _RUNNING_TIMEOUT_SECONDS
+
+    def refresh_now(self, user_id: int) -> bool:
+        """Confie la régénération sans attendre ; False si déjà en cours."""
+        with self._cond:
+            if self._is_running(user_id, time.monotonic()):
+                return False
+            self._due.pop(user_id, None)
+            self._running[user_id] = time.monotonic()
+        enqueue_post_commit(RECOMMENDATION_REFRESH_JOB, user_id)
+        return True
+
+    def flush(self) -> List[int]:
+        """Confie immédiatement toutes les régénérations planifiées (tests, arrêt)."""
+        with self._cond:
+            user_ids = list(self._due)
+            self._due.clear()
+            now = time.monotonic()
+            self._running.update((user_id, now) for user_id in user_ids)
+        for user_id in user_ids:
+            enqueue_post_commit(RECOMMENDATION_REFRESH_JOB, user_id)
+        return user_ids
+
+    def mark_done(self, user_id: int) -> None:
+        with self._cond:
+            self._running.pop(user_id, None)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Arrête le thread ; les échéances non atteintes sont abandonnées (voir stale)."""
+        with self._cond:
+            self._stopped = True
+            self._due.clear()
+            self._cond.notify()
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+        with self._cond:
+            # Réutilisable : le prochain ``schedule`` redémarre un thread.
+            self._stopped = False
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="mathakine-recommendation-refresh", daemon=True
+        )
+        self._thread.start()
+
+    def _take_due(self) -> Optional[List[int]]:
+        """Attend la prochaine échéance ; None à l'arrêt."""
+        with self._cond:
+            while not self._stopped:
+                now = time.monotonic()
+                ready = [uid for uid, (_, due) in self._due.items() if due <= now]
+                if ready:
+                    for user_id in ready:
+                        del self._due[user_id]
+                        self._running[user_id] = now
+                    return ready
+                next_due = min((due for _, due in self._due.values()), default=None)
+                self._cond.wait(None if next_due is None else next_due - now)
+            return None
+
+    def _run(self) -> None:
+        while True:
+            ready = self._take_due()
+            if ready is None:
+                return
+            for user_id in ready:
+                enqueue_post_commit(RECOMMENDATION_REFRESH_JOB, user_id)
+
+
+recommendation_refresh_scheduler = RecommendationRefreshScheduler(
+    debounce_sec=settings.RECOMMENDATION_REFRESH_DEBOUNCE_SECONDS,
+    max_delay_sec=settings.RECOMMENDATION_REFRESH_MAX_DELAY_SECONDS,
+)
+
+
+def notify_progress_changed(user_id: int) -> None:
+    """À appeler après le commit d'une tentative : cache invalidé, régénération planifiée."""
+    recommendation_read_cache.invalidate(user_id)
+    if settings.RECOMMENDATION_REFRESH_ASYNC:
+        recommendation_refresh_scheduler.schedule(user_id)
+
+
+def request_recommendation_refresh(user_id: int) -> None:
+    """Régénération immédiate (lecture sans aucune reco active), sans doublon en cours."""
+    recommendation_refresh_scheduler.refresh_now(user_id)
+
+
+def refresh_user_recommendations(user_id: int) -> bool:
+    """Job : régénère les recommandations d'un utilisateur dans sa propre session."""
+    from app.core.db_boundary import sync_db_session
+    from app.services.recommendation.recommendation_service import (
+        RecommendationService,
+    )
+
+    try:
+        with sync_db_session() as db:
+            RecommendationService.generate_recommendations(
+                db, user_id, raise_errors=True
+            )
+        recommendation_read_cache.invalidate(user_id)
+        return True
+    finally:
+        recommendation_refresh_scheduler.mark_done(user_id)
+
+
+register_post_commit_handler(RECOMMENDATION_REFRESH_JOB, refresh_user_recommendations)
+
+
+def get_recommendation_freshness(db: Session, user_id: int) -> Dict[str, Any]:
+    """
+    Fraîcheur des recommandations actives d'un utilisateur.
+
+    ``stale`` : aucune reco active, génération plus ancienne que
+    RECOMMENDATION_STALE_AFTER_SECONDS, ou progression mise à jour depuis.
+    """
+    generated_at, progress_at = db.execute(
+        select(
+            select(func.max(Recommendation.created_at))
+            .where(
+                Recommendation.user_id == user_id,
+                Recommendation.is_completed.is_(False),
+            )
+            .scalar_subquery(),
+            select(func.max(Progress.last_updated))
+            .where(Progress.user_id == user_id)
+            .scalar_subquery(),
+        )
+    ).one()
+    age_seconds = None
+    stale = True
+    if generated_at is not None:
+        if generated_at.tzinfo is None:
+            generated_at = generated_at.replace(tzinfo=timezone.utc)
+        age_seconds = max(
+            0, int((datetime.now(timezone.utc) - generated_at).total_seconds())
+        )
+        if progress_at is not None and progress_at.tzinfo is None:
+            progress_at = progress_at.replace(tzinfo=timezone.utc)
+        stale = age_seconds > settings.RECOMMENDATION_STALE_AFTER_SECONDS or (
+            progress_at is not None and progress_at > generated_at
+        )
+    return {
+        "generated_at": generated_at.isoformat() if generated_at else None,
+        "age_seconds": age_seconds,
+        "stale": stale,
+        "refresh_pending": recommendation_refresh_scheduler.is_pending(user_id),
+    }
+
+
+# ─── Job nocturne : tous les utilisateurs actifs ──────────────────────────────
+
+
+def iter_active_user_ids(
+    db: Session, active_days: int, batch_size: int
+) -> Iterator[List[int]]:
+    """Ids (par lots, ordre croissant) des comptes actifs avec activité récente."""
+    since = datetime.now(timezone.utc).date() - timedelta(days=active_days)
+    last_id = 0
+    while True:
+        ids = list(
+            db.scalars(
+                select(User.id)
+                .where(
+                    User.id > last_id,
+                    User.is_active.is_(True),
+                    User.last_activity_date >= since,
+                )
+                .order_by(User.id)
+                .limit(batch_size)
+            )
+        )
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+
+def _init_refresh_process() -> None:
+    # Connexions héritées du parent (fork) : jamais réutilisées dans l'enfant.
+    from app.db.base import engine
+
+    engine.dispose(close=False)
+
+
+def refresh_user_batch(user_ids: List[int]) -> Tuple[int, int]:
+    """Régénère un lot dans une session ; retourne (réussis, échecs)."""
+    from app.db.base import SessionLocal
+    from app.services.recommendation.recommendation_service import (
+        RecommendationService,
+    )
+
+    done = failed = 0
+    db = SessionLocal()
+    try:
+        for user_id in user_ids:
+            try:
+                RecommendationService.generate_recommendations(
+                    db, user_id, raise_errors=True
+                )
+                done += 1
+            except Exception:
+                db.rollback()
+                failed += 1
+                logger.exception(
+                    "Régénération recommandations user {} en échec", user_id
+                )
+    finally:
+        db.close()
+    return done, failed
+
+
+def refresh_active_users(
+    db: Session,
+    *,
+    workers: int,
+    active_days: int = 30,
+    batch_size: int = 100,
+) -> Dict[str, int]:
+    """
+    Régénère les recommandations des utilisateurs actifs.
+
+    Lots de ``batch_size`` ids répartis sur ``workers`` process (1 = dans ce
+    process). Retourne ``{"users": …, "done": …, "failed": …}``.
+    """
+    batches = iter_active_user_ids(db, active_days, batch_size)
+    totals = {"users": 0, "done": 0, "failed": 0}
+
+    def _add(batch: List[int], result: Tuple[int, int]) -> None:
+        totals["users"] += len(batch)
+        totals["done"] += result[0]
+        totals["failed"] += result[1]
+
+    if workers <= 1:
+        for batch in batches:
+            _add(batch, refresh_user_batch(batch))
+        return totals
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_refresh_process
+    ) as pool:
+        # Fenêtre bornée de lots en vol : la liste des ids n'est jamais entière en mémoire.
+        in_flight: Dict[Any, List[int]] = {}
+        for batch in batches:
+            in_flight[pool.submit(refresh_user_batch, batch)] = batch
+            if len(in_flight) >= workers * 2:
+                future = next(iter(in_flight))
+                _add(in_flight.pop(future), future.result())
+        for future, batch in in_flight.items():
+            _add(batch, future.result())
+    return totals
@@ -1,18 +1,41 @@
 from collections import Counter
 from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
-from sqlalchemy import and_, exists, or_
+from sqlalchemy import (
+    Integer,
+    and_,
+    exists,
+    insert,
+    literal,
+    or_,
+    select,
+    union_all,
+)
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import selectinload
 from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.sql import func
 
+from app.core.config import settings
 from app.core.constants import AgeGroups, normalize_age_group
 from app.core.difficulty_tier import (
+    DIFFICULTY_TIER_MAX,
+    DIFFICULTY_TIER_MIN,
     compute_user_target_difficulty_tier,
     exercise_tier_filter_expression,
+    exercise_tier_matches,
 )
 from app.core.logging_config import get_logger
 from app.models.attempt import Attempt
@@ -21,6 +44,10 @@ from app.models.logic_challenge import AgeGroup, LogicChallenge, LogicChallengeA
 from app.models.progress import Progress
 from app.models.recommendation import Recommendation
 from app.models.user import User
+from app.services.exercises.exercise_catalog_index import (
+    CatalogBucket,
+    select_candidate_ids,
+)
 from app.services.recommendation.recommendation_exercise_ranking import (
     MAX_CANDIDATES_TO_RANK,
     collect_recent_recommended_exercise_ids,
@@ -43,6 +70,11 @@ from app.services.recommendation.recommendation_exercise_reasons import (
     params_maintenance,
     params_progression,
 )
+from app.services.recommendation.recommendation_refresh import (
+    get_recommendation_freshness,
+    recommendation_read_cache,
+    request_recommendation_refresh,
+)
 from app.services.recommendation.recommendation_user_context import (
     build_recommendation_user_context,
     get_target_difficulty_for_type,
@@ -289,16 +321,285 @@ def _select_logic_challenge_recommendation_entries(
 # --- R2 — Contexte utilisateur : diagnostic par type (``RecommendationUserContext``) ---
 
 
+def _exercise_age_values(user_age_group: str) -> Optional[Tuple[str, ...]]:
+    """Valeurs ``LOWER(age_group)`` acceptées pour l'âge utilisateur (None = tous âges)."""
+    if user_age_group == AgeGroups.ALL_AGES:
+        return None
+    age_values = [
+        str(v).lower()
+        for v in AgeGroups.AGE_ALIASES.get(user_age_group, [user_age_group])
+    ]
+    age_values.extend(["tous-ages", "tous ages", "all_ages"])
+    return tuple(age_values)
+
+
+class _CandidateSpec(NamedTuple):
+    """Critères d'un pool de candidats (une section × un type d'exercice)."""
+
+    ex_type: Optional[str]
+    user_tier: Optional[int]
+    target_difficulty: Optional[str]
+    age_values: Optional[Tuple[str, ...]] = None
+    # Fallback : tier absent ou dans la fenêtre ±1, toutes difficultés.
+    any_difficulty: bool = False
+
+
+class _SectionPick(NamedTuple):
+    """Recommandation(s) d'exercice prévue(s) par une section, avant classement."""
+
+    spec: _CandidateSpec
+    count: int
+    priority: int
+    reason_code: str
+    reason_params: Dict[str, Any]
+    reason: str
+
+
+def _fallback_tier_window(user_tier: int) -> Tuple[int, int]:
+    return (
+        max(DIFFICULTY_TIER_MIN, user_tier - 1),
+        min(DIFFICULTY_TIER_MAX, user_tier + 1),
+    )
+
+
+def _candidate_bucket_match(spec: _CandidateSpec) -> Callable[[CatalogBucket], bool]:
+    """Prédicat de seau (index catalogue) équivalent à ``_candidate_filters``."""
+    age_set = frozenset(spec.age_values) if spec.age_values is not None else None
+    if spec.any_difficulty and spec.user_tier is not None:
+        lo, hi = _fallback_tier_window(spec.user_tier)
+
+    def _tier_ok(bucket: CatalogBucket) -> bool:
+        if not spec.any_difficulty:
+            return exercise_tier_matches(
+                spec.user_tier,
+                spec.target_difficulty,
+                bucket.difficulty_tier,
+                bucket.difficulty,
+            )
+        return (
+            spec.user_tier is None
+            or bucket.difficulty_tier is None
+            or lo <= bucket.difficulty_tier <= hi
+        )
+
+    def _match(bucket: CatalogBucket) -> bool:
+        return (
+            (spec.ex_type is None or bucket.exercise_type == spec.ex_type)
+            and (age_set is None or bucket.age_group in age_set)
+            and _tier_ok(bucket)
+        )
+
+    return _match
+
+
+def _candidate_filters(spec: _CandidateSpec) -> list:
+    """Filtres SQL d'un pool (F42 : fenêtre tier ±1 + legacy), hors exclusion des réussis."""
+    ex_filter = [
+        Exercise.exercise_type.in_([t.value for t in ExerciseType]),
+        Exercise.difficulty.in_([d.value for d in DifficultyLevel]),
+        Exercise.is_archived.is_(False),
+        Exercise.is_active.is_(True),
+    ]
+    if spec.ex_type is not None:
+        ex_filter.append(func.lower(Exercise.exercise_type) == spec.ex_type)
+    if not spec.any_difficulty:
+        ex_filter.append(
+            exercise_tier_filter_expression(spec.user_tier, spec.target_difficulty)
+        )
+    elif spec.user_tier is not None:
+        lo, hi = _fallback_tier_window(spec.user_tier)
+        ex_filter.append(
+            or_(
+                Exercise.difficulty_tier.is_(None),
+                Exercise.difficulty_tier.between(lo, hi),
+            )
+        )
+    if spec.age_values is not None:
+        ex_filter.append(func.lower(Exercise.age_group).in_(spec.age_values))
+    return ex_filter
+
+
+def _not_solved_by(user_id: int):
+    """Anti-jointure : l'exercice n'a aucune tentative correcte de l'utilisateur."""
+    return ~exists().where(
+        Attempt.user_id == user_id,
+        Attempt.exercise_id == Exercise.id,
+        Attempt.is_correct.is_(True),
+    )
+
+
+def _load_candidate_pools(
+    db, user_id: int, specs: Sequence[_CandidateSpec]
+) -> Dict[_CandidateSpec, List[Exercise]]:
+    """
+    Pools bornés (MAX_CANDIDATES_TO_RANK, ids décroissants) de toutes les sections.
+
+    Les exercices déjà réussis sont écartés en SQL (``_not_solved_by``) : aucun id
+    réussi n'est chargé côté Python. Index catalogue chaud : sélection des ids en
+    mémoire puis une lecture par PK avec anti-jointure ; un pool tronqué par les
+    réussis est relu en SQL. Sinon une seule requête (UNION ALL d'un sous-select
+    borné par spec) charge tous les pools.
+    """
+    pools: Dict[_CandidateSpec, List[Exercise]] = {spec: [] for spec in specs}
+    sql_specs = list(pools)
+    indexed: Dict[_CandidateSpec, List[int]] = {}
+    for spec in sql_specs:
+        ids = select_candidate_ids(
+            db, _candidate_bucket_match(spec), limit=MAX_CANDIDATES_TO_RANK
+        )
+        if ids is None:
+            break
+        indexed[spec] = ids
+    else:
+        wanted = set().union(*indexed.values())
+        by_id: Dict[int, Exercise] = {}
+        if wanted:
+            # Garde-fous relus en base : l'index peut retarder sur un autre worker.
+            by_id = {
+                ex.id: ex
+                for ex in db.query(Exercise).filter(
+                    Exercise.id.in_(wanted),
+                    Exercise.is_archived.is_(False),
+                    Exercise.is_active.is_(True),
+                    _not_solved_by(user_id),
+                )
+            }
+        sql_specs = []
+        for spec, ids in indexed.items():
+            pools[spec] = [by_id[i] for i in ids if i in by_id]
+            if len(ids) == MAX_CANDIDATES_TO_RANK and len(pools[spec]) < len(ids):
+                sql_specs.append(spec)
+
+    if sql_specs:
+        bounded = [
+            select(
+                literal(pos, Integer).label("spec_pos"),
+                Exercise.id.label("exercise_id"),
+            )
+            .where(*_candidate_filters(spec), _not_solved_by(user_id))
+            .order_by(Exercise.id.desc())
+            .limit(MAX_CANDIDATES_TO_RANK)
+            .subquery()
+            for pos, spec in enumerate(sql_specs)
+        ]
+        ranked = union_all(
+            *(select(sub.c.spec_pos, sub.c.exercise_id) for sub in bounded)
+        ).subquery()
+        rows = (
+            db.query(ranked.c.spec_pos, Exercise)
+            .join(Exercise, Exercise.id == ranked.c.exercise_id)
+            .order_by(ranked.c.spec_pos, Exercise.id.desc())
+            .all()
+        )
+        for spec in sql_specs:
+            pools[spec] = []
+        for pos, ex in rows:
+            pools[sql_specs[pos]].append(ex)
+    return pools
+
+
+def _recent_performance_by_type(
+    db, user_id: int, days: int = 30
+) -> Dict[str, Dict[str, int]]:
+    """
+    Tentatives des ``days`` derniers jours par type normalisé, en une agrégation.
+
+    Mêmes clés et valeurs que ``by_exercise_type`` de ``UserService.get_user_stats``.
+    """
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    type_key = func.lower(Exercise.exercise_type)
+    rows = (
+        db.query(
+            type_key,
+            func.count(Attempt.id),
+            func.count(Attempt.id).filter(Attempt.is_correct.is_(True)),
+        )
+        .join(Exercise, Exercise.id == Attempt.exercise_id)
+        .filter(Attempt.user_id == user_id, Attempt.created_at >= since)
+        .group_by(type_key)
+        .all()
+    )
+    return {
+        ex_type: {
+            "total": total,
+            "correct": correct,
+            "success_rate": round((correct / total) * 100) if total > 0 else 0,
+        }
+        for ex_type, total, correct in rows
+    }
+
+
+def _catalog_exercise_types(db) -> List[str]:
+    """Types valides présents au catalogue : un EXISTS par type plutôt qu'un DISTINCT."""
+    valid_types = [t.value for t in ExerciseType]
+    valid_difficulties = [d.value for d in DifficultyLevel]
+    present = db.query(
+        *(
+            exists().where(
+                Exercise.exercise_type == ex_type,
+                Exercise.difficulty.in_(valid_difficulties),
+            )
+            for ex_type in valid_types
+        )
+    ).one()
+    return [ex_type for ex_type, found in zip(valid_types, present) if found]
+
+
+def _recommendation_row(
+    *,
+    user_id: int,
+    exercise_type: str,
+    difficulty: str,
+    priority: int,
+    reason: str,
+    reason_code: str,
+    reason_params: Dict[str, Any],
+    exercise_id: Optional[int] = None,
+    challenge_id: Optional[int] = None,
+    recommendation_type: str = "exercise",
+) -> Dict[str, Any]:
+    """Ligne d'INSERT bulk (mêmes clés pour toutes : un seul lot insertmanyvalues)."""
+    return {
+        "user_id": user_id,
+        "exercise_id": exercise_id,
+        "challenge_id": challenge_id,
+        "recommendation_type": recommendation_type,
+        "exercise_type": exercise_type,
+        "difficulty": difficulty,
+        "priority": priority,
+        "reason": reason,
+        "reason_code": reason_code,
+        "reason_params": reason_params,
+    }
+
+
+def _exercise_recommendation_row(
+    user_id: int, ex: Exercise, pick: _SectionPick
+) -> Dict[str, Any]:
+    return _recommendation_row(
+        user_id=user_id,
+        exercise_id=ex.id,
+        exercise_type=ex.exercise_type,
+        difficulty=ex.difficulty,
+        priority=pick.priority,
+        reason=pick.reason,
+        reason_code=pick.reason_code,
+        reason_params=pick.reason_params,
+    )
+
+
 class RecommendationService:
     """Service analysant les performances et générant des recommandations personnalisées"""
 
     @staticmethod
-    def generate_recommendations(db, user_id):
+    def generate_recommendations(db, user_id, raise_errors=False):
         """Génère des recommandations pour un utilisateur basé sur ses performances
 
         Args:
             db: Session SQLAlchemy
             user_id: ID de l'utilisateur
+            raise_errors: relever l'erreur SQLAlchemy (après rollback) au lieu de
+                retourner une liste vide (jobs de régénération)
 
         Returns:
             list: Liste des recommandations générées
@@ -332,40 +633,13 @@ class RecommendationService:
                 learning_goal,
             )
 
-            # Récupérer les stats récentes (30 derniers jours) pour mieux cibler
-            from app.services.users.user_service import UserService
-
-            recent_stats = UserService.get_user_stats(db, user_id, time_range="30")
-            performance_by_type = recent_stats.get("by_exercise_type", {})
+            # Stats récentes (30 derniers jours) par type, en une agrégation
+            performance_by_type = _recent_performance_by_type(db, user_id)
 
             # Analyser les performances récentes
             progress_records = (
                 db.query(Progress).filter(Progress.user_id == user_id).all()
             )
-            recent_attempts = (
-                db.query(Attempt)
-                .filter(
-                    Attempt.user_id == user_id,
-                    Attempt.created_at
-                    > datetime.now(timezone.utc) - timedelta(days=30),
-                )
-                .order_by(Attempt.created_at.desc())
-                .limit(50)
-                .all()
-            )
-
-            # Exercices déjà réussis (toutes périodes) — ne pas recommander
-            all_completed_exercise_ids = {
-                a.exercise_id
-                for a in db.query(Attempt)
-                .filter(
-                    Attempt.user_id == user_id,
-                    Attempt.is_correct.is_(True),
-                    Attempt.exercise_id.isnot(None),
-                )
-                .all()
-                if a.exercise_id
-            }
 
             # R3 — Avant suppression des incomplètes : capturer les exercices récemment recommandés
             penalized_exercise_ids = collect_recent_recommended_exercise_ids(
@@ -384,8 +658,11 @@ class RecommendationService:
             # la collection en mémoire sans toucher à la ligne ``users``.
             set_committed_value(user, "recommendations", [])
 
-            # Générer de nouvelles recommandations
-            recommendations = []
+            age_values = _exercise_age_values(user_age_group)
+
+            # Sections 1 à 4 : on collecte les critères de chaque section, puis tous les
+            # pools sont chargés en une fois (exercices déjà réussis exclus en SQL).
+            picks: List[_SectionPick] = []
 
             # 1. Recommandations basées sur les domaines à améliorer (utilisant les stats récentes)
             # Prioriser les types avec faible taux de réussite récent
@@ -418,72 +695,24 @@ class RecommendationService:
                         ctx, ex_type, progress_difficulty
                     )
 
-                    # FILTRE CRITIQUE : Exclure les exercices avec des types/difficultés invalides
-                    valid_types = [t.value for t in ExerciseType]
-                    valid_difficulties = [d.value for d in DifficultyLevel]
-
                     improv_tier = compute_user_target_difficulty_tier(
                         user_age_group, target_difficulty
                     )
-                    # Trouver des exercices appropriés (F42 : fenêtre tier ±1 + legacy)
-                    exercise_query = db.query(Exercise).filter(
-                        func.lower(Exercise.exercise_type) == ex_type,
-                        exercise_tier_filter_expression(improv_tier, target_difficulty),
-                        Exercise.exercise_type.in_(valid_types),
-                        Exercise.difficulty.in_(valid_difficulties),
-                        Exercise.is_archived.is_(False),
-                        Exercise.is_active.is_(True),
-                    )
-                    # Cibler le groupe d'âge utilisateur (sauf tous-ages = pas de filtre)
-                    if user_age_group != AgeGroups.ALL_AGES:
-                        age_values = list(
-                            AgeGroups.AGE_ALIASES.get(user_age_group, [user_age_group])
+                    # Candidats (F42 : fenêtre tier ±1 + legacy), âge utilisateur
+                    picks.append(
+                        _SectionPick(
+                            spec=_CandidateSpec(
+                                ex_type, improv_tier, target_difficulty, age_values
+                            ),
+                            count=2,
+                            priority=priority,
+                            reason_code=REASON_EXERCISE_IMPROVEMENT,
+                            reason_params=params_improvement(
+                                ex_type, int(success_rate), target_difficulty
+                            ),
+                            reason=english_improvement(ex_type, int(success_rate)),
                         )
-                        age_values = [str(v).lower() for v in age_values]
-                        age_values.extend(["tous-ages", "tous ages", "all_ages"])
-                        exercise_query = exercise_query.filter(
-                            func.lower(Exercise.age_group).in_(age_values)
-                        )
-
-                    # Exclure les exercices déjà réussis
-                    if all_completed_exercise_ids:
-                        exercise_query = exercise_query.filter(
-                            ~Exercise.id.in_(list(all_completed_exercise_ids))
-                        )
-
-                    # Borne le pool : ids décroissants = contenus récents d'abord (évite un LIMIT arbitraire)
-                    candidates = (
-                        exercise_query.order_by(Exercise.id.desc())
-                        .limit(MAX_CANDIDATES_TO_RANK)
-                        .all()
-                    )
-                    exercises = select_top_ranked_exercises(
-                        candidates,
-                        user_age_group,
-                        penalized_exercise_ids,
-                        2,
-                        user_target_tier=improv_tier,
                     )
-                    ex_reason_params = params_improvement(
-                        ex_type, int(success_rate), target_difficulty
-                    )
-                    ex_reason_en = english_improvement(ex_type, int(success_rate))
-
-                    for ex in exercises:
-                        # Exclure si l'utilisateur a déjà réussi cet exercice
-                        if ex.id not in all_completed_exercise_ids:
-                            recommendations.append(
-                                Recommendation(
-                                    user_id=user_id,
-                                    exercise_type=ex.exercise_type,
-                                    difficulty=ex.difficulty,
-                                    exercise_id=ex.id,
-                                    priority=priority,
-                                    reason=ex_reason_en,
-                                    reason_code=REASON_EXERCISE_IMPROVEMENT,
-                                    reason_params=ex_reason_params,
-                                )
-                            )
 
             # 2. Recommandations pour monter en niveau (progression) - basé sur stats récentes
             for ex_type_key, type_stats in performance_by_type.items():
@@ -511,264 +740,113 @@ class RecommendationService:
                         current_difficulty
                     )
                     if next_difficulty:
-                        # FILTRE CRITIQUE : Exclure les exercices avec des types/difficultés invalides
-                        valid_types = [t.value for t in ExerciseType]
-                        valid_difficulties = [d.value for d in DifficultyLevel]
-
                         prog_tier = compute_user_target_difficulty_tier(
                             user_age_group, next_difficulty
                         )
-                        exercise_query = db.query(Exercise).filter(
-                            func.lower(Exercise.exercise_type) == ex_type,
-                            exercise_tier_filter_expression(prog_tier, next_difficulty),
-                            Exercise.exercise_type.in_(valid_types),
-                            Exercise.difficulty.in_(valid_difficulties),
-                            Exercise.is_archived.is_(False),
-                            Exercise.is_active.is_(True),
-                        )
-
-                        # Exclure les exercices déjà réussis
-                        if all_completed_exercise_ids:
-                            exercise_query = exercise_query.filter(
-                                ~Exercise.id.in_(list(all_completed_exercise_ids))
+                        picks.append(
+                            _SectionPick(
+                                spec=_CandidateSpec(
+                                    ex_type, prog_tier, next_difficulty
+                                ),
+                                count=1,
+                                priority=7,
+                                reason_code=REASON_EXERCISE_PROGRESSION,
+                                reason_params=params_progression(
+                                    ex_type, int(success_rate), next_difficulty
+                                ),
+                                reason=english_progression(
+                                    ex_type, int(success_rate), next_difficulty
+                                ),
                             )
-
-                        candidates = (
-                            exercise_query.order_by(Exercise.id.desc())
-                            .limit(MAX_CANDIDATES_TO_RANK)
-                            .all()
-                        )
-                        exercises = select_top_ranked_exercises(
-                            candidates,
-                            user_age_group,
-                            penalized_exercise_ids,
-                            1,
-                            user_target_tier=prog_tier,
-                        )
-                        prog_params = params_progression(
-                            ex_type, int(success_rate), next_difficulty
                         )
-                        prog_en = english_progression(
-                            ex_type, int(success_rate), next_difficulty
-                        )
-
-                        for ex in exercises:
-                            if ex.id not in all_completed_exercise_ids:
-                                recommendations.append(
-                                    Recommendation(
-                                        user_id=user_id,
-                                        exercise_type=ex.exercise_type,
-                                        difficulty=ex.difficulty,
-                                        exercise_id=ex.id,
-                                        priority=7,
-                                        reason=prog_en,
-                                        reason_code=REASON_EXERCISE_PROGRESSION,
-                                        reason_params=prog_params,
-                                    )
-                                )
 
             # 3. Recommandations pour maintenir les compétences (réactivation)
-            # Trouver les compétences non pratiquées récemment
-            # FILTRE CRITIQUE : Exclure les exercices avec des types/difficultés invalides dès le départ
-            valid_types = [t.value for t in ExerciseType]
-            valid_difficulties = [d.value for d in DifficultyLevel]
-
-            all_exercise_types = (
-                db.query(Exercise.exercise_type)
-                .filter(
-                    Exercise.exercise_type.in_(valid_types),
-                    Exercise.difficulty.in_(valid_difficulties),
-                )
-                .distinct()
-                .all()
-            )
-
-            # B4.2: précharger les exercices des tentatives récentes en une requête
-            # au lieu de N requêtes dans la boucle (évite O(attempts × types) requêtes)
-            recent_exercise_ids = [
-                a.exercise_id for a in recent_attempts if a.exercise_id
+            # Types du catalogue non pratiqués sur les 30 derniers jours.
+            # FILTRE CRITIQUE : types/difficultés invalides exclus dès le départ
+            catalog_types = [
+                normalize_exercise_type_key(ex_type)
+                for ex_type in _catalog_exercise_types(db)
             ]
-            exercises_by_id = {}
-            if recent_exercise_ids:
-                exercises = (
-                    db.query(Exercise)
-                    .filter(
-                        Exercise.id.in_(recent_exercise_ids),
-                        Exercise.exercise_type.in_(valid_types),
-                        Exercise.difficulty.in_(valid_difficulties),
-                    )
-                    .all()
+            for nt_key in catalog_types:
+                if nt_key in performance_by_type:
+                    continue
+                # Trouver le niveau le plus élevé maîtrisé par l'utilisateur pour ce type
+                user_level = None
+                for p in progress_records:
+                    if (
+                        normalize_exercise_type_key(p.exercise_type) == nt_key
+                        and p.calculate_completion_rate() > 70
+                    ):
+                        user_level = p.difficulty
+
+                # Sinon diagnostic par type (R2) puis défaut global
+                if not user_level:
+                    user_level = get_target_difficulty_for_type(ctx, nt_key, None)
+
+                # Proposer un exercice pour maintenir cette compétence
+                maint_tier = compute_user_target_difficulty_tier(
+                    user_age_group, user_level
                 )
-                exercises_by_id = {ex.id: ex for ex in exercises}
-
-            for ex_type in all_exercise_types:
-                ex_type = ex_type[0]  # Extraction du tuple
-                # Vérifier si ce type d'exercice a été pratiqué récemment
-                recent_type_attempts = []
-                for a in recent_attempts:
-                    if not a.exercise_id:
-                        continue
-                    exercise = exercises_by_id.get(a.exercise_id)
-                    if exercise and normalize_exercise_type_key(
-                        exercise.exercise_type
-                    ) == normalize_exercise_type_key(ex_type):
-                        recent_type_attempts.append(a)
-
-                if not recent_type_attempts:
-                    # Trouver le niveau le plus élevé maîtrisé par l'utilisateur pour ce type
-                    user_level = None
-                    for p in progress_records:
-                        if (
-                            normalize_exercise_type_key(p.exercise_type)
-                            == normalize_exercise_type_key(ex_type)
-                            and p.calculate_completion_rate() > 70
-                        ):
-                            user_level = p.difficulty
-
-                    # Sinon diagnostic par type (R2) puis défaut global
-                    if not user_level:
-                        user_level = get_target_difficulty_for_type(
-                            ctx, normalize_exercise_type_key(ex_type), None
-                        )
-
-                    # Proposer un exercice pour maintenir cette compétence
-                    maint_tier = compute_user_target_difficulty_tier(
-                        user_age_group, user_level
-                    )
-                    ex_filter = [
-                        func.lower(Exercise.exercise_type)
-                        == normalize_exercise_type_key(ex_type),
-                        exercise_tier_filter_expression(maint_tier, user_level),
-                        Exercise.exercise_type.in_(valid_types),
-                        Exercise.difficulty.in_(valid_difficulties),
-                        Exercise.is_archived.is_(False),
-                        Exercise.is_active.is_(True),
-                    ]
-                    if user_age_group != AgeGroups.ALL_AGES:
-                        age_values = list(
-                            AgeGroups.AGE_ALIASES.get(user_age_group, [user_age_group])
-                        )
-                        age_values = [str(v).lower() for v in age_values]
-                        age_values.extend(["tous-ages", "tous ages", "all_ages"])
-                        ex_filter.append(func.lower(Exercise.age_group).in_(age_values))
-                    cand_react = (
-                        db.query(Exercise)
-                        .filter(*ex_filter)
-                        .order_by(Exercise.id.desc())
-                        .limit(MAX_CANDIDATES_TO_RANK)
-                        .all()
+                picks.append(
+                    _SectionPick(
+                        spec=_CandidateSpec(nt_key, maint_tier, user_level, age_values),
+                        count=1,
+                        priority=5,
+                        reason_code=REASON_EXERCISE_MAINTENANCE,
+                        reason_params=params_maintenance(nt_key, user_level),
+                        reason=english_maintenance(nt_key),
                     )
-                    exercises = select_top_ranked_exercises(
-                        cand_react,
-                        user_age_group,
-                        penalized_exercise_ids,
-                        1,
-                        user_target_tier=maint_tier,
-                    )
-                    nt_key = normalize_exercise_type_key(ex_type)
-                    maint_params = params_maintenance(nt_key, user_level)
-                    maint_en = english_maintenance(nt_key)
-
-                    for ex in exercises:
-                        # Exclure les exercices déjà réussis
-                        if ex.id not in all_completed_exercise_ids:
-                            recommendations.append(
-                                Recommendation(
-                                    user_id=user_id,
-                                    exercise_type=ex.exercise_type,
-                                    difficulty=ex.difficulty,
-                                    exercise_id=ex.id,
-                                    priority=5,
-                                    reason=maint_en,
-                                    reason_code=REASON_EXERCISE_MAINTENANCE,
-                                    reason_params=maint_params,
-                                )
-                            )
+                )
 
             # 4. Recommandations de découverte (R6 — diversité par type + ranking R3 + anti-répétition)
             practised_types = {
                 normalize_exercise_type_key(p.exercise_type) for p in progress_records
             }
-            all_types = {
-                normalize_exercise_type_key(ex_type[0])
-                for ex_type in all_exercise_types
-            }
-            new_types = all_types - practised_types
-
-            if new_types:
-                valid_types = [t.value for t in ExerciseType]
-                valid_difficulties = [d.value for d in DifficultyLevel]
-                discovery_penalized: Set[int] = set(penalized_exercise_ids)
-
-                for nt in sorted(new_types):
-                    target_d = get_target_difficulty_for_type(ctx, nt, None)
-                    disc_tier = compute_user_target_difficulty_tier(
-                        user_age_group, target_d
+            new_types = set(catalog_types) - practised_types
+            for nt in sorted(new_types):
+                target_d = get_target_difficulty_for_type(ctx, nt, None)
+                disc_tier = compute_user_target_difficulty_tier(
+                    user_age_group, target_d
+                )
+                picks.append(
+                    _SectionPick(
+                        spec=_CandidateSpec(nt, disc_tier, target_d, age_values),
+                        count=1,
+                        priority=4,
+                        reason_code=REASON_EXERCISE_DISCOVERY,
+                        reason_params=params_discovery(nt, target_d),
+                        reason=english_discovery(nt),
                     )
-                    ex_filter = [
-                        func.lower(Exercise.exercise_type) == nt,
-                        exercise_tier_filter_expression(disc_tier, target_d),
-                        Exercise.exercise_type.in_(valid_types),
-                        Exercise.difficulty.in_(valid_difficulties),
-                        Exercise.is_archived.is_(False),
-                        Exercise.is_active.is_(True),
-                    ]
-                    if user_age_group != AgeGroups.ALL_AGES:
-                        age_values = list(
-                            AgeGroups.AGE_ALIASES.get(user_age_group, [user_age_group])
-                        )
-                        age_values = [str(v).lower() for v in age_values]
-                        age_values.extend(["tous-ages", "tous ages", "all_ages"])
-                        ex_filter.append(func.lower(Exercise.age_group).in_(age_values))
-                    if all_completed_exercise_ids:
-                        ex_filter.append(
-                            ~Exercise.id.in_(list(all_completed_exercise_ids))
-                        )
+                )
 
-                    candidates = (
-                        db.query(Exercise)
-                        .filter(*ex_filter)
-                        .order_by(Exercise.id.desc())
-                        .limit(MAX_CANDIDATES_TO_RANK)
-                        .all()
-                    )
-                    picked = select_top_ranked_exercises(
-                        candidates,
-                        user_age_group,
-                        discovery_penalized,
-                        1,
-                        user_target_tier=disc_tier,
-                    )
-                    if not picked:
-                        continue
-                    ex = picked[0]
-                    disc_params = params_discovery(nt, target_d)
-                    disc_en = english_discovery(nt)
-                    recommendations.append(
-                        Recommendation(
-                            user_id=user_id,
-                            exercise_type=ex.exercise_type,
-                            difficulty=ex.difficulty,
-                            exercise_id=ex.id,
-                            priority=4,
-                            reason=disc_en,
-                            reason_code=REASON_EXERCISE_DISCOVERY,
-                            reason_params=disc_params,
-                        )
-                    )
-                    discovery_penalized.add(ex.id)
+            rows: List[Dict[str, Any]] = []
+            pools = _load_candidate_pools(db, user_id, [p.spec for p in picks])
+            # R6 — la découverte pénalise aussi ses propres choix (un exercice distinct par type)
+            discovery_penalized: Set[int] = set(penalized_exercise_ids)
+            for pick in picks:
+                is_discovery = pick.reason_code == REASON_EXERCISE_DISCOVERY
+                exercises = select_top_ranked_exercises(
+                    pools[pick.spec],
+                    user_age_group,
+                    discovery_penalized if is_discovery else penalized_exercise_ids,
+                    pick.count,
+                    user_target_tier=pick.spec.user_tier,
+                )
+                for ex in exercises:
+                    rows.append(_exercise_recommendation_row(user_id, ex, pick))
+                    if is_discovery:
+                        discovery_penalized.add(ex.id)
 
             # 5. Recommandations de défis logiques (R5 — scoring explicite + reason_code)
             completed_challenge_ids = {
-                a.challenge_id
-                for a in db.query(LogicChallengeAttempt)
+                challenge_id
+                for (challenge_id,) in db.query(LogicChallengeAttempt.challenge_id)
                 .filter(
                     LogicChallengeAttempt.user_id == user_id,
                     LogicChallengeAttempt.is_correct.is_(True),
                     LogicChallengeAttempt.challenge_id.isnot(None),
                 )
-                .all()
-                if a.challenge_id
+                .distinct()
             }
             for entry in _select_logic_challenge_recommendation_entries(
                 db,
@@ -779,10 +857,9 @@ class RecommendationService:
                 user_target_tier=ctx.target_difficulty_tier,
             ):
                 ch = entry["challenge"]
-                recommendations.append(
-                    Recommendation(
+                rows.append(
+                    _recommendation_row(
                         user_id=user_id,
-                        exercise_id=None,
                         challenge_id=ch.id,
                         recommendation_type="challenge",
                         exercise_type="challenge",
@@ -795,60 +872,28 @@ class RecommendationService:
                 )
 
             # Si aucune recommandation n'a été générée, proposer quelques exercices aléatoires
-            if not recommendations:
-                # FILTRE CRITIQUE : Exclure les exercices avec des types/difficultés invalides
-                valid_types = [t.value for t in ExerciseType]
-                valid_difficulties = [d.value for d in DifficultyLevel]
-
+            if not rows:
                 logger.debug(
                     "Aucune recommandation générée, recherche d'exercices aléatoires..."
                 )
-                logger.debug("Types valides: %s", valid_types)
-                logger.debug("Difficultés valides: %s", valid_difficulties)
-
                 fb_tier = compute_user_target_difficulty_tier(
                     user_age_group, ctx.global_default_difficulty
                 )
-                ex_filter = [
-                    Exercise.exercise_type.in_(valid_types),
-                    Exercise.difficulty.in_(valid_difficulties),
-                    Exercise.is_archived.is_(False),
-                    Exercise.is_active.is_(True),
-                ]
-                if fb_tier is not None:
-                    lo_fb = max(1, fb_tier - 1)
-                    hi_fb = min(12, fb_tier + 1)
-                    ex_filter.append(
-                        or_(
-                            Exercise.difficulty_tier.is_(None),
-                            Exercise.difficulty_tier.between(lo_fb, hi_fb),
-                        )
-                    )
-                if user_age_group != AgeGroups.ALL_AGES:
-                    age_values = list(
-                        AgeGroups.AGE_ALIASES.get(user_age_group, [user_age_group])
-                    )
-                    age_values = [str(v).lower() for v in age_values]
-                    age_values.extend(["tous-ages", "tous ages", "all_ages"])
-                    ex_filter.append(func.lower(Exercise.age_group).in_(age_values))
-                exercise_query = db.query(Exercise).filter(*ex_filter)
-
-                # Exclure les exercices déjà réussis
-                if all_completed_exercise_ids:
-                    exercise_query = exercise_query.filter(
-                        ~Exercise.id.in_(list(all_completed_exercise_ids))
-                    )
-
-                fb_candidates = (
-                    exercise_query.order_by(Exercise.id.desc())
-                    .limit(MAX_CANDIDATES_TO_RANK)
-                    .all()
+                fallback = _SectionPick(
+                    spec=_CandidateSpec(
+                        None, fb_tier, None, age_values, any_difficulty=True
+                    ),
+                    count=3,
+                    priority=3,
+                    reason_code=REASON_EXERCISE_FALLBACK,
+                    reason_params=params_fallback(),
+                    reason=english_fallback(),
                 )
                 ranked_fallback = select_top_ranked_exercises(
-                    fb_candidates,
+                    _load_candidate_pools(db, user_id, [fallback.spec])[fallback.spec],
                     user_age_group,
                     penalized_exercise_ids,
-                    3,
+                    fallback.count,
                     user_target_tier=fb_tier,
                 )
 
@@ -859,29 +904,18 @@ class RecommendationService:
                     logger.debug(
                         "  - %s (%s/%s)", ex.title, ex.exercise_type, ex.difficulty
                     )
+                    rows.append(_exercise_recommendation_row(user_id, ex, fallback))
 
-                for ex in ranked_fallback:
-                    if ex.id in all_completed_exercise_ids:
-                        continue
-                    recommendations.append(
-                        Recommendation(
-                            user_id=user_id,
-                            exercise_type=ex.exercise_type,
-                            difficulty=ex.difficulty,
-                            exercise_id=ex.id,
-                            priority=3,
-                            reason=english_fallback(),
-                            reason_code=REASON_EXERCISE_FALLBACK,
-                            reason_params=params_fallback(),
-                        )
-                    )
-
-                logger.debug(
-                    "Recommandations fallback créées: %s", len(recommendations)
-                )
-
-            # Ajouter toutes les recommandations
-            db.add_all(recommendations)
+            # Ajouter toutes les recommandations : un INSERT bulk (RETURNING) au lieu
+            # d'un flush unitaire par objet
+            recommendations = []
+            if rows:
+                recommendations = db.scalars(
+                    insert(Recommendation).returning(
+                        Recommendation, sort_by_parameter_order=True
+                    ),
+                    rows,
+                ).all()
             db.commit()
 
             return recommendations
@@ -892,6 +926,8 @@ class RecommendationService:
                 str(recommendations_generation_error),
             )
             db.rollback()
+            if raise_errors:
+                raise
             return []
 
     @staticmethod
@@ -942,17 +978,19 @@ class RecommendationService:
         if not recommendation_ids:
             return
         try:
-            rows = (
-                db.query(Recommendation)
-                .filter(
-                    Recommendation.id.in_(recommendation_ids),
-                    Recommendation.user_id == user_id,
-                    Recommendation.is_completed.is_(False),
-                )
-                .all()
+            db.query(Recommendation).filter(
+                Recommendation.id.in_(recommendation_ids),
+                Recommendation.user_id == user_id,
+                Recommendation.is_completed.is_(False),
+            ).update(
+                {
+                    Recommendation.shown_count: func.coalesce(
+                        Recommendation.shown_count, 0
+                    )
+                    + 1
+                },
+                synchronize_session=False,
             )
-            for row in rows:
-                row.shown_count = (row.shown_count or 0) + 1
             db.commit()
         except SQLAlchemyError as impression_error:
             logger.error(
@@ -1044,9 +1082,22 @@ class RecommendationService:
         Returns:
             Liste de dicts prêts pour JSONResponse
         """
+        cached = recommendation_read_cache.get(user_id, limit)
+        if cached is not None:
+            result, displayed_ids = cached
+            RecommendationService.record_recommendations_list_impression(
+                db, user_id, displayed_ids
+            )
+            return result
+
         recommendations = RecommendationService.get_user_recommendations(
             db, user_id, limit=limit
         )
+        if not recommendations and settings.RECOMMENDATION_REFRESH_ASYNC:
+            # Génération hors requête : la liste arrive au prochain GET
+            # (voir GET /api/recommendations/status).
+            request_recommendation_refresh(user_id)
+            return []
         if not recommendations:
             try:
                 RecommendationService.generate_recommendations(db, user_id)
@@ -1058,28 +1109,41 @@ class RecommendationService:
                 logger.error("Erreur génération recommandations: %s", gen_error)
                 return []
 
-        completed_exercise_ids = {
-            a.exercise_id
-            for a in db.query(Attempt)
-            .filter(
-                Attempt.user_id == user_id,
-                Attempt.is_correct.is_(True),
-                Attempt.exercise_id.isnot(None),
-            )
-            .all()
-            if a.exercise_id
+        # Réussites limitées aux exercices / défis de la liste (pas tout l'historique)
+        recommended_exercise_ids = {
+            r.exercise_id for r in recommendations if r.exercise_id
         }
-        completed_challenge_ids = {
-            a.challenge_id
-            for a in db.query(LogicChallengeAttempt)
-            .filter(
-                LogicChallengeAttempt.user_id == user_id,
-                LogicChallengeAttempt.is_correct.is_(True),
-                LogicChallengeAttempt.challenge_id.isnot(None),
-            )
-            .all()
-            if a.challenge_id
+        recommended_challenge_ids = {
+            r.challenge_id for r in recommendations if getattr(r, "challenge_id", None)
         }
+        completed_exercise_ids = set()
+        if recommended_exercise_ids:
+            completed_exercise_ids = set(
+                db.scalars(
+                    select(Attempt.exercise_id)
+                    .where(
+                        Attempt.user_id == user_id,
+                        Attempt.is_correct.is_(True),
+                        Attempt.exercise_id.in_(recommended_exercise_ids),
+                    )
+                    .distinct()
+                )
+            )
+        completed_challenge_ids = set()
+        if recommended_challenge_ids:
+            completed_challenge_ids = set(
+                db.scalars(
+                    select(LogicChallengeAttempt.challenge_id)
+                    .where(
+                        LogicChallengeAttempt.user_id == user_id,
+                        LogicChallengeAttempt.is_correct.is_(True),
+                        LogicChallengeAttempt.challenge_id.in_(
+                            recommended_challenge_ids
+                        ),
+                    )
+                    .distinct()
+                )
+            )
 
         difficulty_to_age_group = {
             "INITIE": "6-8",
@@ -1164,6 +1228,7 @@ class RecommendationService:
         RecommendationService.record_recommendations_list_impression(
             db, user_id, displayed_ids
         )
+        recommendation_read_cache.set(user_id, limit, result, displayed_ids)
 
         return result
 
@@ -1239,7 +1304,17 @@ def generate_recommendations_sync(user_id: int):
     from app.core.db_boundary import sync_db_session
 
     with sync_db_session() as db:
-        return RecommendationService.generate_recommendations(db, user_id)
+        recommendations = RecommendationService.generate_recommendations(db, user_id)
+    recommendation_read_cache.invalidate(user_id)
+    return recommendations
+
+
+def get_recommendation_freshness_sync(user_id: int) -> Dict[str, Any]:
+    """Use case sync: métadonnées de fraîcheur des recommandations (GET status)."""
+    from app.core.db_boundary import sync_db_session
+
+    with sync_db_session() as db:
+        return get_recommendation_freshness(db, user_id)
 
 
 def mark_recommendation_as_completed_sync(
@@ -1254,9 +1329,11 @@ def mark_recommendation_as_completed_sync(
     from app.core.db_boundary import sync_db_session
 
     with sync_db_session() as db:
-        return RecommendationService.mark_recommendation_as_completed(
+        outcome = RecommendationService.mark_recommendation_as_completed(
             db, recommendation_id, user_id=user_id
         )
+    recommendation_read_cache.invalidate(user_id)
+    return outcome
 
 
 def mark_recommendation_as_opened_sync(
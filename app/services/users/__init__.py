@@ -10,8 +10,10 @@ from app.services.users.user_application_service import (
     get_dashboard_stats,
     get_leaderboard,
     get_progress_timeline_data,
+    get_user_export_profile,
     get_user_progress_data,
     get_user_sessions_list,
+    iter_user_export_records,
     register_user,
     revoke_session,
     update_password,
@@ -28,8 +30,10 @@ __all__ = [
     "get_dashboard_stats",
     "get_leaderboard",
     "get_progress_timeline_data",
+    "get_user_export_profile",
     "get_user_progress_data",
     "get_user_sessions_list",
+    "iter_user_export_records",
     "register_user",
     "revoke_session",
     "update_password",
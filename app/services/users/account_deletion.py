@@ -0,0 +1,472 @@
+"""
+Suppression de compte ensembliste : un DELETE par table, dans l'ordre des dépendances,
+par paquets bornés, sans charger les lignes filles dans la session (la cascade ORM de
+User les chargeait toutes avant de les supprimer une à une).
+
+- ``ACCOUNT_DELETION_PLAN`` : contenu créé par le compte d'abord (tentatives d'autres
+  joueurs sur ses exercices/défis, révisions espacées de ses exercices), puis son
+  historique, les tables à une ligne par jour/période (sans paquet), le contenu créé et
+  enfin la ligne users (les FK SET NULL — journal admin, événements EdTech,
+  signalements — sont traitées par PostgreSQL).
+- ``delete_account_data`` : exécute le plan à partir d'une étape, un commit par paquet
+  (verrous courts) ; ``on_chunk`` écrit la progression dans la transaction du paquet.
+- ``request_account_deletion`` / ``AccountDeletionWorker`` : mode
+  ACCOUNT_DELETION_ASYNC. Le compte est désactivé et un job ``account_deletion_jobs``
+  écrit ; le thread le réserve avec un bail (SKIP LOCKED) et le reprend à son étape
+  après un arrêt.
+
+Les DELETE ensemblistes ne passent pas par ``session.deleted`` : les caches alimentés
+par les events ORM (payload auth, totaux et index catalogue, recommandations) sont
+invalidés explicitement une fois le compte supprimé.
+"""
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.core.monitoring import (
+    record_account_deletion_job,
+    record_account_deletion_rows,
+)
+from app.db.base import SessionLocal
+from app.exceptions import UserNotFoundError
+from app.models.account_deletion_job import (
+    DELETION_DONE,
+    DELETION_FAILED,
+    DELETION_PENDING,
+    AccountDeletionJob,
+)
+from app.models.achievement import UserAchievement
+from app.models.attempt import Attempt
+from app.models.attempt_side_effect import AttemptSideEffect
+from app.models.challenge_progress import ChallengeProgress
+from app.models.daily_challenge import DailyChallenge
+from app.models.diagnostic_result import DiagnosticResult
+from app.models.edtech_daily_rollup import EdTechDailyUser
+from app.models.email_outbox import EmailOutbox
+from app.models.exercise import Exercise
+from app.models.leaderboard_score import LeaderboardPeriodScore, UserDailyPoints
+from app.models.logic_challenge import LogicChallenge, LogicChallengeAttempt
+from app.models.notification import Notification
+from app.models.point_event import PointEvent
+from app.models.progress import Progress
+from app.models.recommendation import Recommendation
+from app.models.spaced_repetition_item import SpacedRepetitionItem
+from app.models.user import User
+from app.models.user_session import UserSession
+from app.models.user_stats_rollup import UserStatsRollup
+
+logger = get_logger(__name__)
+
+# Durée pendant laquelle un job réservé reste invisible aux autres process.
+CLAIM_LEASE = timedelta(minutes=5)
+
+# (session, étape, lignes du paquet) -> progression écrite avant le commit du paquet.
+ChunkCallback = Callable[[Session, str, int], None]
+
+
+@dataclass(frozen=True)
+class DeletionStep:
+    """Une table du plan : ``key`` découpe en paquets (None = DELETE unique)."""
+
+    name: str
+    model: Any
+    key: Any
+    where: Callable[[int], Any]
+
+
+def _created_exercises(user_id: int):
+    return select(Exercise.id).where(Exercise.creator_id == user_id)
+
+
+def _created_challenges(user_id: int):
+    return select(LogicChallenge.id).where(LogicChallenge.creator_id == user_id)
+
+
+def _owned(model: Any, key: Any = None) -> DeletionStep:
+    """Étape « lignes du compte » (``model.user_id = :user_id``)."""
+    return DeletionStep(
+        model.__tablename__,
+        model,
+        model.id if key is None else key,
+        lambda user_id: model.user_id == user_id,
+    )
+
+
+def _per_period(model: Any) -> DeletionStep:
+    """Étape sans paquet : une ligne par jour ou par période au plus."""
+    return DeletionStep(
+        model.__tablename__, model, None, lambda user_id: model.user_id == user_id
+    )
+
+
+ACCOUNT_DELETION_PLAN: List[DeletionStep] = [
+    _owned(AttemptSideEffect, AttemptSideEffect.attempt_id),
+    DeletionStep(
+        "attempts_on_created_exercises",
+        Attempt,
+        Attempt.id,
+        lambda user_id: Attempt.exercise_id.in_(_created_exercises(user_id)),
+    ),
+    DeletionStep(
+        "spaced_repetition_items_on_created_exercises",
+        SpacedRepetitionItem,
+        SpacedRepetitionItem.id,
+        lambda user_id: SpacedRepetitionItem.exercise_id.in_(
+            _created_exercises(user_id)
+        ),
+    ),
+    DeletionStep(
+        "attempts_on_created_challenges",
+        LogicChallengeAttempt,
+        LogicChallengeAttempt.id,
+        lambda user_id: LogicChallengeAttempt.challenge_id.in_(
+            _created_challenges(user_id)
+        ),
+    ),
+    _owned(Attempt),
+    _owned(LogicChallengeAttempt),
+    _owned(PointEvent),
+    _owned(SpacedRepetitionItem),
+    _owned(Recommendation),
+    _owned(Notification),
+    _owned(UserSession),
+    _owned(Progress),
+    _owned(ChallengeProgress),
+    _owned(UserAchievement),
+    _owned(DiagnosticResult),
+    _owned(DailyChallenge),
+    _owned(EmailOutbox),
+    _per_period(UserDailyPoints),
+    _per_period(LeaderboardPeriodScore),
+    _per_period(UserStatsRollup),
+    _per_period(EdTechDailyUser),
+    DeletionStep(
+        "exercises",
+        Exercise,
+        Exercise.id,
+        lambda user_id: Exercise.creator_id == user_id,
+    ),
+    DeletionStep(
+        "logic_challenges",
+        LogicChallenge,
+        LogicChallenge.id,
+        lambda user_id: LogicChallenge.creator_id == user_id,
+    ),
+    DeletionStep("users", User, None, lambda user_id: User.id == user_id),
+]
+
+_STEP_INDEX = {step.name: index for index, step in enumerate(ACCOUNT_DELETION_PLAN)}
+
+
+def _delete_chunk(
+    db: Session, step: DeletionStep, user_id: int, chunk_size: int
+) -> List[int]:
+    """Supprime un paquet de l'étape ; retourne les ids supprimés (ou leur clé)."""
+    table = step.model.__table__
+    condition = step.where(user_id)
+    if step.key is None:
+        stmt = delete(table).where(condition)
+        returned = table.primary_key.columns.values()[0]
+    else:
+        chunk = select(step.key).where(condition).limit(chunk_size)
+        stmt = delete(table).where(step.key.in_(chunk))
+        returned = step.key
+    return list(db.execute(stmt.returning(returned)).scalars())
+
+
+def _invalidate_caches(user_id: int, exercise_ids: List[int], challenges: int) -> None:
+    from app.services.exercises.exercise_catalog_index import exercise_catalog_index
+    from app.services.recommendation.recommendation_refresh import (
+        recommendation_read_cache,
+    )
+    from app.utils.auth_cache import invalidate_user_payload
+    from app.utils.catalog_sampling import catalog_totals_cache
+
+    invalidate_user_payload(user_id)
+    recommendation_read_cache.invalidate(user_id)
+    if exercise_ids:
+        catalog_totals_cache.invalidate(Exercise.__tablename__)
+        if exercise_catalog_index.ready:
+            exercise_catalog_index.apply(dict.fromkeys(exercise_ids))
+    if challenges:
+        catalog_totals_cache.invalidate(LogicChallenge.__tablename__)
+
+
+def delete_account_data(
+    db: Session,
+    user_id: int,
+    *,
+    chunk_size: Optional[int] = None,
+    start_step: Optional[str] = None,
+    on_chunk: Optional[ChunkCallback] = None,
+    commit: bool = True,
+) -> Dict[str, int]:
+    """
+    Exécute le plan de suppression du compte ``user_id`` et retourne les lignes
+    supprimées par étape.
+
+    ``start_step`` : reprise d'un job interrompu (les étapes précédentes sont vides).
+    ``commit=False`` : tout dans la transaction de l'appelant (pas de commit par
+    paquet, caches invalidés avant son commit).
+    """
+    chunk_size = chunk_size or settings.ACCOUNT_DELETION_CHUNK_ROWS
+    start = _STEP_INDEX[start_step] if start_step else 0
+    deleted: Dict[str, int] = {}
+    exercise_ids: List[int] = []
+    for step in ACCOUNT_DELETION_PLAN[start:]:
+        while True:
+            ids = _delete_chunk(db, step, user_id, chunk_size)
+            if step.model is Exercise:
+                exercise_ids.extend(ids)
+            deleted[step.name] = deleted.get(step.name, 0) + len(ids)
+            if on_chunk is not None:
+                on_chunk(db, step.name, len(ids))
+            if commit:
+                db.commit()
+            record_account_deletion_rows(step.model.__tablename__, len(ids))
+            if step.key is None or len(ids) < chunk_size:
+                break
+    _invalidate_caches(user_id, exercise_ids, deleted.get("logic_challenges", 0))
+    return deleted
+
+
+# ─── Mode arrière-plan (ACCOUNT_DELETION_ASYNC) ───────────────────────────────
+
+
+def request_account_deletion(
+    db: Session, user_id: int, *, requested_by: Optional[int] = None
+) -> int:
+    """
+    Désactive le compte et écrit un job ``pending`` (commit) ; retourne son id.
+    Un job déjà ouvert pour ce compte est réutilisé.
+    """
+    user = db.get(User, user_id)
+    if user is None:
+        raise UserNotFoundError(f"Utilisateur avec ID {user_id} non trouvé")
+    existing = (
+        db.query(AccountDeletionJob.id)
+        .filter(
+            AccountDeletionJob.user_id == user_id,
+            AccountDeletionJob.status == DELETION_PENDING,
+        )
+        .scalar()
+    )
+    if existing is not None:
+        return existing
+    user.is_active = False
+    job = AccountDeletionJob(
+        user_id=user_id,
+        requested_by=requested_by,
+        status=DELETION_PENDING,
+        rows_deleted=0,
+        progress={},
+        tries=0,
+        next_attempt_at=datetime.now(timezone.utc),
+    )
+    db.add(job)
+    db.commit()
+    logger.info("Suppression du compte {} planifiée (job #{})", user_id, job.id)
+    wake_account_deletion_worker()
+    return job.id
+
+
+def claim_account_deletion_job(db: Session, now: datetime) -> Optional[tuple]:
+    """Réserve le plus ancien job échu (essai compté, bail posé) et commit."""
+    job = (
+        db.query(AccountDeletionJob)
+        .filter(
+            AccountDeletionJob.status == DELETION_PENDING,
+            AccountDeletionJob.next_attempt_at <= now,
+        )
+        .order_by(AccountDeletionJob.next_attempt_at, AccountDeletionJob.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .first()
+    )
+    if job is None:
+        return None
+    job.tries = (job.tries or 0) + 1
+    job.next_attempt_at = now + CLAIM_LEASE
+    claimed = (job.id, job.user_id, job.step, job.tries)
+    db.commit()
+    return claimed
+
+
+def _record_chunk(job_id: int) -> ChunkCallback:
+    """Progression écrite dans la transaction du paquet (reprise exacte)."""
+
+    def _on_chunk(db: Session, step: str, count: int) -> None:
+        job = db.get(AccountDeletionJob, job_id)
+        progress = dict(job.progress or {})
+        progress[step] = progress.get(step, 0) + count
+        job.progress = progress
+        job.step = step
+        job.rows_deleted = (job.rows_deleted or 0) + count
+        job.updated_at = datetime.now(timezone.utc)
+        # Bail prolongé à chaque paquet : un long job reste réservé.
+        job.next_attempt_at = job.updated_at + CLAIM_LEASE
+
+    return _on_chunk
+
+
+def run_account_deletion_job(
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> Optional[str]:
+    """Traite un job échu ; retourne ``done`` / ``retry`` / ``failed`` (None si aucun)."""
+    db = session_factory()
+    try:
+        claimed = claim_account_deletion_job(db, datetime.now(timezone.utc))
+        if claimed is None:
+            return None
+        job_id, user_id, step, tries = claimed
+        try:
+            deleted = delete_account_data(
+                db, user_id, start_step=step, on_chunk=_record_chunk(job_id)
+            )
+        except SQLAlchemyError as exc:
+            db.rollback()
+            failed = tries >= settings.ACCOUNT_DELETION_MAX_TRIES
+            db.execute(
+                update(AccountDeletionJob)
+                .where(AccountDeletionJob.id == job_id)
+                .values(
+                    status=DELETION_FAILED if failed else DELETION_PENDING,
+                    last_error=f"{type(exc).__name__}: {exc}"[:2000],
+                    next_attempt_at=datetime.now(timezone.utc),
+                )
+            )
+            db.commit()
+            logger.exception(
+                "Suppression du compte {} (job #{}) en échec", user_id, job_id
+            )
+            result = "failed" if failed else "retry"
+            record_account_deletion_job(result)
+            return result
+        now = datetime.now(timezone.utc)
+        db.execute(
+            update(AccountDeletionJob)
+            .where(AccountDeletionJob.id == job_id)
+            .values(status=DELETION_DONE, completed_at=now, updated_at=now)
+        )
+        db.commit()
+        logger.info(
+            "Compte {} supprimé (job #{}) : {} ligne(s)",
+            user_id,
+            job_id,
+            sum(deleted.values()),
+        )
+        record_account_deletion_job("done")
+        return "done"
+    finally:
+        db.close()
+
+
+def get_account_deletion_job_for_api(
+    db: Session, job_id: int
+) -> Optional[Dict[str, Any]]:
+    """Progression d'un job (GET admin) ; None si inconnu."""
+    job = db.get(AccountDeletionJob, job_id)
+    if job is None:
+        return None
+    return {
+        "id": job.id,
+        "user_id": job.user_id,
+        "status": job.status,
+        "step": job.step,
+        "steps": [step.name for step in ACCOUNT_DELETION_PLAN],
+        "rows_deleted": job.rows_deleted,
+        "progress": job.progress or {},
+        "tries": job.tries,
+        "last_error": job.last_error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+    }
+
+
+class AccountDeletionWorker:
+    """Thread de suppression : draine les jobs au réveil ou toutes les ``poll_seconds``."""
+
+    def __init__(
+        self,
+        poll_seconds: float,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        self.poll_seconds = poll_seconds
+        self._session_factory = session_factory
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="mathakine-account-deletion", daemon=True
+        )
+        self._thread.start()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def drain(self) -> int:
+        """Traite les jobs échus un par un ; retourne le nombre traité."""
+        processed = 0
+        while not self._stop.is_set():
+            if run_account_deletion_job(self._session_factory) is None:
+                break
+            processed += 1
+        return processed
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.drain()
+            except Exception:
+                logger.exception("Thread account_deletion : drain en échec")
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+
+
+_worker: Optional[AccountDeletionWorker] = None
+_worker_lock = threading.Lock()
+
+
+def start_account_deletion_worker() -> AccountDeletionWorker:
+    """Démarre le thread de suppression du process (startup, ACCOUNT_DELETION_ASYNC)."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = AccountDeletionWorker(settings.ACCOUNT_DELETION_POLL_SECONDS)
+            _worker.start()
+        return _worker
+
+
+def wake_account_deletion_worker() -> None:
+    """Réveille le thread de suppression (no-op s'il ne tourne pas dans ce process)."""
+    worker = _worker
+    if worker is not None:
+        worker.wake()
+
+
+def stop_account_deletion_worker() -> None:
+    """Arrête le thread de suppression (shutdown de l'application)."""
+    global _worker
+    with _worker_lock:
+        worker, _worker = _worker, None
+    if worker is not None:
+        worker.stop()
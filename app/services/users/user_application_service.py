@@ -9,11 +9,17 @@ LOT A6 : sync + sync_db_session, exécuté via run_db_bound() depuis les handler
 """
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.db_boundary import sync_db_session
-from app.core.leaderboard_period import LeaderboardPeriod
+from app.core.leaderboard_period import (
+    LeaderboardCursor,
+    LeaderboardPeriod,
+    encode_leaderboard_cursor,
+)
 from app.core.logging_config import get_logger
 from app.schemas.challenge_progress import ChallengeProgressDetailedResponse
 from app.schemas.user import UserCreate
@@ -22,7 +28,11 @@ from app.services.challenges.challenge_progress_service import (
     list_challenge_progress_for_user,
 )
 from app.services.communication.email_service import EmailService
+from app.services.gamification.leaderboard_scores import (
+    ensure_leaderboard_windows_current,
+)
 from app.services.progress.progress_timeline_service import get_progress_timeline
+from app.services.users.account_deletion import request_account_deletion
 from app.services.users.user_service import UserService
 
 logger = get_logger(__name__)
@@ -82,6 +92,7 @@ def register_user(
                 username=user.username,
                 verification_token=verification_token,
                 frontend_url=settings.FRONTEND_URL,
+                user_id=user.id,
             )
             if email_sent:
                 logger.info(
@@ -162,10 +173,41 @@ def get_leaderboard(
     period: LeaderboardPeriod = LeaderboardPeriod.ALL,
 ) -> List[Dict[str, Any]]:
     """Récupère le classement des utilisateurs (voir ``LeaderboardPeriod``)."""
+    if period is not LeaderboardPeriod.ALL:
+        ensure_leaderboard_windows_current()
     with sync_db_session() as db:
-        return UserService.get_leaderboard_for_api(
-            db, current_user_id, limit=limit, period=period
-        )
+        return query_leaderboard(db, current_user_id, limit=limit, period=period)
+
+
+def query_leaderboard(
+    db: Session,
+    current_user_id: int,
+    limit: int = 50,
+    period: LeaderboardPeriod = LeaderboardPeriod.ALL,
+) -> List[Dict[str, Any]]:
+    """Classement sur une session fournie (lecture seule, via run_db_read())."""
+    return UserService.get_leaderboard_for_api(
+        db, current_user_id, limit=limit, period=period
+    )
+
+
+def query_leaderboard_page(
+    db: Session,
+    current_user_id: int,
+    limit: int = 50,
+    period: LeaderboardPeriod = LeaderboardPeriod.ALL,
+    after: Optional[LeaderboardCursor] = None,
+) -> Dict[str, Any]:
+    """Page keyset du classement : ``{"leaderboard": [...], "next_cursor": str | None}``."""
+    entries, next_cursor = UserService.get_leaderboard_page_for_api(
+        db, current_user_id, limit=limit, period=period, after=after
+    )
+    return {
+        "leaderboard": entries,
+        "next_cursor": (
+            encode_leaderboard_cursor(next_cursor) if next_cursor is not None else None
+        ),
+    }
 
 
 def get_user_rank_by_points_data(
@@ -173,6 +215,8 @@ def get_user_rank_by_points_data(
     period: LeaderboardPeriod = LeaderboardPeriod.ALL,
 ) -> Dict[str, Any]:
     """Rang de l'utilisateur par points (même sémantique de période que le classement)."""
+    if period is not LeaderboardPeriod.ALL:
+        ensure_leaderboard_windows_current()
     with sync_db_session() as db:
         return UserService.get_user_rank_by_points_for_api(db, user_id, period=period)
 
@@ -249,12 +293,16 @@ def update_password(
         )
 
 
-def delete_user_account(user_id: int) -> None:
-    """Supprime le compte utilisateur. Lève UserNotFoundError si introuvable."""
-    from app.exceptions import UserNotFoundError
-
+def delete_user_account(user_id: int) -> Optional[int]:
+    """
+    Supprime le compte utilisateur. Lève UserNotFoundError si introuvable.
+    Avec ACCOUNT_DELETION_ASYNC : compte désactivé, retourne l'id du job planifié.
+    """
     with sync_db_session() as db:
+        if settings.ACCOUNT_DELETION_ASYNC:
+            return request_account_deletion(db, user_id, requested_by=user_id)
         UserService.delete_user(db, user_id)
+        return None
 
 
 def export_user_data(user_id: int) -> Optional[Dict[str, Any]]:
@@ -263,6 +311,21 @@ def export_user_data(user_id: int) -> Optional[Dict[str, Any]]:
         return UserService.get_user_export_data_for_api(db, user_id)
 
 
+def get_user_export_profile(user_id: int) -> Optional[Dict[str, Any]]:
+    """Profil de l'export RGPD streamé. Retourne None si introuvable."""
+    with sync_db_session() as db:
+        return UserService.get_user_export_profile_for_api(db, user_id)
+
+
+def iter_user_export_records(
+    db: Session, user_id: int
+) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """Paquets (section, enregistrements) de l'export RGPD, via run_db_stream."""
+    return UserService.iter_user_export_records_for_api(
+        db, user_id, chunk_size=settings.DB_STREAM_CHUNK_ROWS
+    )
+
+
 def get_user_sessions_list(user_id: int) -> List[Dict[str, Any]]:
     """Récupère les sessions actives de l'utilisateur."""
     with sync_db_session() as db:
@@ -0,0 +1,277 @@
+"""
+Export RGPD des données utilisateur (GET /api/users/me/export) : sections, requêtes
+par colonnes et encodeurs streamés.
+
+Formats (paramètre ``format``) :
+- ``json``   : document identique à l'export historique (format 1.1), écrit section
+  par section, tableaux ouverts/fermés au fil des paquets ;
+- ``ndjson`` : une ligne ``{"section": ..., "data": ...}`` par enregistrement
+  (``meta``, ``profile``, une par tentative/badge/…, ``statistics`` en dernier) ;
+- ``zip``    : ``profile.json``, un ``<section>.ndjson`` par section, puis
+  ``statistics.json`` ; archive écrite au fil de l'eau (descripteurs de données).
+
+Les encodeurs consomment les paquets de UserService.iter_user_export_records_for_api
+(via run_db_stream) : la mémoire dépend de la taille d'un paquet, pas de l'historique.
+"""
+
+import json
+import zipfile
+from datetime import datetime, timezone
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, List, Tuple
+
+from sqlalchemy import Row, Select, select
+
+from app.models.achievement import UserAchievement
+from app.models.attempt import Attempt
+from app.models.logic_challenge import LogicChallengeAttempt
+from app.models.progress import Progress
+from app.models.recommendation import Recommendation
+
+USER_EXPORT_FORMAT_VERSION = "1.1"
+USER_EXPORT_FORMATS = ("json", "ndjson", "zip")
+
+# Section -> clé de statistique (ordre du document exporté).
+USER_EXPORT_SECTIONS: Dict[str, str] = {
+    "exercise_attempts": "total_exercise_attempts",
+    "challenge_attempts": "total_challenge_attempts",
+    "badges_earned": "total_badges",
+    "progress": "total_progress_records",
+    "recommendations": "total_recommendations",
+}
+
+UserExportRecords = AsyncIterable[Tuple[str, List[Dict[str, Any]]]]
+
+
+def _iso(value: Any) -> Any:
+    return value.isoformat() if value else None
+
+
+def user_export_header() -> Dict[str, str]:
+    """Champs d'en-tête du document d'export."""
+    return {
+        "export_date": datetime.now(timezone.utc).isoformat(),
+        "format_version": USER_EXPORT_FORMAT_VERSION,
+    }
+
+
+def user_export_queries(
+    user_id: int,
+) -> List[Tuple[str, Select, Callable[[Row], Dict[str, Any]]]]:
+    """(section, SELECT de colonnes, mise en forme d'une ligne) par section."""
+    return [
+        (
+            "exercise_attempts",
+            select(
+                Attempt.exercise_id,
+                Attempt.user_answer,
+                Attempt.is_correct,
+                Attempt.time_spent,
+                Attempt.attempt_number,
+                Attempt.hints_used,
+                Attempt.created_at,
+            )
+            .where(Attempt.user_id == user_id)
+            .order_by(Attempt.id),
+            lambda row: {
+                "exercise_id": row.exercise_id,
+                "answer": row.user_answer,
+                "is_correct": row.is_correct,
+                "time_spent": row.time_spent,
+                "attempt_number": row.attempt_number,
+                "hints_used": row.hints_used,
+                "created_at": _iso(row.created_at),
+            },
+        ),
+        (
+            "challenge_attempts",
+            select(
+                LogicChallengeAttempt.challenge_id,
+                LogicChallengeAttempt.user_solution,
+                LogicChallengeAttempt.is_correct,
+                LogicChallengeAttempt.time_spent,
+                LogicChallengeAttempt.hints_used,
+                LogicChallengeAttempt.created_at,
+            )
+            .where(LogicChallengeAttempt.user_id == user_id)
+            .order_by(LogicChallengeAttempt.id),
+            lambda row: {
+                "challenge_id": row.challenge_id,
+                "user_solution": row.user_solution,
+                "is_correct": row.is_correct,
+                "time_spent": row.time_spent,
+                "hints_used": row.hints_used,
+                "created_at": _iso(row.created_at),
+            },
+        ),
+        (
+            "badges_earned",
+            select(
+                UserAchievement.achievement_id,
+                UserAchievement.earned_at,
+                UserAchievement.progress_data,
+                UserAchievement.is_displayed,
+            )
+            .where(UserAchievement.user_id == user_id)
+            .order_by(UserAchievement.id),
+            lambda row: {
+                "achievement_id": row.achievement_id,
+                "earned_at": _iso(row.earned_at),
+                "progress_data": row.progress_data,
+                "is_displayed": row.is_displayed,
+            },
+        ),
+        (
+            "progress",
+            select(
+                Progress.exercise_type,
+                Progress.difficulty,
+                Progress.total_attempts,
+                Progress.correct_attempts,
+            )
+            .where(Progress.user_id == user_id)
+            .order_by(Progress.id),
+            # success_rate / last_attempt_at n'existent pas sur Progress : null,
+            # comme dans le format 1.1.
+            lambda row: {
+                "exercise_type": row.exercise_type,
+                "difficulty": row.difficulty,
+                "total_attempts": row.total_attempts,
+                "correct_attempts": row.correct_attempts,
+                "success_rate": None,
+                "last_attempt_at": None,
+            },
+        ),
+        (
+            "recommendations",
+            select(
+                Recommendation.exercise_type,
+                Recommendation.priority,
+                Recommendation.is_completed,
+                Recommendation.reason,
+                Recommendation.created_at,
+            )
+            .where(Recommendation.user_id == user_id)
+            .order_by(Recommendation.id),
+            lambda row: {
+                "exercise_type": row.exercise_type,
+                "priority": row.priority,
+                "is_completed": row.is_completed,
+                "reason": row.reason,
+                "created_at": _iso(row.created_at),
+            },
+        ),
+    ]
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _ndjson(section: str, records: List[Dict[str, Any]]) -> str:
+    return "".join(
+        _dumps({"section": section, "data": record}) + "\n" for record in records
+    )
+
+
+async def json_export_stream(
+    header: Dict[str, Any], profile: Dict[str, Any], records: UserExportRecords
+) -> AsyncIterator[bytes]:
+    """Document JSON complet (format 1.1), un bloc d'octets par paquet."""
+    statistics = dict.fromkeys(USER_EXPORT_SECTIONS.values(), 0)
+    head = _dumps({**header, "profile": profile})
+    yield head[:-1].encode("utf-8")
+    current = None
+    async for section, chunk in records:
+        parts = []
+        if section != current:
+            if current is not None:
+                parts.append("]")
+            parts.append(f",{_dumps(section)}:[")
+            current = section
+            first = True
+        for record in chunk:
+            parts.append(_dumps(record) if first else "," + _dumps(record))
+            first = False
+        statistics[USER_EXPORT_SECTIONS[section]] += len(chunk)
+        yield "".join(parts).encode("utf-8")
+    tail = "]" if current is not None else ""
+    yield f'{tail},"statistics":{_dumps(statistics)}}}'.encode("utf-8")
+
+
+async def ndjson_export_stream(
+    header: Dict[str, Any], profile: Dict[str, Any], records: UserExportRecords
+) -> AsyncIterator[bytes]:
+    """NDJSON : meta, profile, enregistrements, statistics."""
+    statistics = dict.fromkeys(USER_EXPORT_SECTIONS.values(), 0)
+    yield (_ndjson("meta", [header]) + _ndjson("profile", [profile])).encode("utf-8")
+    async for section, chunk in records:
+        statistics[USER_EXPORT_SECTIONS[section]] += len(chunk)
+        yield _ndjson(section, chunk).encode("utf-8")
+    yield _ndjson("statistics", [statistics]).encode("utf-8")
+
+
+class _ZipSink:
+    """Sortie non seekable de ZipFile : octets écrits récupérés entre deux paquets."""
+
+    def __init__(self) -> None:
+        self._parts: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+async def zip_export_stream(
+    header: Dict[str, Any], profile: Dict[str, Any], records: UserExportRecords
+) -> AsyncIterator[bytes]:
+    """Archive zip multi-fichiers écrite au fil des paquets."""
+    statistics = dict.fromkeys(USER_EXPORT_SECTIONS.values(), 0)
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(
+            "profile.json", _dumps({**header, "profile": profile}).encode("utf-8")
+        )
+        yield sink.drain()
+        entry = None
+        current = None
+        try:
+            async for section, chunk in records:
+                if section != current:
+                    if entry is not None:
+                        entry.close()
+                    entry = archive.open(f"{section}.ndjson", "w")
+                    current = section
+                entry.write(
+                    "".join(_dumps(record) + "\n" for record in chunk).encode("utf-8")
+                )
+                statistics[USER_EXPORT_SECTIONS[section]] += len(chunk)
+                yield sink.drain()
+        finally:
+            if entry is not None:
+                entry.close()
+        archive.writestr(
+            "statistics.json", _dumps({**header, "statistics": statistics})
+        )
+    yield sink.drain()
+
+
+USER_EXPORT_ENCODERS: Dict[str, Callable[..., AsyncIterator[bytes]]] = {
+    "json": json_export_stream,
+    "ndjson": ndjson_export_stream,
+    "zip": zip_export_stream,
+}
+
+# format -> (media type, extension du fichier).
+USER_EXPORT_MEDIA: Dict[str, Tuple[str, str]] = {
+    "json": ("application/json", "json"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "zip": ("application/zip", "zip"),
+}
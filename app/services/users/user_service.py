@@ -3,12 +3,11 @@ Service pour la gestion des utilisateurs.
 Implémente les opérations métier liées aux utilisateurs et utilise le transaction manager.
 """
 
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from app.core.leaderboard_period import (
-    LeaderboardPeriod,
-    leaderboard_period_cutoff_utc,
-)
+from app.core.config import settings
+from app.core.db_boundary import iter_result_chunks
+from app.core.leaderboard_period import LeaderboardCursor, LeaderboardPeriod
 from app.core.logging_config import get_logger
 from app.core.mastery_tier_bridge import project_exercise_progress_f42
 from app.core.types import (
@@ -27,7 +26,7 @@ from app.services.gamification.compute import (
 
 logger = get_logger(__name__)
 
-from sqlalchemy import func, text
+from sqlalchemy import and_, exists, func, or_, text
 
 
 def _norm_exercise_type_lookup_key(raw: Any) -> str:
@@ -49,22 +48,29 @@ from sqlalchemy.orm import Session, selectinload
 
 from app.db.adapter import DatabaseAdapter
 from app.db.transaction import TransactionManager
-from app.exceptions import UserNotFoundError
-from app.models.achievement import UserAchievement
+from app.exceptions import DatabaseOperationError, UserNotFoundError
 from app.models.attempt import Attempt
 from app.models.exercise import Exercise
+from app.models.leaderboard_score import LeaderboardPeriodScore
 from app.models.logic_challenge import LogicChallenge, LogicChallengeAttempt
-from app.models.point_event import PointEvent
 from app.models.progress import Progress
-from app.models.recommendation import Recommendation
 from app.models.user import User, UserRole
 from app.models.user_session import UserSession
 from app.services.gamification.gamification_service import GamificationService
 from app.services.spaced_repetition.spaced_repetition_read_service import (
     get_spaced_repetition_user_summary,
 )
+from app.services.users.account_deletion import delete_account_data
+from app.services.users.user_data_export import (
+    USER_EXPORT_SECTIONS,
+    user_export_header,
+    user_export_queries,
+)
 from app.utils.db_helpers import adapt_enum_for_db, get_enum_value
 
+# Comptes visibles au classement (prédicat de ix_users_leaderboard_visible).
+_LEADERBOARD_VISIBLE = (User.is_active.is_(True), User.show_in_leaderboards.is_(True))
+
 
 class UserService:
     """
@@ -229,7 +235,9 @@ class UserService:
     def delete_user(db: Session, user_id: int, *, auto_commit: bool = True) -> None:
         """
         Supprime physiquement un utilisateur de la base de données.
-        Les entités associées sont supprimées en cascade.
+        Les entités associées sont supprimées par le plan ensembliste
+        (app.services.users.account_deletion) : DELETE par table et par paquets,
+        un commit par paquet si ``auto_commit``.
 
         Args:
             db: Session de base de données
@@ -244,7 +252,17 @@ class UserService:
             logger.error("Utilisateur avec ID %s non trouvé pour suppression", user_id)
             raise UserNotFoundError(f"Utilisateur avec ID {user_id} non trouvé")
 
-        TransactionManager.safe_delete(db, user, auto_commit=auto_commit)
+        try:
+            deleted = delete_account_data(db, user_id, commit=auto_commit)
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error("Échec de la suppression de l'utilisateur {}: {}", user_id, e)
+            raise DatabaseOperationError(
+                f"Échec de la suppression de l'utilisateur {user_id}"
+            ) from e
+        logger.info(
+            "Utilisateur {} supprimé : {} ligne(s)", user_id, sum(deleted.values())
+        )
 
     @staticmethod
     def disable_user(db: Session, user_id: int) -> bool:
@@ -638,31 +656,14 @@ class UserService:
             return 0
 
     @staticmethod
-    def _is_visible_in_leaderboards(user: User) -> bool:
-        """Applique la confidentialité leaderboard côté service."""
-        settings = user.accessibility_settings or {}
-        privacy = (
-            (settings.get("privacy_settings") or {})
-            if isinstance(settings.get("privacy_settings"), dict)
-            else {}
-        )
-        return privacy.get("show_in_leaderboards") is not False
-
-    @staticmethod
-    def _iter_leaderboard_rows_from_users(
-        users: List[User],
+    def _leaderboard_entries(
+        rows: List[Tuple[User, Optional[int]]],
         current_user_id: int,
-        score_fn: Callable[[User], int],
-        limit: int,
+        first_rank: int = 1,
     ) -> List[Dict[str, Any]]:
-        """Construit la liste classement à partir d'utilisateurs déjà triés (privacy en Python)."""
+        """Construit les lignes classement à partir de (user, score) déjà filtrés et triés en SQL."""
         leaderboard: List[Dict[str, Any]] = []
-        for user in users:
-            if len(leaderboard) >= limit:
-                break
-            if not UserService._is_visible_in_leaderboards(user):
-                continue
-            score = int(score_fn(user))
+        for rank, (user, score) in enumerate(rows, start=first_rank):
             account_total = int(getattr(user, "total_points", None) or 0)
             _, syn_level, _, _ = compute_state_from_total_points(account_total)
             rank_bucket = canonicalize_progression_rank_bucket(
@@ -672,7 +673,7 @@ class UserService:
             leaderboard.append(
                 {
                     "username": user.username,
-                    "total_points": score,
+                    "total_points": int(score or 0),
                     "current_level": syn_level,
                     "jedi_rank": rank_bucket,
                     "progression_rank": rank_bucket,
@@ -680,100 +681,152 @@ class UserService:
                     "avatar_url": user.avatar_url,
                     "current_streak": user.current_streak or 0,
                     "badges_count": len(user.user_achievements),
+                    "rank": rank,
                 }
             )
-        for i, entry in enumerate(leaderboard, start=1):
-            entry["rank"] = i
         return leaderboard
 
     @staticmethod
-    def get_leaderboard_for_api(
+    def _leaderboard_rows(
         db: Session,
-        current_user_id: int,
-        limit: int = 50,
-        period: LeaderboardPeriod = LeaderboardPeriod.ALL,
-    ) -> List[Dict[str, Any]]:
+        limit: int,
+        period: LeaderboardPeriod,
+        after: Optional[LeaderboardCursor],
+    ) -> List[Tuple[User, Optional[int]]]:
         """
-        Récupère le classement des utilisateurs pour l'API.
-        Applique le filtre de confidentialité (show_in_leaderboards).
+        Page keyset (user, score) : une requête LIMIT sur index, confidentialité filtrée
+        en SQL (``users.show_in_leaderboards``).
 
-        ``period`` :
-            - ``all`` : colonne ``users.total_points`` (cumul historique).
-            - ``week`` / ``month`` : somme des ``point_events.points_delta`` depuis la fenêtre
-              glissante (7j / 30j, UTC).
+        - ``all`` : ``ix_users_leaderboard_visible`` (total_points DESC NULLS LAST, id).
+        - ``week`` / ``month`` : ``ix_leaderboard_period_scores_rank`` puis, si la page
+          n'est pas pleine, les comptes sans point sur la fenêtre (score 0, par id).
         """
-        cutoff = leaderboard_period_cutoff_utc(period)
-        batch_size = max(limit + 50, 100)
-
-        if cutoff is None:
+        if period is LeaderboardPeriod.ALL:
             q = (
                 db.query(User)
-                .filter(User.is_active.is_(True))
+                .filter(*_LEADERBOARD_VISIBLE)
                 .options(selectinload(User.user_achievements))
-                .order_by(User.total_points.desc(), User.id.asc())
             )
-            users: List[User] = []
-            offset = 0
-            while len(users) < limit:
-                batch = q.offset(offset).limit(batch_size).all()
-                if not batch:
-                    break
-                users.extend(
-                    user
-                    for user in batch
-                    if UserService._is_visible_in_leaderboards(user)
-                )
-                offset += len(batch)
-            return UserService._iter_leaderboard_rows_from_users(
-                users,
-                current_user_id,
-                lambda u: u.total_points or 0,
-                limit,
+            if after is not None:
+                if after.score is None:
+                    q = q.filter(User.total_points.is_(None), User.id > after.user_id)
+                else:
+                    q = q.filter(
+                        or_(
+                            User.total_points < after.score,
+                            and_(
+                                User.total_points == after.score,
+                                User.id > after.user_id,
+                            ),
+                            User.total_points.is_(None),
+                        )
+                    )
+            users = (
+                q.order_by(User.total_points.desc().nulls_last(), User.id.asc())
+                .limit(limit)
+                .all()
             )
+            return [(user, user.total_points) for user in users]
 
-        period_subq = (
-            db.query(
-                PointEvent.user_id.label("uid"),
-                func.sum(PointEvent.points_delta).label("period_pts"),
+        period_key = str(period)
+        rows: List[Tuple[User, Optional[int]]] = []
+        if after is None or (after.score or 0) > 0:
+            q = (
+                db.query(User, LeaderboardPeriodScore.score)
+                .join(
+                    LeaderboardPeriodScore,
+                    and_(
+                        LeaderboardPeriodScore.user_id == User.id,
+                        LeaderboardPeriodScore.period == period_key,
+                    ),
+                )
+                .filter(*_LEADERBOARD_VISIBLE)
+                .options(selectinload(User.user_achievements))
+            )
+            if after is not None:
+                q = q.filter(
+                    or_(
+                        LeaderboardPeriodScore.score < after.score,
+                        and_(
+                            LeaderboardPeriodScore.score == after.score,
+                            LeaderboardPeriodScore.user_id > after.user_id,
+                        ),
+                    )
+                )
+            rows.extend(
+                q.order_by(
+                    LeaderboardPeriodScore.score.desc(),
+                    LeaderboardPeriodScore.user_id.asc(),
+                )
+                .limit(limit)
+                .all()
             )
-            .filter(PointEvent.created_at >= cutoff)
-            .group_by(PointEvent.user_id)
-            .subquery()
-        )
 
-        q = (
-            db.query(
-                User, func.coalesce(period_subq.c.period_pts, 0).label("lb_points")
+        if len(rows) < limit:
+            scored = exists().where(
+                LeaderboardPeriodScore.period == period_key,
+                LeaderboardPeriodScore.user_id == User.id,
             )
-            .outerjoin(period_subq, User.id == period_subq.c.uid)
-            .filter(User.is_active.is_(True))
-            .options(selectinload(User.user_achievements))
-            .order_by(
-                func.coalesce(period_subq.c.period_pts, 0).desc(),
-                User.id.asc(),
+            q = (
+                db.query(User)
+                .filter(*_LEADERBOARD_VISIBLE, ~scored)
+                .options(selectinload(User.user_achievements))
             )
+            if after is not None and (after.score or 0) == 0:
+                q = q.filter(User.id > after.user_id)
+            rows.extend(
+                (user, 0)
+                for user in q.order_by(User.id.asc()).limit(limit - len(rows)).all()
+            )
+        return rows
+
+    @staticmethod
+    def get_leaderboard_page_for_api(
+        db: Session,
+        current_user_id: int,
+        limit: int = 50,
+        period: LeaderboardPeriod = LeaderboardPeriod.ALL,
+        after: Optional[LeaderboardCursor] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[LeaderboardCursor]]:
+        """
+        Page du classement + curseur de la page suivante (None si dernière page).
+
+        ``period`` :
+            - ``all`` : colonne ``users.total_points`` (cumul historique).
+            - ``week`` / ``month`` : scores matérialisés ``leaderboard_period_scores``
+              (fenêtre glissante 7j / 30j à la journée UTC).
+        """
+        rows = UserService._leaderboard_rows(db, limit, period, after)
+        first_rank = after.rank + 1 if after is not None else 1
+        entries = UserService._leaderboard_entries(rows, current_user_id, first_rank)
+        next_cursor = None
+        if rows and len(rows) >= limit:
+            last_user, last_score = rows[-1]
+            next_cursor = LeaderboardCursor(
+                score=last_score,
+                user_id=last_user.id,
+                rank=first_rank + len(rows) - 1,
+            )
+        return entries, next_cursor
+
+    @staticmethod
+    def get_leaderboard_for_api(
+        db: Session,
+        current_user_id: int,
+        limit: int = 50,
+        period: LeaderboardPeriod = LeaderboardPeriod.ALL,
+        after: Optional[LeaderboardCursor] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Récupère le classement des utilisateurs pour l'API.
+        Applique le filtre de confidentialité (show_in_leaderboards).
+
+        Voir ``get_leaderboard_page_for_api`` pour ``period`` et ``after``.
+        """
+        entries, _ = UserService.get_leaderboard_page_for_api(
+            db, current_user_id, limit=limit, period=period, after=after
         )
-        users_ordered: List[User] = []
-        scores_by_id: Dict[int, int] = {}
-        offset = 0
-        while len(users_ordered) < limit:
-            rows = q.offset(offset).limit(batch_size).all()
-            if not rows:
-                break
-            for user, lb_points in rows:
-                if not UserService._is_visible_in_leaderboards(user):
-                    continue
-                users_ordered.append(user)
-                scores_by_id[user.id] = int(lb_points or 0)
-                if len(users_ordered) >= limit:
-                    break
-            offset += len(rows)
-        return UserService._iter_leaderboard_rows_from_users(
-            users_ordered,
-            current_user_id,
-            lambda u: scores_by_id.get(u.id, 0),
-            limit,
-        )
+        return entries
 
     @staticmethod
     def get_user_rank_by_points_for_api(
@@ -782,52 +835,44 @@ class UserService:
         period: LeaderboardPeriod = LeaderboardPeriod.ALL,
     ) -> Dict[str, Any]:
         """
-        Rang par points (utilisateurs actifs uniquement) : 1 + nombre d'utilisateurs
-        avec strictement plus de points. Même logique de tie que le tri du leaderboard.
+        Rang par points parmi les comptes visibles au classement (actifs,
+        ``show_in_leaderboards``) : 1 + nombre d'entre eux avec strictement plus de
+        points. Même population et même logique de tie que le leaderboard affiché.
 
         ``period`` : voir ``get_leaderboard_for_api`` (``all`` = ``total_points`` cumulé).
+        Comptage par parcours d'index (score > le mien), sans agrégation du ledger.
         """
         user = UserService.get_user(db, user_id)
         if user is None:
             raise UserNotFoundError(f"Utilisateur avec ID {user_id} non trouvé")
-        cutoff = leaderboard_period_cutoff_utc(period)
 
-        if cutoff is None:
+        if period is LeaderboardPeriod.ALL:
             my_points = int(user.total_points or 0)
-            pts = func.coalesce(User.total_points, 0)
             ahead = (
                 db.query(func.count())
                 .select_from(User)
-                .filter(User.is_active.is_(True), pts > my_points)
+                .filter(*_LEADERBOARD_VISIBLE, User.total_points > my_points)
                 .scalar()
             )
         else:
+            period_key = str(period)
             my_row = (
-                db.query(func.coalesce(func.sum(PointEvent.points_delta), 0))
+                db.query(LeaderboardPeriodScore.score)
                 .filter(
-                    PointEvent.user_id == user_id,
-                    PointEvent.created_at >= cutoff,
+                    LeaderboardPeriodScore.period == period_key,
+                    LeaderboardPeriodScore.user_id == user_id,
                 )
                 .scalar()
             )
             my_points = int(my_row or 0)
-
-            pte_agg = (
-                db.query(
-                    PointEvent.user_id.label("agg_uid"),
-                    func.sum(PointEvent.points_delta).label("agg_pts"),
-                )
-                .filter(PointEvent.created_at >= cutoff)
-                .group_by(PointEvent.user_id)
-                .subquery()
-            )
             ahead = (
                 db.query(func.count())
-                .select_from(User)
-                .outerjoin(pte_agg, User.id == pte_agg.c.agg_uid)
+                .select_from(LeaderboardPeriodScore)
+                .join(User, User.id == LeaderboardPeriodScore.user_id)
                 .filter(
-                    User.is_active.is_(True),
-                    func.coalesce(pte_agg.c.agg_pts, 0) > my_points,
+                    LeaderboardPeriodScore.period == period_key,
+                    LeaderboardPeriodScore.score > my_points,
+                    *_LEADERBOARD_VISIBLE,
                 )
                 .scalar()
             )
@@ -1423,15 +1468,10 @@ class UserService:
         return True, None
 
     @staticmethod
-    def get_user_export_data_for_api(
+    def get_user_export_profile_for_api(
         db: Session, user_id: int
     ) -> Optional[Dict[str, Any]]:
-        """
-        Récupère toutes les données d'un utilisateur pour export RGPD.
-        Retourne None si l'utilisateur n'existe pas.
-        """
-        from datetime import datetime, timezone
-
+        """Profil de l'export RGPD. Retourne None si l'utilisateur n'existe pas."""
         user = UserService.get_user(db, user_id)
         if not user:
             return None
@@ -1443,7 +1483,7 @@ class UserService:
             syn_level,
         )
 
-        profile = {
+        return {
             "id": user.id,
             "username": user.username,
             "email": user.email,
@@ -1469,111 +1509,45 @@ class UserService:
             "updated_at": user.updated_at.isoformat() if user.updated_at else None,
         }
 
-        attempts = db.query(Attempt).filter(Attempt.user_id == user_id).all()
-        exercises_data = [
-            {
-                "exercise_id": a.exercise_id,
-                "answer": a.user_answer if hasattr(a, "user_answer") else None,
-                "is_correct": a.is_correct,
-                "time_spent": a.time_spent if hasattr(a, "time_spent") else None,
-                "attempt_number": (
-                    a.attempt_number if hasattr(a, "attempt_number") else None
-                ),
-                "hints_used": a.hints_used if hasattr(a, "hints_used") else 0,
-                "created_at": a.created_at.isoformat() if a.created_at else None,
-            }
-            for a in attempts
-        ]
-
-        challenge_attempts = (
-            db.query(LogicChallengeAttempt)
-            .filter(LogicChallengeAttempt.user_id == user_id)
-            .all()
-        )
-        challenges_data = [
-            {
-                "challenge_id": ca.challenge_id,
-                "user_solution": ca.user_solution,
-                "is_correct": ca.is_correct,
-                "time_spent": ca.time_spent,
-                "hints_used": ca.hints_used,
-                "created_at": (ca.created_at.isoformat() if ca.created_at else None),
-            }
-            for ca in challenge_attempts
-        ]
-
-        achievements = (
-            db.query(UserAchievement).filter(UserAchievement.user_id == user_id).all()
-        )
-        badges_data = [
-            {
-                "achievement_id": ach.achievement_id,
-                "earned_at": (
-                    ach.earned_at.isoformat()
-                    if hasattr(ach, "earned_at") and ach.earned_at
-                    else None
-                ),
-                "progress_data": (
-                    ach.progress_data if hasattr(ach, "progress_data") else None
-                ),
-                "is_displayed": (
-                    ach.is_displayed if hasattr(ach, "is_displayed") else True
-                ),
-            }
-            for ach in achievements
-        ]
+    @staticmethod
+    def iter_user_export_records_for_api(
+        db: Session, user_id: int, *, chunk_size: int
+    ) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Historique de l'export RGPD : (section, paquet d'enregistrements).
 
-        progress_records = db.query(Progress).filter(Progress.user_id == user_id).all()
-        progress_data = [
-            {
-                "exercise_type": p.exercise_type,
-                "difficulty": p.difficulty,
-                "total_attempts": p.total_attempts,
-                "correct_attempts": p.correct_attempts,
-                "success_rate": p.success_rate if hasattr(p, "success_rate") else None,
-                "last_attempt_at": (
-                    p.last_attempt_at.isoformat()
-                    if hasattr(p, "last_attempt_at") and p.last_attempt_at
-                    else None
-                ),
-            }
-            for p in progress_records
-        ]
+        Sections dans l'ordre de USER_EXPORT_SECTIONS, au moins un paquet (peut-être
+        vide) par section ; tuples de colonnes lus par curseur serveur, mémoire
+        constante quel que soit l'historique.
+        """
+        for section, stmt, to_record in user_export_queries(user_id):
+            empty = True
+            for chunk in iter_result_chunks(db, stmt, chunk_size):
+                empty = False
+                yield section, [to_record(row) for row in chunk]
+            if empty:
+                yield section, []
 
-        recommendations = (
-            db.query(Recommendation).filter(Recommendation.user_id == user_id).all()
-        )
-        recommendations_data = [
-            {
-                "exercise_type": (
-                    r.exercise_type if hasattr(r, "exercise_type") else None
-                ),
-                "priority": r.priority if hasattr(r, "priority") else None,
-                "is_completed": r.is_completed if hasattr(r, "is_completed") else False,
-                "reason": r.reason if hasattr(r, "reason") else None,
-                "created_at": (
-                    r.created_at.isoformat()
-                    if hasattr(r, "created_at") and r.created_at
-                    else None
-                ),
-            }
-            for r in recommendations
-        ]
+    @staticmethod
+    def get_user_export_data_for_api(
+        db: Session, user_id: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Récupère toutes les données d'un utilisateur pour export RGPD (document complet
+        en mémoire ; GET /api/users/me/export streame les mêmes sections).
+        Retourne None si l'utilisateur n'existe pas.
+        """
+        profile = UserService.get_user_export_profile_for_api(db, user_id)
+        if profile is None:
+            return None
 
-        return {
-            "export_date": datetime.now(timezone.utc).isoformat(),
-            "format_version": "1.1",
-            "profile": profile,
-            "exercise_attempts": exercises_data,
-            "challenge_attempts": challenges_data,
-            "badges_earned": badges_data,
-            "progress": progress_data,
-            "recommendations": recommendations_data,
-            "statistics": {
-                "total_exercise_attempts": len(exercises_data),
-                "total_challenge_attempts": len(challenges_data),
-                "total_badges": len(badges_data),
-                "total_progress_records": len(progress_data),
-                "total_recommendations": len(recommendations_data),
-            },
+        export = {**user_export_header(), "profile": profile}
+        export.update({section: [] for section in USER_EXPORT_SECTIONS})
+        for section, records in UserService.iter_user_export_records_for_api(
+            db, user_id, chunk_size=settings.DB_STREAM_CHUNK_ROWS
+        ):
+            export[section].extend(records)
+        export["statistics"] = {
+            stat: len(export[section]) for section, stat in USER_EXPORT_SECTIONS.items()
         }
+        return export
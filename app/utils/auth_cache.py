@@ -0,0 +1,207 @@
+"""
+Caches auth process-wide (perf chemin chaud GET authentifié).
+
+1. Tokens vérifiés : LRU borné {sha256(token): payload}, entrée valable jusqu'à
+   l'``exp`` du JWT. Évite la vérification HMAC à chaque requête /api/*.
+2. Payload utilisateur : TTL court {username: payload /me}, évite la requête users
+   + compute_state_from_total_points. Invalidé après commit de toute modification
+   d'un User (reset password, rôle, points, profil, suppression) via les events
+   de session SQLAlchemy ; le TTL borne la convergence des autres workers.
+
+Le token brut n'est jamais stocké (digest uniquement).
+"""
+
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+_SESSION_INFO_KEY = "auth_cache_dirty_user_ids"
+
+
+# ─── 1. Tokens vérifiés ───────────────────────────────────────────────────────
+
+
+class VerifiedTokenCache:
+    """LRU thread-safe de payloads JWT déjà vérifiés, expirant à ``exp``."""
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[dict, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[dict]:
+        if self._max_entries <= 0:
+            return None
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            payload, expires_at = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return dict(payload)
+
+    def put(self, token: str, payload: dict) -> None:
+        exp = payload.get("exp")
+        if self._max_entries <= 0 or exp is None:
+            return
+        try:
+            expires_at = float(exp)
+        except (TypeError, ValueError):
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (dict(payload), expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+verified_token_cache = VerifiedTokenCache(settings.AUTH_TOKEN_CACHE_MAX_ENTRIES)
+
+
+# ─── 2. Payload utilisateur ───────────────────────────────────────────────────
+
+
+class UserPayloadCache:
+    """
+    Cache TTL {username: payload /me} avec index user_id → usernames pour
+    l'invalidation depuis les events ORM.
+
+    ``password_changed_at`` est conservé à part : la révocation par reset password
+    est revérifiée à chaque lecture contre l'``iat`` du token courant.
+
+    ``generation`` protège contre la course lecture DB / invalidation concurrente :
+    put() est ignoré si une invalidation a eu lieu depuis la capture.
+    """
+
+    def __init__(self, ttl_sec: float):
+        self._ttl_sec = ttl_sec
+        self._generation = 0
+        self._entries: Dict[str, Tuple[Dict[str, Any], Optional[datetime], float]] = {}
+        self._usernames_by_id: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, username: str) -> Optional[Tuple[Dict[str, Any], Optional[datetime]]]:
+        if self._ttl_sec <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None:
+                return None
+            user_payload, password_changed_at, stored_at = entry
+            if (time.monotonic() - stored_at) >= self._ttl_sec:
+                self._drop(username)
+                return None
+        return copy.deepcopy(user_payload), password_changed_at
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def put(
+        self,
+        username: str,
+        user_payload: Dict[str, Any],
+        password_changed_at: Optional[datetime],
+        generation: Optional[int] = None,
+    ) -> None:
+        if self._ttl_sec <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[username] = (
+                copy.deepcopy(user_payload),
+                password_changed_at,
+                time.monotonic(),
+            )
+            user_id = user_payload.get("id")
+            if user_id is not None:
+                self._usernames_by_id.setdefault(user_id, set()).add(username)
+
+    def _drop(self, username: str) -> None:
+        entry = self._entries.pop(username, None)
+        if entry is None:
+            return
+        user_id = entry[0].get("id")
+        names = self._usernames_by_id.get(user_id)
+        if names is not None:
+            names.discard(username)
+            if not names:
+                del self._usernames_by_id[user_id]
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            self._generation += 1
+            for username in list(self._usernames_by_id.get(user_id, ())):
+                self._drop(username)
+
+    def invalidate_username(self, username: str) -> None:
+        with self._lock:
+            self._generation += 1
+            self._drop(username)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._usernames_by_id.clear()
+
+
+user_payload_cache = UserPayloadCache(settings.USER_PAYLOAD_CACHE_TTL_SECONDS)
+
+
+def invalidate_user_payload(user_id: int) -> None:
+    """Invalidation explicite (hors ORM, ex. UPDATE SQL brut)."""
+    user_payload_cache.invalidate_user(user_id)
+
+
+def clear_auth_caches() -> None:
+    """Vide les deux caches (tests, rotation SECRET_KEY)."""
+    verified_token_cache.clear()
+    user_payload_cache.clear()
+
+
+# ─── Invalidation post-commit (events ORM) ────────────────────────────────────
+# Pas de purge sur rollback : un id resté dans session.info ne coûte qu'une
+# invalidation superflue au prochain commit.
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_dirty_users(session, _flush_context) -> None:
+    from app.models.user import User
+
+    dirty = session.info.setdefault(_SESSION_INFO_KEY, set())
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            dirty.add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session) -> None:
+    for user_id in session.info.pop(_SESSION_INFO_KEY, ()):
+        user_payload_cache.invalidate_user(user_id)
@@ -0,0 +1,171 @@
+"""
+Tirage aléatoire et totaux des listings catalogue (exercices, défis logiques).
+
+1. ``sample_by_key`` : ``order=random`` sans ``OFFSET``. Chaque ligne porte une
+   clé uniforme ``sample_key`` dans [0, 1) ; on tire ``r`` puis on lit
+   ``WHERE sample_key >= r ORDER BY sample_key LIMIT n`` (parcours d'index), en
+   repartant de 0 si la fin de l'intervalle ne suffit pas. Coût indépendant de la
+   taille du catalogue, là où ``OFFSET k`` parcourt et jette k lignes.
+2. ``catalog_totals_cache`` : TTL court {(table, filtres...): total}, évite le
+   ``count()`` à chaque page. Invalidé après commit de toute création /
+   suppression / modification d'une colonne filtrée (events de session
+   SQLAlchemy) ; le TTL borne la convergence des autres workers et des écritures
+   SQL brutes. Une session qui a écrit dans la table compte sans cache jusqu'à
+   son commit / rollback (elle doit voir ses propres lignes).
+"""
+
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+_SESSION_INFO_KEY = "catalog_totals_dirty_tables"
+
+# Colonnes utilisées par les filtres de listing : leur modification change les totaux.
+_FILTERED_COLUMNS = {
+    "exercises": ("exercise_type", "age_group", "title", "question", "is_archived"),
+    "logic_challenges": (
+        "challenge_type",
+        "age_group",
+        "difficulty_rating",
+        "tags",
+        "title",
+        "description",
+        "is_active",
+        "is_archived",
+    ),
+}
+
+
+# ─── 1. Tirage par keyset ─────────────────────────────────────────────────────
+
+
+def sample_by_key(query, key_column, limit: int, pivot: Optional[float] = None) -> List:
+    """
+    Retourne jusqu'à ``limit`` lignes de ``query`` (déjà filtrée) à partir d'un
+    point aléatoire de ``key_column``, avec bouclage en début d'intervalle.
+
+    Les lignes d'une page sont consécutives dans l'ordre de la clé ; d'une
+    requête à l'autre le point de départ change.
+    """
+    if limit <= 0:
+        return []
+    if pivot is None:
+        pivot = random.random()
+    rows = query.filter(key_column >= pivot).order_by(key_column).limit(limit).all()
+    if len(rows) < limit:
+        rows += (
+            query.filter(key_column < pivot)
+            .order_by(key_column)
+            .limit(limit - len(rows))
+            .all()
+        )
+    return rows
+
+
+# ─── 2. Totaux par combinaison de filtres ─────────────────────────────────────
+
+
+class CatalogTotalsCache:
+    """LRU thread-safe {clé de filtres: total} à TTL, clés préfixées par la table."""
+
+    def __init__(self, ttl_sec: float, max_entries: int):
+        self._ttl_sec = ttl_sec
+        self._max_entries = max_entries
+        self._generation = 0
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Tuple[int, float]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl_sec > 0 and self._max_entries > 0
+
+    def get_or_count(
+        self,
+        db: Session,
+        key: Tuple[Hashable, ...],
+        count: Callable[[], int],
+    ) -> int:
+        """Total en cache pour ``key`` (``key[0]`` = table), sinon ``count()``."""
+        if not self.enabled or key[0] in db.info.get(_SESSION_INFO_KEY, ()):
+            return count()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                total, stored_at = entry
+                if (time.monotonic() - stored_at) < self._ttl_sec:
+                    self._entries.move_to_end(key)
+                    return total
+                del self._entries[key]
+            generation = self._generation
+        total = count()
+        with self._lock:
+            # Invalidation concurrente pendant le count : ne pas stocker un total périmé.
+            if generation == self._generation:
+                self._entries[key] = (total, time.monotonic())
+                self._entries.move_to_end(key)
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+        return total
+
+    def invalidate(self, table: str) -> None:
+        with self._lock:
+            self._generation += 1
+            for key in [k for k in self._entries if k[0] == table]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+catalog_totals_cache = CatalogTotalsCache(
+    settings.CATALOG_TOTALS_CACHE_TTL_SECONDS,
+    settings.CATALOG_TOTALS_CACHE_MAX_ENTRIES,
+)
+
+
+# ─── Invalidation post-commit (events ORM) ────────────────────────────────────
+
+
+def _changes_totals(obj, table: str, is_dirty: bool) -> bool:
+    if not is_dirty:
+        return True
+    attrs = inspect(obj).attrs
+    return any(attrs[name].history.has_changes() for name in _FILTERED_COLUMNS[table])
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_dirty_catalog_tables(session, _flush_context) -> None:
+    for objects, is_dirty in (
+        (session.new, False),
+        (session.dirty, True),
+        (session.deleted, False),
+    ):
+        for obj in objects:
+            table = getattr(obj, "__tablename__", None)
+            if table in _FILTERED_COLUMNS and _changes_totals(obj, table, is_dirty):
+                session.info.setdefault(_SESSION_INFO_KEY, set()).add(table)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_catalog_tables(session) -> None:
+    for table in session.info.pop(_SESSION_INFO_KEY, ()):
+        catalog_totals_cache.invalidate(table)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_catalog_tables(session) -> None:
+    session.info.pop(_SESSION_INFO_KEY, None)
@@ -3,13 +3,14 @@ Utilitaires DB pour les handlers (DRY).
 Context manager sync pour session + commit/rollback/close.
 
 Vérité runtime: sync_db_session est la source unique pour les services exécutés
-via run_db_bound(). Aucun context manager async legacy.
+via run_db_bound(). async_db_session (opt-in DB_ASYNC_ENABLED) sert uniquement
+les lectures de run_db_read().
 
 Contrat boundary (F5): voir app.core.db_boundary pour la formalisation explicite.
 """
 
-from contextlib import contextmanager
-from typing import Generator
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncGenerator, Generator
 
 from sqlalchemy.orm import Session
 
@@ -34,3 +35,26 @@ def sync_db_session() -> Generator[Session, None, None]:
         raise
     finally:
         db.close()
+
+
+@asynccontextmanager
+async def async_db_session() -> AsyncGenerator[Any, None]:
+    """
+    Context manager async pour une AsyncSession (asyncpg).
+    Lève RuntimeError si le mode async n'est pas actif (DB_ASYNC_ENABLED / asyncpg).
+
+    Usage:
+        async with async_db_session() as db:
+            result = await db.run_sync(some_sync_read, arg)
+    """
+    from app.db.async_base import get_async_sessionmaker
+
+    factory = get_async_sessionmaker()
+    if factory is None:
+        raise RuntimeError("async_db_session indisponible (DB_ASYNC_ENABLED=false)")
+    async with factory() as db:
+        try:
+            yield db
+        except Exception:
+            await db.rollback()
+            raise
@@ -17,6 +17,7 @@ from app.core.logging_config import get_logger
 logger = get_logger(__name__)
 from starlette.responses import JSONResponse
 
+from app.exceptions import DbExecutorOverloadedError
 from app.utils.json_utils import make_json_serializable
 
 # Message générique pour ne pas exposer les détails techniques en production
@@ -126,6 +127,15 @@ def api_error_response(
     return JSONResponse(payload, status_code=status_code)
 
 
+def overloaded_error_response(
+    message: str, *, path: Optional[str] = None
+) -> JSONResponse:
+    """503 de délestage (executor DB saturé) avec Retry-After — pas de capture Sentry."""
+    response = api_error_response(503, message, path=path)
+    response.headers["Retry-After"] = "1"
+    return response
+
+
 def get_safe_error_message(exc: Exception, default: Optional[str] = None) -> str:
     """
     Retourne un message d'erreur sûr pour l'utilisateur.
@@ -153,6 +163,8 @@ def capture_internal_error_response(
     """
     Retourne une réponse 500 standardisée après capture Sentry de l'exception.
     """
+    if isinstance(error, DbExecutorOverloadedError):
+        return overloaded_error_response(error.message, path=path)
     capture_exception_for_sentry(
         error,
         status_code=500,
@@ -197,6 +209,10 @@ class ErrorHandler:
                 traceback (exc_info) remplace la paire logger.error + logger.debug(traceback)
                 répétée dans les handlers — évite la double journalisation avec ce helper.
         """
+        if isinstance(error, DbExecutorOverloadedError):
+            # Délestage attendu sous charge : ni log error ni Sentry
+            return overloaded_error_response(error.message)
+
         error_type = type(error).__name__
         error_message = str(error)
 
@@ -1,16 +1,182 @@
 """
 Lecture des paramètres globaux (table settings).
 Utilisé par middleware et handlers pour maintenance_mode, registration_enabled, etc.
+
+Snapshot process-wide (perf) :
+- La table settings est chargée en une requête puis servie depuis la mémoire
+  pendant SETTINGS_SNAPSHOT_TTL_SECONDS.
+- admin_config_service invalide le snapshot après écriture (invalidate_settings_snapshot).
+- Si REDIS_URL est défini, l'invalidation est diffusée en pub/sub : chaque worker
+  Gunicorn abonné (start_settings_invalidation_listener) vide son snapshot.
+- peek_setting_bool() lit le snapshot sans DB ni threadpool (None si froid/expiré).
 """
 
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
 from app.core.db_boundary import sync_db_session
+from app.core.logging_config import get_logger
+from app.core.monitoring import record_settings_snapshot_lookup
 from app.models.setting import Setting
 
+logger = get_logger(__name__)
 
-def get_setting_bool(key: str, default: bool = False) -> bool:
-    """Lit une valeur booléenne depuis la table settings."""
+SETTINGS_INVALIDATION_CHANNEL = "mathakine:settings:invalidate"
+
+# Snapshot {key: value brute} + instant de chargement (monotonic). None = froid.
+_snapshot: Optional[Dict[str, Optional[str]]] = None
+_loaded_at: float = 0.0
+_lock = threading.Lock()
+
+# Listener pub/sub Redis (un par process)
+_listener: Any = None
+_listener_pubsub: Any = None
+
+
+def _parse_bool(raw: Optional[str], default: bool) -> bool:
+    if raw is None:
+        return default
+    return str(raw).lower() in ("true", "1", "yes", "on")
+
+
+def _load_snapshot() -> Dict[str, Optional[str]]:
+    """Charge toute la table settings (quelques lignes) en une requête."""
     with sync_db_session() as db:
-        row = db.query(Setting).filter(Setting.key == key).first()
-        if not row or row.value is None:
-            return default
-        return str(row.value).lower() in ("true", "1", "yes", "on")
+        rows = db.query(Setting.key, Setting.value).all()
+    return {key: value for key, value in rows}
+
+
+def _fresh_snapshot() -> Optional[Dict[str, Optional[str]]]:
+    snap = _snapshot
+    if snap is None:
+        return None
+    if (time.monotonic() - _loaded_at) >= settings.SETTINGS_SNAPSHOT_TTL_SECONDS:
+        return None
+    return snap
+
+
+def _get_snapshot() -> Dict[str, Optional[str]]:
+    """Snapshot frais, rechargé depuis la DB si froid ou expiré."""
+    global _snapshot, _loaded_at
+
+    snap = _fresh_snapshot()
+    if snap is not None:
+        record_settings_snapshot_lookup(hit=True)
+        return snap
+
+    with _lock:
+        # Un autre thread a pu recharger pendant l'attente du lock
+        snap = _fresh_snapshot()
+        if snap is not None:
+            record_settings_snapshot_lookup(hit=True)
+            return snap
+        record_settings_snapshot_lookup(hit=False)
+        snap = _load_snapshot()
+        _snapshot = snap
+        _loaded_at = time.monotonic()
+        return snap
+
+
+def get_setting_bool(key: str, default: bool = False) -> bool:
+    """Lit une valeur booléenne depuis la table settings (via snapshot TTL)."""
+    return _parse_bool(_get_snapshot().get(key), default)
+
+
+def peek_setting_bool(key: str, default: bool = False) -> Optional[bool]:
+    """
+    Lecture non bloquante : valeur depuis le snapshot s'il est frais, sinon None.
+
+    Permet au code async d'éviter run_db_bound() sur le chemin chaud ;
+    sur None, l'appelant retombe sur get_setting_bool() via run_db_bound().
+    """
+    snap = _fresh_snapshot()
+    if snap is None:
+        return None
+    record_settings_snapshot_lookup(hit=True)
+    return _parse_bool(snap.get(key), default)
+
+
+def _clear_local_snapshot() -> None:
+    global _snapshot, _loaded_at
+    with _lock:
+        _snapshot = None
+        _loaded_at = 0.0
+
+
+def invalidate_settings_snapshot(broadcast: bool = True) -> None:
+    """
+    Invalide le snapshot local et, si Redis est configuré, celui des autres workers.
+
+    Appelé après commit d'une écriture dans settings. Best effort côté Redis :
+    en cas d'échec, les autres workers convergent au plus tard après le TTL.
+    """
+    _clear_local_snapshot()
+    if not broadcast:
+        return
+    redis_url = (settings.REDIS_URL or "").strip()
+    if not redis_url:
+        return
+    try:
+        import redis
+
+        client = redis.from_url(redis_url, socket_timeout=1.0)
+        try:
+            client.publish(SETTINGS_INVALIDATION_CHANNEL, "1")
+        finally:
+            client.close()
+    except Exception as exc:
+        logger.warning(
+            "Settings invalidation broadcast failed (fallback TTL {}s): {}",
+            settings.SETTINGS_SNAPSHOT_TTL_SECONDS,
+            exc,
+        )
+
+
+def start_settings_invalidation_listener() -> bool:
+    """
+    Abonne ce process au canal d'invalidation Redis (thread daemon redis-py).
+
+    No-op si REDIS_URL est vide ou si le listener tourne déjà.
+    Returns:
+        True si un listener est actif après l'appel.
+    """
+    global _listener, _listener_pubsub
+
+    if _listener is not None:
+        return True
+    redis_url = (settings.REDIS_URL or "").strip()
+    if not redis_url:
+        return False
+    try:
+        import redis
+
+        client = redis.from_url(redis_url)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(
+            **{SETTINGS_INVALIDATION_CHANNEL: lambda _message: _clear_local_snapshot()}
+        )
+        _listener = pubsub.run_in_thread(sleep_time=0.5, daemon=True)
+        _listener_pubsub = pubsub
+        logger.info("Settings invalidation listener started")
+        return True
+    except Exception as exc:
+        logger.warning("Settings invalidation listener unavailable: {}", exc)
+        return False
+
+
+def stop_settings_invalidation_listener() -> None:
+    """Arrête le listener pub/sub (shutdown)."""
+    global _listener, _listener_pubsub
+
+    listener, pubsub = _listener, _listener_pubsub
+    _listener = None
+    _listener_pubsub = None
+    try:
+        if listener is not None:
+            listener.stop()
+        if pubsub is not None:
+            pubsub.close()
+    except Exception as exc:
+        logger.debug("Settings invalidation listener stop failed: {}", exc)
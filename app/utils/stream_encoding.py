@@ -0,0 +1,82 @@
+"""
+Encodage des téléchargements streamés (exports admin, RGPD) : CSV par paquets de
+lignes et compression gzip à la volée, négociée via Accept-Encoding.
+
+Chaque paquet de lignes produit un seul bloc d'octets (pas un yield par ligne) ; le
+compresseur gzip est incrémental, la mémoire reste bornée par la taille d'un paquet.
+"""
+
+import csv
+import io
+import zlib
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional, Sequence
+
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+
+from app.core.config import settings
+
+# BOM UTF-8 : ouverture correcte des accents dans Excel.
+CSV_BOM = "\ufeff"
+# Niveau 6 (défaut zlib) : bon compromis débit / taille pour du CSV/JSON.
+_GZIP_LEVEL = 6
+# En-tête + trailer gzip (wbits 16 + 15).
+_GZIP_WBITS = 31
+
+
+def accepts_gzip(request: Request) -> bool:
+    """True si le client accepte gzip (et ENABLE_GZIP actif)."""
+    if not settings.ENABLE_GZIP:
+        return False
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00")
+    return False
+
+
+async def csv_stream(
+    headers: Sequence[str], row_chunks: AsyncIterable[List[List[Any]]]
+) -> AsyncIterator[bytes]:
+    """CSV UTF-8 (BOM + en-têtes) puis un bloc d'octets par paquet de lignes."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    buf.write(CSV_BOM)
+    writer.writerow(headers)
+    yield buf.getvalue().encode("utf-8")
+    async for rows in row_chunks:
+        buf.seek(0)
+        buf.truncate(0)
+        writer.writerows(rows)
+        yield buf.getvalue().encode("utf-8")
+
+
+async def gzip_stream(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """Compresse un flux d'octets en gzip, bloc par bloc."""
+    compressor = zlib.compressobj(_GZIP_LEVEL, zlib.DEFLATED, _GZIP_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def streamed_download_response(
+    request: Request,
+    body: AsyncIterable[bytes],
+    *,
+    media_type: str,
+    filename: str,
+    extra_headers: Optional[Dict[str, str]] = None,
+) -> StreamingResponse:
+    """StreamingResponse en pièce jointe, gzip à la volée si le client l'accepte."""
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Vary": "Accept-Encoding",
+    }
+    if extra_headers:
+        headers.update(extra_headers)
+    if accepts_gzip(request):
+        body = gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type=media_type, headers=headers)
@@ -11,7 +11,7 @@ from typing import Sequence, Union
 
 import sqlalchemy as sa
 from alembic import op
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm import Session, defer, sessionmaker
 
 revision: str = "20260327_content_difficulty_tier"
 down_revision: Union[str, None] = "20260326_users_age_group"
@@ -59,9 +59,16 @@ def upgrade() -> None:
         from app.models.exercise import Exercise
         from app.models.logic_challenge import LogicChallenge
 
-        for ex in s.query(Exercise).yield_per(300):
+        # Colonnes ORM ajoutées par des révisions ultérieures : absentes à ce stade.
+        for ex in (
+            s.query(Exercise).options(defer(Exercise.sample_key)).yield_per(300)
+        ):
             assign_exercise_difficulty_tier(ex)
-        for ch in s.query(LogicChallenge).yield_per(300):
+        for ch in (
+            s.query(LogicChallenge)
+            .options(defer(LogicChallenge.sample_key))
+            .yield_per(300)
+        ):
             assign_logic_challenge_difficulty_tier(ch)
         s.commit()
     finally:
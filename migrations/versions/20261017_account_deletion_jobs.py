@@ -0,0 +1,75 @@
+"""Suppression de compte par paquets : table account_deletion_jobs, index créateur
+
+Revision ID: 20261017_account_deletion_jobs
+Revises: 20261017_exercise_inventory
+Create Date: 2026-10-17
+
+account_deletion_jobs porte la progression des suppressions de compte en
+arrière-plan (ACCOUNT_DELETION_ASYNC). ix_exercises_creator_id sert les étapes du
+plan qui visent le contenu créé par le compte (``creator_id = :user_id``).
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "20261017_account_deletion_jobs"
+down_revision: Union[str, None] = "20261017_exercise_inventory"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    indexes = {i["name"] for i in inspector.get_indexes("exercises")}
+    if "ix_exercises_creator_id" not in indexes:
+        op.create_index("ix_exercises_creator_id", "exercises", ["creator_id"])
+    if "account_deletion_jobs" in inspector.get_table_names():
+        return
+    op.create_table(
+        "account_deletion_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("requested_by", sa.Integer(), nullable=True),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("step", sa.String(length=64), nullable=True),
+        sa.Column("rows_deleted", sa.Integer(), nullable=False),
+        sa.Column("progress", sa.JSON(), nullable=True),
+        sa.Column("tries", sa.Integer(), nullable=False),
+        sa.Column(
+            "next_attempt_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=True,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_account_deletion_jobs_id", "account_deletion_jobs", ["id"])
+    op.create_index(
+        "ix_account_deletion_jobs_user_id", "account_deletion_jobs", ["user_id"]
+    )
+    op.execute(sa.text("""
+            CREATE INDEX ix_account_deletion_jobs_pending
+            ON account_deletion_jobs (next_attempt_at)
+            WHERE status = 'pending'
+            """))
+
+
+def downgrade() -> None:
+    op.execute(sa.text("DROP INDEX IF EXISTS ix_account_deletion_jobs_pending"))
+    op.drop_index(
+        "ix_account_deletion_jobs_user_id", table_name="account_deletion_jobs"
+    )
+    op.drop_index("ix_account_deletion_jobs_id", table_name="account_deletion_jobs")
+    op.drop_table("account_deletion_jobs")
+    op.drop_index("ix_exercises_creator_id", table_name="exercises")
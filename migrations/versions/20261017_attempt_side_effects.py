@@ -0,0 +1,65 @@
+"""Outbox des effets de bord de tentative : table attempt_side_effects
+
+Revision ID: 20261017_attempt_side_effects
+Revises: 20261017_user_stats_rollup
+Create Date: 2026-10-17
+
+Utilisée uniquement si SUBMIT_SIDE_EFFECTS_ASYNC : une ligne ``pending`` par
+tentative, passée à ``done`` par le job post-commit.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "20261017_attempt_side_effects"
+down_revision: Union[str, None] = "20261017_user_stats_rollup"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if "attempt_side_effects" in sa.inspect(conn).get_table_names():
+        return
+    op.create_table(
+        "attempt_side_effects",
+        sa.Column(
+            "attempt_id",
+            sa.Integer(),
+            sa.ForeignKey("attempts.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("tries", sa.Integer(), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=True,
+        ),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_attempt_side_effects_user_id", "attempt_side_effects", ["user_id"]
+    )
+    op.execute(sa.text("""
+            CREATE INDEX ix_attempt_side_effects_pending
+            ON attempt_side_effects (created_at)
+            WHERE status = 'pending'
+            """))
+
+
+def downgrade() -> None:
+    op.execute(sa.text("DROP INDEX IF EXISTS ix_attempt_side_effects_pending"))
+    op.drop_index("ix_attempt_side_effects_user_id", table_name="attempt_side_effects")
+    op.drop_table("attempt_side_effects")
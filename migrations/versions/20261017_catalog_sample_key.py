@@ -0,0 +1,57 @@
+"""Tirage aléatoire par keyset : exercises.sample_key / logic_challenges.sample_key
+
+Revision ID: 20261017_catalog_sample_key
+Revises: 20261017_email_outbox
+Create Date: 2026-10-17
+
+``sample_key`` est une clé uniforme dans [0, 1) : le listing ``order=random``
+lit ``WHERE sample_key >= r ORDER BY sample_key LIMIT n`` (index) au lieu de
+``ORDER BY id OFFSET k``. ``DEFAULT random()`` étant volatile, l'ajout de la
+colonne réécrit la table et tire une valeur distincte par ligne existante.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "20261017_catalog_sample_key"
+down_revision: Union[str, None] = "20261017_email_outbox"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TABLES = (
+    ("exercises", "exercise_type", "ix_exercises"),
+    ("logic_challenges", "challenge_type", "ix_challenges"),
+)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    for table, type_column, prefix in _TABLES:
+        cols = {c["name"] for c in insp.get_columns(table)}
+        if "sample_key" not in cols:
+            op.add_column(
+                table,
+                sa.Column(
+                    "sample_key",
+                    sa.Float(),
+                    nullable=False,
+                    server_default=sa.text("random()"),
+                ),
+            )
+        indexes = {i["name"] for i in insp.get_indexes(table)}
+        if f"{prefix}_sample_key" not in indexes:
+            op.create_index(f"{prefix}_sample_key", table, ["sample_key"])
+        if f"{prefix}_type_sample_key" not in indexes:
+            op.create_index(
+                f"{prefix}_type_sample_key", table, [type_column, "sample_key"]
+            )
+
+
+def downgrade() -> None:
+    for table, _type_column, prefix in _TABLES:
+        op.drop_index(f"{prefix}_type_sample_key", table_name=table)
+        op.drop_index(f"{prefix}_sample_key", table_name=table)
+        op.drop_column(table, "sample_key")
@@ -0,0 +1,54 @@
+"""Inventaire de défis IA pré-générés : table challenge_inventory
+
+Revision ID: 20261017_challenge_inventory
+Revises: 20261017_exercises_updated_idx
+Create Date: 2026-10-17
+
+Utilisée si CHALLENGE_INVENTORY_ENABLED : le thread de refill y stocke des défis
+validés par seau (type, âge, tier, locale), servis par FOR UPDATE SKIP LOCKED.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "20261017_challenge_inventory"
+down_revision: Union[str, None] = "20261017_exercises_updated_idx"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if "challenge_inventory" in sa.inspect(conn).get_table_names():
+        return
+    op.create_table(
+        "challenge_inventory",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("challenge_type", sa.String(length=32), nullable=False),
+        sa.Column("age_group", sa.String(length=32), nullable=False),
+        sa.Column("difficulty_tier", sa.Integer(), nullable=True),
+        sa.Column("locale", sa.String(length=8), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("personalization", sa.JSON(), nullable=True),
+        sa.Column("model", sa.String(length=64), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=True,
+        ),
+    )
+    op.create_index("ix_challenge_inventory_id", "challenge_inventory", ["id"])
+    op.create_index(
+        "ix_challenge_inventory_bucket",
+        "challenge_inventory",
+        ["challenge_type", "age_group", "difficulty_tier", "locale", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_challenge_inventory_bucket", table_name="challenge_inventory")
+    op.drop_index("ix_challenge_inventory_id", table_name="challenge_inventory")
+    op.drop_table("challenge_inventory")
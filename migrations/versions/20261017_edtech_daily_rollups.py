@@ -0,0 +1,75 @@
+"""Analytics EdTech agrégés en SQL : rollups quotidiens + index (event, created_at)
+
+Revision ID: 20261017_edtech_rollups
+Revises: 20261017_account_deletion_jobs
+Create Date: 2026-10-17
+
+- ``edtech_daily_rollups`` / ``edtech_daily_users`` : agrégats par jour UTC clos,
+  compactés à la première lecture admin qui couvre le jour (``edtech_rollup_days``
+  absent) ; pas de backfill ici, la première lecture 30 jours les construit.
+- ``ix_edtech_events_event_created_at`` : liste filtrée par événement et bords de la
+  fenêtre agrégés directement sur ``edtech_events``.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "20261017_edtech_rollups"
+down_revision: Union[str, None] = "20261017_account_deletion_jobs"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    indexes = {i["name"] for i in inspector.get_indexes("edtech_events")}
+    if "ix_edtech_events_event_created_at" not in indexes:
+        op.create_index(
+            "ix_edtech_events_event_created_at",
+            "edtech_events",
+            ["event", "created_at"],
+        )
+
+    tables = set(inspector.get_table_names())
+    if "edtech_daily_rollups" not in tables:
+        op.create_table(
+            "edtech_daily_rollups",
+            sa.Column("day", sa.Date(), primary_key=True),
+            sa.Column("event", sa.String(length=50), primary_key=True),
+            sa.Column("target_type", sa.String(length=20), primary_key=True),
+            sa.Column("guided", sa.Boolean(), primary_key=True),
+            sa.Column("events", sa.Integer(), nullable=False),
+            sa.Column("ttfa_sum_ms", sa.Float(), nullable=False),
+            sa.Column("ttfa_count", sa.Integer(), nullable=False),
+        )
+    if "edtech_daily_users" not in tables:
+        op.create_table(
+            "edtech_daily_users",
+            sa.Column("day", sa.Date(), primary_key=True),
+            sa.Column("event", sa.String(length=50), primary_key=True),
+            sa.Column("user_id", sa.Integer(), primary_key=True),
+        )
+        op.create_index(
+            "ix_edtech_daily_users_user_id", "edtech_daily_users", ["user_id"]
+        )
+    if "edtech_rollup_days" not in tables:
+        op.create_table(
+            "edtech_rollup_days",
+            sa.Column("day", sa.Date(), primary_key=True),
+            sa.Column(
+                "rolled_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+            ),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("edtech_rollup_days")
+    op.drop_index("ix_edtech_daily_users_user_id", table_name="edtech_daily_users")
+    op.drop_table("edtech_daily_users")
+    op.drop_table("edtech_daily_rollups")
+    op.drop_index("ix_edtech_events_event_created_at", table_name="edtech_events")
@@ -0,0 +1,70 @@
+"""Outbox des emails transactionnels : table email_outbox
+
+Revision ID: 20261017_email_outbox
+Revises: 20261017_attempt_side_effects
+Create Date: 2026-10-17
+
+Utilisée si EMAIL_OUTBOX_ENABLED : les handlers y écrivent les emails de
+vérification / réinitialisation, le thread d'envoi les draine par lots.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "20261017_email_outbox"
+down_revision: Union[str, None] = "20261017_attempt_side_effects"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if "email_outbox" in sa.inspect(conn).get_table_names():
+        return
+    op.create_table(
+        "email_outbox",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=True,
+        ),
+        sa.Column("kind", sa.String(length=32), nullable=False),
+        sa.Column("to_email", sa.String(length=255), nullable=False),
+        sa.Column("subject", sa.String(length=255), nullable=False),
+        sa.Column("html_content", sa.Text(), nullable=True),
+        sa.Column("text_content", sa.Text(), nullable=True),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column(
+            "next_attempt_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=True,
+        ),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_email_outbox_id", "email_outbox", ["id"])
+    op.create_index("ix_email_outbox_user_id", "email_outbox", ["user_id"])
+    op.execute(sa.text("""
+            CREATE INDEX ix_email_outbox_pending
+            ON email_outbox (next_attempt_at)
+            WHERE status = 'pending'
+            """))
+
+
+def downgrade() -> None:
+    op.execute(sa.text("DROP INDEX IF EXISTS ix_email_outbox_pending"))
+    op.drop_index("ix_email_outbox_user_id", table_name="email_outbox")
+    op.drop_index("ix_email_outbox_id", table_name="email_outbox")
+    op.drop_table("email_outbox")
@@ -0,0 +1,53 @@
+"""Inventaire d'exercices IA pré-générés : table exercise_inventory
+
+Revision ID: 20261017_exercise_inventory
+Revises: 20261017_challenge_inventory
+Create Date: 2026-10-17
+
+Utilisée si EXERCISE_INVENTORY_ENABLED : le thread de refill y stocke des exercices
+validés par seau (type, âge, bande pédagogique, locale), servis par FOR UPDATE
+SKIP LOCKED.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "20261017_exercise_inventory"
+down_revision: Union[str, None] = "20261017_challenge_inventory"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if "exercise_inventory" in sa.inspect(conn).get_table_names():
+        return
+    op.create_table(
+        "exercise_inventory",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("exercise_type", sa.String(length=32), nullable=False),
+        sa.Column("age_group", sa.String(length=32), nullable=False),
+        sa.Column("pedagogical_band", sa.String(length=32), nullable=True),
+        sa.Column("locale", sa.String(length=8), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=True,
+        ),
+    )
+    op.create_index("ix_exercise_inventory_id", "exercise_inventory", ["id"])
+    op.create_index(
+        "ix_exercise_inventory_bucket",
+        "exercise_inventory",
+        ["exercise_type", "age_group", "pedagogical_band", "locale", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_exercise_inventory_bucket", table_name="exercise_inventory")
+    op.drop_index("ix_exercise_inventory_id", table_name="exercise_inventory")
+    op.drop_table("exercise_inventory")
@@ -0,0 +1,31 @@
+"""Index catalogue exercices : index sur exercises.updated_at
+
+Revision ID: 20261017_exercises_updated_idx
+Revises: 20261017_catalog_sample_key
+Create Date: 2026-10-17
+
+Chaque worker relit périodiquement les exercices modifiés depuis son dernier
+passage (``updated_at >= :since``) pour tenir son index catalogue en mémoire à
+jour des écritures des autres workers.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "20261017_exercises_updated_idx"
+down_revision: Union[str, None] = "20261017_catalog_sample_key"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    indexes = {i["name"] for i in sa.inspect(conn).get_indexes("exercises")}
+    if "ix_exercises_updated_at" not in indexes:
+        op.create_index("ix_exercises_updated_at", "exercises", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_exercises_updated_at", table_name="exercises")
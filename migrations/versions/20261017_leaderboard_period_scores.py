@@ -0,0 +1,113 @@
+"""Classement matérialisé : users.show_in_leaderboards + scores week / month
+
+Revision ID: 20261017_leaderboard_scores
+Revises: 20260416_feedback_context
+Create Date: 2026-10-17
+
+- ``users.show_in_leaderboards`` dénormalisé depuis
+  ``accessibility_settings.privacy_settings`` (filtre SQL) + index partiel de tri.
+- ``user_daily_points`` backfillé depuis ``point_events`` (30 derniers jours UTC) ;
+  ``leaderboard_period_scores`` est reconstruit depuis ces buckets à la première
+  lecture week / month (ligne ``leaderboard_period_windows`` absente).
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "20261017_leaderboard_scores"
+down_revision: Union[str, None] = "20260416_feedback_context"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    cols = {c["name"] for c in insp.get_columns("users")}
+    if "show_in_leaderboards" not in cols:
+        op.add_column(
+            "users",
+            sa.Column(
+                "show_in_leaderboards",
+                sa.Boolean(),
+                nullable=False,
+                server_default=sa.true(),
+            ),
+        )
+
+    # accessibility_settings est du JSON sérialisé en TEXT : ne caster que les lignes
+    # qui mentionnent la clé (évite un échec sur contenu historique non JSON).
+    op.execute(sa.text("""
+            UPDATE users
+            SET show_in_leaderboards = FALSE
+            WHERE accessibility_settings LIKE '%show_in_leaderboards%'
+              AND jsonb_typeof(accessibility_settings::jsonb -> 'privacy_settings') = 'object'
+              AND accessibility_settings::jsonb -> 'privacy_settings'
+                  -> 'show_in_leaderboards' = 'false'::jsonb
+            """))
+
+    op.execute(sa.text("""
+            CREATE INDEX IF NOT EXISTS ix_users_leaderboard_visible
+            ON users (total_points DESC NULLS LAST, id)
+            WHERE is_active IS true AND show_in_leaderboards IS true
+            """))
+
+    tables = set(insp.get_table_names())
+    if "user_daily_points" not in tables:
+        op.create_table(
+            "user_daily_points",
+            sa.Column(
+                "user_id",
+                sa.Integer(),
+                sa.ForeignKey("users.id", ondelete="CASCADE"),
+                primary_key=True,
+            ),
+            sa.Column("day", sa.Date(), primary_key=True),
+            sa.Column("points", sa.Integer(), nullable=False),
+        )
+        op.create_index("ix_user_daily_points_day", "user_daily_points", ["day"])
+        op.execute(sa.text("""
+                INSERT INTO user_daily_points (user_id, day, points)
+                SELECT user_id, (created_at AT TIME ZONE 'UTC')::date, SUM(points_delta)
+                FROM point_events
+                WHERE created_at >= (now() AT TIME ZONE 'UTC')::date - INTERVAL '29 days'
+                GROUP BY 1, 2
+                """))
+
+    if "leaderboard_period_scores" not in tables:
+        op.create_table(
+            "leaderboard_period_scores",
+            sa.Column("period", sa.String(length=10), primary_key=True),
+            sa.Column(
+                "user_id",
+                sa.Integer(),
+                sa.ForeignKey("users.id", ondelete="CASCADE"),
+                primary_key=True,
+            ),
+            sa.Column("score", sa.Integer(), nullable=False),
+        )
+        op.execute(sa.text("""
+                CREATE INDEX ix_leaderboard_period_scores_rank
+                ON leaderboard_period_scores (period, score DESC, user_id)
+                """))
+
+    if "leaderboard_period_windows" not in tables:
+        op.create_table(
+            "leaderboard_period_windows",
+            sa.Column("period", sa.String(length=10), primary_key=True),
+            sa.Column("window_start", sa.Date(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("leaderboard_period_windows")
+    op.drop_index(
+        "ix_leaderboard_period_scores_rank", table_name="leaderboard_period_scores"
+    )
+    op.drop_table("leaderboard_period_scores")
+    op.drop_index("ix_user_daily_points_day", table_name="user_daily_points")
+    op.drop_table("user_daily_points")
+    op.execute(sa.text("DROP INDEX IF EXISTS ix_users_leaderboard_visible"))
+    op.drop_column("users", "show_in_leaderboards")
@@ -0,0 +1,33 @@
+"""Backoff des reprises d'effets de bord : attempt_side_effects.next_attempt_at
+
+Revision ID: 20261017_side_effects_retry
+Revises: 20261017_edtech_rollups
+Create Date: 2026-10-17
+
+NULL tant que la ligne n'a pas échoué ; après un échec, instant à partir duquel le
+balayage post-commit la re-planifie.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "20261017_side_effects_retry"
+down_revision: Union[str, None] = "20261017_edtech_rollups"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    columns = {c["name"] for c in sa.inspect(conn).get_columns("attempt_side_effects")}
+    if "next_attempt_at" not in columns:
+        op.add_column(
+            "attempt_side_effects",
+            sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    op.drop_column("attempt_side_effects", "next_attempt_at")
@@ -0,0 +1,58 @@
+"""Rollup incrémental des stats badges : table user_stats_rollup
+
+Revision ID: 20261017_user_stats_rollup
+Revises: 20261017_leaderboard_scores
+Create Date: 2026-10-17
+
+Une ligne par utilisateur, maintenue à chaque tentative. Pas de backfill ici :
+une ligne absente est recalculée depuis ``attempts`` à la lecture et créée à la
+tentative suivante ; ``python scripts/user_stats_rollup.py backfill`` la matérialise
+pour tous les utilisateurs.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "20261017_user_stats_rollup"
+down_revision: Union[str, None] = "20261017_leaderboard_scores"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if "user_stats_rollup" in sa.inspect(conn).get_table_names():
+        return
+    op.create_table(
+        "user_stats_rollup",
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("attempts_total", sa.Integer(), nullable=False),
+        sa.Column("attempts_correct", sa.Integer(), nullable=False),
+        sa.Column("logic_correct_count", sa.Integer(), nullable=False),
+        sa.Column("per_type_attempts", sa.JSON(), nullable=False),
+        sa.Column("per_type_correct", sa.JSON(), nullable=False),
+        sa.Column("consecutive_by_type", sa.JSON(), nullable=False),
+        sa.Column("min_fast_time", sa.Float(), nullable=True),
+        sa.Column("last_activity_day", sa.Date(), nullable=True),
+        sa.Column("activity_bitmap", sa.BigInteger(), nullable=False),
+        sa.Column("today_day", sa.Date(), nullable=True),
+        sa.Column("today_total", sa.Integer(), nullable=False),
+        sa.Column("today_correct", sa.Integer(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_stats_rollup")
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark : suppression de compte ensembliste (delete_account_data) vs cascade ORM.
+
+Crée un compte (un exercice créé) avec --attempts tentatives et autant d'événements
+de points (INSERT ... SELECT generate_series), puis mesure :
+- ``set-based`` : plan ACCOUNT_DELETION_PLAN, DELETE par paquets de
+  ACCOUNT_DELETION_CHUNK_ROWS lignes, un commit par paquet ;
+- ``orm`` : ``db.delete(user)`` + commit (relations chargées puis supprimées une à une),
+  sur --orm-attempts tentatives seulement (au-delà, la cascade ORM devient très lente).
+
+Nécessite une base PostgreSQL accessible via DATABASE_URL (ou TEST_DATABASE_URL
+avec TESTING=true). Les lignes créées sont supprimées par le benchmark lui-même.
+
+Usage:
+  python scripts/bench_account_deletion.py
+  python scripts/bench_account_deletion.py --attempts 1000000 --orm-attempts 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+_FILL_SQL = """
+INSERT INTO attempts (user_id, exercise_id, user_answer, is_correct, time_spent,
+                      attempt_number, hints_used, created_at)
+SELECT :user_id, :exercise_id, n::text, n % 3 = 0, n % 120, 1, 0,
+       now() - make_interval(secs => n)
+FROM generate_series(1, :rows) AS n;
+INSERT INTO point_events (user_id, source_type, points_delta, balance_after,
+                          created_at)
+SELECT :user_id, 'exercise_attempt', 10, 10 * n, now() - make_interval(secs => n)
+FROM generate_series(1, :rows) AS n;
+"""
+
+
+def _make_account(db, rows: int) -> int:
+    from sqlalchemy import text
+
+    from app.models.exercise import Exercise
+    from app.models.user import User
+
+    uid = uuid.uuid4().hex[:8]
+    user = User(
+        username=f"bench_del_{uid}",
+        email=f"bench_del_{uid}@example.com",
+        hashed_password="x",
+    )
+    db.add(user)
+    db.flush()
+    exercise = Exercise(
+        title=f"bench_del_{uid}",
+        creator_id=user.id,
+        exercise_type="addition",
+        difficulty="initie",
+        age_group="6-8",
+        question="1+1=?",
+        correct_answer="2",
+    )
+    db.add(exercise)
+    db.flush()
+    for statement in _FILL_SQL.strip().split(";\n"):
+        db.execute(
+            text(statement),
+            {"user_id": user.id, "exercise_id": exercise.id, "rows": rows},
+        )
+    db.commit()
+    return user.id
+
+
+def _set_based(db, user_id: int) -> int:
+    from app.services.users.account_deletion import delete_account_data
+
+    return sum(delete_account_data(db, user_id).values())
+
+
+def _orm_cascade(db, user_id: int) -> int:
+    from app.models.user import User
+
+    # Chemin historique (TransactionManager.safe_delete) : relations cascade chargées.
+    user = db.get(User, user_id)
+    rows = len(user.attempts) + len(user.point_events)
+    db.delete(user)
+    db.commit()
+    return rows
+
+
+def _run(label: str, rows: int, delete) -> None:
+    from app.db.base import SessionLocal
+
+    db = SessionLocal()
+    try:
+        user_id = _make_account(db, rows)
+        start = time.perf_counter()
+        deleted = delete(db, user_id)
+        elapsed = time.perf_counter() - start
+    finally:
+        db.close()
+    print(
+        f"  {label:<10} {rows:>9} tentatives  {elapsed:7.2f} s"
+        f"  {deleted / elapsed:9.0f} lignes/s ({deleted} lignes)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--attempts", type=int, default=1_000_000)
+    parser.add_argument("--orm-attempts", type=int, default=20_000)
+    args = parser.parse_args()
+
+    from app.core.config import settings
+
+    print(
+        f"\n=== Suppression de compte (paquets "
+        f"{settings.ACCOUNT_DELETION_CHUNK_ROWS} lignes) ===\n"
+    )
+    _run("orm", args.orm_attempts, _orm_cascade)
+    _run("set-based", args.orm_attempts, _set_based)
+    _run("set-based", args.attempts, _set_based)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark : lectures chaudes sous concurrence, mode sync vs async (run_db_read).
+
+Lance N clients concurrents appelant la même lecture service (liste exercices,
+classement) et mesure débit + latences p50/p99 :
+  - sync  : run_db_bound → threadpool → sync_db_session (psycopg2)
+  - async : AsyncSession.run_sync sur asyncpg (DB_ASYNC_ENABLED=true)
+
+Nécessite une base PostgreSQL accessible via DATABASE_URL (ou TEST_DATABASE_URL
+avec TESTING=true) et asyncpg installé pour le mode async.
+
+Usage:
+  python scripts/bench_db_boundary.py
+  python scripts/bench_db_boundary.py --clients 200 --requests 10
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from unittest.mock import patch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+async def _client(read, args, kwargs, n: int, latencies: list) -> None:
+    from app.core.db_boundary import run_db_read
+
+    for _ in range(n):
+        start = time.perf_counter()
+        await run_db_read(read, *args, **kwargs)
+        latencies.append(time.perf_counter() - start)
+
+
+async def _measure(read, args, kwargs, clients: int, n: int) -> tuple:
+    latencies: list = []
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(_client(read, args, kwargs, n, latencies) for _ in range(clients))
+    )
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return len(latencies) / elapsed, statistics.median(latencies) * 1e3, p99 * 1e3
+
+
+async def _run(clients: int, n: int) -> None:
+    from app.core.config import settings
+    from app.core.leaderboard_period import LeaderboardPeriod
+    from app.db.async_base import dispose_async_engine
+    from app.schemas.exercise import ExerciseListQuery
+    from app.services.exercises.exercise_query_service import (
+        query_exercises_list_for_api,
+    )
+    from app.services.users.user_application_service import query_leaderboard
+
+    scenarios = [
+        (
+            "GET /api/exercises",
+            query_exercises_list_for_api,
+            (ExerciseListQuery(limit=20, order="recent"), None),
+            {},
+        ),
+        (
+            "GET /api/users/leaderboard",
+            query_leaderboard,
+            (0,),
+            {"limit": 50, "period": LeaderboardPeriod.ALL},
+        ),
+    ]
+
+    print(f"\n=== DB boundary ({clients} clients x {n} lectures) ===\n")
+    for label, read, args, kwargs in scenarios:
+        results = []
+        for mode, enabled in (("sync (threadpool)", False), ("async (asyncpg)", True)):
+            with patch.object(settings, "DB_ASYNC_ENABLED", enabled):
+                try:
+                    await _measure(read, args, kwargs, min(clients, 10), 1)
+                    rps, p50, p99 = await _measure(read, args, kwargs, clients, n)
+                finally:
+                    await dispose_async_engine()
+            results.append(rps)
+            print(
+                f"  {label:<28} {mode:<18} {rps:8.0f} req/s"
+                f"  p50 {p50:7.1f} ms  p99 {p99:7.1f} ms"
+            )
+        print(f"  {'':<28} {'gain débit':<18} {results[1] / results[0]:8.2f}x\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(_run(args.clients, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark : export CSV streamé (run_db_stream + curseur serveur + gzip à la volée).
+
+Lit --rows lignes synthétiques (generate_series, colonnes proches d'un export
+attempts) par paquets de DB_STREAM_CHUNK_ROWS, les encode en CSV puis gzip comme
+GET /api/admin/export, et affiche débit et octets produits. --trace-memory ajoute le
+pic mémoire Python (tracemalloc, ralentit ~4x) : il doit rester stable quand --rows
+augmente.
+
+Nécessite une base PostgreSQL accessible via DATABASE_URL (ou TEST_DATABASE_URL
+avec TESTING=true).
+
+Usage:
+  python scripts/bench_db_stream_export.py
+  python scripts/bench_db_stream_export.py --rows 100000 1000000 --trace-memory
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+_SQL = (
+    "SELECT n, n % 5000, n % 800, n % 3 = 0, n % 120, "
+    "now() - make_interval(secs => n) FROM generate_series(1, :rows) AS n"
+)
+
+
+def _rows(db, rows: int, chunk_size: int):
+    from sqlalchemy import text
+
+    from app.core.db_boundary import iter_result_chunks
+
+    stmt = text(_SQL).bindparams(rows=rows)
+    for chunk in iter_result_chunks(db, stmt, chunk_size):
+        yield [
+            [rid, user_id, exercise_id, ok, spent, created.isoformat()]
+            for rid, user_id, exercise_id, ok, spent, created in chunk
+        ]
+
+
+async def _export(
+    rows: int, chunk_size: int, use_gzip: bool, trace_memory: bool
+) -> tuple:
+    from app.core.db_boundary import run_db_stream
+    from app.utils.stream_encoding import csv_stream, gzip_stream
+
+    headers = ["id", "user_id", "exercise_id", "is_correct", "time_spent", "created_at"]
+    body = csv_stream(headers, run_db_stream(_rows, rows, chunk_size))
+    if use_gzip:
+        body = gzip_stream(body)
+    produced = 0
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    async for block in body:
+        produced += len(block)
+    elapsed = time.perf_counter() - start
+    peak = None
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, produced, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--no-gzip", action="store_true")
+    parser.add_argument("--trace-memory", action="store_true")
+    args = parser.parse_args()
+
+    from app.core.config import settings
+
+    chunk_size = settings.DB_STREAM_CHUNK_ROWS
+    print(
+        f"\n=== Export streamé (paquets {chunk_size} lignes, "
+        f"file {settings.DB_STREAM_QUEUE_CHUNKS}, gzip={not args.no_gzip}) ===\n"
+    )
+    for rows in args.rows:
+        elapsed, produced, peak = asyncio.run(
+            _export(rows, chunk_size, not args.no_gzip, args.trace_memory)
+        )
+        memory = f"  pic mémoire {peak / 1e6:5.1f} Mo" if peak is not None else ""
+        print(
+            f"  {rows:>9} lignes  {elapsed:6.2f} s  {rows / elapsed:9.0f} lignes/s"
+            f"  {produced / 1e6:7.1f} Mo{memory}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark : agrégats analytics EdTech admin sur 30 jours (edtech_aggregates).
+
+Insère --events événements répartis sur 30 jours d'une fenêtre passée fixe
+(INSERT ... SELECT generate_series, payloads JSONB variés), puis mesure :
+- ``orm``        : chargement ORM de tous les événements de la fenêtre (coût minimal
+  de l'agrégation Python historique, boucle non comprise) ;
+- ``sql``        : GROUP BY + opérateurs JSONB sur toute la fenêtre (sans rollups) ;
+- ``rollup 1er`` : première lecture, compactage des 29 jours clos inclus ;
+- ``rollup``     : lectures suivantes (jours clos lus dans edtech_daily_rollups).
+
+Nécessite une base PostgreSQL accessible via DATABASE_URL (ou TEST_DATABASE_URL
+avec TESTING=true). Les lignes créées sont supprimées en fin de benchmark.
+
+Usage:
+  python scripts/bench_edtech_analytics.py
+  python scripts/bench_edtech_analytics.py --events 100000 1000000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# Fenêtre passée fixe : n'interfère pas avec des événements réels.
+_NOW = datetime(2024, 3, 31, 12, 0, tzinfo=timezone.utc)
+_SINCE = _NOW - timedelta(days=30)
+
+_FILL_SQL = """
+INSERT INTO edtech_events (user_id, event, payload, created_at)
+SELECT NULL,
+       CASE WHEN n % 2 = 0 THEN 'quick_start_click' ELSE 'first_attempt' END,
+       jsonb_build_object(
+           'type', (ARRAY['exercise', 'challenge', 'interleaved'])[n % 3 + 1],
+           'guided', n % 5 = 0,
+           'targetId', n % 1000,
+           'timeToFirstAttemptMs', (n % 60000) - 1000
+       ),
+       :since + (CAST(:span AS bigint) * n / :rows) * INTERVAL '1 second'
+FROM generate_series(1, :rows) AS n
+"""
+
+
+def _timed(func, repeat: int = 1) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def _cleanup(db) -> None:
+    from app.models.edtech_daily_rollup import (
+        EdTechDailyRollup,
+        EdTechDailyUser,
+        EdTechRollupDay,
+    )
+    from app.models.edtech_event import EdTechEvent
+
+    db.query(EdTechEvent).filter(
+        EdTechEvent.created_at >= _SINCE, EdTechEvent.created_at < _NOW
+    ).delete(synchronize_session=False)
+    for model in (EdTechDailyRollup, EdTechDailyUser, EdTechRollupDay):
+        db.query(model).filter(
+            model.day.between(_SINCE.date(), date(_NOW.year, _NOW.month, _NOW.day))
+        ).delete(synchronize_session=False)
+    db.commit()
+
+
+def _run(rows: int) -> None:
+    from sqlalchemy import text
+
+    from app.db.base import SessionLocal
+    from app.models.edtech_event import EdTechEvent
+    from app.services.analytics.edtech_rollup import edtech_aggregates
+
+    db = SessionLocal()
+    try:
+        _cleanup(db)
+        db.execute(
+            text(_FILL_SQL),
+            {"since": _SINCE, "span": 30 * 86400, "rows": rows},
+        )
+        db.commit()
+        db.execute(text("ANALYZE edtech_events"))
+
+        def _orm():
+            db.query(EdTechEvent).filter(
+                EdTechEvent.created_at >= _SINCE, EdTechEvent.created_at < _NOW
+            ).all()
+            db.expunge_all()
+
+        def _aggregate(use_rollup):
+            return edtech_aggregates(
+                db, since=_SINCE, use_rollup=use_rollup, now=_NOW
+            )
+
+        orm_s = _timed(_orm)
+        sql_s = _timed(lambda: _aggregate(False), repeat=3)
+        first_s = _timed(lambda: _aggregate(True))
+        rollup_s = _timed(lambda: _aggregate(True), repeat=5)
+        assert _aggregate(True) == _aggregate(False)
+        print(
+            f"  {rows:>9} événements  orm {orm_s * 1000:8.0f} ms"
+            f"  sql {sql_s * 1000:7.0f} ms  rollup 1er {first_s * 1000:7.0f} ms"
+            f"  rollup {rollup_s * 1000:6.1f} ms"
+        )
+    finally:
+        db.rollback()
+        _cleanup(db)
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print("\n=== Analytics EdTech admin, fenêtre 30 jours ===\n")
+    for rows in args.events:
+        _run(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark : débit d'ingestion des événements EdTech par worker (objectif 5k/s).
+
+Compare, pour --events événements émis par --producers threads (requêtes
+concurrentes d'un worker) :
+- ``commit/événement`` : record_edtech_event_sync (INSERT + commit par événement,
+  chemin historique) ;
+- ``tampon``           : EdTechEventBuffer (offer non bloquant, thread d'écriture
+  par COPY) ; le temps inclut le vidage complet en base.
+
+Nécessite une base PostgreSQL accessible via DATABASE_URL (ou TEST_DATABASE_URL
+avec TESTING=true). Les lignes créées sont supprimées en fin de benchmark.
+
+Usage:
+  python scripts/bench_edtech_ingest.py
+  python scripts/bench_edtech_ingest.py --events 50000 --producers 8
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def _payload(run: str, n: int) -> dict:
+    return {
+        "run": run,
+        "type": ("exercise", "challenge", "interleaved")[n % 3],
+        "targetId": n % 1000,
+        "timeToFirstAttemptMs": n % 60000,
+    }
+
+
+def _cleanup(run: str) -> None:
+    from app.db.base import SessionLocal
+    from app.models.edtech_event import EdTechEvent
+
+    db = SessionLocal()
+    try:
+        stored = (
+            db.query(EdTechEvent)
+            .filter(EdTechEvent.payload["run"].astext == run)
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+    finally:
+        db.close()
+    return stored
+
+
+def _produce(emit, events: int, producers: int) -> float:
+    """Émet ``events`` appels à ``emit(n)`` répartis sur ``producers`` threads."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=producers) as pool:
+        list(pool.map(emit, range(events), chunksize=max(1, events // producers)))
+    return time.perf_counter() - start
+
+
+def _per_event(events: int, producers: int) -> None:
+    from app.services.analytics.analytics_service import record_edtech_event_sync
+
+    run = uuid.uuid4().hex
+
+    def emit(n):
+        record_edtech_event_sync(event="first_attempt", payload=_payload(run, n))
+
+    elapsed = _produce(emit, events, producers)
+    stored = _cleanup(run)
+    _report("commit/événement", events, stored, elapsed)
+
+
+def _buffered(events: int, producers: int, args) -> None:
+    from app.services.analytics.edtech_ingest import EdTechEventBuffer
+
+    run = uuid.uuid4().hex
+    buffer = EdTechEventBuffer(args.capacity, args.flush_events, args.flush_ms)
+
+    def emit(n):
+        row = {"user_id": None, "event": "first_attempt", "payload": _payload(run, n)}
+        # Tampon plein : on réessaie (ce que fait un client après un 503).
+        while not buffer.offer([row]):
+            time.sleep(0.01)
+
+    start = time.perf_counter()
+    _produce(emit, events, producers)
+    accepted_s = time.perf_counter() - start
+    buffer.shutdown(timeout=60)
+    elapsed = time.perf_counter() - start
+    stored = _cleanup(run)
+    _report("tampon", events, stored, elapsed, f"  (dépôt seul {accepted_s:.2f} s)")
+
+
+def _report(label: str, events: int, stored: int, elapsed: float, extra="") -> None:
+    rate = events / elapsed
+    target = "OK" if rate >= 5000 else "< 5k/s"
+    print(
+        f"  {label:<17} {events:>7} événements  {elapsed:6.2f} s"
+        f"  {rate:8.0f} év/s  {target}  ({stored} en base){extra}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--per-event-events", type=int, default=2_000)
+    parser.add_argument("--producers", type=int, default=8)
+    parser.add_argument("--capacity", type=int, default=20_000)
+    parser.add_argument("--flush-events", type=int, default=500)
+    parser.add_argument("--flush-ms", type=int, default=250)
+    args = parser.parse_args()
+
+    print(f"\n=== Ingestion EdTech, {args.producers} producteurs ===\n")
+    _per_event(args.per_event_events, args.producers)
+    _buffered(args.events, args.producers, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark : surcoût par requête de la chaîne de bord (middleware).
+
+Compare la chaîne historique BaseHTTPMiddleware (SecureHeaders → CORS → Maintenance
+→ CSRF → Auth) à EdgeMiddleware (ASGI pur fusionné) sur une petite app Starlette,
+sans réseau (httpx.ASGITransport) ni DB (snapshot settings pré-chargé).
+
+Usage:
+  python scripts/bench_middleware_chain.py
+  python scripts/bench_middleware_chain.py --requests 5000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import patch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+os.environ.setdefault("TESTING", "true")
+os.environ.setdefault("SECRET_KEY", "bench-middleware-secret")
+
+
+def _build_app(edge_middleware):
+    from starlette.applications import Starlette
+    from starlette.middleware import Middleware
+    from starlette.responses import JSONResponse
+    from starlette.routing import Route
+
+    from server.middleware import RequestIdMiddleware
+
+    async def small_json(request):
+        return JSONResponse({"ok": True})
+
+    return Starlette(
+        routes=[
+            Route("/api/bench", small_json, methods=["GET", "POST"]),
+            Route("/health", small_json),
+        ],
+        middleware=[Middleware(RequestIdMiddleware), *edge_middleware],
+    )
+
+
+async def _measure(app, n: int, path: str, method: str, headers: dict) -> float:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        for _ in range(min(200, n)):
+            await c.request(method, path, headers=headers)
+        start = time.perf_counter()
+        for _ in range(n):
+            resp = await c.request(method, path, headers=headers)
+        elapsed = time.perf_counter() - start
+    assert resp.status_code == 200, resp.text
+    return elapsed / n * 1e6
+
+
+async def _run(n: int) -> None:
+    from app.core.security import create_access_token
+    from app.utils import settings_reader
+    from server.middleware import (
+        EdgeMiddleware,
+        get_cors_options,
+        get_legacy_edge_middleware,
+    )
+    from starlette.middleware import Middleware
+
+    token = create_access_token({"sub": "bench_user"})
+    auth = {"Authorization": f"Bearer {token}"}
+    csrf = {**auth, "Cookie": "csrf_token=abc", "X-CSRF-Token": "abc"}
+    scenarios = [
+        ("GET /health (public)", "/health", "GET", {}),
+        ("GET /api/bench (JWT)", "/api/bench", "GET", auth),
+        ("POST /api/bench (JWT+CSRF)", "/api/bench", "POST", csrf),
+    ]
+    chains = [
+        ("legacy BaseHTTPMiddleware x4", get_legacy_edge_middleware()),
+        (
+            "EdgeMiddleware (ASGI pur)",
+            [Middleware(EdgeMiddleware, cors_options=get_cors_options())],
+        ),
+    ]
+
+    with patch.object(settings_reader, "_load_snapshot", return_value={}):
+        settings_reader.get_setting_bool("maintenance_mode")
+        print(f"\n=== Middleware chain overhead ({n} requêtes / scénario) ===\n")
+        for label, path, method, headers in scenarios:
+            results = []
+            for chain_label, chain in chains:
+                us = await _measure(_build_app(chain), n, path, method, headers)
+                results.append(us)
+                print(f"  {label:<28} {chain_label:<30} {us:8.1f} µs/req")
+            print(f"  {'':<28} {'gain':<30} {results[0] / results[1]:8.2f}x\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(_run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
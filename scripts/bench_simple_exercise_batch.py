@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark : génération d'exercices simples, boucle unitaire vs lot.
+
+Compare, par type arithmétique et pour chaque taille demandée :
+  - unitaire : N appels à generate_simple_exercise
+  - lot      : generate_simple_exercises_batch(..., unique=False), même loi
+et affiche le débit (exercices/s), le gain, puis la taille d'un lot dédoublonné
+(espace des opérandes du niveau). Aucune base de données requise.
+
+Usage:
+  python scripts/bench_simple_exercise_batch.py
+  python scripts/bench_simple_exercise_batch.py --sizes 10000 100000 --age-group 12-14
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+TYPES = ("addition", "soustraction", "multiplication", "division")
+
+
+def _scalar(exercise_type: str, age_group: str, n: int) -> int:
+    from app.generators.exercise_generator import generate_simple_exercise
+
+    produced = 0
+    for _ in range(n):
+        try:
+            generate_simple_exercise(exercise_type, age_group)
+            produced += 1
+        except ValueError:
+            # Bornes de soustraction vides pour certains tirages (générateur unitaire).
+            continue
+    return produced
+
+
+def _batch(exercise_type: str, age_group: str, n: int) -> int:
+    from app.generators.exercise_batch_generator import (
+        generate_simple_exercises_batch,
+    )
+
+    batch = generate_simple_exercises_batch(exercise_type, age_group, n, unique=False)
+    return len(batch)
+
+
+def _rate(func, *args) -> float:
+    start = time.perf_counter()
+    produced = func(*args)
+    return produced / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--age-group", default="9-11")
+    args = parser.parse_args()
+
+    from app.generators.exercise_batch_generator import (
+        generate_simple_exercises_batch,
+    )
+
+    print(f"\n=== Exercices simples ({args.age_group}) ===\n")
+    for exercise_type in TYPES:
+        for n in args.sizes:
+            scalar = _rate(_scalar, exercise_type, args.age_group, n)
+            batch = _rate(_batch, exercise_type, args.age_group, n)
+            print(
+                f"  {exercise_type:<15} {n:>7}  unitaire {scalar:9.0f} ex/s"
+                f"  lot {batch:9.0f} ex/s  gain {batch / scalar:5.2f}x"
+            )
+        distinct = generate_simple_exercises_batch(
+            exercise_type, args.age_group, max(args.sizes)
+        )
+        print(f"  {exercise_type:<15} lot dédoublonné : {len(distinct)} exercice(s)\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Recalcule les scores de classement week / month depuis ``point_events``.
+
+À lancer après une modification directe du ledger (correction manuelle, import)
+ou pour réparer ``user_daily_points`` / ``leaderboard_period_scores``.
+
+Usage:
+    python scripts/rebuild_leaderboard_scores.py
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+
+load_dotenv(override=False)
+
+from app.db.base import SessionLocal
+from app.services.gamification.leaderboard_scores import rebuild_leaderboard_scores
+
+
+def main():
+    db = SessionLocal()
+    try:
+        rebuild_leaderboard_scores(db)
+        db.commit()
+        print("Scores de classement week / month reconstruits.")
+    except Exception as e:
+        db.rollback()
+        print(f"Erreur: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Réconciliation des séries d'entraînement (users.current_streak / best_streak /
+last_activity_date) avec l'historique des tentatives.
+
+Le streak est maintenu de façon incrémentale à chaque tentative ; ce job le
+recalcule depuis attempts + logic_challenge_attempts pour détecter une dérive.
+--fix réaligne les lignes incohérentes (commit par lot).
+
+Usage:
+    python scripts/reconcile_user_streaks.py [--fix] [--user-id 42] [--batch-size 200]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+
+load_dotenv(override=False)
+
+from app.db.base import SessionLocal
+from app.models.user import User
+from app.services.progress.streak_service import (
+    check_user_streak,
+    reconcile_user_streak,
+)
+
+
+def _iter_user_ids(db, batch_size, user_id=None):
+    if user_id is not None:
+        yield [user_id]
+        return
+    last_id = 0
+    while True:
+        ids = [
+            r[0]
+            for r in db.query(User.id)
+            .filter(User.id > last_id)
+            .order_by(User.id)
+            .limit(batch_size)
+            .all()
+        ]
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+
+def reconcile(db, batch_size, fix, user_id=None):
+    checked = drifted = 0
+    for ids in _iter_user_ids(db, batch_size, user_id):
+        for uid in ids:
+            checked += 1
+            mismatches = (
+                reconcile_user_streak(db, uid) if fix else check_user_streak(db, uid)
+            )
+            if not mismatches:
+                continue
+            drifted += 1
+            for field, (stored, computed) in mismatches.items():
+                print(f"  user {uid} — {field}: stocké={stored!r} historique={computed!r}")
+        if fix:
+            db.commit()
+        else:
+            db.rollback()
+    print(f"Streaks : {checked} utilisateur(s), {drifted} incohérent(s).")
+    return 1 if drifted and not fix else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--user-id", type=int, default=None)
+    parser.add_argument(
+        "--fix", action="store_true", help="réaligne les streaks incohérents"
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        code = reconcile(db, args.batch_size, args.fix, args.user_id)
+    except Exception as e:
+        db.rollback()
+        print(f"Erreur: {e}")
+        code = 1
+    finally:
+        db.close()
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
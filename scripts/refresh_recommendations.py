@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Régénération nocturne des recommandations de tous les utilisateurs actifs.
+
+Utilisateurs actifs : is_active et activité (last_activity_date) sur les
+--active-days derniers jours. Les ids sont lus par lots (keyset) et chaque lot
+est régénéré dans un process du pool (--workers, 1 = process courant).
+
+Usage:
+    python scripts/refresh_recommendations.py [--workers 4] [--active-days 30] [--batch-size 100]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+
+load_dotenv(override=False)
+
+from app.db.base import SessionLocal
+from app.services.recommendation.recommendation_refresh import refresh_active_users
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--active-days", type=int, default=30)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        totals = refresh_active_users(
+            db,
+            workers=args.workers,
+            active_days=args.active_days,
+            batch_size=args.batch_size,
+        )
+    except Exception as e:
+        print(f"Erreur: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+    print(
+        f"Recommandations : {totals['done']}/{totals['users']} utilisateur(s) "
+        f"régénéré(s), {totals['failed']} échec(s), "
+        f"{time.perf_counter() - started:.1f} s ({args.workers} process)."
+    )
+    sys.exit(1 if totals["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Seeding en masse d'exercices arithmétiques simples (générateur par lots).
+
+Pour chaque couple (type, tranche d'âge), generate_simple_exercises_batch produit
+--count exercices aux opérandes distincts (moins si l'espace du niveau est plus
+petit), insérés par paquets de --batch-size (un commit par paquet).
+
+Usage:
+    python scripts/seed_simple_exercises.py --count 500
+    python scripts/seed_simple_exercises.py --types addition division --age-groups 6-8 9-11 --count 200 [--dry-run]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+
+load_dotenv(override=False)
+
+from app.db.base import SessionLocal
+from app.generators.exercise_batch_generator import generate_simple_exercises_batch
+from app.models.exercise import Exercise
+
+TYPES = ["addition", "soustraction", "multiplication", "division"]
+AGE_GROUPS = ["6-8", "9-11", "12-14", "15-17"]
+# Clés de travail du générateur, absentes du modèle Exercise.
+_GENERATOR_ONLY_KEYS = ("num1", "num2")
+
+
+def _rows(exercises):
+    for exercise in exercises:
+        row = {k: v for k, v in exercise.items() if k not in _GENERATOR_ONLY_KEYS}
+        yield Exercise(**row, is_active=True, is_archived=False, view_count=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--types", nargs="+", default=TYPES)
+    parser.add_argument("--age-groups", nargs="+", default=AGE_GROUPS)
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    inserted = 0
+    try:
+        for exercise_type in args.types:
+            for age_group in args.age_groups:
+                exercises = generate_simple_exercises_batch(
+                    exercise_type, age_group, args.count
+                )
+                print(f"{exercise_type} {age_group} : {len(exercises)} exercice(s)")
+                if args.dry_run:
+                    continue
+                for start in range(0, len(exercises), args.batch_size):
+                    db.add_all(_rows(exercises[start : start + args.batch_size]))
+                    db.commit()
+                inserted += len(exercises)
+    except Exception as e:
+        db.rollback()
+        print(f"Erreur: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+    print(
+        f"Exercices simples : {inserted} inséré(s)"
+        f"{' (dry-run)' if args.dry_run else ''}, "
+        f"{time.perf_counter() - started:.1f} s."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Backfill et vérification de la table user_stats_rollup (stats badges).
+
+- backfill : recalcule la ligne de chaque utilisateur depuis attempts /
+  logic_challenge_attempts (commit par lot).
+- check    : compare chaque ligne existante aux tables brutes et liste les écarts ;
+  --fix recalcule les lignes incohérentes.
+
+Usage:
+    python scripts/user_stats_rollup.py backfill [--batch-size 200]
+    python scripts/user_stats_rollup.py check [--fix] [--user-id 42]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+
+load_dotenv(override=False)
+
+from app.db.base import SessionLocal
+from app.models.user import User
+from app.models.user_stats_rollup import UserStatsRollup
+from app.services.badges.user_stats_rollup import (
+    check_user_stats_rollup,
+    rebuild_user_stats_rollup,
+)
+
+
+def _iter_user_ids(db, column, batch_size, user_id=None):
+    if user_id is not None:
+        yield [user_id]
+        return
+    last_id = 0
+    while True:
+        ids = [
+            r[0]
+            for r in db.query(column)
+            .filter(column > last_id)
+            .order_by(column)
+            .limit(batch_size)
+            .all()
+        ]
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+
+def backfill(db, batch_size, user_id=None):
+    total = 0
+    for ids in _iter_user_ids(db, User.id, batch_size, user_id):
+        for uid in ids:
+            rebuild_user_stats_rollup(db, uid)
+        db.commit()
+        total += len(ids)
+        print(f"  {total} utilisateur(s) traités…")
+    print(f"Backfill terminé : {total} ligne(s) user_stats_rollup.")
+    return 0
+
+
+def check(db, batch_size, fix, user_id=None):
+    checked = drifted = 0
+    for ids in _iter_user_ids(db, UserStatsRollup.user_id, batch_size, user_id):
+        for uid in ids:
+            checked += 1
+            mismatches = check_user_stats_rollup(db, uid)
+            if not mismatches:
+                continue
+            drifted += 1
+            for field, (stored, raw) in mismatches.items():
+                print(f"  user {uid} — {field}: rollup={stored!r} brut={raw!r}")
+            if fix:
+                rebuild_user_stats_rollup(db, uid)
+        if fix:
+            db.commit()
+    print(f"Vérification : {checked} ligne(s), {drifted} incohérente(s).")
+    return 1 if drifted and not fix else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("command", choices=("backfill", "check"))
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--user-id", type=int, default=None)
+    parser.add_argument(
+        "--fix", action="store_true", help="check : recalcule les lignes incohérentes"
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.command == "backfill":
+            code = backfill(db, args.batch_size, args.user_id)
+        else:
+            code = check(db, args.batch_size, args.fix, args.user_id)
+    except Exception as e:
+        db.rollback()
+        print(f"Erreur: {e}")
+        code = 1
+    finally:
+        db.close()
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
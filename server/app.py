@@ -14,8 +14,34 @@ import os
 
 import uvicorn
 
+from app.core.config import settings
 from app.core.logging_config import get_logger
 from app.core.monitoring import init_monitoring
+from app.core.openai_clients import openai_client_registry
+from app.core.post_commit import (
+    shutdown_post_commit_queue,
+    start_post_commit_sweeper,
+)
+from app.core.runtime import run_db_bound, shutdown_db_executor
+from app.db.async_base import dispose_async_engine
+from app.services.analytics.edtech_ingest import shutdown_edtech_ingest
+from app.services.challenges.challenge_inventory import challenge_stock
+from app.services.communication.email_outbox import (
+    start_email_sender,
+    stop_email_sender,
+)
+from app.services.exercises.exercise_inventory import exercise_stock
+from app.services.recommendation.recommendation_refresh import (
+    recommendation_refresh_scheduler,
+)
+from app.services.users.account_deletion import (
+    start_account_deletion_worker,
+    stop_account_deletion_worker,
+)
+from app.utils.settings_reader import (
+    start_settings_invalidation_listener,
+    stop_settings_invalidation_listener,
+)
 
 logger = get_logger(__name__)
 from starlette.applications import Starlette
@@ -44,6 +70,7 @@ def create_app(debug: bool = False) -> Starlette:
         middleware=get_middleware(),
         exception_handlers=get_exception_handlers(),
         on_startup=[startup],
+        on_shutdown=[shutdown],
     )
 
     # Store templates in application state for API routes
@@ -62,6 +89,36 @@ async def startup():
     logger.info("Starting up Mathakine server")
     init_monitoring()
     init_database()
+    # Transport OpenAI partagé (keep-alive / HTTP/2), pools créés au premier appel.
+    openai_client_registry.start()
+    # Pub/sub Redis : invalidation du snapshot settings entre workers (no-op sans REDIS_URL)
+    start_settings_invalidation_listener()
+    if settings.SUBMIT_SIDE_EFFECTS_ASYNC:
+        # Outbox : balayage périodique des effets de bord restés pending (échec avec
+        # backoff, file saturée, arrêt pendant traitement) ; 1er passage immédiat.
+        # L'import du service enregistre son balayage.
+        from app.services.exercises import exercise_attempt_service  # noqa: F401
+
+        start_post_commit_sweeper()
+    if settings.EMAIL_OUTBOX_ENABLED:
+        # Thread d'envoi email_outbox (un par worker ; SKIP LOCKED répartit les lots).
+        start_email_sender()
+    if settings.ACCOUNT_DELETION_ASYNC:
+        # Thread de suppression de comptes (job repris à son étape après arrêt).
+        start_account_deletion_worker()
+    if settings.EXERCISE_CATALOG_INDEX_ENABLED:
+        # Index catalogue exercices du worker (candidats de recommandation en mémoire).
+        from app.services.exercises.exercise_catalog_index import (
+            build_exercise_catalog_index,
+        )
+
+        await run_db_bound(build_exercise_catalog_index)
+    if settings.CHALLENGE_INVENTORY_ENABLED:
+        # Thread de refill de l'inventaire défis IA (seaux sous le seuil bas).
+        challenge_stock.start_refiller()
+    if settings.EXERCISE_INVENTORY_ENABLED:
+        # Thread de refill de l'inventaire exercices IA (même principe).
+        exercise_stock.start_refiller()
 
     # Note: La migration email est désormais gérée via Alembic (migrations/versions/)
     # L'ancien script scripts/apply_email_verification_migration.py a été archivé dans _ARCHIVE_2026
@@ -69,6 +126,28 @@ async def startup():
     logger.info("Mathakine server started successfully")
 
 
+async def shutdown():
+    """
+    Shutdown event handler for the application.
+
+    Releases process-wide background resources started in ``startup``.
+    """
+    stop_settings_invalidation_listener()
+    # Avant la file post-commit : plus aucune régénération planifiée ensuite.
+    recommendation_refresh_scheduler.stop()
+    shutdown_post_commit_queue()
+    stop_email_sender()
+    stop_account_deletion_worker()
+    # Reliquat du tampon d'ingestion EdTech écrit avant de fermer les connexions.
+    shutdown_edtech_ingest()
+    challenge_stock.stop_refiller()
+    exercise_stock.stop_refiller()
+    await openai_client_registry.aclose()
+    await dispose_async_engine()
+    shutdown_db_executor()
+    logger.info("Mathakine server stopped")
+
+
 def run_server(
     app: object | None = None,
     host: str = "0.0.0.0",
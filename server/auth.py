@@ -10,14 +10,14 @@ from functools import wraps
 
 from starlette.responses import JSONResponse, StreamingResponse
 
+from app.core.db_boundary import run_db_read
 from app.core.logging_config import get_logger
-from app.core.runtime import run_db_bound
 from app.core.user_roles import serialize_user_role
 from app.utils.error_handler import api_error_response
 
 logger = get_logger(__name__)
 
-from app.services.auth.auth_session_service import get_current_user_payload
+from app.services.auth.auth_session_service import resolve_current_user_payload
 
 
 async def get_current_user(request):  # noqa: C901
@@ -53,13 +53,13 @@ async def get_current_user(request):  # noqa: C901
 
         from starlette.exceptions import HTTPException
 
-        from app.core.security import decode_token
+        from app.core.security import decode_token_cached
 
         # Reutiliser le payload deja decode par AuthenticationMiddleware (evite double decode)
         payload = getattr(request.state, "auth_payload", None)
         if not payload or not payload.get("sub"):
             try:
-                payload = decode_token(access_token)
+                payload = decode_token_cached(access_token)
             except HTTPException:
                 return None
             except Exception as decode_error:
@@ -71,8 +71,8 @@ async def get_current_user(request):  # noqa: C901
         if not username:
             return None
 
-        # Recuperer l'utilisateur depuis la DB via use case sync (threadpool)
-        return await run_db_bound(get_current_user_payload, username, payload)
+        # Recuperer l'utilisateur (cache payload, sinon lecture DB via run_db_read)
+        return await run_db_read(resolve_current_user_payload, username, payload)
 
     except Exception as user_fetch_error:
         logger.error(
@@ -15,7 +15,12 @@ from starlette.exceptions import HTTPException
 from starlette.requests import Request
 
 from app.core.logging_config import get_logger
-from app.utils.error_handler import api_error_response, capture_exception_for_sentry
+from app.exceptions import DbExecutorOverloadedError
+from app.utils.error_handler import (
+    api_error_response,
+    capture_exception_for_sentry,
+    overloaded_error_response,
+)
 
 logger = get_logger(__name__)
 
@@ -59,6 +64,14 @@ async def server_error(request: Request, exc: Exception):
     )
 
 
+async def db_overloaded(request: Request, exc: DbExecutorOverloadedError):
+    """
+    Handle 503 load shedding (DB executor queue full) raised outside handler try blocks.
+    """
+    logger.warning("503 DB executor saturé: {}", request.url.path)
+    return overloaded_error_response(exc.message, path=str(request.url.path))
+
+
 def get_exception_handlers():
     """
     Get a dictionary of exception handlers for use in Starlette app initialization.
@@ -69,5 +82,6 @@ def get_exception_handlers():
     return {
         404: not_found,
         500: server_error,
+        DbExecutorOverloadedError: db_overloaded,
         Exception: server_error,  # Catch all other exceptions
     }
@@ -3,12 +3,10 @@ Handlers pour l'espace admin (rôle admin canonique).
 LOT A6 : appels via run_db_bound() vers facades sync.
 """
 
-import csv
-import io
-
 from starlette.requests import Request
-from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.responses import JSONResponse, Response
 
+from app.core.db_boundary import run_db_stream
 from app.core.runtime import run_db_bound
 from app.schemas.admin import AdminError
 from app.services.admin.admin_application_service import AdminApplicationService
@@ -32,6 +30,7 @@ from app.utils.error_handler import api_error_response
 from app.utils.generation_metrics import generation_metrics
 from app.utils.pagination import parse_pagination_params
 from app.utils.request_utils import parse_json_body_any
+from app.utils.stream_encoding import csv_stream, streamed_download_response
 from app.utils.token_tracker import token_tracker
 from server.auth import require_admin, require_auth
 
@@ -219,9 +218,31 @@ async def admin_users_delete(request: Request) -> JSONResponse:
         )
     except AdminError as e:
         return api_error_response(e.status_code, e.message)
+    if result.job_id is not None:
+        return JSONResponse(
+            {"message": result.message, "job_id": result.job_id}, status_code=202
+        )
     return JSONResponse({"message": result.message})
 
 
+@require_auth
+@require_admin
+async def admin_users_deletion_job(request: Request) -> JSONResponse:
+    """
+    GET /api/admin/users/deletions/{job_id}
+    Progression d'une suppression planifiée (ACCOUNT_DELETION_ASYNC) : statut,
+    étape courante, lignes supprimées par étape.
+    """
+    job_id = int(request.path_params["job_id"])
+    try:
+        job = await run_db_bound(
+            AdminApplicationService.get_account_deletion_job, job_id
+        )
+    except AdminError as e:
+        return api_error_response(e.status_code, e.message)
+    return JSONResponse(job)
+
+
 @require_auth
 @require_admin
 async def admin_exercises(request: Request) -> JSONResponse:
@@ -608,7 +629,8 @@ async def admin_reports(request: Request) -> JSONResponse:
 async def admin_export(request: Request) -> Response:
     """
     GET /api/admin/export?type=users|exercises|attempts|overview&period=7d|30d|all
-    Export CSV streamé. Limite 10 000 lignes par export.
+    Export CSV streamé sans limite de lignes : curseur serveur côté DB, paquets en
+    file bornée (run_db_stream), gzip à la volée si Accept-Encoding le permet.
     """
     query_params = dict(request.query_params)
     export_type = (query_params.get("type") or "users").strip().lower()
@@ -619,33 +641,19 @@ async def admin_export(request: Request) -> Response:
         )
     admin_id = getattr(request.state, "user", {}).get("id")
     export_result = await run_db_bound(
-        AdminApplicationService.export_csv_data_for_admin,
+        AdminApplicationService.start_export_for_admin,
         export_type,
         period,
         admin_id,
     )
-    headers = export_result.headers
-    rows_data = export_result.rows
-
-    def generate_csv():
-        buf = io.StringIO()
-        writer = csv.writer(buf)
-        yield "\ufeff"
-        writer.writerow(headers)
-        yield buf.getvalue()
-        buf.seek(0)
-        buf.truncate(0)
-        for row in rows_data:
-            writer.writerow(row)
-            yield buf.getvalue()
-            buf.seek(0)
-            buf.truncate(0)
-
-    filename = f"mathakine_export_{export_type}_{period}.csv"
-    return StreamingResponse(
-        generate_csv(),
+    rows = run_db_stream(
+        AdminApplicationService.iter_export_rows_for_admin, export_type, period
+    )
+    return streamed_download_response(
+        request,
+        csv_stream(export_result.headers, rows),
         media_type="text/csv; charset=utf-8",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        filename=f"mathakine_export_{export_type}_{period}.csv",
     )
 
 
@@ -1,23 +1,74 @@
 """
 Handler pour les evenements analytiques EdTech (CTR Quick Start, temps vers 1er attempt, conversion).
-Persistance en BDD + log structure. Consultation via admin /api/admin/analytics/edtech.
+Persistance en BDD + une ligne de log par requete.
+Consultation via admin /api/admin/analytics/edtech.
+
+Avec EDTECH_INGEST_BUFFERED, les evenements passent par le tampon d'ingestion
+(app.services.analytics.edtech_ingest) : aucune requete DB dans la requete HTTP.
 """
 
 import json
+from typing import Any, Dict, List, Optional
 
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 
+from app.core.config import settings
 from app.core.logging_config import get_logger
+from app.core.monitoring import record_edtech_ingest
 from app.core.runtime import run_db_bound
-from app.services.analytics.analytics_service import record_edtech_event_sync
-from app.utils.error_handler import api_error_response, capture_internal_error_response
+from app.services.analytics.analytics_service import (
+    normalize_edtech_event,
+    record_edtech_events_sync,
+)
+from app.services.analytics.edtech_ingest import offer_edtech_events
+from app.utils.error_handler import (
+    api_error_response,
+    capture_internal_error_response,
+    overloaded_error_response,
+)
 from app.utils.pagination import parse_pagination_params
 from app.utils.request_utils import parse_json_body_any
 from server.auth import require_auth
 
 logger = get_logger(__name__)
 
+INVALID_EVENT_MESSAGE = "event invalide (attendu: first_attempt, quick_start_click)"
+INGEST_FULL_MESSAGE = "Analytics momentanement satures, reessayez plus tard."
+
+
+def _request_user_id(request: Request) -> Optional[int]:
+    if hasattr(request.state, "user") and request.state.user:
+        return request.state.user.get("id")
+    return None
+
+
+def _edtech_row(item: Any, user_id: Optional[int]) -> Optional[Dict[str, Any]]:
+    """Ligne edtech_events d'un evenement du body, ou None si invalide."""
+    if not isinstance(item, dict):
+        return None
+    normalized = normalize_edtech_event(item.get("event"), item.get("payload"))
+    if normalized is None:
+        return None
+    event, payload = normalized
+    return {"user_id": user_id, "event": event, "payload": payload}
+
+
+async def _ingest_edtech_rows(rows: List[Dict[str, Any]]) -> int:
+    """Tampon d'ingestion (non bloquant) ou ecriture directe ; nombre accepte."""
+    # Une ligne par requête, détail complet : objet pour un événement, liste sinon.
+    entries = [
+        {"event": row["event"], "user_id": row["user_id"], **row["payload"]}
+        for row in rows
+    ]
+    logger.info(
+        "[EDTECH] {}",
+        json.dumps(entries[0] if len(entries) == 1 else entries, default=str),
+    )
+    if settings.EDTECH_INGEST_BUFFERED:
+        return offer_edtech_events(rows)
+    return await run_db_bound(record_edtech_events_sync, rows)
+
 
 @require_auth
 async def analytics_event(request: Request) -> JSONResponse:
@@ -30,30 +81,14 @@ async def analytics_event(request: Request) -> JSONResponse:
     if isinstance(body_or_err, JSONResponse):
         return body_or_err
     try:
-        event = (body_or_err.get("event") or "").strip()
-        payload = body_or_err.get("payload") or {}
-
-        user_id = None
-        if hasattr(request.state, "user") and request.state.user:
-            user_id = request.state.user.get("id")
-
-        payload_dict = payload if isinstance(payload, dict) else {}
-        log_payload = {
-            "event": event,
-            "user_id": user_id,
-            **payload_dict,
-        }
-        logger.info("[EDTECH] %s", json.dumps(log_payload, default=str))
-
-        ok = await run_db_bound(
-            record_edtech_event_sync,
-            event=event,
-            payload=payload_dict,
-            user_id=user_id,
-        )
-        if not ok:
-            return api_error_response(
-                400, "event invalide (attendu: first_attempt, quick_start_click)"
+        row = _edtech_row(body_or_err, _request_user_id(request))
+        if row is None:
+            record_edtech_ingest("invalid")
+            return api_error_response(400, INVALID_EVENT_MESSAGE)
+
+        if not await _ingest_edtech_rows([row]):
+            return overloaded_error_response(
+                INGEST_FULL_MESSAGE, path=str(request.url.path)
             )
 
         return JSONResponse({"ok": True}, status_code=200)
@@ -66,6 +101,60 @@ async def analytics_event(request: Request) -> JSONResponse:
         )
 
 
+@require_auth
+async def analytics_events_batch(request: Request) -> JSONResponse:
+    """
+    Enregistrer plusieurs evenements analytics EdTech en une requete.
+    Route: POST /api/analytics/events
+    Body: { "events": [{ "event": ..., "payload": {...} }, ...] }
+    (au plus EDTECH_BATCH_MAX_EVENTS). Les evenements invalides sont ignores et
+    comptes dans ``rejected`` ; ``dropped`` : refuses faute de place (tampon plein).
+    """
+    body_or_err = await parse_json_body_any(request)
+    if isinstance(body_or_err, JSONResponse):
+        return body_or_err
+    try:
+        items = body_or_err.get("events")
+        if not isinstance(items, list) or not items:
+            return api_error_response(400, "events doit etre une liste non vide")
+        max_events = settings.EDTECH_BATCH_MAX_EVENTS
+        if len(items) > max_events:
+            return api_error_response(
+                400, f"Trop d'evenements dans le lot (maximum {max_events})"
+            )
+
+        user_id = _request_user_id(request)
+        rows = [row for row in (_edtech_row(i, user_id) for i in items) if row]
+        rejected = len(items) - len(rows)
+        if rejected:
+            record_edtech_ingest("invalid", rejected)
+        if not rows:
+            return api_error_response(400, INVALID_EVENT_MESSAGE)
+
+        accepted = await _ingest_edtech_rows(rows)
+        if not accepted:
+            return overloaded_error_response(
+                INGEST_FULL_MESSAGE, path=str(request.url.path)
+            )
+
+        return JSONResponse(
+            {
+                "ok": True,
+                "accepted": accepted,
+                "rejected": rejected,
+                "dropped": len(rows) - accepted,
+            },
+            status_code=200,
+        )
+    except Exception as e:
+        logger.exception("analytics_events_batch: {}", e)
+        return capture_internal_error_response(
+            e,
+            "Erreur serveur",
+            tags={"handler": "analytics.analytics_events_batch"},
+        )
+
+
 # --- Admin : consultation des analytics EdTech ---
 
 from app.services.admin.admin_read_service import get_edtech_analytics_for_admin
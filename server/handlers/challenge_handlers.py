@@ -10,6 +10,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from starlette.requests import Request
 from starlette.responses import JSONResponse, Response, StreamingResponse
 
+from app.core.db_boundary import run_db_read
 from app.core.logging_config import get_logger
 from app.core.runtime import run_db_bound
 from app.exceptions import ChallengeAttemptRecordError, ChallengeNotFoundError
@@ -27,7 +28,7 @@ from app.services.challenges.challenge_query_service import (
     get_completed_challenges_ids as query_completed_challenges_ids,
 )
 from app.services.challenges.challenge_query_service import (
-    list_challenges_for_api,
+    query_challenges_list_for_api,
 )
 from app.services.challenges.challenge_stream_service import prepare_stream_context
 from app.utils.error_handler import (
@@ -82,8 +83,8 @@ async def get_challenges_list(request: Request) -> JSONResponse:
 
         user_id = current_user.get("id")
 
-        list_result = await run_db_bound(
-            list_challenges_for_api,
+        list_result = await run_db_read(
+            query_challenges_list_for_api,
             challenge_type=p.challenge_type,
             age_group_db=p.age_group_db,
             search=p.search,
@@ -313,10 +314,9 @@ async def generate_ai_challenge_stream(request: Request) -> Response:
     """
     Genere un challenge avec OpenAI en streaming SSE.
     Handler fin : body JSON validé, preparation via challenge_stream_service, StreamingResponse.
+    Sans prompt libre : inventaire pré-généré si CHALLENGE_INVENTORY_ENABLED.
     """
-    from app.services.challenges.challenge_ai_service import (
-        generate_challenge_stream as svc_generate_stream,
-    )
+    from app.services.challenges.challenge_inventory import serve_challenge_stream
     from app.utils.sse_utils import SSE_HEADERS, sse_error_response
 
     try:
@@ -340,19 +340,8 @@ async def generate_ai_challenge_stream(request: Request) -> Response:
 
         query = stream_result.query
 
-        async def generate():
-            async for event in svc_generate_stream(
-                challenge_type=query.challenge_type,
-                age_group=query.age_group,
-                prompt=query.prompt,
-                user_id=query.user_id,
-                locale=query.locale,
-                personalization=query.personalization,
-            ):
-                yield event
-
         return StreamingResponse(
-            generate(),
+            serve_challenge_stream(query),
             media_type="text/event-stream",
             headers=dict(SSE_HEADERS),
         )
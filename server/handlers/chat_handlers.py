@@ -11,6 +11,7 @@ from starlette.responses import JSONResponse, Response, StreamingResponse
 
 from app.core.config import settings
 from app.core.logging_config import get_logger
+from app.core.openai_clients import openai_client
 
 try:
     from openai import AsyncOpenAI
@@ -76,7 +77,9 @@ async def chat_api(request: Request) -> JSONResponse:
             return api_error_response(400, f"Message invalide: {safety_reason}")
         message = sanitize_user_prompt(message_raw, max_length=2000)
 
-        client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        client = openai_client(
+            api_key=settings.OPENAI_API_KEY, profile="assistant_chat"
+        )
 
         is_image_req, is_math = detect_image_request(message)
         image_url = None
@@ -169,7 +172,9 @@ async def chat_api_stream(request: Request) -> Response:
             return _sse_error(f"Message invalide: {safety_reason}")
         message = sanitize_user_prompt(message_raw, max_length=2000)
 
-        client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        client = openai_client(
+            api_key=settings.OPENAI_API_KEY, profile="assistant_chat"
+        )
 
         is_image_req, is_math = detect_image_request(message)
         image_url = None
@@ -2,7 +2,9 @@
 Handlers pour la génération d'exercices (API)
 """
 
+import asyncio
 import json
+import time
 import traceback
 
 from pydantic import ValidationError
@@ -15,6 +17,7 @@ from starlette.responses import (
     StreamingResponse,
 )
 
+from app.core.db_boundary import run_db_read
 from app.core.logging_config import get_logger
 from app.core.runtime import run_db_bound
 from app.exceptions import (
@@ -22,6 +25,7 @@ from app.exceptions import (
     ExerciseSubmitError,
     InterleavedNotEnoughVariety,
 )
+from app.models.attempt_side_effect import SIDE_EFFECTS_PENDING
 from app.schemas.exercise import (
     GenerateExerciseRequest,
     GenerateExerciseStreamPostBody,
@@ -29,7 +33,10 @@ from app.schemas.exercise import (
     InterleavedPlanQuery,
     SubmitAnswerRequest,
 )
-from app.services.exercises.exercise_attempt_service import submit_answer_sync
+from app.services.exercises.exercise_attempt_service import (
+    get_attempt_side_effects_sync,
+    submit_answer_sync,
+)
 from app.services.exercises.exercise_generation_service import (
     AgeGroupRequiredError,
     generate_exercise_sync,
@@ -37,9 +44,9 @@ from app.services.exercises.exercise_generation_service import (
 from app.services.exercises.exercise_query_service import (
     get_completed_exercise_ids_sync,
     get_exercise_for_api_sync,
-    get_exercises_list_for_api_sync,
     get_exercises_stats_for_api_sync,
     get_interleaved_plan_for_api_sync,
+    query_exercises_list_for_api,
 )
 from app.services.exercises.exercise_stream_service import prepare_stream_context
 from app.utils.error_handler import (
@@ -54,6 +61,10 @@ from server.exercise_generator import normalize_and_validate_exercise_params
 
 logger = get_logger(__name__)
 
+# Flux SSE des effets de bord d'une tentative : intervalle de relecture et durée max.
+SIDE_EFFECTS_POLL_INTERVAL_SECONDS = 0.25
+SIDE_EFFECTS_STREAM_TIMEOUT_SECONDS = 15.0
+
 
 def _parse_submit_answer_payload(raw_data: dict) -> SubmitAnswerRequest:
     """Valide la payload de soumission d'exercice hors contexte HTTP."""
@@ -230,7 +241,7 @@ async def get_exercises_list(request: Request) -> JSONResponse:
             q.age_group,
         )
 
-        response_data = await run_db_bound(get_exercises_list_for_api_sync, q, user_id)
+        response_data = await run_db_read(query_exercises_list_for_api, q, user_id)
         return JSONResponse(response_data.model_dump())
 
     except Exception as exercises_list_error:
@@ -344,9 +355,7 @@ async def generate_ai_exercise_stream(request: Request) -> Response:
     Body JSON typé (POST) — le prompt ne transite plus dans l'URL.
     """
     try:
-        from app.services.exercises.exercise_ai_service import (
-            generate_exercise_stream as svc_generate_stream,
-        )
+        from app.services.exercises.exercise_inventory import serve_exercise_stream
         from app.utils.sse_utils import SSE_HEADERS, sse_error_response
 
         body_or_err = await parse_json_body_as_model(
@@ -371,20 +380,8 @@ async def generate_ai_exercise_stream(request: Request) -> Response:
             logger.warning("Préparation stream rejetée: %s", error)
             return sse_error_response(error)
 
-        async def generate():
-            async for event in svc_generate_stream(
-                exercise_type=context.exercise_type,
-                age_group=context.age_group,
-                derived_difficulty=context.derived_difficulty,
-                pedagogical_band_override=context.pedagogical_band,
-                prompt=context.prompt,
-                locale=context.locale,
-                user_id=context.user_id,
-            ):
-                yield event
-
         return StreamingResponse(
-            generate(),
+            serve_exercise_stream(context),
             media_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache",
@@ -475,3 +472,53 @@ async def get_exercises_stats(request: Request) -> JSONResponse:
         return api_error_response(
             500, "Une perturbation empêche l'accès aux archives. Réessayez plus tard."
         )
+
+
+@require_auth
+async def get_attempt_side_effects(request: Request) -> JSONResponse:
+    """
+    GET /api/exercises/attempts/{attempt_id}/side-effects
+    État des effets de bord différés d'une tentative (polling après soumission).
+    """
+    attempt_id = int(request.path_params["attempt_id"])
+    user_id = request.state.user.get("id")
+    payload = await run_db_bound(get_attempt_side_effects_sync, attempt_id, user_id)
+    if payload is None:
+        return api_error_response(404, "Tentative introuvable.")
+    return JSONResponse(payload)
+
+
+@require_auth_sse
+async def stream_attempt_side_effects(request: Request) -> StreamingResponse:
+    """
+    GET /api/exercises/attempts/{attempt_id}/side-effects/stream
+    SSE : un événement ``side_effects`` dès que le traitement n'est plus ``pending``
+    (ou à l'expiration du délai, avec le statut courant).
+    """
+    from app.utils.sse_utils import SSE_HEADERS, sse_error_response
+
+    attempt_id = int(request.path_params["attempt_id"])
+    user_id = request.state.user.get("id")
+    payload = await run_db_bound(get_attempt_side_effects_sync, attempt_id, user_id)
+    if payload is None:
+        return sse_error_response("Tentative introuvable.")
+
+    async def generate():
+        current = payload
+        deadline = time.monotonic() + SIDE_EFFECTS_STREAM_TIMEOUT_SECONDS
+        while (
+            current is not None
+            and current["status"] == SIDE_EFFECTS_PENDING
+            and time.monotonic() < deadline
+        ):
+            await asyncio.sleep(SIDE_EFFECTS_POLL_INTERVAL_SECONDS)
+            current = await run_db_bound(
+                get_attempt_side_effects_sync, attempt_id, user_id
+            )
+        yield f"data: {json.dumps({'type': 'side_effects', **(current or payload)})}\n\n"
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"X-Accel-Buffering": "no", **dict(SSE_HEADERS)},
+    )
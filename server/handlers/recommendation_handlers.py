@@ -9,6 +9,7 @@ from app.core.logging_config import get_logger
 from app.core.runtime import run_db_bound
 from app.services.recommendation.recommendation_service import (
     generate_recommendations_sync,
+    get_recommendation_freshness_sync,
     get_recommendations_for_api_sync,
     mark_recommendation_as_completed_sync,
     mark_recommendation_as_opened_sync,
@@ -48,6 +49,31 @@ async def get_recommendations(request: Request) -> JSONResponse:
         )
 
 
+@require_auth
+@require_full_access
+async def get_recommendations_status(request: Request) -> JSONResponse:
+    """
+    Fraîcheur des recommandations de l'utilisateur connecté.
+    Route: GET /api/recommendations/status
+    Réponse: { generated_at, age_seconds, stale, refresh_pending }
+    """
+    try:
+        current_user = request.state.user
+        user_id = current_user.get("id")
+        if not user_id:
+            return api_error_response(400, "ID utilisateur manquant")
+
+        freshness = await run_db_bound(get_recommendation_freshness_sync, user_id)
+        return JSONResponse(freshness)
+    except Exception as freshness_error:
+        logger.error(
+            "Erreur lors de la lecture de la fraîcheur des recommandations: {}",
+            freshness_error,
+            exc_info=True,
+        )
+        return api_error_response(500, get_safe_error_message(freshness_error))
+
+
 @require_auth
 @require_full_access
 async def generate_recommendations(request: Request) -> JSONResponse:
@@ -10,33 +10,48 @@ import traceback
 from pydantic import ValidationError
 from sqlalchemy.exc import SQLAlchemyError
 from starlette.requests import Request
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response, StreamingResponse
 
-from app.core.leaderboard_period import parse_leaderboard_period
+from app.core.db_boundary import run_db_read, run_db_stream
+from app.core.leaderboard_period import (
+    LeaderboardPeriod,
+    parse_leaderboard_cursor,
+    parse_leaderboard_period,
+)
 from app.core.logging_config import get_logger
 from app.core.runtime import run_db_bound
 from app.core.security import get_cookie_config
 from app.exceptions import UserNotFoundError
 from app.schemas.user import UserCreate, UserPasswordUpdate
+from app.services.gamification.leaderboard_scores import (
+    ensure_leaderboard_windows_current,
+)
 from app.services.spaced_repetition.spaced_repetition_next_review_service import (
     get_next_review_api_payload,
 )
 from app.services.users.user_application_service import (
     delete_user_account,
-    export_user_data,
     get_challenges_detailed_progress_data,
     get_challenges_progress_data,
-    get_leaderboard,
     get_progress_timeline_data,
+    get_user_export_profile,
     get_user_progress_data,
     get_user_rank_by_points_data,
     get_user_sessions_list,
     get_user_stats_for_api,
+    iter_user_export_records,
+    query_leaderboard_page,
     register_user,
     revoke_session,
     update_password,
     update_profile,
 )
+from app.services.users.user_data_export import (
+    USER_EXPORT_ENCODERS,
+    USER_EXPORT_FORMATS,
+    USER_EXPORT_MEDIA,
+    user_export_header,
+)
 from app.utils.error_handler import (
     api_error_response,
     capture_internal_error_response,
@@ -46,6 +61,7 @@ from app.utils.pagination import parse_pagination_params
 from app.utils.rate_limit import rate_limit_register
 from app.utils.request_utils import parse_json_body_any
 from app.utils.settings_reader import get_setting_bool
+from app.utils.stream_encoding import streamed_download_response
 from server.auth import require_auth, require_full_access
 
 logger = get_logger(__name__)
@@ -186,9 +202,10 @@ async def get_users_leaderboard(request: Request) -> JSONResponse:
     """
     Handler pour récupérer le classement des utilisateurs par points.
     Route: GET /api/users/leaderboard
-    Paramètres: ``limit`` (pagination), ``period`` = ``all`` | ``week`` | ``month``
-    (fenêtre glissante sur ``point_events`` pour ``week`` / ``month`` ; ``all`` = cumul
-    ``users.total_points``). Le paramètre historique ``age_group`` a été retiré.
+    Paramètres: ``limit`` (taille de page), ``cursor`` (``next_cursor`` de la page
+    précédente), ``period`` = ``all`` | ``week`` | ``month`` (scores glissants
+    matérialisés pour ``week`` / ``month`` ; ``all`` = cumul ``users.total_points``).
+    Le paramètre historique ``age_group`` a été retiré.
     """
     try:
         current_user = request.state.user
@@ -205,18 +222,26 @@ async def get_users_leaderboard(request: Request) -> JSONResponse:
                 "Période invalide. Valeurs acceptées : all, week, month.",
             )
 
-        leaderboard = await run_db_bound(
-            get_leaderboard,
+        try:
+            after = parse_leaderboard_cursor(query_params.get("cursor"))
+        except ValueError:
+            return api_error_response(400, "Curseur de pagination invalide.")
+
+        if period is not LeaderboardPeriod.ALL:
+            await run_db_bound(ensure_leaderboard_windows_current)
+        page = await run_db_read(
+            query_leaderboard_page,
             user_id,
             limit=limit,
             period=period,
+            after=after,
         )
         logger.info(
             "Classement récupéré par user_id={}: {} utilisateurs",
             current_user.get("id"),
-            len(leaderboard),
+            len(page["leaderboard"]),
         )
-        return JSONResponse({"leaderboard": leaderboard}, status_code=200)
+        return JSONResponse(page, status_code=200)
 
     except Exception as e:
         logger.error(
@@ -477,13 +502,28 @@ async def delete_user_me(request: Request) -> JSONResponse:
         current_user = request.state.user
         user_id = current_user.get("id")
 
-        await run_db_bound(delete_user_account, user_id)
+        job_id = await run_db_bound(delete_user_account, user_id)
 
-        logger.info("Compte utilisateur supprimé user_id=%s", user_id)
-
-        response = JSONResponse(
-            {"success": True, "message": "Votre compte a été supprimé avec succès."}
-        )
+        if job_id is not None:
+            logger.info(
+                "Suppression du compte planifiée user_id={} job_id={}", user_id, job_id
+            )
+            response = JSONResponse(
+                {
+                    "success": True,
+                    "message": "La suppression de votre compte est en cours.",
+                    "job_id": job_id,
+                },
+                status_code=202,
+            )
+        else:
+            logger.info("Compte utilisateur supprimé user_id=%s", user_id)
+            response = JSONResponse(
+                {
+                    "success": True,
+                    "message": "Votre compte a été supprimé avec succès.",
+                }
+            )
         cookie_samesite, cookie_secure = get_cookie_config()
         response.delete_cookie(
             "access_token",
@@ -538,28 +578,48 @@ async def delete_user(request: Request) -> JSONResponse:
 
 @require_auth
 @require_full_access
-async def export_user_data_handler(request: Request) -> JSONResponse:
+async def export_user_data_handler(request: Request) -> Response:
     """
-    Exporte toutes les données de l'utilisateur connecté (RGPD).
-    Route: GET /api/users/me/export
+    Exporte toutes les données de l'utilisateur connecté (RGPD), en streaming.
+    Route: GET /api/users/me/export?format=json|ndjson|zip
+
+    Historique lu par curseur serveur et encodé paquet par paquet (mémoire constante) ;
+    json/ndjson compressés en gzip si Accept-Encoding le permet.
     """
+    export_format = (request.query_params.get("format") or "json").strip().lower()
+    if export_format not in USER_EXPORT_FORMATS:
+        return api_error_response(
+            400, "format invalide. Valeurs: " + ", ".join(USER_EXPORT_FORMATS) + "."
+        )
     try:
         current_user = request.state.user
         user_id = current_user.get("id")
 
-        export = await run_db_bound(export_user_data, user_id)
-        if export is None:
+        profile = await run_db_bound(get_user_export_profile, user_id)
+        if profile is None:
             return api_error_response(404, "Utilisateur introuvable.")
 
-        stats = export["statistics"]
         logger.info(
-            "Export de données pour l'utilisateur %s : %s exercices, %s défis, %s badges",
+            "Export de données pour l'utilisateur {} (format {})",
             user_id,
-            stats["total_exercise_attempts"],
-            stats["total_challenge_attempts"],
-            stats["total_badges"],
+            export_format,
+        )
+        records = run_db_stream(iter_user_export_records, user_id)
+        body = USER_EXPORT_ENCODERS[export_format](
+            user_export_header(), profile, records
+        )
+        media_type, extension = USER_EXPORT_MEDIA[export_format]
+        filename = f"mathakine_export_{user_id}.{extension}"
+        if export_format == "zip":
+            # Archive déjà compressée : pas de gzip par-dessus.
+            return StreamingResponse(
+                body,
+                media_type=media_type,
+                headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+            )
+        return streamed_download_response(
+            request, body, media_type=media_type, filename=filename
         )
-        return JSONResponse(export)
 
     except Exception as e:
         logger.error("Erreur lors de l'export des données: %s", e, exc_info=True)
@@ -9,17 +9,20 @@ import re
 import uuid
 from typing import Callable, List, Set, Tuple
 
+from starlette.datastructures import MutableHeaders
 from starlette.exceptions import HTTPException
 from starlette.middleware import Middleware
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.cors import CORSMiddleware
 from starlette.requests import Request
+from starlette.responses import Response
 
 from app.core.config import _is_production, settings
 from app.core.logging_config import get_logger
-from app.core.runtime import run_db_bound
-from app.utils.error_handler import api_error_response
-from app.utils.settings_reader import get_setting_bool
+from app.core.runtime import is_db_executor_saturated, run_db_bound
+from app.exceptions import DbExecutorOverloadedError
+from app.utils.error_handler import api_error_response, overloaded_error_response
+from app.utils.settings_reader import get_setting_bool, peek_setting_bool
 
 logger = get_logger(__name__)
 
@@ -96,20 +99,6 @@ class RequestIdMiddleware:
             request_id_ctx.reset(token)
 
 
-class SecureHeadersMiddleware(BaseHTTPMiddleware):
-    """Ajoute les headers de sécurité HTTP (X-Content-Type-Options, X-Frame-Options, etc.) si config activée."""
-
-    async def dispatch(self, request: Request, call_next: Callable):
-        response = await call_next(request)
-        if settings.SECURE_HEADERS:
-            for key, value in SECURE_HEADERS_DICT.items():
-                response.headers[key] = value
-            response.headers["Permissions-Policy"] = PERMISSIONS_POLICY_VALUE
-            if _is_production():
-                response.headers["Strict-Transport-Security"] = HSTS_VALUE
-        return response
-
-
 MAINTENANCE_EXEMPT_PREFIXES = (
     "/live",
     "/ready",
@@ -123,31 +112,6 @@ MAINTENANCE_EXEMPT_PREFIXES = (
 )
 
 
-class MaintenanceMiddleware(BaseHTTPMiddleware):
-    """
-    Bloque les requêtes si maintenance_mode est activé (sauf routes exemptées).
-
-    Politique fail-open: si la vérification maintenance échoue (ex. DB indisponible),
-    la requête est laissée passer. Choix volontaire pour éviter de bloquer tout le site
-    quand seul le check maintenance casse.
-    """
-
-    async def dispatch(self, request: Request, call_next: Callable):
-        if any(request.url.path.startswith(p) for p in MAINTENANCE_EXEMPT_PREFIXES):
-            return await call_next(request)
-        try:
-            if await run_db_bound(get_setting_bool, "maintenance_mode", False):
-                return api_error_response(
-                    503, "Le temple est en maintenance. Réessayez plus tard."
-                )
-        except Exception as e:
-            # Fail-open volontaire: laisser passer la requête si le check échoue
-            logger.warning(
-                "Maintenance check failed: %s — fail-open, requête autorisée", e
-            )
-        return await call_next(request)
-
-
 # ============================================================================
 # A6 — Registre unique de routes publiques / exemptées
 # Source unique pour auth-whitelist et CSRF-exempt. Chaque entrée :
@@ -221,98 +185,253 @@ def _is_auth_public(path: str, method: str) -> bool:
     return False
 
 
-class CsrfMiddleware(BaseHTTPMiddleware):
+def _apply_secure_headers(headers: MutableHeaders) -> None:
+    """Injecte les headers OWASP (+ HSTS en prod) si SECURE_HEADERS est activé."""
+    for key, value in SECURE_HEADERS_DICT.items():
+        headers[key] = value
+    headers["Permissions-Policy"] = PERMISSIONS_POLICY_VALUE
+    if _is_production():
+        headers["Strict-Transport-Security"] = HSTS_VALUE
+
+
+def _extract_access_token(request: Request) -> str | None:
+    """Cookie access_token, sinon header Authorization: Bearer."""
+    access_token = request.cookies.get("access_token")
+    if not access_token:
+        auth_header = request.headers.get("Authorization", "")
+        if auth_header.startswith("Bearer "):
+            access_token = auth_header[7:].strip()
+    return access_token or None
+
+
+# ============================================================================
+# Contrôles de bord — source unique pour EdgeMiddleware et les adaptateurs
+# BaseHTTPMiddleware ci-dessous. None = laisser passer la requête.
+# ============================================================================
+
+
+async def _maintenance_response(path: str) -> Response | None:
     """
-    Protection CSRF centralisée (audit H6).
+    503 si maintenance_mode est activé (sauf routes exemptées).
+
+    Politique fail-open: si la vérification maintenance échoue (ex. DB indisponible),
+    la requête est laissée passer. Choix volontaire pour éviter de bloquer tout le site
+    quand seul le check maintenance casse.
 
-    Vérifie le token CSRF (pattern double-submit) sur toutes les requêtes
-    mutantes sauf les routes exemptées (login, inscription, etc.).
+    Lecture via le snapshot settings (app.utils.settings_reader) : DB uniquement
+    quand le snapshot est froid ou expiré.
     """
+    if any(path.startswith(p) for p in MAINTENANCE_EXEMPT_PREFIXES):
+        return None
+    try:
+        # Snapshot mémoire frais → pas de hop threadpool ni de session DB
+        in_maintenance = peek_setting_bool("maintenance_mode", False)
+        if in_maintenance is None:
+            in_maintenance = await run_db_bound(
+                get_setting_bool, "maintenance_mode", False
+            )
+        if in_maintenance:
+            return api_error_response(
+                503, "Le temple est en maintenance. Réessayez plus tard."
+            )
+    except Exception as e:
+        # Fail-open volontaire: laisser passer la requête si le check échoue
+        logger.warning("Maintenance check failed: {} — fail-open, requête autorisée", e)
+    return None
 
-    async def dispatch(self, request: Request, call_next: Callable):
-        if request.method not in _CSRF_MUTATING_METHODS:
-            return await call_next(request)
-        path = request.url.path.rstrip("/") or "/"
-        if path in _CSRF_EXEMPT_NORMALIZED:
-            return await call_next(request)
-        if not path.startswith("/api/"):
-            return await call_next(request)
-        if not _has_auth_credentials(request):
-            # Laisse l'AuthenticationMiddleware produire le 401 canonique.
-            return await call_next(request)
 
-        from app.utils.csrf import validate_csrf_token
+def _csrf_response(request: Request, path: str, method: str) -> Response | None:
+    """
+    Protection CSRF centralisée (audit H6) : token double-submit vérifié sur les
+    requêtes mutantes /api/* sauf routes exemptées (login, inscription, etc.).
+    """
+    if method not in _CSRF_MUTATING_METHODS:
+        return None
+    normalized = path.rstrip("/") or "/"
+    if normalized in _CSRF_EXEMPT_NORMALIZED:
+        return None
+    if not normalized.startswith("/api/"):
+        return None
+    if not _has_auth_credentials(request):
+        # Laisse l'authentification produire le 401 canonique.
+        return None
 
-        csrf_err = validate_csrf_token(request)
-        if csrf_err:
-            return csrf_err
-        return await call_next(request)
+    from app.utils.csrf import validate_csrf_token
 
+    return validate_csrf_token(request)
 
-class AuthenticationMiddleware(BaseHTTPMiddleware):
+
+def _auth_response(request: Request, path: str, method: str) -> Response | None:
+    """
+    Authentification deny-by-default : seules les routes de la whitelist sont
+    accessibles sans token ; payload décodé conservé dans request.state.
+    """
+    if _is_auth_public(path, method):
+        return None
+    # Routes hors /api : health, metrics, robots - déjà gérées en exact
+    if not path.startswith("/api/"):
+        return None
+
+    access_token = _extract_access_token(request)
+    if not access_token:
+        logger.info("Unauthorized access attempt to {}", path)
+        return api_error_response(401, "Authentication required")
+
+    try:
+        # Verify the token (une seule fois — réutilisé par get_current_user)
+        from app.core.security import decode_token_cached
+
+        payload = decode_token_cached(access_token)
+        request.state.auth_payload = payload
+
+        # Contexte utilisateur Sentry — permet de corréler erreurs + "User Impact"
+        try:
+            import sentry_sdk
+
+            sentry_sdk.set_user(
+                {
+                    "username": payload.get("sub"),
+                    "id": str(payload.get("user_id", payload.get("sub", ""))),
+                }
+            )
+        except Exception:
+            pass
+        return None
+
+    except HTTPException as http_exc:
+        # 401 attendu : token expiré ou invalide — pas une erreur applicative
+        logger.warning("Unauthorized request to {}: {}", path, http_exc.detail)
+        return api_error_response(http_exc.status_code, http_exc.detail)
+    except Exception as auth_error:
+        # Erreur inattendue lors du décodage (ex. clé corrompue, librairie)
+        logger.error("Unexpected auth error for {}: {}", path, auth_error)
+        return api_error_response(401, "Invalid or expired token")
+
+
+class SecureHeadersMiddleware(BaseHTTPMiddleware):
     """
-    Middleware d'authentification deny-by-default.
+    Ajoute les headers de sécurité HTTP (X-Content-Type-Options, X-Frame-Options, etc.) si config activée.
 
-    Seules les routes de la whitelist sont accessibles sans token.
-    Les routes /api/* non listées exigent un cookie access_token valide.
+    Adaptateur BaseHTTPMiddleware de _apply_secure_headers ; le runtime utilise
+    EdgeMiddleware (tests de parité, scripts/bench_middleware_chain.py).
     """
 
     async def dispatch(self, request: Request, call_next: Callable):
-        path = request.url.path
-        method = request.method
+        response = await call_next(request)
+        if settings.SECURE_HEADERS:
+            _apply_secure_headers(response.headers)
+        return response
 
-        if _is_auth_public(path, method):
-            return await call_next(request)
 
-        # Routes hors /api : health, metrics, robots - déjà gérées en exact
-        if not path.startswith("/api/"):
-            return await call_next(request)
+class MaintenanceMiddleware(BaseHTTPMiddleware):
+    """Adaptateur BaseHTTPMiddleware de _maintenance_response ; voir EdgeMiddleware."""
 
-        access_token = request.cookies.get("access_token")
-        if not access_token:
-            auth_header = request.headers.get("Authorization", "")
-            if auth_header.startswith("Bearer "):
-                access_token = auth_header[7:].strip()
-        if not access_token:
-            logger.info("Unauthorized access attempt to %s", request.url.path)
-            return api_error_response(401, "Authentication required")
+    async def dispatch(self, request: Request, call_next: Callable):
+        response = await _maintenance_response(request.url.path)
+        return response or await call_next(request)
 
-        try:
-            # Verify the token (une seule fois — réutilisé par get_current_user)
-            from app.core.security import decode_token
 
-            payload = decode_token(access_token)
-            request.state.auth_payload = payload
+class CsrfMiddleware(BaseHTTPMiddleware):
+    """Adaptateur BaseHTTPMiddleware de _csrf_response ; voir EdgeMiddleware."""
 
-            # Contexte utilisateur Sentry — permet de corréler erreurs + "User Impact"
-            try:
-                import sentry_sdk
+    async def dispatch(self, request: Request, call_next: Callable):
+        response = _csrf_response(request, request.url.path, request.method)
+        return response or await call_next(request)
 
-                sentry_sdk.set_user(
-                    {
-                        "username": payload.get("sub"),
-                        "id": str(payload.get("user_id", payload.get("sub", ""))),
-                    }
-                )
-            except Exception:
-                pass
 
-            # Continue with the request if token is valid
-            response = await call_next(request)
-            return response
+class AuthenticationMiddleware(BaseHTTPMiddleware):
+    """Adaptateur BaseHTTPMiddleware de _auth_response ; voir EdgeMiddleware."""
 
-        except HTTPException as http_exc:
-            # 401 attendu : token expiré ou invalide — pas une erreur applicative
-            logger.warning(
-                "Unauthorized request to %s: %s", request.url.path, http_exc.detail
-            )
-            return api_error_response(http_exc.status_code, http_exc.detail)
-        except Exception as auth_error:
-            # Erreur inattendue lors du décodage (ex. clé corrompue, librairie)
-            logger.error(
-                "Unexpected auth error for %s: %s", request.url.path, str(auth_error)
-            )
-            return api_error_response(401, "Invalid or expired token")
+    async def dispatch(self, request: Request, call_next: Callable):
+        response = _auth_response(request, request.url.path, request.method)
+        return response or await call_next(request)
+
+
+class EdgeMiddleware:
+    """
+    Middleware ASGI pur fusionnant la chaîne de bord (perf) :
+    SecureHeaders → CORS → Maintenance → CSRF → Authentication.
+
+    Même comportement que l'empilement des BaseHTTPMiddleware historiques, en une
+    seule passe sur ``scope`` : pas de task hop ni de re-wrapping du flux de réponse
+    (SSE, petits JSON). CORSMiddleware (déjà ASGI pur) est conservé en interne à la
+    même position pour que les réponses 401/403/503 portent les headers CORS.
+    """
+
+    def __init__(self, app, cors_options: dict | None = None):
+        self.app = app
+        self._gated = (
+            CORSMiddleware(self._gate, **cors_options) if cors_options else self._gate
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if settings.SECURE_HEADERS:
+            inner_send = send
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    _apply_secure_headers(MutableHeaders(scope=message))
+                await inner_send(message)
+
+        await self._gated(scope, receive, send)
+
+    async def _gate(self, scope, receive, send):
+        request = Request(scope, receive)
+        path = scope["path"]
+        response = self._overload_response(path)
+        if response is None:
+            response = await _maintenance_response(path)
+        if response is None:
+            response = _csrf_response(request, path, scope["method"])
+        if response is None:
+            response = _auth_response(request, path, scope["method"])
+        if response is not None:
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    def _overload_response(path: str) -> Response | None:
+        """Délestage 503 des requêtes /api/* tant que la file de l'executor DB est pleine."""
+        if not path.startswith("/api/") or not is_db_executor_saturated():
+            return None
+        return overloaded_error_response(DbExecutorOverloadedError().message)
+
+
+def get_cors_options() -> dict:
+    """Options CORSMiddleware (source unique : settings.BACKEND_CORS_ORIGINS)."""
+    return {
+        "allow_origins": settings.BACKEND_CORS_ORIGINS,
+        "allow_methods": ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+        # Audit 4.2: restreindre aux headers utilisés par le frontend
+        "allow_headers": [
+            "Content-Type",
+            "Authorization",
+            "Accept",
+            "Accept-Language",
+            "X-CSRF-Token",  # Protection CSRF (audit 3.2)
+        ],
+        "allow_credentials": True,  # Important pour les cookies HTTP-only
+    }
+
+
+def get_legacy_edge_middleware() -> List[Middleware]:
+    """
+    Chaîne historique SecureHeaders → CORS → Maintenance → CSRF → Auth (BaseHTTPMiddleware).
+
+    Référence de comportement pour les tests de parité et le benchmark ; non utilisée au runtime.
+    """
+    return [
+        Middleware(SecureHeadersMiddleware),
+        Middleware(CORSMiddleware, **get_cors_options()),
+        Middleware(MaintenanceMiddleware),
+        Middleware(CsrfMiddleware),
+        Middleware(AuthenticationMiddleware),
+    ]
 
 
 def get_middleware() -> List[Middleware]:
@@ -322,9 +441,6 @@ def get_middleware() -> List[Middleware]:
     Returns:
         List of Middleware instances
     """
-    # P1 — source unique : settings.BACKEND_CORS_ORIGINS (config.py)
-    allowed_origins = settings.BACKEND_CORS_ORIGINS
-
     middleware_list = []
 
     # Request ID (corrélation logs + Sentry) — en premier
@@ -338,27 +454,8 @@ def get_middleware() -> List[Middleware]:
     except ImportError:
         pass
 
-    middleware_list.extend(
-        [
-            Middleware(SecureHeadersMiddleware),
-            Middleware(
-                CORSMiddleware,
-                allow_origins=allowed_origins,
-                allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-                # Audit 4.2: restreindre aux headers utilisés par le frontend
-                allow_headers=[
-                    "Content-Type",
-                    "Authorization",
-                    "Accept",
-                    "Accept-Language",
-                    "X-CSRF-Token",  # Protection CSRF (audit 3.2)
-                ],
-                allow_credentials=True,  # Important pour les cookies HTTP-only
-            ),
-            Middleware(MaintenanceMiddleware),
-            Middleware(CsrfMiddleware),
-            Middleware(AuthenticationMiddleware),
-        ]
-    )
+    # Chaîne de bord fusionnée (ASGI pur) : headers sécurité, CORS, maintenance, CSRF, auth.
+    # P1 — source unique CORS : settings.BACKEND_CORS_ORIGINS (config.py)
+    middleware_list.append(Middleware(EdgeMiddleware, cors_options=get_cors_options()))
 
     return middleware_list
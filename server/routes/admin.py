@@ -34,6 +34,7 @@ from server.handlers.admin_handlers import (
     admin_reports,
     admin_users,
     admin_users_delete,
+    admin_users_deletion_job,
     admin_users_patch,
     admin_users_resend_verification,
     admin_users_send_reset_password,
@@ -80,6 +81,11 @@ def get_admin_routes():
                     endpoint=admin_users_delete,
                     methods=["DELETE"],
                 ),
+                Route(
+                    "/users/deletions/{job_id:int}",
+                    endpoint=admin_users_deletion_job,
+                    methods=["GET"],
+                ),
                 Route("/exercises", endpoint=admin_exercises, methods=["GET"]),
                 Route("/exercises", endpoint=admin_exercises_post, methods=["POST"]),
                 Route(
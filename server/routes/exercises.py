@@ -5,11 +5,13 @@ from starlette.routing import Route
 from server.handlers.exercise_handlers import (
     generate_ai_exercise_stream,
     generate_exercise_api,
+    get_attempt_side_effects,
     get_completed_exercises_ids,
     get_exercise,
     get_exercises_list,
     get_exercises_stats,
     get_interleaved_plan_api,
+    stream_attempt_side_effects,
     submit_answer,
 )
 
@@ -52,4 +54,14 @@ def get_exercises_routes():
             endpoint=submit_answer,
             methods=["POST"],
         ),
+        Route(
+            "/api/exercises/attempts/{attempt_id:int}/side-effects",
+            endpoint=get_attempt_side_effects,
+            methods=["GET"],
+        ),
+        Route(
+            "/api/exercises/attempts/{attempt_id:int}/side-effects/stream",
+            endpoint=stream_attempt_side_effects,
+            methods=["GET"],
+        ),
     ]
@@ -2,12 +2,13 @@
 
 from starlette.routing import Route
 
-from server.handlers.analytics_handlers import analytics_event
+from server.handlers.analytics_handlers import analytics_event, analytics_events_batch
 from server.handlers.chat_handlers import chat_api, chat_api_stream
 from server.handlers.feedback_handlers import submit_feedback
 from server.handlers.recommendation_handlers import (
     generate_recommendations,
     get_recommendations,
+    get_recommendations_status,
     handle_recommendation_complete,
     handle_recommendation_open,
 )
@@ -20,6 +21,11 @@ def get_misc_routes():
             endpoint=analytics_event,
             methods=["POST"],
         ),
+        Route(
+            "/api/analytics/events",
+            endpoint=analytics_events_batch,
+            methods=["POST"],
+        ),
         Route(
             "/api/feedback",
             endpoint=submit_feedback,
@@ -30,6 +36,11 @@ def get_misc_routes():
             endpoint=get_recommendations,
             methods=["GET"],
         ),
+        Route(
+            "/api/recommendations/status",
+            endpoint=get_recommendations_status,
+            methods=["GET"],
+        ),
         Route(
             "/api/recommendations/generate",
             endpoint=generate_recommendations,
@@ -138,3 +138,48 @@ async def test_admin_analytics_edtech_excludes_negative_times(
     fa = data.get("aggregates", {}).get("first_attempt", {})
     # Seul le temps positif (5000 ms) doit être inclus → moyenne = 5000
     assert fa.get("avg_time_to_first_attempt_ms") == 5000
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("buffered", [True, False])
+async def test_analytics_events_batch(
+    padawan_client, archiviste_client, monkeypatch, buffered
+):
+    """POST /api/analytics/events : lot partiellement invalide, visible dans admin."""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "EDTECH_INGEST_BUFFERED", buffered)
+    client = padawan_client["client"]
+    response = await client.post(
+        "/api/analytics/events",
+        json={
+            "events": [
+                {"event": "quick_start_click", "payload": {"targetId": 4201}},
+                {"event": "first_attempt", "payload": {"targetId": 4202}},
+                {"event": "invalid_event", "payload": {}},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    assert response.json() == {"ok": True, "accepted": 2, "rejected": 1, "dropped": 0}
+
+    admin_response = await archiviste_client["client"].get(
+        "/api/admin/analytics/edtech"
+    )
+    target_ids = {
+        (e.get("payload") or {}).get("targetId")
+        for e in admin_response.json()["events"]
+    }
+    assert {4201, 4202} <= target_ids
+
+
+@pytest.mark.asyncio
+async def test_analytics_events_batch_rejects_bad_body(padawan_client):
+    """POST /api/analytics/events : liste vide, trop longue ou sans événement valide."""
+    from app.core.config import settings
+
+    client = padawan_client["client"]
+    too_many = [{"event": "first_attempt"}] * (settings.EDTECH_BATCH_MAX_EVENTS + 1)
+    for body in ({"events": []}, {"events": too_many}, {"events": [{"event": "x"}]}):
+        response = await client.post("/api/analytics/events", json=body)
+        assert response.status_code == 400
@@ -385,6 +385,28 @@ async def test_admin_export_overview(archiviste_client):
     assert "metric" in content or "value" in content or "total" in content.lower()
 
 
+@pytest.mark.asyncio
+async def test_admin_export_streams_all_rows_gzipped(
+    archiviste_client, db_session, monkeypatch
+):
+    """GET /api/admin/export?type=users — toutes les lignes, paquets, gzip négocié."""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "DB_STREAM_CHUNK_ROWS", 2)
+    client = archiviste_client["client"]
+    response = await client.get(
+        "/api/admin/export?type=users&period=all",
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.status_code == 200
+    assert response.headers.get("content-encoding") == "gzip"
+    lines = response.text.lstrip("\ufeff").splitlines()
+    assert lines[0] == "id,username,email,full_name,role,is_active,created_at"
+    total_users = db_session.query(User).count()
+    assert total_users > 2
+    assert len(lines) - 1 == total_users
+
+
 @pytest.mark.asyncio
 async def test_admin_f43_account_progression_observability(
     archiviste_client, db_session
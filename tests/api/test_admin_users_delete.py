@@ -6,7 +6,10 @@ Tests pour les mutations admin users (LOT 5 / 5.1) :
   POST /api/admin/users/{user_id}/resend-verification
 """
 
+from app.core.config import settings
+from app.models.account_deletion_job import AccountDeletionJob
 from app.models.user import User
+from app.services.users.account_deletion import run_account_deletion_job
 from tests.utils.test_helpers import adapted_dict_to_user
 
 # ─── PATCH /api/admin/users/{user_id} (LOT 5.1) ────────────────────────────────
@@ -138,6 +141,44 @@ async def test_admin_delete_user_archiviste(archiviste_client, db_session, mock_
     assert deleted is None
 
 
+async def test_admin_delete_user_async_job(
+    archiviste_client, db_session, mock_user, monkeypatch
+):
+    """ACCOUNT_DELETION_ASYNC — 202 + job_id, compte désactivé, progression admin."""
+    monkeypatch.setattr(settings, "ACCOUNT_DELETION_ASYNC", True)
+    client = archiviste_client["client"]
+
+    user = adapted_dict_to_user(mock_user(), db_session)
+    db_session.add(user)
+    db_session.commit()
+    user_id = user.id
+
+    try:
+        response = await client.delete(f"/api/admin/users/{user_id}")
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        db_session.expire_all()
+        assert db_session.get(User, user_id).is_active is False
+
+        progress = await client.get(f"/api/admin/users/deletions/{job_id}")
+        assert progress.status_code == 200
+        assert progress.json()["status"] == "pending"
+        assert progress.json()["steps"][-1] == "users"
+
+        assert run_account_deletion_job() == "done"
+        progress = await client.get(f"/api/admin/users/deletions/{job_id}")
+        assert progress.json()["status"] == "done"
+        assert progress.json()["progress"]["users"] == 1
+        db_session.expire_all()
+        assert db_session.get(User, user_id) is None
+
+        missing = await client.get(f"/api/admin/users/deletions/{job_id + 1}")
+        assert missing.status_code == 404
+    finally:
+        db_session.query(AccountDeletionJob).delete()
+        db_session.commit()
+
+
 async def test_admin_delete_user_self_forbidden(archiviste_client):
     """DELETE /api/admin/users/{id} — un admin ne peut pas se supprimer lui-même."""
     client = archiviste_client["client"]
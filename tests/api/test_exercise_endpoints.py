@@ -442,6 +442,40 @@ async def test_submit_answer_selected_answer_alias(
     assert data["is_correct"] is True
 
 
+async def test_attempt_side_effects_poll(padawan_client, db_session, mock_exercise):
+    """GET /api/exercises/attempts/{id}/side-effects : done en mode inline, 404 sinon."""
+    from app.models.exercise import DifficultyLevel, Exercise, ExerciseType
+
+    client = padawan_client["client"]
+    ex_data = mock_exercise()
+    exercise = Exercise(
+        title=ex_data["title"],
+        exercise_type=ExerciseType(ex_data["exercise_type"]),
+        difficulty=DifficultyLevel(ex_data["difficulty"]),
+        age_group=ex_data.get("age_group", "6-8"),
+        question=ex_data["question"],
+        correct_answer=ex_data["correct_answer"],
+        is_active=True,
+        is_archived=False,
+    )
+    db_session.add(exercise)
+    db_session.commit()
+    db_session.refresh(exercise)
+
+    submitted = await client.post(
+        f"/api/exercises/{exercise.id}/attempt",
+        json={"answer": ex_data["correct_answer"], "time_spent": 1.0},
+    )
+    attempt_id = submitted.json()["attempt_id"]
+
+    response = await client.get(f"/api/exercises/attempts/{attempt_id}/side-effects")
+    assert response.status_code == 200
+    assert response.json()["status"] == "done"
+
+    missing = await client.get("/api/exercises/attempts/999999999/side-effects")
+    assert missing.status_code == 404
+
+
 async def test_submit_answer_invalid_json_returns_400(
     padawan_client, db_session, mock_exercise
 ):
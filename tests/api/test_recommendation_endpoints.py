@@ -7,6 +7,7 @@ Routes réelles:
 - POST /api/recommendations/open (body: { recommendation_id: int }) — R4
 - POST /api/recommendations/clicked — alias même handler que `/open`
 - POST /api/recommendations/complete (body: { recommendation_id: int })
+- GET /api/recommendations/status — fraîcheur (generated_at, stale, refresh_pending)
 """
 
 import pytest
@@ -555,6 +556,28 @@ async def test_get_recommendations_unauthorized(client):
     assert response.status_code == 401
 
 
+async def test_get_recommendations_status(padawan_client):
+    """GET /api/recommendations/status : fraîcheur après génération."""
+    client = padawan_client["client"]
+
+    before = await client.get("/api/recommendations/status")
+    assert before.status_code == 200
+    assert before.json()["stale"] is True
+
+    await client.post("/api/recommendations/generate")
+    after = (await client.get("/api/recommendations/status")).json()
+    assert set(after) == {"generated_at", "age_seconds", "stale", "refresh_pending"}
+    assert after["refresh_pending"] is False
+    if after["generated_at"] is not None:
+        assert after["stale"] is False
+
+
+async def test_get_recommendations_status_unauthorized(client):
+    """GET /api/recommendations/status requiert authentification."""
+    response = await client.get("/api/recommendations/status")
+    assert response.status_code == 401
+
+
 async def test_mark_recommendation_complete_nonexistent(padawan_client):
     """POST /api/recommendations/complete avec recommendation_id inexistant → 404."""
     client = padawan_client["client"]
@@ -3,12 +3,18 @@ Tests des endpoints API pour les utilisateurs.
 Migre de FastAPI TestClient vers httpx.AsyncClient (Starlette).
 """
 
+import io
+import json
 import uuid
+import zipfile
 from datetime import datetime, timedelta, timezone
 
 import pytest
 
+from app.core.config import settings
 from app.core.security import get_password_hash, verify_password
+from app.models.attempt import Attempt
+from app.models.exercise import Exercise
 from app.models.user import User, UserRole
 from app.services.auth.auth_service import create_session
 from app.utils.db_helpers import get_enum_value
@@ -262,6 +268,28 @@ async def test_get_leaderboard_invalid_period_returns_400(padawan_client):
     assert response.status_code == 400
 
 
+async def test_get_leaderboard_keyset_pages_chain(padawan_client):
+    client = padawan_client["client"]
+    first = await client.get("/api/users/leaderboard?period=week&limit=2")
+    assert first.status_code == 200
+    data = first.json()
+    assert "next_cursor" in data
+    if data["next_cursor"] is None:
+        return
+    second = await client.get(
+        f"/api/users/leaderboard?period=week&limit=2&cursor={data['next_cursor']}"
+    )
+    assert second.status_code == 200
+    ranks = [e["rank"] for e in data["leaderboard"] + second.json()["leaderboard"]]
+    assert ranks == list(range(1, len(ranks) + 1))
+
+
+async def test_get_leaderboard_invalid_cursor_returns_400(padawan_client):
+    client = padawan_client["client"]
+    response = await client.get("/api/users/leaderboard?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+
 async def test_get_me_rank_invalid_period_returns_400(padawan_client):
     client = padawan_client["client"]
     response = await client.get("/api/users/me/rank?period=invalid")
@@ -412,6 +440,72 @@ async def test_get_user_export_progression_rank_is_canonical_alias(
     assert profile["progression_rank"] == "explorer"
 
 
+def _add_export_attempts(db_session, username: str, count: int) -> None:
+    user = db_session.query(User).filter(User.username == username).one()
+    exercise = Exercise(
+        title="Export RGPD",
+        exercise_type="addition",
+        difficulty="initie",
+        age_group="6-8",
+        question="1 + 1 = ?",
+        correct_answer="2",
+        choices=["1", "2", "3", "4"],
+        is_active=True,
+        is_archived=False,
+    )
+    db_session.add(exercise)
+    db_session.flush()
+    db_session.add_all(
+        Attempt(
+            user_id=user.id,
+            exercise_id=exercise.id,
+            user_answer=str(index),
+            is_correct=index == 2,
+            time_spent=10,
+        )
+        for index in range(count)
+    )
+    db_session.commit()
+
+
+async def test_get_user_export_streams_every_format(
+    padawan_client, db_session, monkeypatch
+):
+    """GET /api/users/me/export?format=json|ndjson|zip — historique complet, paquets."""
+    monkeypatch.setattr(settings, "DB_STREAM_CHUNK_ROWS", 2)
+    client = padawan_client["client"]
+    _add_export_attempts(db_session, padawan_client["user_data"]["username"], 5)
+
+    response = await client.get(
+        "/api/users/me/export", headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.status_code == 200
+    assert response.headers.get("content-encoding") == "gzip"
+    data = response.json()
+    assert [a["answer"] for a in data["exercise_attempts"]] == list("01234")
+    assert data["statistics"]["total_exercise_attempts"] == 5
+
+    response = await client.get("/api/users/me/export?format=ndjson")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["section"] for line in lines[:2]] == ["meta", "profile"]
+    assert sum(line["section"] == "exercise_attempts" for line in lines) == 5
+    assert lines[-1]["section"] == "statistics"
+    assert lines[-1]["data"]["total_exercise_attempts"] == 5
+
+    response = await client.get("/api/users/me/export?format=zip")
+    assert response.status_code == 200
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    assert archive.namelist()[0] == "profile.json"
+    assert archive.namelist()[-1] == "statistics.json"
+    attempts = archive.read("exercise_attempts.ndjson").decode().splitlines()
+    assert len(attempts) == 5
+
+    response = await client.get("/api/users/me/export?format=xml")
+    assert response.status_code == 400
+
+
 async def test_get_user_sessions_returns_current_session(padawan_client):
     """GET /api/users/me/sessions doit retourner au moins la session active courante."""
     client = padawan_client["client"]
@@ -90,22 +90,38 @@ configure_mappers()  # Force la résolution des relations immédiatement (évite
 from app.core.config import settings
 from app.core.security import create_access_token, get_password_hash
 from app.db.base import Base, engine
+from app.models.account_deletion_job import AccountDeletionJob
 from app.models.ai_eval_harness_run import AiEvalHarnessCaseResult, AiEvalHarnessRun
 from app.models.attempt import Attempt
+from app.models.attempt_side_effect import AttemptSideEffect
+from app.models.challenge_inventory import ChallengeInventoryItem
 from app.models.challenge_progress import ChallengeProgress
 from app.models.daily_challenge import DailyChallenge
+from app.models.edtech_daily_rollup import (
+    EdTechDailyRollup,
+    EdTechDailyUser,
+    EdTechRollupDay,
+)
+from app.models.email_outbox import EmailOutbox
 from app.models.exercise import DifficultyLevel, Exercise, ExerciseType
+from app.models.exercise_inventory import ExerciseInventoryItem
 from app.models.logic_challenge import (
     AgeGroup,
     LogicChallenge,
     LogicChallengeAttempt,
     LogicChallengeType,
 )
+from app.models.leaderboard_score import (
+    LeaderboardPeriodScore,
+    LeaderboardPeriodWindow,
+    UserDailyPoints,
+)
 from app.models.point_event import PointEvent
 from app.models.progress import Progress
 from app.models.recommendation import Recommendation
 from app.models.spaced_repetition_item import SpacedRepetitionItem
 from app.models.user import User, UserRole
+from app.models.user_stats_rollup import UserStatsRollup
 from app.utils.db_helpers import (
     adapt_enum_for_db,
     get_all_enum_values,
@@ -199,6 +215,85 @@ def setup_test_environment():
     DailyChallenge.__table__.create(bind=imported_engine, checkfirst=True)
     PointEvent.__table__.create(bind=imported_engine, checkfirst=True)
     ChallengeProgress.__table__.create(bind=imported_engine, checkfirst=True)
+    # Classement matérialisé : colonne privacy dénormalisée + tables de scores.
+    if imported_engine.dialect.name == "postgresql":
+        with imported_engine.begin() as connection:
+            connection.execute(
+                text(
+                    "ALTER TABLE users ADD COLUMN IF NOT EXISTS show_in_leaderboards "
+                    "BOOLEAN NOT NULL DEFAULT TRUE"
+                )
+            )
+            # Tirage aléatoire par keyset (app.utils.catalog_sampling).
+            for table, prefix, type_column in (
+                ("exercises", "ix_exercises", "exercise_type"),
+                ("logic_challenges", "ix_challenges", "challenge_type"),
+            ):
+                connection.execute(
+                    text(
+                        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS sample_key "
+                        "DOUBLE PRECISION NOT NULL DEFAULT random()"
+                    )
+                )
+                connection.execute(
+                    text(
+                        f"CREATE INDEX IF NOT EXISTS {prefix}_sample_key "
+                        f"ON {table} (sample_key)"
+                    )
+                )
+                connection.execute(
+                    text(
+                        f"CREATE INDEX IF NOT EXISTS {prefix}_type_sample_key "
+                        f"ON {table} ({type_column}, sample_key)"
+                    )
+                )
+            # Relecture delta de l'index catalogue exercices.
+            connection.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_exercises_updated_at "
+                    "ON exercises (updated_at)"
+                )
+            )
+            # Suppression de compte : contenu créé par le compte.
+            connection.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_exercises_creator_id "
+                    "ON exercises (creator_id)"
+                )
+            )
+            # Analytics EdTech : bords de fenêtre, liste filtrée par événement.
+            connection.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_edtech_events_created_at "
+                    "ON edtech_events (created_at)"
+                )
+            )
+            connection.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_edtech_events_event_created_at "
+                    "ON edtech_events (event, created_at)"
+                )
+            )
+    UserDailyPoints.__table__.create(bind=imported_engine, checkfirst=True)
+    LeaderboardPeriodScore.__table__.create(bind=imported_engine, checkfirst=True)
+    LeaderboardPeriodWindow.__table__.create(bind=imported_engine, checkfirst=True)
+    UserStatsRollup.__table__.create(bind=imported_engine, checkfirst=True)
+    AttemptSideEffect.__table__.create(bind=imported_engine, checkfirst=True)
+    if imported_engine.dialect.name == "postgresql":
+        with imported_engine.begin() as connection:
+            connection.execute(
+                text(
+                    "ALTER TABLE attempt_side_effects "
+                    "ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMPTZ"
+                )
+            )
+    EmailOutbox.__table__.create(bind=imported_engine, checkfirst=True)
+    ChallengeInventoryItem.__table__.create(bind=imported_engine, checkfirst=True)
+    ExerciseInventoryItem.__table__.create(bind=imported_engine, checkfirst=True)
+    AccountDeletionJob.__table__.create(bind=imported_engine, checkfirst=True)
+    EdTechDailyRollup.__table__.create(bind=imported_engine, checkfirst=True)
+    EdTechDailyUser.__table__.create(bind=imported_engine, checkfirst=True)
+    EdTechRollupDay.__table__.create(bind=imported_engine, checkfirst=True)
     # IA8 : tables harness eval (même principe que daily_challenges — base de test sans alembic à jour).
     AiEvalHarnessRun.__table__.create(bind=imported_engine, checkfirst=True)
     AiEvalHarnessCaseResult.__table__.create(bind=imported_engine, checkfirst=True)
@@ -1038,6 +1133,29 @@ def _clear_adaptive_context_cache_between_tests():
     clear_resolve_adaptive_context_cache()
 
 
+@pytest.fixture(autouse=True, scope="function")
+def _clear_auth_caches_between_tests():
+    """Caches auth in-process (tokens vérifiés, payload /me) : pas de fuite entre tests.
+
+    Le nettoyage SQL brut des fixtures ne passe pas par les events ORM d'invalidation.
+    """
+    from app.utils.auth_cache import clear_auth_caches
+
+    clear_auth_caches()
+    yield
+    clear_auth_caches()
+
+
+@pytest.fixture(autouse=True, scope="function")
+def _clear_catalog_totals_cache_between_tests():
+    """Totaux de listings en cache : même raison que les caches auth (nettoyage SQL brut)."""
+    from app.utils.catalog_sampling import catalog_totals_cache
+
+    catalog_totals_cache.clear()
+    yield
+    catalog_totals_cache.clear()
+
+
 @pytest.fixture(autouse=True, scope="function")
 def auto_cleanup_test_data(db_session):
     """Nettoyage automatique des donnees de test.
@@ -0,0 +1,246 @@
+"""
+Tests — suppression de compte ensembliste (app.services.users.account_deletion) :
+couverture des FK, DELETE par paquets, contenu créé, jobs repris à leur étape.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.db.base import Base
+from app.models.account_deletion_job import (
+    DELETION_DONE,
+    DELETION_PENDING,
+    AccountDeletionJob,
+)
+from app.models.attempt import Attempt
+from app.models.exercise import DifficultyLevel, Exercise, ExerciseType
+from app.models.logic_challenge import (
+    AgeGroup,
+    LogicChallenge,
+    LogicChallengeAttempt,
+    LogicChallengeType,
+)
+from app.models.progress import Progress
+from app.models.recommendation import Recommendation
+from app.models.user import User, UserRole
+from app.services.users import account_deletion
+from app.services.users.account_deletion import (
+    ACCOUNT_DELETION_PLAN,
+    delete_account_data,
+    get_account_deletion_job_for_api,
+    request_account_deletion,
+    run_account_deletion_job,
+)
+from app.utils.db_helpers import get_enum_value
+
+
+@pytest.fixture
+def deletion_jobs(db_session):
+    db_session.query(AccountDeletionJob).delete()
+    db_session.commit()
+    try:
+        yield db_session
+    finally:
+        db_session.rollback()
+        db_session.query(AccountDeletionJob).delete()
+        db_session.commit()
+
+
+def _user(db, prefix):
+    uid = uuid.uuid4().hex[:8]
+    user = User(
+        username=f"{prefix}_{uid}",
+        email=f"{prefix}_{uid}@example.com",
+        hashed_password="test_password",
+        role=get_enum_value(UserRole, UserRole.PADAWAN),
+    )
+    db.add(user)
+    db.flush()
+    return user
+
+
+def _account_with_history(db, attempts=5):
+    """Compte avec exercice et défi créés, historique, et un autre joueur dessus."""
+    user = _user(db, "del_set")
+    other = _user(db, "del_other")
+    exercise = Exercise(
+        title=f"Créé par {user.username}",
+        creator_id=user.id,
+        exercise_type=get_enum_value(ExerciseType, ExerciseType.ADDITION),
+        difficulty=get_enum_value(DifficultyLevel, DifficultyLevel.INITIE),
+        age_group="6-8",
+        question="1+1=?",
+        correct_answer="2",
+    )
+    challenge = LogicChallenge(
+        title=f"Défi de {user.username}",
+        creator_id=user.id,
+        challenge_type=get_enum_value(LogicChallengeType, LogicChallengeType.SEQUENCE),
+        age_group=get_enum_value(AgeGroup, AgeGroup.GROUP_10_12),
+        description="Suite",
+        correct_answer="8",
+        solution_explanation="+2",
+    )
+    db.add_all([exercise, challenge])
+    db.flush()
+    for index in range(attempts):
+        db.add(
+            Attempt(
+                user_id=user.id,
+                exercise_id=exercise.id,
+                user_answer=str(index),
+                is_correct=index % 2 == 0,
+            )
+        )
+    db.add(
+        Attempt(
+            user_id=other.id,
+            exercise_id=exercise.id,
+            user_answer="2",
+            is_correct=True,
+        )
+    )
+    db.add(
+        LogicChallengeAttempt(
+            user_id=other.id,
+            challenge_id=challenge.id,
+            user_solution="8",
+            is_correct=True,
+        )
+    )
+    db.add(
+        Progress(
+            user_id=user.id,
+            exercise_type="addition",
+            difficulty="initie",
+            total_attempts=attempts,
+        )
+    )
+    db.add(
+        Recommendation(
+            user_id=other.id,
+            exercise_id=exercise.id,
+            exercise_type="addition",
+            difficulty="initie",
+            priority=1,
+        )
+    )
+    db.commit()
+    return user.id, other.id, exercise.id, challenge.id
+
+
+def _cleanup(db, *user_ids):
+    for user_id in user_ids:
+        user = db.get(User, user_id)
+        if user is not None:
+            db.delete(user)
+    db.commit()
+
+
+def test_plan_covers_every_restrictive_foreign_key():
+    """Toute FK sans ON DELETE vers users / contenu créé a une étape du plan."""
+    planned = {step.model.__tablename__ for step in ACCOUNT_DELETION_PLAN}
+    targets = {"users", "exercises", "logic_challenges"}
+    for table in Base.metadata.sorted_tables:
+        for fk in table.foreign_keys:
+            if fk.column.table.name in targets and fk.ondelete is None:
+                assert table.name in planned, f"{table.name}.{fk.parent.name}"
+    names = [step.name for step in ACCOUNT_DELETION_PLAN]
+    assert len(names) == len(set(names))
+    assert names[-1] == "users"
+
+
+def test_delete_account_data_in_chunks(db_session):
+    user_id, other_id, exercise_id, challenge_id = _account_with_history(db_session)
+    try:
+        chunks = []
+        deleted = delete_account_data(
+            db_session,
+            user_id,
+            chunk_size=2,
+            on_chunk=lambda db, step, count: chunks.append((step, count)),
+        )
+
+        assert deleted["attempts_on_created_exercises"] == 6
+        assert deleted["attempts_on_created_challenges"] == 1
+        assert deleted["progress"] == 1
+        assert deleted["exercises"] == 1
+        assert deleted["logic_challenges"] == 1
+        assert deleted["users"] == 1
+        # 6 tentatives par paquets de 2 : 3 paquets pleins + le paquet vide final.
+        sizes = [c for s, c in chunks if s == "attempts_on_created_exercises"]
+        assert sizes == [2, 2, 2, 0]
+        db_session.expire_all()
+        assert db_session.get(User, user_id) is None
+        assert db_session.get(Exercise, exercise_id) is None
+        assert db_session.get(LogicChallenge, challenge_id) is None
+        assert db_session.query(Attempt).filter_by(user_id=other_id).count() == 0
+        # FK SET NULL : la recommandation de l'autre joueur reste, sans exercice.
+        recommendation = db_session.query(Recommendation).filter_by(user_id=other_id)
+        assert recommendation.one().exercise_id is None
+        assert db_session.get(User, other_id) is not None
+    finally:
+        _cleanup(db_session, user_id, other_id)
+
+
+def test_job_resumes_at_its_step_after_failure(deletion_jobs, monkeypatch):
+    db = deletion_jobs
+    user_id, other_id, _, _ = _account_with_history(db, attempts=3)
+    delete_chunk = account_deletion._delete_chunk
+
+    def _fail_on_progress(session, step, *args):
+        if step.name == "progress":
+            raise OperationalError("DELETE", {}, Exception("connexion perdue"))
+        return delete_chunk(session, step, *args)
+
+    try:
+        job_id = request_account_deletion(db, user_id, requested_by=user_id)
+        assert request_account_deletion(db, user_id) == job_id
+        db.expire_all()
+        assert db.get(User, user_id).is_active is False
+
+        monkeypatch.setattr(account_deletion, "_delete_chunk", _fail_on_progress)
+        assert run_account_deletion_job() == "retry"
+        db.expire_all()
+        job = db.get(AccountDeletionJob, job_id)
+        assert job.status == DELETION_PENDING
+        # Dernier paquet commité : l'étape qui précède « progress ».
+        assert job.step == "user_sessions"
+        assert job.progress["attempts_on_created_exercises"] == 4
+        assert "progress" not in job.progress
+        assert "OperationalError" in job.last_error
+
+        monkeypatch.setattr(account_deletion, "_delete_chunk", delete_chunk)
+        assert run_account_deletion_job() == "done"
+        db.expire_all()
+        job = db.get(AccountDeletionJob, job_id)
+        assert job.status == DELETION_DONE
+        assert job.tries == 2
+        assert job.progress["progress"] == 1
+        assert job.progress["users"] == 1
+        assert job.rows_deleted == sum(job.progress.values())
+        assert db.get(User, user_id) is None
+        assert get_account_deletion_job_for_api(db, job_id)["status"] == "done"
+        assert run_account_deletion_job() is None
+    finally:
+        _cleanup(db, user_id, other_id)
+
+
+def test_claimed_job_is_leased(deletion_jobs):
+    db = deletion_jobs
+    user = _user(db, "del_lease")
+    db.commit()
+    try:
+        job_id = request_account_deletion(db, user.id)
+        now = datetime.now(timezone.utc)
+        claimed = account_deletion.claim_account_deletion_job(db, now)
+        assert claimed == (job_id, user.id, None, 1)
+        # Bail en cours : invisible pour un autre worker.
+        assert account_deletion.claim_account_deletion_job(db, now) is None
+        later = now + account_deletion.CLAIM_LEASE + timedelta(seconds=1)
+        assert account_deletion.claim_account_deletion_job(db, later)[3] == 2
+    finally:
+        _cleanup(db, user.id)
@@ -0,0 +1,213 @@
+"""
+Exécution concurrente du harness IA : bornes live (global + budget par modèle),
+pool de process offline, ordre déterministe des rapports et gain mesuré contre
+un faux serveur OpenAI en streaming local (aucun appel réseau externe).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app.core.config import settings
+from app.evaluation.ai_generation_harness import (
+    run_live_harness_for_explicit_cases,
+    run_offline_harness_report,
+)
+from app.evaluation.concurrency import (
+    ModelBudget,
+    parse_model_budgets,
+    run_live_cases,
+)
+from app.evaluation.corpus_loader import load_corpus
+from app.evaluation.reporting import order_results_by_cases
+from app.evaluation.schemas import CaseResult
+from app.services.exercises import exercise_ai_service
+
+FAKE_EXERCISE = json.loads(
+    (
+        Path(__file__).resolve().parents[1]
+        / "fixtures"
+        / "ai_eval"
+        / "exercise_openai_valid.json"
+    ).read_text(encoding="utf-8")
+)
+
+
+def test_parse_model_budgets():
+    budgets = parse_model_budgets(["o3=2", "gpt-4o-mini=8/120"])
+    assert budgets == {
+        "o3": ModelBudget(max_in_flight=2),
+        "gpt-4o-mini": ModelBudget(max_in_flight=8, requests_per_minute=120.0),
+    }
+    for bad in ("o3", "o3=", "o3=0", "o3=x", "o3=2/0"):
+        with pytest.raises(ValueError):
+            parse_model_budgets([bad])
+
+
+def test_order_results_by_cases_ignores_completion_order():
+    cases = [{"id": "b"}, {"id": "a"}, {"id": "c"}]
+    results = [
+        CaseResult(case_id=cid, pipeline="p", success=True) for cid in ("c", "a", "b")
+    ]
+    assert [r.case_id for r in order_results_by_cases(results, cases)] == [
+        "b",
+        "a",
+        "c",
+    ]
+
+
+def test_offline_process_pool_matches_sequential_run():
+    sequential = run_offline_harness_report("all")
+    pooled = run_offline_harness_report("all", concurrency=2)
+
+    def _verdicts(report):
+        return [(r["case_id"], r["success"]) for r in report.results]
+
+    assert _verdicts(pooled) == _verdicts(sequential)
+    assert pooled.concurrency == 2
+    assert pooled.wall_clock_ms is not None
+
+
+async def test_live_cases_respect_global_and_model_budgets():
+    in_flight = {"all": 0, "o3": 0}
+    peaks = {"all": 0, "o3": 0}
+
+    async def _fake_dispatch(case):
+        model = case.get("eval_model") or "default"
+        in_flight["all"] += 1
+        in_flight["o3"] += model == "o3"
+        peaks["all"] = max(peaks["all"], in_flight["all"])
+        peaks["o3"] = max(peaks["o3"], in_flight["o3"])
+        # Les premiers cas finissent en dernier : l'ordre d'arrivée est inversé.
+        await asyncio.sleep(0.05 / (1 + int(case["id"][1:])))
+        in_flight["all"] -= 1
+        in_flight["o3"] -= model == "o3"
+        return CaseResult(case_id=case["id"], pipeline=case["pipeline"], success=True)
+
+    cases = [
+        {
+            "id": f"c{i}",
+            "pipeline": "openai_exercise_stream",
+            "eval_model": "o3" if i % 2 else "gpt-4o-mini",
+        }
+        for i in range(10)
+    ]
+    with patch("app.evaluation.concurrency.dispatch_live", _fake_dispatch):
+        results = await run_live_cases(
+            cases, concurrency=4, model_budgets={"o3": ModelBudget(1)}
+        )
+
+    assert [r.case_id for r in results] == [c["id"] for c in cases]
+    assert peaks["all"] == 4
+    assert peaks["o3"] == 1
+
+
+async def test_model_budget_spaces_request_starts():
+    starts = []
+
+    async def _fake_dispatch(case):
+        starts.append(time.monotonic())
+        return CaseResult(case_id=case["id"], pipeline=case["pipeline"], success=True)
+
+    cases = [
+        {"id": f"c{i}", "pipeline": "openai_exercise_stream"} for i in range(3)
+    ]
+    with patch("app.evaluation.concurrency.dispatch_live", _fake_dispatch):
+        await run_live_cases(
+            cases,
+            concurrency=3,
+            model_budgets={"default": ModelBudget(3, requests_per_minute=600)},
+        )
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert all(gap >= 0.09 for gap in gaps)
+
+
+class _FakeOpenAIStreamHandler(BaseHTTPRequestHandler):
+    """``POST /v1/chat/completions`` en SSE, après une latence fixe par requête."""
+
+    latency_sec = 0.3
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        time.sleep(self.latency_sec)
+        content = json.dumps(FAKE_EXERCISE, ensure_ascii=False)
+        pieces = [content[i : i + 64] for i in range(0, len(content), 64)]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for piece in pieces + [None]:
+            chunk = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": "fake",
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {"content": piece} if piece else {},
+                        "finish_reason": None if piece else "stop",
+                    }
+                ],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def log_message(self, *_args):
+        pass
+
+
+@pytest.fixture
+def fake_openai_server(monkeypatch):
+    from openai._client import AsyncOpenAI
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOpenAIStreamHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    def _local_client(*args, **kwargs):
+        # Vrai client SDK (HTTP + parsing SSE réels), épinglé sur le faux serveur.
+        return AsyncOpenAI(*args, **{**kwargs, "base_url": base_url})
+
+    monkeypatch.setattr("openai.AsyncOpenAI", _local_client)
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "sk-fake-local")
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_live_concurrency_speedup_against_fake_stream_server(fake_openai_server):
+    source = next(
+        c
+        for c in load_corpus()["cases"]
+        if c["id"] == "live_openai_exercise_addition"
+    )
+    cases = [{**source, "id": f"{source['id']}__{i}"} for i in range(6)]
+    product_resolve = exercise_ai_service.resolve_exercise_ai_model
+
+    sequential = run_live_harness_for_explicit_cases(cases, concurrency=1)
+    concurrent = run_live_harness_for_explicit_cases(cases, concurrency=6)
+
+    for report in (sequential, concurrent):
+        assert report.cases_passed == len(cases), report.summary_markdown
+        assert [r["case_id"] for r in report.results] == [c["id"] for c in cases]
+    assert sequential.wall_clock_ms >= 6 * 300
+    assert concurrent.wall_clock_ms < sequential.wall_clock_ms / 2
+    # Patches d'isolation posés une fois pour les cas en vol, puis retirés.
+    assert exercise_ai_service.resolve_exercise_ai_model is product_resolve
+    print(
+        f"\nHarness live (faux serveur 300 ms) : séquentiel "
+        f"{sequential.wall_clock_ms:.0f} ms, concurrence 6 "
+        f"{concurrent.wall_clock_ms:.0f} ms"
+    )
@@ -0,0 +1,130 @@
+"""Tests pour app.utils.auth_cache (tokens vérifiés + payload /me) et leur câblage."""
+
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from starlette.exceptions import HTTPException
+
+from app.core import security
+from app.core.security import create_access_token, decode_token_cached
+from app.services.auth import auth_session_service
+from app.utils.auth_cache import (
+    UserPayloadCache,
+    VerifiedTokenCache,
+    user_payload_cache,
+    verified_token_cache,
+)
+
+
+class TestVerifiedTokenCache:
+    def test_put_get_roundtrip_returns_copy(self):
+        cache = VerifiedTokenCache(max_entries=4)
+        cache.put("tok", {"sub": "u", "exp": time.time() + 60})
+        first = cache.get("tok")
+        first["sub"] = "mutated"
+        assert cache.get("tok")["sub"] == "u"
+
+    def test_expired_entry_is_evicted(self):
+        cache = VerifiedTokenCache(max_entries=4)
+        cache.put("tok", {"sub": "u", "exp": time.time() - 1})
+        assert cache.get("tok") is None
+        assert len(cache) == 0
+
+    def test_lru_bound(self):
+        cache = VerifiedTokenCache(max_entries=2)
+        exp = time.time() + 60
+        cache.put("a", {"exp": exp})
+        cache.put("b", {"exp": exp})
+        cache.get("a")
+        cache.put("c", {"exp": exp})
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+    def test_payload_without_exp_not_cached(self):
+        cache = VerifiedTokenCache(max_entries=2)
+        cache.put("tok", {"sub": "u"})
+        assert cache.get("tok") is None
+
+    def test_disabled_when_size_zero(self):
+        cache = VerifiedTokenCache(max_entries=0)
+        cache.put("tok", {"exp": time.time() + 60})
+        assert cache.get("tok") is None
+
+
+class TestDecodeTokenCached:
+    def test_second_decode_skips_jwt_verification(self):
+        token = create_access_token({"sub": "cached_user"})
+        with patch.object(
+            security, "decode_token", wraps=security.decode_token
+        ) as spy:
+            assert decode_token_cached(token)["sub"] == "cached_user"
+            assert decode_token_cached(token)["sub"] == "cached_user"
+        assert spy.call_count == 1
+
+    def test_invalid_token_raises_and_is_not_cached(self):
+        with pytest.raises(HTTPException):
+            decode_token_cached("not-a-jwt")
+        assert len(verified_token_cache) == 0
+
+
+class TestUserPayloadCache:
+    def test_ttl_expiry(self):
+        cache = UserPayloadCache(ttl_sec=0.01)
+        cache.put("u", {"id": 1}, None)
+        time.sleep(0.02)
+        assert cache.get("u") is None
+
+    def test_invalidate_by_user_id(self):
+        cache = UserPayloadCache(ttl_sec=60)
+        cache.put("u", {"id": 1}, None)
+        cache.invalidate_user(1)
+        assert cache.get("u") is None
+
+    def test_put_ignored_after_concurrent_invalidation(self):
+        cache = UserPayloadCache(ttl_sec=60)
+        generation = cache.generation
+        cache.invalidate_user(1)
+        cache.put("u", {"id": 1}, None, generation=generation)
+        assert cache.get("u") is None
+
+
+class TestCurrentUserPayloadCaching:
+    def test_cache_hit_skips_db(self):
+        user_payload_cache.put("alice", {"id": 7, "username": "alice"}, None)
+        with patch.object(auth_session_service, "sync_db_session") as db:
+            result = auth_session_service.get_current_user_payload(
+                "alice", {"sub": "alice", "iat": time.time()}
+            )
+        db.assert_not_called()
+        assert result == {"id": 7, "username": "alice"}
+
+    def test_cache_hit_still_enforces_password_reset_revocation(self):
+        changed = datetime.now(timezone.utc)
+        user_payload_cache.put("alice", {"id": 7}, changed)
+        old_iat = (changed - timedelta(minutes=5)).timestamp()
+        assert (
+            auth_session_service.get_current_user_payload(
+                "alice", {"sub": "alice", "iat": old_iat}
+            )
+            is None
+        )
+
+    def test_user_commit_invalidates_cached_payload(self, db_session):
+        from tests.utils.test_data_cleanup import TestDataManager
+
+        user = TestDataManager(db_session).create_test_user(
+            username_prefix="test_auth_cache"
+        )
+        db_session.commit()
+        payload = {"sub": user.username, "iat": time.time() + 5}
+        first = auth_session_service.get_current_user_payload(user.username, payload)
+        assert first["total_points"] == int(user.total_points or 0)
+
+        user.total_points = int(user.total_points or 0) + 42
+        db_session.commit()
+
+        second = auth_session_service.get_current_user_payload(user.username, payload)
+        assert second["total_points"] == first["total_points"] + 42
@@ -0,0 +1,167 @@
+"""
+Tests — tirage aléatoire par keyset (sample_key) et cache des totaux de listing.
+
+Chaque test reste dans une transaction non commitée (rollback final), sauf
+l'invalidation post-commit qui nettoie ses lignes.
+"""
+
+import time
+import uuid
+
+import pytest
+from sqlalchemy import insert
+
+from app.models.exercise import Exercise
+from app.services.exercises.exercise_service import ExerciseService
+from app.utils.catalog_sampling import (
+    CatalogTotalsCache,
+    catalog_totals_cache,
+    sample_by_key,
+)
+
+
+@pytest.fixture
+def tx(db_session):
+    try:
+        yield db_session
+    finally:
+        db_session.rollback()
+
+
+def _insert_exercises(db, title_prefix, keys):
+    db.execute(
+        insert(Exercise),
+        [
+            {
+                "title": f"{title_prefix} {index}",
+                "exercise_type": "ADDITION",
+                "difficulty": "INITIE",
+                "age_group": "6-8",
+                "question": "1+1=?",
+                "correct_answer": "2",
+                "is_archived": False,
+                "sample_key": key,
+            }
+            for index, key in enumerate(keys)
+        ],
+    )
+
+
+def test_sample_by_key_wraps_around(tx):
+    prefix = f"sample_{uuid.uuid4().hex[:8]}"
+    _insert_exercises(tx, prefix, [0.05, 0.2, 0.5, 0.8, 0.95])
+    query = tx.query(Exercise.sample_key).filter(Exercise.title.like(f"{prefix} %"))
+
+    keys = [row.sample_key for row in sample_by_key(query, Exercise.sample_key, 3, 0.6)]
+    assert keys == [0.8, 0.95, 0.05]
+
+    keys = [row.sample_key for row in sample_by_key(query, Exercise.sample_key, 10, 0.6)]
+    assert sorted(keys) == [0.05, 0.2, 0.5, 0.8, 0.95]
+
+
+def test_exercise_list_random_pages_without_offset(tx):
+    prefix = f"sample_{uuid.uuid4().hex[:8]}"
+    _insert_exercises(tx, prefix, [i / 40 for i in range(40)])
+
+    seen = set()
+    for _ in range(10):
+        response = ExerciseService.get_exercises_list_for_api(
+            tx, limit=5, search=prefix, order="random"
+        )
+        assert response.total == 40
+        assert len(response.items) == 5
+        seen.update(item.id for item in response.items)
+    # Points de départ aléatoires : pas toujours la même page.
+    assert len(seen) > 5
+
+    past_end = ExerciseService.get_exercises_list_for_api(
+        tx, limit=5, skip=40, search=prefix, order="random"
+    )
+    assert past_end.items == []
+
+
+def test_totals_cache_counts_once_and_bypasses_writing_session(tx):
+    cache = CatalogTotalsCache(ttl_sec=60, max_entries=8)
+    calls = []
+
+    def _count():
+        calls.append(1)
+        return 7
+
+    key = ("exercises", None, "6-8", None)
+    assert cache.get_or_count(tx, key, _count) == 7
+    assert cache.get_or_count(tx, key, _count) == 7
+    assert len(calls) == 1
+
+    # Une session qui a flushé un exercice compte sans cache jusqu'au commit/rollback.
+    tx.add(
+        Exercise(
+            title="sample_flush",
+            exercise_type="ADDITION",
+            difficulty="INITIE",
+            age_group="6-8",
+            question="1+1=?",
+            correct_answer="2",
+        )
+    )
+    tx.flush()
+    assert cache.get_or_count(tx, key, _count) == 7
+    assert len(calls) == 2
+
+    cache.invalidate("exercises")
+    assert len(cache) == 0
+
+
+def test_commit_invalidates_exercise_totals(db_session):
+    prefix = f"sample_{uuid.uuid4().hex[:8]}"
+    try:
+
+        def _total():
+            return ExerciseService.get_exercises_list_for_api(
+                db_session, limit=1, search=prefix
+            ).total
+
+        assert _total() == 0
+        assert len(catalog_totals_cache) == 1
+        db_session.add(
+            Exercise(
+                title=f"{prefix} 0",
+                exercise_type="ADDITION",
+                difficulty="INITIE",
+                age_group="6-8",
+                question="1+1=?",
+                correct_answer="2",
+            )
+        )
+        db_session.commit()
+        assert len(catalog_totals_cache) == 0
+        assert _total() == 1
+    finally:
+        db_session.rollback()
+        db_session.query(Exercise).filter(Exercise.title.like(f"{prefix} %")).delete(
+            synchronize_session=False
+        )
+        db_session.commit()
+
+
+def test_keyset_page_cost_does_not_grow_with_position(tx):
+    prefix = f"sample_{uuid.uuid4().hex[:8]}"
+    count = 20_000
+    _insert_exercises(tx, prefix, [i / count for i in range(count)])
+    # Sans filtre : le parcours d'index sur sample_key borne le keyset à la page.
+    query = tx.query(Exercise.id)
+    total = query.count()
+
+    started = time.perf_counter()
+    deep_offset = query.order_by(Exercise.id).offset(total - 20).limit(20).all()
+    offset_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    keyset = sample_by_key(query, Exercise.sample_key, 20, 0.999)
+    keyset_ms = (time.perf_counter() - started) * 1000
+
+    assert len(deep_offset) == len(keyset) == 20
+    print(
+        f"\nListing aléatoire {total} lignes : keyset {keyset_ms:.2f} ms "
+        f"vs OFFSET {total - 20} {offset_ms:.2f} ms"
+    )
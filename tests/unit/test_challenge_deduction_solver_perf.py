@@ -2,118 +2,80 @@
 Performance and edge-case tests for the deduction solver (Phase 3D).
 
 Couvre :
-- seuil MAX_DEDUCTION_SOLVER_COMBINATIONS : 8! exploré, 9! court-circuité (test comportemental)
-- search_space_too_large : retour immédiat sans exploration (sans dépendance temporelle)
+- ancien plafond de 50 000 combinaisons levé : 9! est vérifié (arrêt à 2 solutions)
+- search_space_too_large : budget MAX_DEDUCTION_SOLVER_NODES dépassé
 - grille ambiguë : solution_count > 1 (plusieurs solutions possibles)
 - valeurs dupliquées : _build_model retourne None → reason='unsupported_model'
-- benchmark 4×4 : grille bien formée résolue en < 500ms et réponse calibrée (marquée @slow)
-
-MAX_DEDUCTION_SOLVER_COMBINATIONS = 50_000
-_total_search_space = factorial(n_entities) ** n_secondary_categories
+- équivalence avec l'énumération exhaustive (_constraint_matches) sur petites grilles
+- benchmarks 4×4, 5 entités × 4 catégories et 6 entités × 3 catégories (marqués @slow)
 """
 
 from __future__ import annotations
 
+import itertools
+import random
 import time
 
 import pytest
 
+from app.services.challenges import challenge_deduction_solver as solver
 from app.services.challenges.challenge_deduction_solver import (
-    MAX_DEDUCTION_SOLVER_COMBINATIONS,
+    MAX_DEDUCTION_SOLVER_NODES,
+    _build_model,
+    _constraint_matches,
+    _parse_constraints,
     analyze_deduction_uniqueness,
 )
 
+# 9 entités × 1 catégorie secondaire → 9! = 362 880 affectations candidates.
+_VISUAL_9_ENTITIES = {
+    "type": "logic_grid",
+    "entities": {
+        "Personnes": [f"P{i}" for i in range(1, 10)],
+        "Couleurs": [f"C{i}" for i in range(1, 10)],
+    },
+    "clues": [],
+    "constraints": [
+        {
+            "type": "entity_value",
+            "left": {"category": "Personnes", "value": "P1"},
+            "right": {"category": "Couleurs", "value": "C1"},
+        },
+    ],
+}
 
-def test_max_combinations_seuil_is_strict() -> None:
-    """Le seuil 50 000 est un contrat de performance : strictement supérieur ⇒ pas exploré.
 
-    Vérifie le comportement (pas seulement la valeur de la constante) sur deux côtés
-    du seuil :
-    - search_space == 50_000 ⇒ exploré (pas de short-circuit)
-    - search_space > 50_000  ⇒ short-circuit avec ``search_space_too_large``
-    """
-    # 8! = 40 320 (≤ 50 000) avec 1 catégorie secondaire ⇒ exploré
-    visual_under = {
-        "type": "logic_grid",
-        "entities": {
-            "Personnes": [f"P{i}" for i in range(1, 9)],
-            "Couleurs": [f"C{i}" for i in range(1, 9)],
-        },
-        "clues": [],
-        "constraints": [
-            {
-                "type": "entity_value",
-                "left": {"category": "Personnes", "value": "P1"},
-                "right": {"category": "Couleurs", "value": "C1"},
-            },
-        ],
+def _constraint(kind: str, left: tuple, right: tuple) -> dict:
+    return {
+        "type": kind,
+        "left": {"category": left[0], "value": left[1]},
+        "right": {"category": right[0], "value": right[1]},
     }
-    res_under = analyze_deduction_uniqueness(visual_under, "P1:C1")
-    assert (
-        res_under.reason != "search_space_too_large"
-    ), f"8! = 40 320 doit être exploré, reçu reason={res_under.reason!r}"
 
-    # 9! = 362 880 (> 50 000) ⇒ short-circuit
-    visual_over = {
-        "type": "logic_grid",
-        "entities": {
-            "Personnes": [f"P{i}" for i in range(1, 10)],
-            "Couleurs": [f"C{i}" for i in range(1, 10)],
-        },
-        "clues": [],
-        "constraints": [
-            {
-                "type": "entity_value",
-                "left": {"category": "Personnes", "value": "P1"},
-                "right": {"category": "Couleurs", "value": "C1"},
-            },
-        ],
-    }
-    res_over = analyze_deduction_uniqueness(visual_over, "P1:C1")
-    assert res_over.checked is False
-    assert res_over.reason == "search_space_too_large"
 
-    # Ancrage explicite : si la constante bouge, ce test doit être ré-évalué.
-    assert MAX_DEDUCTION_SOLVER_COMBINATIONS == 50_000
+def test_former_combination_ceiling_is_now_explored() -> None:
+    """9 entités × 1 catégorie (9! = 362 880) : autrefois court-circuité, désormais vérifié.
 
+    Une seule contrainte ⇒ grille ambiguë ; le solveur s'arrête dès la 2e solution.
+    """
+    result = analyze_deduction_uniqueness(_VISUAL_9_ENTITIES, "P1:C1")
+    assert result.checked is True, result.reason
+    assert result.solution_count == 2
 
-class TestSearchSpaceTooLarge:
-    """Grille dont search_space > 50_000 : retour immédiat sans exploration."""
-
-    # 9 entités × 1 catégorie secondaire → 9! = 362 880 > 50 000.
-    # 1 contrainte structurée pour que le parsing atteigne la vérification du search_space.
-    # NB : ne pas ajouter de catégorie supplémentaire — le coût construit avant le
-    # short-circuit n'est garanti que pour ce gabarit (1 catégorie secondaire).
-    _N_ENTITIES = 9
-    _N_SECONDARY_CATEGORIES = 1
-    _VISUAL_LARGE = {
-        "type": "logic_grid",
-        "entities": {
-            "Personnes": [f"P{i}" for i in range(1, _N_ENTITIES + 1)],
-            "Couleurs": [f"C{i}" for i in range(1, _N_ENTITIES + 1)],
-        },
-        "clues": [],
-        "constraints": [
-            {
-                "type": "entity_value",
-                "left": {"category": "Personnes", "value": "P1"},
-                "right": {"category": "Couleurs", "value": "C1"},
-            },
-        ],
-    }
 
-    def test_visual_large_invariant(self) -> None:
-        """Garde-fou : 1 catégorie principale + 1 secondaire (cf. _total_search_space)."""
-        secondary = len(self._VISUAL_LARGE["entities"]) - 1
-        assert (
-            secondary == self._N_SECONDARY_CATEGORIES
-        ), f"_VISUAL_LARGE doit garder 1 catégorie secondaire, reçu {secondary}"
+class TestSearchSpaceTooLarge:
+    """Budget de nœuds dépassé : retour ``search_space_too_large`` (fail open)."""
 
-    def test_returns_without_computation(self) -> None:
-        result = analyze_deduction_uniqueness(self._VISUAL_LARGE, "P1:C1")
+    def test_node_budget_exceeded(self, monkeypatch) -> None:
+        monkeypatch.setattr(solver, "MAX_DEDUCTION_SOLVER_NODES", 1)
+        result = analyze_deduction_uniqueness(_VISUAL_9_ENTITIES, "P1:C1")
         assert result.checked is False
         assert result.reason == "search_space_too_large"
 
+    def test_default_budget_is_a_performance_contract(self) -> None:
+        # Ancrage explicite : si la constante bouge, les benchmarks ci-dessous sont à revoir.
+        assert MAX_DEDUCTION_SOLVER_NODES == 20_000
+
 
 class TestAmbiguousGrid:
     """Grille avec contraintes insuffisantes → plusieurs solutions possibles."""
@@ -173,6 +135,61 @@ class TestDuplicateValuesInCategory:
         assert result.reason == "unsupported_model"
 
 
+_ALL_KINDS = tuple(solver._COORDINATE_PREDICATES)
+
+
+def _brute_force_solution_count(visual: dict) -> int:
+    """Énumération exhaustive de référence (ancien algorithme), plafonnée à 2."""
+    model = _build_model(visual)
+    constraints, _source = _parse_constraints(visual, model)
+    count = 0
+    permutations = [
+        itertools.permutations(model.values_by_category[category])
+        for category in model.secondary_categories
+    ]
+    for combo in itertools.product(*permutations):
+        assignment = {entity: {} for entity in model.first_values}
+        for category, permutation in zip(model.secondary_categories, combo):
+            for entity, value in zip(model.first_values, permutation):
+                assignment[entity][category] = value
+        if all(_constraint_matches(assignment, model, c) for c in constraints):
+            count += 1
+            if count == 2:
+                break
+    return count
+
+
+class TestBruteForceEquivalence:
+    """Le solveur par propagation donne le même nombre de solutions (plafonné à 2)."""
+
+    @pytest.mark.parametrize("with_days", [True, False])
+    def test_random_small_grids_match_enumeration(self, with_days: bool) -> None:
+        rng = random.Random(20261017)
+        for _ in range(150):
+            size = rng.choice((3, 4))
+            entities = {
+                "Personnes": [f"P{i}" for i in range(size)],
+                "Couleurs": [f"C{i}" for i in range(size)],
+            }
+            if with_days:
+                entities["Jours"] = ["Lundi", "Mardi", "Mercredi", "Jeudi"][:size]
+            else:
+                entities["Animaux"] = [f"A{i}" for i in range(size)]
+            refs = [(cat, value) for cat, values in entities.items() for value in values]
+            visual = {
+                "type": "logic_grid",
+                "entities": entities,
+                "clues": [],
+                "constraints": [
+                    _constraint(rng.choice(_ALL_KINDS), rng.choice(refs), rng.choice(refs))
+                    for _ in range(rng.randint(1, 5))
+                ],
+            }
+            result = analyze_deduction_uniqueness(visual, "")
+            assert result.checked is True, result.reason
+            assert result.solution_count == _brute_force_solution_count(visual), visual
+
+
 @pytest.mark.slow
 class TestSolverBenchmark:
     """Benchmark : grille 4×4 bien formée résolue en < 500ms.
@@ -246,3 +263,136 @@ class TestSolverBenchmark:
         assert (
             elapsed_ms < 500
         ), f"Solveur 4×4 trop lent : {elapsed_ms:.1f}ms (seuil 500ms CI-safe)"
+
+
+@pytest.mark.slow
+class TestLargeGridBenchmark:
+    """Grilles hors de portée de l'énumération (6!³ ≈ 3,7·10⁸, 5!⁴ ≈ 2,1·10⁸)."""
+
+    _VISUAL_6X3_CONSTRAINTS = [
+        # Jours : chaîne « juste avant » ⇒ ordre complet.
+        *(
+            _constraint(
+                "entity_immediately_before_entity",
+                ("Personnes", left),
+                ("Personnes", right),
+            )
+            for left, right in (
+                ("Alice", "Bob"),
+                ("Bob", "Clara"),
+                ("Clara", "David"),
+                ("David", "Emma"),
+                ("Emma", "Félix"),
+            )
+        ),
+        # Couleurs
+        _constraint("same_row", ("Couleurs", "Rouge"), ("Jours", "Lundi")),
+        _constraint("entity_value", ("Personnes", "Bob"), ("Couleurs", "Bleu")),
+        _constraint("value_before_value", ("Couleurs", "Vert"), ("Couleurs", "Jaune")),
+        _constraint("entity_not_value", ("Personnes", "Clara"), ("Couleurs", "Jaune")),
+        _constraint("entity_value", ("Personnes", "Emma"), ("Couleurs", "Noir")),
+        _constraint("entity_not_value", ("Personnes", "Félix"), ("Couleurs", "Jaune")),
+        # Activités
+        _constraint("entity_value", ("Couleurs", "Rouge"), ("Activités", "Judo")),
+        _constraint("same_row", ("Activités", "Piano"), ("Jours", "Mardi")),
+        _constraint("entity_value", ("Couleurs", "Noir"), ("Activités", "Tennis")),
+        _constraint(
+            "value_before_value",
+            ("Activités", "Danse"),
+            ("Activités", "Échecs"),
+        ),
+        _constraint(
+            "entity_not_adjacent_value",
+            ("Personnes", "Emma"),
+            ("Activités", "Danse"),
+        ),
+        _constraint(
+            "entity_not_immediately_before_value",
+            ("Personnes", "Clara"),
+            ("Activités", "Tennis"),
+        ),
+        _constraint(
+            "entity_not_value", ("Personnes", "Félix"), ("Activités", "Échecs")
+        ),
+    ]
+    _VISUAL_6X3 = {
+        "type": "logic_grid",
+        "entities": {
+            "Personnes": ["Alice", "Bob", "Clara", "David", "Emma", "Félix"],
+            "Jours": ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi"],
+            "Couleurs": ["Rouge", "Bleu", "Vert", "Jaune", "Noir", "Blanc"],
+            "Activités": ["Judo", "Piano", "Danse", "Échecs", "Tennis", "Dessin"],
+        },
+        "clues": [],
+        "constraints": _VISUAL_6X3_CONSTRAINTS,
+    }
+    _ANSWER_6X3 = (
+        "Alice:Lundi:Rouge:Judo,Bob:Mardi:Bleu:Piano,Clara:Mercredi:Vert:Danse,"
+        "David:Jeudi:Jaune:Échecs,Emma:Vendredi:Noir:Tennis,Félix:Samedi:Blanc:Dessin"
+    )
+
+    @staticmethod
+    def _visual_5x4() -> dict:
+        """5 entités × 4 catégories sans jour ; chaque catégorie est reliée à la précédente."""
+        categories = ["Personnes", "Couleurs", "Animaux", "Villes", "Sports"]
+        entities = {cat: [f"{cat[:3]}{i}" for i in range(5)] for cat in categories}
+        constraints = []
+        for previous, category in zip(categories, categories[1:]):
+            for i in range(3):
+                constraints.append(
+                    _constraint(
+                        "entity_value",
+                        (previous, entities[previous][i]),
+                        (category, entities[category][i]),
+                    )
+                )
+            constraints.append(
+                _constraint(
+                    "entity_not_value",
+                    ("Personnes", entities["Personnes"][3]),
+                    (category, entities[category][4]),
+                )
+            )
+        return {
+            "type": "logic_grid",
+            "entities": entities,
+            "clues": [],
+            "constraints": constraints,
+        }
+
+    def test_6x3_unique_solution_in_milliseconds(self) -> None:
+        start = time.perf_counter()
+        result = analyze_deduction_uniqueness(self._VISUAL_6X3, self._ANSWER_6X3)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        assert result.checked is True, result.reason
+        assert result.solution_count == 1
+        assert result.expected_answer_matches is True
+        assert elapsed_ms < 100, f"Solveur 6×3 trop lent : {elapsed_ms:.1f}ms"
+
+    def test_6x3_missing_clue_is_ambiguous(self) -> None:
+        visual = dict(self._VISUAL_6X3)
+        visual["constraints"] = self._VISUAL_6X3_CONSTRAINTS[:-1]
+        result = analyze_deduction_uniqueness(visual, self._ANSWER_6X3)
+        assert result.checked is True
+        assert result.solution_count == 2
+
+    def test_6x3_wrong_answer_detected(self) -> None:
+        wrong = self._ANSWER_6X3.replace("Danse", "X").replace("Dessin", "Danse")
+        wrong = wrong.replace("X", "Dessin")
+        result = analyze_deduction_uniqueness(self._VISUAL_6X3, wrong)
+        assert result.solution_count == 1
+        assert result.expected_answer_matches is False
+
+    def test_5x4_unique_solution_in_milliseconds(self) -> None:
+        visual = self._visual_5x4()
+        answer = ",".join(
+            ":".join(values[i] for values in visual["entities"].values())
+            for i in range(5)
+        )
+        start = time.perf_counter()
+        result = analyze_deduction_uniqueness(visual, answer)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        assert result.checked is True, result.reason
+        assert result.solution_count == 1
+        assert result.expected_answer_matches is True
+        assert elapsed_ms < 100, f"Solveur 5×4 trop lent : {elapsed_ms:.1f}ms"
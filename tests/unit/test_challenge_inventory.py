@@ -0,0 +1,238 @@
+"""
+Tests — inventaire de défis IA pré-générés : réservation SKIP LOCKED, service SSE
+(hit / miss / prompt libre) et refill sous le seuil bas.
+"""
+
+import json
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from app.core.config import settings
+from app.core.db_boundary import sync_db_session
+from app.db.base import SessionLocal
+from app.models.challenge_inventory import ChallengeInventoryItem
+from app.models.logic_challenge import LogicChallenge
+from app.models.user import User, UserRole
+from app.schemas.logic_challenge import (
+    ChallengeStreamPersonalizationMeta,
+    GenerateChallengeStreamQuery,
+)
+from app.services.challenges.challenge_inventory import (
+    ChallengeInventoryBucket,
+    challenge_stock,
+    inventory_bucket_for,
+    serve_challenge_stream,
+    stock_challenge_persist,
+)
+from app.services.core.content_inventory import InventoryRefiller
+from app.utils.db_helpers import get_enum_value
+from tests.utils.test_helpers import unique_email, unique_username
+
+
+def _normalized(title="Suite mystère"):
+    return {
+        "challenge_type": "sequence",
+        "age_group": "9-11",
+        "title": title,
+        "description": "Trouve le terme manquant.",
+        "question": "2, 4, 8, ?",
+        "correct_answer": "16",
+        "solution_explanation": "Chaque terme double.",
+        "hints": ["Compare deux termes voisins."],
+        "visual_data": {"sequence": [2, 4, 8]},
+        "difficulty_rating": 2.5,
+        "difficulty_tier": 5,
+        "estimated_time_minutes": 10,
+        "tags": "ai,generated,mathélogique",
+        "choices": ["12", "16", "10"],
+        "response_mode": "single_choice",
+    }
+
+
+@pytest.fixture
+def bucket():
+    # Locale unique : seau isolé des autres tests.
+    bucket = ChallengeInventoryBucket(
+        "sequence", "9-11", 5, locale=uuid.uuid4().hex[:8]
+    )
+    yield bucket
+    db = SessionLocal()
+    try:
+        db.query(ChallengeInventoryItem).filter(
+            ChallengeInventoryItem.locale == bucket.locale
+        ).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def learner(db_session):
+    user = User(
+        username=unique_username(),
+        email=unique_email(),
+        hashed_password="test_hash",
+        role=get_enum_value(UserRole, UserRole.PADAWAN.value, db_session),
+    )
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+def _stock(bucket, count):
+    persist = stock_challenge_persist(bucket)
+    return [
+        persist(_normalized(f"Stock {i}"), None, "sequence", "o4-mini", None)[
+            "inventory_id"
+        ]
+        for i in range(count)
+    ]
+
+
+def _query(bucket, prompt="", user_id=None):
+    return GenerateChallengeStreamQuery(
+        challenge_type=bucket.challenge_type,
+        age_group=bucket.age_group,
+        prompt=prompt,
+        user_id=user_id,
+        locale=bucket.locale,
+        personalization=ChallengeStreamPersonalizationMeta(
+            resolved_target_tier=bucket.difficulty_tier
+        ),
+    )
+
+
+def test_bucket_ignores_requests_with_free_prompt(bucket):
+    assert inventory_bucket_for(_query(bucket)) == bucket
+    assert inventory_bucket_for(_query(bucket, prompt="des planètes")) is None
+
+
+def test_claim_serves_oldest_and_removes_it(bucket, learner, db_session):
+    first_id, second_id = _stock(bucket, 2)
+    other = ChallengeInventoryBucket("sequence", "9-11", 6, locale=bucket.locale)
+    _stock(other, 1)
+
+    served = challenge_stock.claim(db_session, bucket, learner.id)
+
+    challenge = db_session.get(LogicChallenge, served["id"])
+    assert challenge.creator_id == learner.id
+    assert challenge.generation_parameters["model"] == "o4-mini"
+    assert served["title"] == "Stock 0"
+    assert db_session.get(ChallengeInventoryItem, first_id) is None
+    assert challenge_stock.count_sync(bucket) == 1
+    assert challenge_stock.count_sync(other) == 1
+
+
+def test_concurrent_claims_skip_locked_rows(bucket, learner):
+    _stock(bucket, 1)
+    holder, contender = SessionLocal(), SessionLocal()
+    try:
+        locked_id = (
+            holder.query(ChallengeInventoryItem)
+            .filter(ChallengeInventoryItem.locale == bucket.locale)
+            .with_for_update()
+            .one()
+            .id
+        )
+        # Ligne verrouillée ailleurs : pas d'attente, seau vu comme vide.
+        assert challenge_stock.claim(contender, bucket, learner.id) is None
+        holder.rollback()
+        assert challenge_stock.claim(contender, bucket, learner.id) is not None
+        assert contender.get(ChallengeInventoryItem, locked_id) is None
+    finally:
+        holder.close()
+        contender.close()
+
+
+async def test_serve_hit_skips_generation(bucket, learner):
+    _stock(bucket, 1)
+
+    async def _no_generation(*_args, **_kwargs):
+        raise AssertionError("génération inattendue")
+        yield  # pragma: no cover
+
+    with (
+        patch.object(settings, "CHALLENGE_INVENTORY_ENABLED", True),
+        patch(
+            "app.services.challenges.challenge_ai_service.generate_challenge_stream",
+            _no_generation,
+        ),
+    ):
+        query = _query(bucket, user_id=learner.id)
+        events = [e async for e in serve_challenge_stream(query)]
+
+    payloads = [json.loads(e[6:]) for e in events]
+    assert [p["type"] for p in payloads] == ["challenge", "done"]
+    assert payloads[0]["challenge"]["title"] == "Stock 0"
+    assert challenge_stock.count_sync(bucket) == 0
+
+
+async def test_serve_miss_generates_and_signals_demand(bucket):
+    calls = []
+
+    async def _fake_generation(**kwargs):
+        calls.append(kwargs)
+        yield 'data: {"type": "done"}\n\n'
+
+    refiller = InventoryRefiller(challenge_stock, poll_seconds=60)
+    with (
+        patch.object(settings, "CHALLENGE_INVENTORY_ENABLED", True),
+        patch.object(challenge_stock, "_refiller", refiller),
+        patch(
+            "app.services.challenges.challenge_ai_service.generate_challenge_stream",
+            _fake_generation,
+        ),
+    ):
+        events = [e async for e in serve_challenge_stream(_query(bucket))]
+        [e async for e in serve_challenge_stream(_query(bucket, prompt="robots"))]
+
+    assert events == ['data: {"type": "done"}\n\n']
+    assert [c["prompt"] for c in calls] == ["", "robots"]
+    assert [b for b, _ in refiller.buckets()] == [bucket]
+
+
+async def test_refill_tops_up_below_low_watermark(bucket):
+    generated = []
+
+    async def _fake_generation(challenge_type, age_group, prompt, user_id, *_a, **kw):
+        generated.append(kw["personalization"].resolved_target_tier)
+        kw["persist"](_normalized(), user_id, challenge_type, "o4-mini", None)
+        yield 'data: {"type": "challenge", "challenge": {}}\n\n'
+
+    refiller = InventoryRefiller(challenge_stock, poll_seconds=60)
+    personalization = {"resolved_target_tier": 5}
+    with (
+        patch.object(settings, "CHALLENGE_INVENTORY_TARGET", 3),
+        patch.object(settings, "CHALLENGE_INVENTORY_LOW_WATERMARK", 1),
+        patch(
+            "app.services.challenges.challenge_ai_service.generate_challenge_stream",
+            _fake_generation,
+        ),
+    ):
+        assert await refiller.refill_bucket(bucket, personalization) == 3
+        # Au-dessus du seuil bas : pas de refill même sous la cible.
+        with sync_db_session() as db:
+            challenge_stock.claim(db, bucket, None)
+            challenge_stock.claim(db, bucket, None)
+        assert await refiller.refill_bucket(bucket, personalization) == 0
+        with sync_db_session() as db:
+            challenge_stock.claim(db, bucket, None)
+        assert await refiller.refill_bucket(bucket, personalization) == 3
+
+    assert generated == [5] * 6
+    assert challenge_stock.count_sync(bucket) == 3
+
+
+async def test_refill_stops_at_first_failed_generation(bucket):
+    async def _failing_generation(*_args, **_kwargs):
+        yield 'data: {"type": "error", "message": "x"}\n\n'
+
+    refiller = InventoryRefiller(challenge_stock, poll_seconds=60)
+    with patch(
+        "app.services.challenges.challenge_ai_service.generate_challenge_stream",
+        _failing_generation,
+    ):
+        assert await refiller.refill_bucket(bucket) == 0
+    assert challenge_stock.count_sync(bucket) == 0
@@ -68,7 +68,7 @@ def test_list_challenges_order_recent(db_session, sample_challenges):
 
 
 def test_list_challenges_order_random_with_total(db_session, sample_challenges):
-    """list_challenges avec order=random et total utilise random_offset."""
+    """list_challenges avec order=random et total : tirage par sample_key."""
     from app.services.challenges.challenge_service import list_challenges
 
     total = len(sample_challenges) + 5
@@ -84,7 +84,7 @@ def test_list_challenges_order_random_with_total(db_session, sample_challenges):
 
 
 def test_list_challenges_order_random_without_total(db_session, sample_challenges):
-    """list_challenges avec order=random sans total : count + random_offset (pas ORDER BY RANDOM)."""
+    """list_challenges avec order=random sans total : tirage par sample_key, sans count."""
     from app.services.challenges.challenge_service import list_challenges
 
     result = list_challenges(
@@ -229,42 +229,39 @@ def test_list_challenges_active_only_false_includes_inactive(db_session):
     assert inactive.id in {c.id for c in full}
 
 
-def test_execute_list_ordering_random_without_total_uses_id_order_not_func_random():
-    """total=None : random_offset sur order_by(id), jamais func.random() (évite scan O(n))."""
+def test_execute_list_ordering_random_uses_sample_key_without_count():
+    """order=random : keyset sur sample_key, ni count() ni OFFSET (coût indépendant du catalogue)."""
     from unittest.mock import MagicMock
 
-    from app.models.logic_challenge import LogicChallenge
     from app.services.challenges.challenge_service import _execute_list_with_ordering
 
     mock_query = MagicMock()
-    tail = MagicMock()
-    tail.all.return_value = ["c1", "c2"]
-    mock_query.order_by.return_value.offset.return_value.limit.return_value = tail
-    mock_query.count.return_value = 10
+    page = mock_query.filter.return_value.order_by.return_value.limit.return_value
+    page.all.return_value = ["c1", "c2"]
 
     out = _execute_list_with_ordering(
         mock_query, order="random", limit=2, offset=0, total=None
     )
     assert out == ["c1", "c2"]
-    mock_query.count.assert_called_once()
-    mock_query.order_by.assert_called_once_with(LogicChallenge.id)
+    mock_query.count.assert_not_called()
+    mock_query.filter.return_value.order_by.assert_called_once()
+    page.offset.assert_not_called()
 
 
-def test_execute_list_ordering_random_without_total_empty_count():
-    """total=None et count 0 : liste vide sans order_by."""
+def test_execute_list_ordering_random_offset_past_total_is_empty():
+    """total connu et offset au-delà : liste vide sans requête."""
     from unittest.mock import MagicMock
 
     from app.services.challenges.challenge_service import _execute_list_with_ordering
 
     mock_query = MagicMock()
-    mock_query.count.return_value = 0
 
     out = _execute_list_with_ordering(
-        mock_query, order="random", limit=5, offset=0, total=None
+        mock_query, order="random", limit=5, offset=5, total=5
     )
     assert out == []
-    mock_query.count.assert_called_once()
-    mock_query.order_by.assert_not_called()
+    mock_query.filter.assert_not_called()
+    mock_query.count.assert_not_called()
 
 
 # --- E3b : create_challenge decomposition ---
@@ -60,30 +60,32 @@ def test_aggregate_decision_metrics_live_shape():
 
 
 def _fake_live_harness(
-    cases: list, *, corpus_path=None, report_target: str = ""
+    cases: list, *, corpus_path=None, report_target: str = "", **_kwargs
 ) -> HarnessReport:
-    c = cases[0]
-    res = CaseResult(
-        case_id=c["id"],
-        pipeline=str(c.get("pipeline", "")),
-        success=True,
-        latency_ms=7.0,
-        structural_ok=True,
-        business_ok=True,
-        eval_model=c.get("eval_model"),
-        expected_success=True,
-    )
+    results = [
+        CaseResult(
+            case_id=c["id"],
+            pipeline=str(c.get("pipeline", "")),
+            success=True,
+            latency_ms=7.0,
+            structural_ok=True,
+            business_ok=True,
+            eval_model=c.get("eval_model"),
+            expected_success=True,
+        )
+        for c in cases
+    ]
     return HarnessReport(
         mode="live",
         target=report_target,
         corpus_path=str(corpus_path or default_corpus_path()),
         corpus_version=1,
-        cases_total=1,
-        cases_run=1,
-        cases_passed=1,
+        cases_total=len(results),
+        cases_run=len(results),
+        cases_passed=len(results),
         cases_failed=0,
         cases_skipped=0,
-        results=[res.to_dict()],
+        results=[r.to_dict() for r in results],
         summary_markdown="",
         token_tracker_snapshot={"mock": True},
         limitations_note="test",
@@ -94,17 +96,27 @@ def test_run_ia11b_bounded_with_mocked_live(tmp_path: Path):
     with patch(
         "app.evaluation.comparative_campaign.run_live_harness_for_explicit_cases",
         side_effect=_fake_live_harness,
-    ):
+    ) as live:
         payload, jpath, mpath, md = run_ia11b_bounded_live_campaign(
             ia11b_campaign_id="ia11b_live_bounded",
             corpus_path=None,
             output_dir=tmp_path,
+            concurrency=4,
         )
+    # Un seul run live groupé pour les 4 variantes, borné par --concurrency.
+    assert live.call_count == 1
+    assert len(live.call_args.args[0]) == 4
+    assert live.call_args.kwargs["concurrency"] == 4
     assert payload["live_executed"] is True
     assert payload["ia11a_base_campaign_id"] == "ia11a_offline_default"
     assert jpath.is_file() and mpath.is_file()
     ex_seg = next(s for s in payload["segments"] if s["workload_key"] == "exercises_ai")
     assert len(ex_seg["live_executed_variants"]) == 2
+    for variant in ex_seg["live_executed_variants"]:
+        results = variant["harness_report"]["results"]
+        assert [r["case_id"] for r in results] == [
+            f"{variant['source_case_id']}__{variant['variant_id']}"
+        ]
     assert "Recommandation IA11b" in md
     rec = build_ia11b_recommendation_markdown(payload["segments"])
     assert "faible" in rec.lower()
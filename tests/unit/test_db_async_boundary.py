@@ -0,0 +1,96 @@
+"""
+Boundary lecture run_db_read (opt-in DB_ASYNC_ENABLED) : mêmes résultats en mode
+sync (run_db_bound + sync_db_session) et async (AsyncSession/asyncpg + run_sync).
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.core.config import settings
+from app.core.db_boundary import async_db_session, async_reads_enabled, run_db_read
+from app.core.leaderboard_period import LeaderboardPeriod
+from app.db import async_base
+from app.db.async_base import dispose_async_engine, to_asyncpg_url
+from app.schemas.exercise import ExerciseListQuery
+from app.services.exercises.exercise_query_service import query_exercises_list_for_api
+from app.services.users.user_application_service import query_leaderboard
+
+
+def test_to_asyncpg_url_rewrites_scheme():
+    url, connect_args = to_asyncpg_url("postgresql://u:p@h:5432/db")
+    assert url == "postgresql+asyncpg://u:p@h:5432/db"
+    assert connect_args == {}
+
+
+def test_to_asyncpg_url_moves_sslmode_to_connect_args():
+    url, connect_args = to_asyncpg_url("postgres://u:p@h/db?sslmode=require&x=1")
+    assert url == "postgresql+asyncpg://u:p@h/db?x=1"
+    assert connect_args == {"ssl": "require"}
+
+
+def test_to_asyncpg_url_rejects_non_postgres():
+    with pytest.raises(ValueError):
+        to_asyncpg_url("sqlite:///tmp.db")
+
+
+def test_async_reads_disabled_by_default():
+    assert settings.DB_ASYNC_ENABLED is False
+    assert async_reads_enabled() is False
+
+
+@pytest.mark.asyncio
+async def test_async_db_session_requires_opt_in():
+    with pytest.raises(RuntimeError):
+        async with async_db_session():
+            pass
+
+
+@pytest.mark.asyncio
+async def test_run_db_read_sync_path_passes_session_first():
+    captured = {}
+
+    def read(db, value, *, flag):
+        captured["db"] = db
+        return value, flag
+
+    assert await run_db_read(read, 3, flag=True) == (3, True)
+    assert captured["db"] is not None
+
+
+@pytest.mark.asyncio
+async def test_run_db_read_falls_back_when_asyncpg_missing():
+    with (
+        patch.object(settings, "DB_ASYNC_ENABLED", True),
+        patch.dict("sys.modules", {"asyncpg": None}),
+        patch.object(async_base, "_async_unavailable", False),
+    ):
+        assert await run_db_read(lambda db: "sync") == "sync"
+        assert async_base._async_unavailable is True
+    async_base._async_unavailable = False
+
+
+@pytest.mark.asyncio
+async def test_async_mode_matches_sync_mode_on_hot_reads():
+    pytest.importorskip("asyncpg")
+    query = ExerciseListQuery(limit=5, skip=0, order="recent")
+
+    sync_exercises = await run_db_read(query_exercises_list_for_api, query, None)
+    sync_board = await run_db_read(
+        query_leaderboard, 0, limit=10, period=LeaderboardPeriod.ALL
+    )
+
+    with patch.object(settings, "DB_ASYNC_ENABLED", True):
+        try:
+            assert async_reads_enabled() is True
+            async_exercises = await run_db_read(
+                query_exercises_list_for_api, query, None
+            )
+            async_board = await run_db_read(
+                query_leaderboard, 0, limit=10, period=LeaderboardPeriod.ALL
+            )
+        finally:
+            await dispose_async_engine()
+
+    assert async_exercises.model_dump() == sync_exercises.model_dump()
+    assert async_board == sync_board
@@ -0,0 +1,118 @@
+"""Tests pour l'executor DB dédié de run_db_bound (app.core.runtime)."""
+
+import asyncio
+import threading
+from unittest.mock import patch
+
+import pytest
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core import runtime
+from app.core.runtime import DbExecutor, get_db_executor, run_db_bound
+from app.exceptions import DbExecutorOverloadedError
+from app.utils.error_handler import ErrorHandler
+from server.middleware import EdgeMiddleware
+
+
+@pytest.fixture
+def blocked_executor():
+    """Executor 1 worker / file de 1, le worker bloqué jusqu'à release.set()."""
+    executor = DbExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def _block():
+        started.set()
+        release.wait(5)
+        return "done"
+
+    yield executor, release, started, _block
+    release.set()
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_db_bound_uses_dedicated_threads():
+    name = await run_db_bound(lambda: threading.current_thread().name)
+    assert name.startswith("mathakine-db")
+
+
+def test_default_size_follows_sqlalchemy_pool():
+    from app.db.base import engine
+
+    expected = engine.pool.size() + engine.pool._max_overflow
+    assert get_db_executor().max_workers == expected
+
+
+@pytest.mark.asyncio
+async def test_counters_and_overload(blocked_executor):
+    executor, release, started, block = blocked_executor
+
+    running = asyncio.ensure_future(executor.run(block))
+    await asyncio.to_thread(started.wait, 5)
+    assert executor.running == 1
+
+    queued = asyncio.ensure_future(executor.run(lambda: "queued"))
+    await asyncio.sleep(0)
+    assert executor.queued == 1
+    assert executor.is_saturated()
+
+    with pytest.raises(DbExecutorOverloadedError):
+        await executor.run(lambda: "rejected")
+
+    release.set()
+    assert await running == "done"
+    assert await queued == "queued"
+    assert (executor.queued, executor.running) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_queued_call_frees_its_slot(blocked_executor):
+    executor, release, started, block = blocked_executor
+
+    running = asyncio.ensure_future(executor.run(block))
+    await asyncio.to_thread(started.wait, 5)
+    queued = asyncio.ensure_future(executor.run(lambda: "never"))
+    await asyncio.sleep(0)
+    queued.cancel()
+    await asyncio.sleep(0)
+    assert executor.queued == 0
+
+    release.set()
+    await running
+
+
+@pytest.mark.asyncio
+async def test_contextvars_are_propagated():
+    import contextvars
+
+    var = contextvars.ContextVar("db_executor_test", default=None)
+    var.set("request-42")
+    assert await run_db_bound(var.get) == "request-42"
+
+
+def test_error_handler_maps_overload_to_503():
+    response = ErrorHandler.create_error_response(DbExecutorOverloadedError())
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_edge_middleware_sheds_api_requests_when_saturated():
+    async def ok(request):
+        return JSONResponse({"ok": True})
+
+    app = Starlette(
+        routes=[Route("/api/ping", ok), Route("/health", ok)],
+        middleware=[Middleware(EdgeMiddleware)],
+    )
+    client = TestClient(app)
+    with patch.object(runtime, "_db_executor") as executor:
+        executor.is_saturated.return_value = True
+        shed = client.get("/api/ping")
+        assert shed.status_code == 503
+        assert shed.json()["code"] == "SERVICE_UNAVAILABLE"
+        assert client.get("/health").status_code == 200
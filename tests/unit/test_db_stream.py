@@ -0,0 +1,133 @@
+"""Flux DB (run_db_stream, iter_result_chunks) et encodage des exports streamés."""
+
+import asyncio
+import csv
+import gzip
+import io
+import threading
+
+import pytest
+from sqlalchemy import text
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.db_boundary import iter_result_chunks, run_db_stream
+from app.utils.stream_encoding import CSV_BOM, accepts_gzip, csv_stream, gzip_stream
+
+
+async def _collect(stream):
+    return [item async for item in stream]
+
+
+def _request(accept_encoding: str) -> Request:
+    headers = [(b"accept-encoding", accept_encoding.encode())]
+    return Request({"type": "http", "headers": headers})
+
+
+@pytest.mark.asyncio
+async def test_run_db_stream_yields_chunks_from_db_thread():
+    def _chunks(db, count, *, size):
+        for start in range(0, count, size):
+            name = threading.current_thread().name
+            yield [(name, db.execute(text("SELECT :v"), {"v": start}).scalar())]
+
+    chunks = await _collect(run_db_stream(_chunks, 5, size=2))
+
+    assert [value for [(_, value)] in chunks] == [0, 2, 4]
+    assert all(name.startswith("mathakine-db") for [(name, _)] in chunks)
+
+
+@pytest.mark.asyncio
+async def test_run_db_stream_applies_backpressure(monkeypatch):
+    monkeypatch.setattr(settings, "DB_STREAM_QUEUE_CHUNKS", 2)
+    produced = []
+    finished = threading.Event()
+
+    def _chunks(db):
+        try:
+            for index in range(100):
+                produced.append(index)
+                yield index
+        finally:
+            finished.set()
+
+    stream = run_db_stream(_chunks)
+    assert await stream.__anext__() == 0
+    await asyncio.sleep(0.2)
+
+    # File pleine : le thread DB attend, au plus un paquet en cours en plus.
+    assert len(produced) <= 2 + 2
+    await stream.aclose()
+    assert await asyncio.to_thread(finished.wait, 5)
+    assert len(produced) < 100
+
+
+@pytest.mark.asyncio
+async def test_run_db_stream_reraises_producer_errors():
+    def _chunks(db):
+        yield 1
+        raise ValueError("boom")
+
+    stream = run_db_stream(_chunks)
+    assert await stream.__anext__() == 1
+    with pytest.raises(ValueError, match="boom"):
+        await stream.__anext__()
+
+
+def test_iter_result_chunks_uses_requested_size(db_session):
+    stmt = text("SELECT generate_series(1, 10)")
+    chunks = list(iter_result_chunks(db_session, stmt, 4))
+
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    assert [row[0] for chunk in chunks for row in chunk] == list(range(1, 11))
+
+
+@pytest.mark.asyncio
+async def test_csv_stream_gzip_roundtrip():
+    async def _rows():
+        yield [[1, "a,b"], [2, "é"]]
+        yield [[3, ""]]
+
+    body = b"".join(await _collect(gzip_stream(csv_stream(["id", "label"], _rows()))))
+    content = gzip.decompress(body).decode("utf-8")
+
+    assert content.startswith(CSV_BOM)
+    assert list(csv.reader(io.StringIO(content[1:]))) == [
+        ["id", "label"],
+        ["1", "a,b"],
+        ["2", "é"],
+        ["3", ""],
+    ]
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip, deflate, br", True),
+        ("br;q=1.0, gzip;q=0.8", True),
+        ("*", True),
+        ("gzip;q=0", False),
+        ("identity", False),
+        ("", False),
+    ],
+)
+def test_accepts_gzip(accept_encoding, expected):
+    assert accepts_gzip(_request(accept_encoding)) is expected
+
+
+def test_accepts_gzip_respects_setting(monkeypatch):
+    monkeypatch.setattr(settings, "ENABLE_GZIP", False)
+    assert accepts_gzip(_request("gzip")) is False
+
+
+
+def test_iter_result_chunks_uses_server_side_cursor(db_session):
+    stmt = text("SELECT generate_series(1, 10)")
+    open_cursors = []
+    for _ in iter_result_chunks(db_session, stmt, 4):
+        open_cursors.append(
+            db_session.execute(text("SELECT count(*) FROM pg_cursors")).scalar()
+        )
+
+    assert open_cursors and all(count >= 1 for count in open_cursors)
+    assert db_session.execute(text("SELECT count(*) FROM pg_cursors")).scalar() == 0
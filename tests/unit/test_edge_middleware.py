@@ -0,0 +1,175 @@
+"""
+Parité EdgeMiddleware (ASGI pur fusionné) ↔ chaîne historique BaseHTTPMiddleware.
+
+Même app Starlette, mêmes requêtes : statut, headers sécurité/CORS et payload auth
+doivent être identiques entre les deux chaînes.
+"""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.core.security import create_access_token
+from app.utils import settings_reader
+from app.utils.csrf import validate_csrf_token as _real_validate_csrf_token
+from server.middleware import (
+    PERMISSIONS_POLICY_VALUE,
+    SECURE_HEADERS_DICT,
+    EdgeMiddleware,
+    get_legacy_edge_middleware,
+)
+
+ORIGIN = "http://allowed.test"
+CORS_OPTIONS = {
+    "allow_origins": [ORIGIN],
+    "allow_methods": ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+    "allow_headers": ["Content-Type", "Authorization", "X-CSRF-Token"],
+    "allow_credentials": True,
+}
+
+
+async def _whoami(request):
+    payload = getattr(request.state, "auth_payload", None) or {}
+    return JSONResponse({"sub": payload.get("sub")})
+
+
+def _app(middleware):
+    return Starlette(
+        routes=[
+            Route("/api/whoami", _whoami, methods=["GET", "POST"]),
+            Route("/health", _whoami),
+        ],
+        middleware=middleware,
+    )
+
+
+def _chains():
+    with patch("server.middleware.get_cors_options", return_value=CORS_OPTIONS):
+        legacy = get_legacy_edge_middleware()
+    edge = [Middleware(EdgeMiddleware, cors_options=CORS_OPTIONS)]
+    return {"legacy": _app(legacy), "edge": _app(edge)}
+
+
+@pytest.fixture(autouse=True)
+def _real_csrf_and_snapshot():
+    """Vraie validation CSRF (conftest la mocke) + snapshot settings piloté."""
+    state = {"maintenance_mode": "false"}
+    settings_reader.invalidate_settings_snapshot(broadcast=False)
+    with (
+        patch("app.utils.csrf.validate_csrf_token", _real_validate_csrf_token),
+        patch.object(settings_reader, "_load_snapshot", side_effect=lambda: state),
+    ):
+        yield state
+    settings_reader.invalidate_settings_snapshot(broadcast=False)
+
+
+async def _request(app, method, path, headers=None):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+        return await c.request(method, path, headers=headers or {})
+
+
+def _token():
+    return create_access_token({"sub": "edge_user"})
+
+
+SCENARIOS = {
+    "public_health": ("GET", "/health", {}),
+    "api_without_token": ("GET", "/api/whoami", {"Origin": ORIGIN}),
+    "api_invalid_token": ("GET", "/api/whoami", {"Authorization": "Bearer nope"}),
+    "api_valid_token": ("GET", "/api/whoami", None),
+    "post_without_csrf": ("POST", "/api/whoami", None),
+    "post_with_csrf": ("POST", "/api/whoami", {"X-CSRF-Token": "tok"}),
+    "cors_preflight": (
+        "OPTIONS",
+        "/api/whoami",
+        {"Origin": ORIGIN, "Access-Control-Request-Method": "POST"},
+    ),
+}
+
+
+def _headers_for(name, extra):
+    if extra is not None and name not in ("post_with_csrf",):
+        return extra
+    headers = {"Authorization": f"Bearer {_token()}", "Origin": ORIGIN}
+    if name == "post_with_csrf":
+        headers.update({"Cookie": "csrf_token=tok", **extra})
+    return headers
+
+
+def _snapshot_response(resp):
+    keys = [
+        *SECURE_HEADERS_DICT.keys(),
+        "permissions-policy",
+        "access-control-allow-origin",
+        "access-control-allow-credentials",
+    ]
+    return resp.status_code, {k.lower(): resp.headers.get(k) for k in keys}, resp.text
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", list(SCENARIOS))
+async def test_edge_matches_legacy_chain(name):
+    method, path, extra = SCENARIOS[name]
+    headers = _headers_for(name, extra)
+    apps = _chains()
+    legacy = await _request(apps["legacy"], method, path, headers)
+    edge = await _request(apps["edge"], method, path, headers)
+    assert _snapshot_response(edge) == _snapshot_response(legacy)
+
+
+@pytest.mark.asyncio
+async def test_edge_status_codes_and_payload():
+    app = _chains()["edge"]
+    assert (await _request(app, "GET", "/api/whoami")).status_code == 401
+    resp = await _request(
+        app, "GET", "/api/whoami", {"Authorization": f"Bearer {_token()}"}
+    )
+    assert resp.status_code == 200
+    assert resp.json() == {"sub": "edge_user"}
+    assert resp.headers["Permissions-Policy"] == PERMISSIONS_POLICY_VALUE
+    resp = await _request(
+        app, "POST", "/api/whoami", {"Authorization": f"Bearer {_token()}"}
+    )
+    assert resp.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_edge_maintenance_blocks_api_but_not_health(_real_csrf_and_snapshot):
+    _real_csrf_and_snapshot["maintenance_mode"] = "true"
+    apps = _chains()
+    for app in apps.values():
+        resp = await _request(
+            app, "GET", "/api/whoami", {"Authorization": f"Bearer {_token()}"}
+        )
+        assert resp.status_code == 503
+        assert resp.headers["X-Frame-Options"] == "DENY"
+        assert (await _request(app, "GET", "/health")).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_edge_maintenance_check_failure_is_fail_open():
+    settings_reader.invalidate_settings_snapshot(broadcast=False)
+    app = _chains()["edge"]
+    with patch.object(
+        settings_reader, "_load_snapshot", side_effect=RuntimeError("db down")
+    ):
+        resp = await _request(app, "GET", "/health")
+    assert resp.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_edge_passes_through_non_http_scopes():
+    seen = []
+
+    async def inner(scope, receive, send):
+        seen.append(scope["type"])
+
+    mw = EdgeMiddleware(inner, cors_options=CORS_OPTIONS)
+    await mw({"type": "lifespan"}, None, None)
+    assert seen == ["lifespan"]
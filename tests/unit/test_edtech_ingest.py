@@ -0,0 +1,146 @@
+"""
+Tests — tampon d'ingestion EdTech (app.services.analytics.edtech_ingest) : écriture
+par lots, refus comptés quand le tampon est plein, vidage périodique par le thread,
+lignes rejetées par la base isolées sans perdre le lot.
+"""
+
+import time
+import uuid
+
+import pytest
+
+from app.db.base import SessionLocal
+from app.models.edtech_event import EdTechEvent
+from app.services.analytics.analytics_service import normalize_edtech_event
+from app.services.analytics.edtech_ingest import EdTechEventBuffer, write_edtech_events
+
+
+@pytest.fixture
+def marker(db_session):
+    """Marqueur des événements du test (payload.run), supprimés en fin de test."""
+    run = uuid.uuid4().hex
+    try:
+        yield run
+    finally:
+        db_session.rollback()
+        db_session.query(EdTechEvent).filter(
+            EdTechEvent.payload["run"].astext == run
+        ).delete(synchronize_session=False)
+        db_session.commit()
+
+
+def _rows(run, count):
+    return [
+        {"user_id": None, "event": "first_attempt", "payload": {"run": run, "n": n}}
+        for n in range(count)
+    ]
+
+
+def _stored(db, run):
+    db.expire_all()
+    return (
+        db.query(EdTechEvent).filter(EdTechEvent.payload["run"].astext == run).all()
+    )
+
+
+class _CountingSessions:
+    def __init__(self):
+        self.opened = 0
+
+    def __call__(self):
+        self.opened += 1
+        return SessionLocal()
+
+
+def test_flush_writes_in_batches(db_session, marker):
+    sessions = _CountingSessions()
+    buffer = EdTechEventBuffer(100, 4, 60_000, session_factory=sessions)
+    buffer._stop.set()  # pas de thread : vidage explicite
+
+    assert buffer.offer(_rows(marker, 10)) == 10
+    assert buffer.flush() == 10
+
+    # Lots de 4, 4 puis 2 : une transaction par lot.
+    assert sessions.opened == 3
+    stored = _stored(db_session, marker)
+    assert sorted(e.payload["n"] for e in stored) == list(range(10))
+    assert all(e.created_at is not None for e in stored)
+    assert len(buffer) == 0
+
+
+def test_copy_escapes_payload(db_session, marker):
+    payload = {"run": marker, "note": "tab\there\nnl \\ back \\N été", "n": None}
+    write_edtech_events(db_session, [{"event": "first_attempt", "payload": payload}])
+    db_session.commit()
+
+    (stored,) = _stored(db_session, marker)
+    assert stored.payload == payload
+    assert stored.user_id is None
+
+
+def test_rejected_rows_do_not_lose_the_batch(db_session, marker, monkeypatch):
+    from app.services.analytics import edtech_ingest
+
+    recorded = []
+    monkeypatch.setattr(
+        edtech_ingest,
+        "record_edtech_ingest",
+        lambda result, count=1: recorded.append((result, count)),
+    )
+    rows = _rows(marker, 8)
+    rows[2]["payload"]["note"] = "nul \x00"  # refusé par jsonb
+    rows[5]["user_id"] = -1  # clé étrangère inconnue
+    sessions = _CountingSessions()
+    buffer = EdTechEventBuffer(100, 8, 60_000, session_factory=sessions)
+    buffer._stop.set()
+
+    buffer.offer(rows)
+    assert buffer.flush() == 6
+
+    stored = _stored(db_session, marker)
+    assert sorted(e.payload["n"] for e in stored) == [0, 1, 3, 4, 6, 7]
+    assert recorded.count(("failed", 1)) == 2
+    assert ("flushed", 6) in recorded
+
+
+def test_normalize_strips_nul_characters():
+    _, payload = normalize_edtech_event(
+        "first_attempt", {"a\x00": ["x\x00y", {"k": "\x00"}], "n": 1}
+    )
+    assert payload == {"a": ["xy", {"k": ""}], "n": 1}
+
+
+def test_full_buffer_drops_overflow(db_session, marker, monkeypatch):
+    from app.services.analytics import edtech_ingest
+
+    recorded = []
+    monkeypatch.setattr(
+        edtech_ingest,
+        "record_edtech_ingest",
+        lambda result, count=1: recorded.append((result, count)),
+    )
+    buffer = EdTechEventBuffer(5, 100, 60_000)
+    buffer._stop.set()
+
+    assert buffer.offer(_rows(marker, 3)) == 3
+    assert buffer.offer(_rows(marker, 4)) == 2
+    assert buffer.offer(_rows(marker, 1)) == 0
+    assert ("dropped", 2) in recorded and ("dropped", 1) in recorded
+
+    assert buffer.shutdown() == 5
+    assert len(_stored(db_session, marker)) == 5
+
+
+def test_thread_flushes_after_interval(db_session, marker):
+    buffer = EdTechEventBuffer(100, 1000, 50)
+    try:
+        buffer.offer(_rows(marker, 3))
+        deadline = time.monotonic() + 5
+        while len(buffer) and time.monotonic() < deadline:
+            time.sleep(0.02)
+        # Le lot est retiré du tampon avant d'être écrit : attendre la fin du flush.
+        with buffer._flush_lock:
+            pass
+        assert len(_stored(db_session, marker)) == 3
+    finally:
+        buffer.shutdown()
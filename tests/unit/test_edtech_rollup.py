@@ -0,0 +1,163 @@
+"""
+Tests — agrégats EdTech en SQL (app.services.analytics.edtech_rollup) : même résultat
+avec rollups quotidiens ou GROUP BY direct, sémantique de l'agrégation historique.
+
+Les événements sont datés dans une fenêtre passée fixe (``_NOW``) : aucune autre
+donnée de test ne s'y trouve.
+"""
+
+import uuid
+from datetime import date, datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event
+
+from app.models.edtech_daily_rollup import (
+    EdTechDailyRollup,
+    EdTechDailyUser,
+    EdTechRollupDay,
+)
+from app.models.edtech_event import EdTechEvent
+from app.models.user import User, UserRole
+from app.services.analytics.analytics_service import AnalyticsService
+from app.services.analytics.edtech_rollup import edtech_aggregates, roll_up_closed_days
+from app.utils.db_helpers import get_enum_value
+
+_NOW = datetime(2025, 1, 10, 12, 0, tzinfo=timezone.utc)
+_SINCE = datetime(2025, 1, 3, 12, 0, tzinfo=timezone.utc)
+_TTFA = "timeToFirstAttemptMs"
+
+
+def _at(day, hour):
+    return datetime(2025, 1, day, hour, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def edtech_window(db_session):
+    users = []
+    for _ in range(3):
+        uid = uuid.uuid4().hex[:8]
+        user = User(
+            username=f"edtech_{uid}",
+            email=f"edtech_{uid}@example.com",
+            hashed_password="x",
+            role=get_enum_value(UserRole, UserRole.PADAWAN),
+        )
+        db_session.add(user)
+        users.append(user)
+    db_session.flush()
+    a, b, c = (user.id for user in users)
+    rows = [
+        (_at(3, 9), "quick_start_click", a, {"type": "exercise", "guided": True}),
+        (_at(3, 15), "quick_start_click", a, {"type": "exercise", "guided": True}),
+        (_at(5, 8), "quick_start_click", b, {"type": "challenge", "guided": False}),
+        (_at(5, 9), "quick_start_click", a, {"type": "Exercise", "guided": "yes"}),
+        (_at(6, 10), "first_attempt", a, {"type": "exercise", _TTFA: 4000}),
+        (_at(7, 10), "first_attempt", b, {"type": "challenge", _TTFA: -25000}),
+        (_at(8, 10), "first_attempt", None, {"type": "other", _TTFA: "6000"}),
+        (_at(10, 10), "first_attempt", c, {_TTFA: "abc"}),
+        (_at(10, 11), "quick_start_click", None, {"type": "interleaved", "guided": 0}),
+    ]
+    events = [
+        EdTechEvent(created_at=at, event=event, user_id=user_id, payload=payload)
+        for at, event, user_id, payload in rows
+    ]
+    db_session.add_all(events)
+    db_session.commit()
+    try:
+        yield db_session
+    finally:
+        db_session.rollback()
+        for model in (EdTechDailyRollup, EdTechDailyUser, EdTechRollupDay):
+            db_session.query(model).filter(
+                model.day.between(date(2025, 1, 1), date(2025, 1, 31))
+            ).delete(synchronize_session=False)
+        for event in events:
+            db_session.delete(event)
+        for user in users:
+            db_session.delete(user)
+        db_session.commit()
+
+
+@pytest.mark.parametrize("use_rollup", [True, False])
+def test_aggregates_match_legacy_semantics(edtech_window, use_rollup):
+    result = edtech_aggregates(
+        edtech_window, since=_SINCE, use_rollup=use_rollup, now=_NOW
+    )
+
+    assert result["aggregates"] == {
+        "quick_start_click": {"count": 4, "avg_time_to_first_attempt_ms": None},
+        "first_attempt": {
+            "count": 4,
+            # -25000 (négatif) et "abc" (non numérique) exclus.
+            "avg_time_to_first_attempt_ms": 5000,
+            "by_type": {"exercise": 1, "challenge": 1, "interleaved": 0},
+        },
+    }
+    assert result["ctr_summary"] == {
+        "total_clicks": 4,
+        "guided_clicks": 2,
+        "guided_rate_pct": 50.0,
+        "by_type": {"exercise": 2, "challenge": 1, "interleaved": 1},
+    }
+    assert result["unique_users"] == 3
+
+
+def test_event_filter_and_unique_users(edtech_window):
+    clicks = edtech_aggregates(
+        edtech_window, since=_SINCE, event_filter="quick_start_click", now=_NOW
+    )
+
+    assert list(clicks["aggregates"]) == ["quick_start_click"]
+    assert clicks["unique_users"] == 2
+
+
+def test_closed_days_rolled_up_once(edtech_window):
+    edtech_aggregates(edtech_window, since=_SINCE, now=_NOW)
+
+    # Jours pleins du 4 au 9 (le 10 est le jour courant, le 3 un bord).
+    days = (
+        edtech_window.query(EdTechRollupDay.day)
+        .filter(EdTechRollupDay.day < date(2025, 2, 1))
+        .order_by(EdTechRollupDay.day)
+    )
+    assert [row.day.day for row in days] == [4, 5, 6, 7, 8, 9]
+    assert roll_up_closed_days(edtech_window, date(2025, 1, 4), date(2025, 1, 9)) == 0
+    clicks = edtech_window.query(EdTechDailyRollup).filter_by(
+        day=date(2025, 1, 5), event="quick_start_click"
+    )
+    assert {(row.target_type, row.guided, row.events) for row in clicks} == {
+        ("challenge", False, 1),
+        ("exercise", True, 1),
+    }
+
+
+def test_admin_view_lists_events_after_the_aggregates_commit(edtech_window):
+    empty = {"aggregates": {}, "ctr_summary": {}, "unique_users": 0}
+
+    def _committing_aggregates(db, **_kwargs):
+        db.commit()  # rattrapage des rollups
+        return empty
+
+    statements = []
+    engine = edtech_window.get_bind()
+
+    def listener(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    with patch(
+        "app.services.analytics.analytics_service.edtech_aggregates",
+        _committing_aggregates,
+    ):
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            result = AnalyticsService.get_edtech_analytics_for_admin(
+                edtech_window, since=_SINCE
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+    assert len(result["events"]) >= 9
+    # Une seule lecture de la liste : aucun rechargement ligne à ligne.
+    assert len([sql for sql in statements if "edtech_events" in sql]) == 1
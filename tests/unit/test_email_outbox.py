@@ -0,0 +1,206 @@
+"""
+Tests — outbox email (email_outbox) : mise en file, envoi par lots sur une
+connexion SMTP réutilisée, retries avec backoff.
+
+Le serveur SMTP local est un stand-in minimal (EHLO / AUTH / MAIL / RCPT / DATA)
+tournant dans un thread : il compte connexions et messages reçus.
+"""
+
+import socketserver
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from app.core.config import settings
+from app.models.email_outbox import (
+    EMAIL_FAILED,
+    EMAIL_PENDING,
+    EMAIL_SENT,
+    EmailOutbox,
+)
+from app.services.communication.email_outbox import (
+    enqueue_email,
+    retry_delay_seconds,
+    send_pending_emails,
+)
+from app.services.communication.email_service import (
+    EmailService,
+    EmailTransport,
+    SmtpSession,
+)
+
+
+class _SmtpHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self._reply("220 localhost stand-in")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            verb = line.decode().strip().split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self._reply("250-localhost")
+                self._reply("250 AUTH PLAIN")
+            elif verb == "AUTH":
+                self._reply("235 ok")
+            elif verb == "DATA":
+                self._reply("354 go")
+                data = []
+                while True:
+                    chunk = self.rfile.readline()
+                    if chunk in (b".\r\n", b""):
+                        break
+                    data.append(chunk)
+                with server.lock:
+                    server.messages.append(b"".join(data))
+                self._reply("250 queued")
+            elif verb == "QUIT":
+                self._reply("221 bye")
+                return
+            else:
+                self._reply("250 ok")
+
+
+class _SmtpStandIn(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SmtpHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = []
+
+
+@pytest.fixture
+def smtp_server(monkeypatch):
+    server = _SmtpStandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("SMTP_HOST", "127.0.0.1")
+    monkeypatch.setenv("SMTP_PORT", str(server.server_address[1]))
+    monkeypatch.setenv("SMTP_USER", "mathakine")
+    monkeypatch.setenv("SMTP_PASSWORD", "secret")
+    monkeypatch.setenv("SMTP_USE_TLS", "false")
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def outbox(db_session):
+    db_session.query(EmailOutbox).delete()
+    db_session.commit()
+    try:
+        yield db_session
+    finally:
+        db_session.rollback()
+        db_session.query(EmailOutbox).delete()
+        db_session.commit()
+
+
+def _enqueue(count):
+    for index in range(count):
+        assert enqueue_email(
+            kind="verification",
+            to_email=f"eleve{index}@outbox.test",
+            subject="Bienvenue",
+            html_content=f"<p>lien {index}</p>",
+            text_content=f"lien {index}",
+        )
+
+
+def test_smtp_session_reuses_one_connection(smtp_server):
+    count = 100
+    started = time.perf_counter()
+    with SmtpSession() as session:
+        for index in range(count):
+            assert session.send(f"eleve{index}@outbox.test", "Sujet", "<p>x</p>", "x")
+    reused = time.perf_counter() - started
+    assert smtp_server.connections == 1
+
+    started = time.perf_counter()
+    for index in range(count):
+        assert EmailService._send_via_smtp(
+            f"eleve{index}@outbox.test", "Sujet", "<p>x</p>", "x"
+        )
+    per_message = time.perf_counter() - started
+    assert smtp_server.connections == 1 + count
+    assert len(smtp_server.messages) == 2 * count
+    print(
+        f"\nSMTP stand-in : {count / reused:.0f} msg/s (connexion réutilisée) "
+        f"vs {count / per_message:.0f} msg/s (une connexion par message)"
+    )
+
+
+def test_handlers_only_enqueue(outbox):
+    with (
+        patch.object(settings, "EMAIL_OUTBOX_ENABLED", True),
+        patch.object(EmailService, "send_email") as send_email,
+    ):
+        assert EmailService.send_password_reset_email(
+            "padawan@outbox.test", "padawan", "tok123"
+        )
+    send_email.assert_not_called()
+    row = outbox.query(EmailOutbox).one()
+    assert row.kind == "password_reset"
+    assert row.status == EMAIL_PENDING
+    assert "tok123" in row.html_content
+
+
+def test_outbox_batches_share_one_smtp_connection(outbox, smtp_server):
+    _enqueue(12)
+    with SmtpSession() as session:
+        assert send_pending_emails(session, batch_size=5) == {
+            "sent": 5,
+            "retry": 0,
+            "failed": 0,
+        }
+        assert send_pending_emails(session, batch_size=5)["sent"] == 5
+        assert send_pending_emails(session, batch_size=5)["sent"] == 2
+        assert send_pending_emails(session, batch_size=5) == {}
+
+    assert smtp_server.connections == 1
+    assert len(smtp_server.messages) == 12
+    outbox.expire_all()
+    rows = outbox.query(EmailOutbox).all()
+    assert {row.status for row in rows} == {EMAIL_SENT}
+    assert all(row.html_content is None and row.attempts == 1 for row in rows)
+
+
+class _FailingTransport(EmailTransport):
+    def send(self, to_email, subject, html_content, text_content=None):
+        return False
+
+
+def test_failed_sends_back_off_then_give_up(outbox):
+    _enqueue(1)
+    with patch.object(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 2):
+        assert send_pending_emails(_FailingTransport())["retry"] == 1
+        row = outbox.query(EmailOutbox).one()
+        assert row.status == EMAIL_PENDING
+        delay = row.next_attempt_at - datetime.now(timezone.utc)
+        assert timedelta(0) < delay <= timedelta(seconds=retry_delay_seconds(1))
+
+        # Pas encore échu : rien à envoyer.
+        assert send_pending_emails(_FailingTransport()) == {}
+        row.next_attempt_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+        outbox.commit()
+
+        assert send_pending_emails(_FailingTransport())["failed"] == 1
+    outbox.expire_all()
+    row = outbox.query(EmailOutbox).one()
+    assert row.status == EMAIL_FAILED
+    assert row.attempts == 2
+    assert retry_delay_seconds(2) == 2 * retry_delay_seconds(1)
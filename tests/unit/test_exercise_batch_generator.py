@@ -0,0 +1,84 @@
+"""
+Générateur par lots d'exercices simples : schéma identique au générateur unitaire,
+justesse arithmétique, choix distincts, dédoublonnage et repli des autres types.
+"""
+
+import operator
+import random
+import re
+
+import pytest
+
+from app.generators.exercise_batch_generator import generate_simple_exercises_batch
+from app.generators.exercise_generator import generate_simple_exercise
+
+_OPERATORS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "×": operator.mul,
+    "÷": operator.floordiv,
+}
+
+
+@pytest.mark.parametrize(
+    "exercise_type", ("addition", "soustraction", "multiplication", "division")
+)
+@pytest.mark.parametrize("age_group", ("6-8", "9-11", "12-14"))
+def test_batch_matches_scalar_schema_and_is_correct(exercise_type, age_group):
+    random.seed(42)
+    scalar = generate_simple_exercise(exercise_type, age_group)
+    batch = generate_simple_exercises_batch(exercise_type, age_group, 30)
+
+    assert batch
+    for exercise in batch:
+        assert exercise.keys() == scalar.keys()
+        for key in ("exercise_type", "age_group", "difficulty", "tags"):
+            assert exercise[key] == scalar[key]
+        assert exercise["difficulty_tier"] == scalar["difficulty_tier"]
+        match = re.search(r"(\d+) (.) (\d+)", exercise["question"])
+        num1, op, num2 = int(match[1]), match[2], int(match[3])
+        assert (num1, num2) == (exercise["num1"], exercise["num2"])
+        assert exercise["correct_answer"] == str(_OPERATORS[op](num1, num2))
+        if op == "÷":
+            assert num1 % num2 == 0
+        assert len(set(exercise["choices"])) == 4
+        assert exercise["correct_answer"] in exercise["choices"]
+
+
+def test_unique_batch_is_capped_by_operand_space():
+    batch = generate_simple_exercises_batch("multiplication", "6-8", 10_000)
+    operands = [(e["num1"], e["num2"]) for e in batch]
+
+    assert len(operands) == len(set(operands))
+    assert 0 < len(batch) < 10_000
+
+
+def test_non_unique_batch_has_requested_size_and_stable_choices():
+    batch = generate_simple_exercises_batch(
+        "addition", "6-8", 2_000, unique=False, rng=random.Random(7)
+    )
+    choices = {}
+    for exercise in batch:
+        key = (exercise["num1"], exercise["num2"])
+        choices.setdefault(key, sorted(exercise["choices"]))
+        assert sorted(exercise["choices"]) == choices[key]
+    assert len(batch) == 2_000
+
+
+def test_rng_makes_operands_reproducible():
+    def _operands(seed):
+        batch = generate_simple_exercises_batch(
+            "soustraction", "9-11", 50, rng=random.Random(seed)
+        )
+        return [(e["num1"], e["num2"]) for e in batch]
+
+    assert _operands(3) == _operands(3)
+    assert _operands(3) != _operands(4)
+
+
+def test_other_types_fall_back_to_scalar_generator():
+    batch = generate_simple_exercises_batch("fractions", "9-11", 3)
+
+    assert len(batch) == 3
+    assert all(e["exercise_type"] == "FRACTIONS" for e in batch)
+    assert generate_simple_exercises_batch("addition", "9-11", 0) == []
@@ -0,0 +1,227 @@
+"""
+Tests — index catalogue exercices en mémoire (exercise_catalog_index) : sélection
+équivalente à la requête SQL, mise à jour au commit, empreinte mémoire.
+"""
+
+import time
+import uuid
+from array import array
+
+import pytest
+from sqlalchemy import insert
+
+from app.models.attempt import Attempt
+from app.models.exercise import Exercise
+from app.models.user import User
+from app.services.exercises.exercise_catalog_index import (
+    CatalogBucket,
+    ExerciseCatalogIndex,
+    exercise_catalog_index,
+)
+from app.services.recommendation.recommendation_service import (
+    _CandidateSpec,
+    _load_candidate_pools,
+)
+from tests.utils.test_helpers import unique_email, unique_username
+
+
+@pytest.fixture
+def tx(db_session):
+    try:
+        yield db_session
+    finally:
+        db_session.rollback()
+        exercise_catalog_index.clear()
+
+
+def _age_marker():
+    # Groupe d'âge propre au test : isole ses seaux du reste de la base.
+    return f"t{uuid.uuid4().hex[:8]}"
+
+
+def _insert(db, age_group, rows):
+    db.execute(
+        insert(Exercise),
+        [
+            {
+                "title": f"catalog {age_group} {index}",
+                "exercise_type": exercise_type,
+                "difficulty": difficulty,
+                "difficulty_tier": tier,
+                "age_group": age_group,
+                "question": "1+1=?",
+                "correct_answer": "2",
+                "is_active": active,
+                "is_archived": archived,
+            }
+            for index, (exercise_type, difficulty, tier, active, archived) in enumerate(
+                rows
+            )
+        ],
+    )
+
+
+def _pool_ids(db, user_id, age_group, specs):
+    specs = [spec._replace(age_values=(age_group,)) for spec in specs]
+    pools = _load_candidate_pools(db, user_id, specs)
+    return [[ex.id for ex in pools[spec]] for spec in specs]
+
+
+def _user(db):
+    user = User(
+        username=unique_username(),
+        email=unique_email(),
+        hashed_password="test_hash",
+    )
+    db.add(user)
+    db.flush()
+    return user
+
+
+def test_index_selection_matches_sql_fallback(tx):
+    age = _age_marker()
+    _insert(
+        tx,
+        age,
+        [
+            ("ADDITION", "PADAWAN", 4, True, False),
+            ("ADDITION", "PADAWAN", 5, True, False),
+            ("ADDITION", "PADAWAN", 9, True, False),
+            ("ADDITION", "PADAWAN", None, True, False),
+            ("ADDITION", "CHEVALIER", None, True, False),
+            ("ADDITION", "PADAWAN", 5, False, False),
+            ("ADDITION", "PADAWAN", 5, True, True),
+            ("Addition", "PADAWAN", 5, True, False),
+            ("DIVISION", "PADAWAN", 5, True, False),
+        ],
+    )
+    user = _user(tx)
+    specs = [
+        _CandidateSpec("addition", 5, "PADAWAN"),
+        _CandidateSpec("addition", None, "PADAWAN"),
+        _CandidateSpec("division", 5, "PADAWAN"),
+        _CandidateSpec(None, 5, None, any_difficulty=True),
+    ]
+    cold = _pool_ids(tx, user.id, age, specs)
+    assert len(cold[0]) == 3
+
+    exercise_catalog_index.build(tx)
+    assert exercise_catalog_index.ready
+    assert _pool_ids(tx, user.id, age, specs) == cold
+
+    # Exercice réussi : écarté par l'anti-jointure, index chaud comme froid.
+    tx.add(
+        Attempt(
+            user_id=user.id,
+            exercise_id=cold[0][0],
+            user_answer="2",
+            is_correct=True,
+            time_spent=1.0,
+        )
+    )
+    tx.flush()
+    assert _pool_ids(tx, user.id, age, specs[:1]) == [cold[0][1:]]
+    exercise_catalog_index.clear()
+    assert _pool_ids(tx, user.id, age, specs[:1]) == [cold[0][1:]]
+
+
+def test_commit_updates_index_incrementally(db_session):
+    age = _age_marker()
+    exercise = Exercise(
+        title=f"catalog {age}",
+        exercise_type="MULTIPLICATION",
+        difficulty="INITIE",
+        difficulty_tier=2,
+        age_group=age,
+        question="2x2=?",
+        correct_answer="4",
+    )
+    bucket = CatalogBucket("multiplication", age, 2, "INITIE")
+
+    def _ids():
+        return exercise_catalog_index.candidate_ids(
+            lambda b: b.age_group == age, limit=10
+        )
+
+    try:
+        exercise_catalog_index.build(db_session)
+        db_session.add(exercise)
+        db_session.commit()
+        assert _ids() == [exercise.id]
+
+        exercise.difficulty_tier = 3
+        db_session.commit()
+        assert bucket not in exercise_catalog_index._buckets
+        assert _ids() == [exercise.id]
+
+        exercise.is_archived = True
+        db_session.commit()
+        assert _ids() == []
+    finally:
+        db_session.rollback()
+        db_session.query(Exercise).filter(Exercise.age_group == age).delete(
+            synchronize_session=False
+        )
+        db_session.commit()
+        exercise_catalog_index.clear()
+
+
+def test_rolled_back_writes_do_not_reach_index(tx):
+    age = _age_marker()
+    exercise_catalog_index.build(tx)
+    tx.add(
+        Exercise(
+            title=f"catalog {age}",
+            exercise_type="ADDITION",
+            difficulty="INITIE",
+            age_group=age,
+            question="1+1=?",
+            correct_answer="2",
+        )
+    )
+    tx.flush()
+    tx.rollback()
+    assert exercise_catalog_index.candidate_ids(
+        lambda b: b.age_group == age, limit=10
+    ) == []
+
+
+def test_memory_and_selection_for_500k_catalog():
+    index = ExerciseCatalogIndex()
+    types = ["addition", "soustraction", "multiplication", "division", "fractions"]
+    ages = ["6-8", "9-11", "12-14", "15-17", "adulte"]
+    buckets = [
+        CatalogBucket(t, a, tier, "PADAWAN")
+        for t in types
+        for a in ages
+        for tier in range(1, 13)
+    ]
+    total = 500_000
+    grouped = {bucket: [] for bucket in buckets}
+    for exercise_id in range(1, total + 1):
+        grouped[buckets[exercise_id % len(buckets)]].append(exercise_id)
+    index._buckets = {key: array("i", ids) for key, ids in grouped.items()}
+    index._ready = True
+
+    assert len(index) == total
+    nbytes = index.memory_bytes()
+    assert nbytes < 4 * 1024 * 1024
+
+    excluded = set(range(total - 2000, total + 1))
+    started = time.perf_counter()
+    picked = index.candidate_ids(
+        lambda b: b.exercise_type == "addition"
+        and b.age_group in {"9-11", "adulte"}
+        and 4 <= b.difficulty_tier <= 6,
+        exclude_ids=excluded,
+        limit=150,
+    )
+    selection_ms = (time.perf_counter() - started) * 1000
+
+    assert len(picked) == 150
+    assert picked == sorted(picked, reverse=True)
+    assert not excluded.intersection(picked)
+    print(
+        f"\nIndex catalogue {total} exercices : {nbytes / 1024 / 1024:.2f} Mo, "
+        f"sélection de 150 candidats en {selection_ms:.2f} ms"
+    )
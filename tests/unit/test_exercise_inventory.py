@@ -0,0 +1,204 @@
+"""
+Tests — inventaire d'exercices IA pré-générés : réservation SKIP LOCKED, service SSE
+(hit / miss / prompt libre), refill sous le seuil bas et délai de recomplétion.
+"""
+
+import json
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from app.core.config import settings
+from app.core.db_boundary import sync_db_session
+from app.db.base import SessionLocal
+from app.models.exercise import Exercise
+from app.models.exercise_inventory import ExerciseInventoryItem
+from app.schemas.exercise import GenerateExerciseStreamContext
+from app.services.core.content_inventory import InventoryRefiller
+from app.services.exercises.exercise_inventory import (
+    ExerciseInventoryBucket,
+    exercise_stock,
+    inventory_bucket_for,
+    serve_exercise_stream,
+    stock_exercise_persist,
+)
+
+_STREAM = "app.services.exercises.exercise_ai_service.generate_exercise_stream"
+
+
+def _normalized(title="Mission cargo"):
+    return {
+        "exercise_type": "addition",
+        "age_group": "9-11",
+        "difficulty": "PADAWAN",
+        "difficulty_tier": 5,
+        "title": title,
+        "question": "Combien font 12 + 30 ?",
+        "correct_answer": "42",
+        "choices": ["42", "41", "43", "32"],
+        "explanation": "12 + 30 = 42.",
+        "hint": "Additionne les dizaines.",
+        "ai_generated": True,
+        "tags": "ai,generated",
+    }
+
+
+@pytest.fixture
+def bucket():
+    # Locale unique : seau isolé des autres tests.
+    bucket = ExerciseInventoryBucket(
+        "addition", "9-11", "consolidation", locale=uuid.uuid4().hex[:8]
+    )
+    yield bucket
+    db = SessionLocal()
+    try:
+        db.query(ExerciseInventoryItem).filter(
+            ExerciseInventoryItem.locale == bucket.locale
+        ).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+def _stock(bucket, count):
+    persist = stock_exercise_persist(bucket)
+    return [persist(_normalized(f"Stock {i}"), bucket.locale) for i in range(count)]
+
+
+def _context(bucket, prompt=""):
+    return GenerateExerciseStreamContext(
+        exercise_type=bucket.exercise_type,
+        age_group=bucket.age_group,
+        derived_difficulty="PADAWAN",
+        pedagogical_band=bucket.pedagogical_band,
+        prompt=prompt,
+        locale=bucket.locale,
+    )
+
+
+def test_bucket_ignores_requests_with_free_prompt(bucket):
+    assert inventory_bucket_for(_context(bucket)) == bucket
+    assert inventory_bucket_for(_context(bucket, prompt="des dragons")) is None
+
+
+def test_claim_serves_oldest_and_removes_it(bucket, db_session):
+    first_id, _ = _stock(bucket, 2)
+    other = ExerciseInventoryBucket("addition", "9-11", None, locale=bucket.locale)
+    _stock(other, 1)
+
+    served = exercise_stock.claim(db_session, bucket)
+
+    exercise = db_session.get(Exercise, served["id"])
+    assert exercise.title == "Stock 0"
+    assert exercise.ai_generated is True
+    assert db_session.get(ExerciseInventoryItem, first_id) is None
+    assert exercise_stock.count_sync(bucket) == 1
+    assert exercise_stock.count_sync(other) == 1
+
+
+def test_concurrent_claims_skip_locked_rows(bucket):
+    _stock(bucket, 1)
+    holder, contender = SessionLocal(), SessionLocal()
+    try:
+        locked_id = (
+            holder.query(ExerciseInventoryItem)
+            .filter(ExerciseInventoryItem.locale == bucket.locale)
+            .with_for_update()
+            .one()
+            .id
+        )
+        # Ligne verrouillée ailleurs : pas d'attente, seau vu comme vide.
+        assert exercise_stock.claim(contender, bucket) is None
+        holder.rollback()
+        assert exercise_stock.claim(contender, bucket) is not None
+        assert contender.get(ExerciseInventoryItem, locked_id) is None
+    finally:
+        holder.close()
+        contender.close()
+
+
+async def test_serve_hit_skips_generation(bucket):
+    _stock(bucket, 1)
+
+    async def _no_generation(*_args, **_kwargs):
+        raise AssertionError("génération inattendue")
+        yield  # pragma: no cover
+
+    with (
+        patch.object(settings, "EXERCISE_INVENTORY_ENABLED", True),
+        patch(_STREAM, _no_generation),
+    ):
+        events = [e async for e in serve_exercise_stream(_context(bucket))]
+
+    payloads = [json.loads(e[6:]) for e in events]
+    assert [p["type"] for p in payloads] == ["exercise", "done"]
+    assert payloads[0]["exercise"]["title"] == "Stock 0"
+    assert payloads[0]["exercise"]["id"]
+    assert exercise_stock.count_sync(bucket) == 0
+
+
+async def test_serve_miss_generates_and_signals_demand(bucket):
+    calls = []
+
+    async def _fake_generation(**kwargs):
+        calls.append(kwargs)
+        yield 'data: {"type": "done"}\n\n'
+
+    refiller = InventoryRefiller(exercise_stock, poll_seconds=60)
+    with (
+        patch.object(settings, "EXERCISE_INVENTORY_ENABLED", True),
+        patch.object(exercise_stock, "_refiller", refiller),
+        patch(_STREAM, _fake_generation),
+    ):
+        events = [e async for e in serve_exercise_stream(_context(bucket))]
+        [e async for e in serve_exercise_stream(_context(bucket, prompt="robots"))]
+
+    assert events == ['data: {"type": "done"}\n\n']
+    assert [c["prompt"] for c in calls] == ["", "robots"]
+    assert [c["pedagogical_band_override"] for c in calls] == ["consolidation"] * 2
+    assert refiller.buckets() == [(bucket, None)]
+
+
+async def test_refill_tops_up_below_low_watermark_and_records_lag(bucket):
+    bands = []
+
+    async def _fake_generation(exercise_type, age_group, difficulty, prompt, **kw):
+        bands.append(kw["pedagogical_band_override"])
+        kw["persist"](_normalized(), kw["locale"])
+        yield 'data: {"type": "exercise", "exercise": {}}\n\n'
+
+    refiller = InventoryRefiller(exercise_stock, poll_seconds=60)
+    with (
+        patch.object(settings, "EXERCISE_INVENTORY_TARGET", 3),
+        patch.object(settings, "EXERCISE_INVENTORY_LOW_WATERMARK", 1),
+        patch(_STREAM, _fake_generation),
+        patch.object(exercise_stock, "record_refill_lag") as lag,
+    ):
+        refiller.track(bucket)
+        assert await refiller.refill_bucket(bucket) == 3
+        assert lag.call_count == 1
+        # Au-dessus du seuil bas : pas de refill même sous la cible.
+        with sync_db_session() as db:
+            exercise_stock.claim(db, bucket)
+            exercise_stock.claim(db, bucket)
+        refiller.track(bucket)
+        assert await refiller.refill_bucket(bucket) == 0
+        with sync_db_session() as db:
+            exercise_stock.claim(db, bucket)
+        assert await refiller.refill_bucket(bucket) == 3
+        # Demande soldée sans refill : pas de délai mesuré au cycle suivant.
+        assert lag.call_count == 1
+
+    assert bands == ["consolidation"] * 6
+    assert exercise_stock.count_sync(bucket) == 3
+
+
+async def test_refill_stops_at_first_failed_generation(bucket):
+    async def _failing_generation(*_args, **_kwargs):
+        yield 'data: {"type": "error", "message": "x"}\n\n'
+
+    refiller = InventoryRefiller(exercise_stock, poll_seconds=60)
+    with patch(_STREAM, _failing_generation):
+        assert await refiller.refill_bucket(bucket) == 0
+    assert exercise_stock.count_sync(bucket) == 0
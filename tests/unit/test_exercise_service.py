@@ -4,7 +4,7 @@ Tests unitaires pour le service de gestion des exercices (ExerciseService).
 
 import time
 import uuid
-from datetime import datetime
+from datetime import date, datetime, timezone
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -735,9 +735,10 @@ def test_create_exercise_with_mock(mock_db_create, mock_adapt_enum):
     assert exercise.is_archived is False
 
 
+@patch("app.services.exercises.exercise_service.record_exercise_attempt_stats")
 @patch("app.utils.db_helpers.adapt_enum_for_db")
 @patch("app.services.exercises.exercise_service.ExerciseService.get_exercise")
-def test_record_attempt_with_mock(mock_get_exercise, mock_adapt_enum):
+def test_record_attempt_with_mock(mock_get_exercise, mock_adapt_enum, mock_stats):
     """
     Teste l'enregistrement d'une tentative avec des mocks pour éviter les problèmes
     de compatibilité entre SQLite et PostgreSQL.
@@ -1100,7 +1101,9 @@ def test_submit_answer_result_uses_orchestrator_owned_transaction():
         daily_savepoint,
     ]
 
-    mock_attempt = MagicMock(id=321, created_at=datetime(2026, 3, 6, 12, 0, 0))
+    mock_attempt = MagicMock(
+        id=321, created_at=datetime(2026, 3, 6, 12, 0, 0, tzinfo=timezone.utc)
+    )
     mock_badge_service = MagicMock()
     mock_badge_service.check_and_award_badges.return_value = []
     mock_badge_service.get_closest_progress_notification.return_value = None
@@ -1161,12 +1164,15 @@ def test_submit_answer_result_uses_orchestrator_owned_transaction():
             "is_correct": True,
             "time_spent": 3.5,
         },
+        exercise_type=ExerciseType.ADDITION.value,
     )
     update_progress_mock.assert_called_once()
     apply_points_mock.assert_called_once()
     assert badge_service_cls.call_count >= 1
     badge_service_cls.assert_any_call(mock_db, auto_commit=False)
-    streak_mock.assert_called_once_with(mock_db, 7, auto_commit=False)
+    streak_mock.assert_called_once_with(
+        mock_db, 7, auto_commit=False, today=date(2026, 3, 6)
+    )
     daily_mock.assert_called_once_with(mock_db, 7, ExerciseType.ADDITION.value, True)
     progress_savepoint.commit.assert_called_once()
     sr_savepoint.commit.assert_called_once()
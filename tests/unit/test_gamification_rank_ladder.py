@@ -5,7 +5,9 @@ import pytest
 from app.services.gamification.compute import (
     canonicalize_progression_rank_bucket,
     compute_state_from_total_points,
+    cumulative_points_at_level_start,
     jedi_rank_for_level,
+    level_and_xp_from_total_points,
 )
 
 
@@ -49,6 +51,14 @@ def test_compute_state_rank_aligns_with_level() -> None:
         assert rank == exp_rank
 
 
+def test_level_from_large_total_is_consistent_with_level_floor() -> None:
+    """Solde de plusieurs millions de points (classement) : calcul par palier."""
+    level, xp = level_and_xp_from_total_points(9_999_998)
+    floor = cumulative_points_at_level_start(level)
+    assert floor + xp == 9_999_998
+    assert 0 <= xp < cumulative_points_at_level_start(level + 1) - floor
+
+
 @pytest.mark.parametrize(
     ("raw_rank", "level", "expected"),
     [
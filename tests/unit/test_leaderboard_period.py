@@ -15,6 +15,7 @@ from app.core.security import get_password_hash
 from app.models.point_event import PointEvent
 from app.models.user import User, UserRole
 from app.services.gamification.gamification_service import GamificationService
+from app.services.gamification.leaderboard_scores import rebuild_leaderboard_scores
 from app.services.gamification.point_source import PointEventSourceType
 from app.services.users.user_service import UserService
 from app.utils.db_helpers import get_enum_value
@@ -63,6 +64,8 @@ def test_get_leaderboard_week_prefers_recent_point_events(db_session):
         text("UPDATE point_events SET created_at = :ts WHERE user_id = :uid"),
         {"ts": old_ts, "uid": u_stale.id},
     )
+    # Ledger modifié hors apply_points : resynchroniser les scores matérialisés.
+    rebuild_leaderboard_scores(db_session)
     db_session.commit()
 
     # Score calculé relativement au max hebdo courant pour rester déterministe
@@ -0,0 +1,188 @@
+"""
+Tests — scores de classement matérialisés (buckets jour, fenêtres week / month,
+confidentialité dénormalisée, pagination keyset).
+
+Chaque test reste dans une transaction non commitée (rollback final) : la bascule
+de fenêtre vers une date future ne doit pas fuiter dans la base de test partagée.
+"""
+
+import random
+import uuid
+from datetime import timedelta
+
+import pytest
+
+from app.core.leaderboard_period import (
+    LeaderboardCursor,
+    LeaderboardPeriod,
+    encode_leaderboard_cursor,
+    parse_leaderboard_cursor,
+)
+from app.core.security import get_password_hash
+from app.models.leaderboard_score import LeaderboardPeriodScore, UserDailyPoints
+from app.models.user import User, UserRole, leaderboard_visibility_from_settings
+from app.services.gamification.gamification_service import GamificationService
+from app.services.gamification.leaderboard_scores import (
+    record_points,
+    roll_leaderboard_windows,
+    utc_today,
+)
+from app.services.gamification.point_source import PointEventSourceType
+from app.services.users.user_service import UserService
+from app.utils.db_helpers import get_enum_value
+
+
+@pytest.fixture
+def tx(db_session):
+    try:
+        yield db_session
+    finally:
+        db_session.rollback()
+
+
+def _user(db, prefix, **kwargs):
+    suffix = uuid.uuid4().hex[:8]
+    user = User(
+        username=f"{prefix}_{suffix}",
+        email=f"{prefix}_{suffix}@t.com",
+        hashed_password=get_password_hash("Test123!"),
+        role=get_enum_value(UserRole, UserRole.PADAWAN.value, db),
+        **kwargs,
+    )
+    db.add(user)
+    db.flush()
+    return user
+
+
+def _score(db, period, user_id):
+    return (
+        db.query(LeaderboardPeriodScore.score)
+        .filter(
+            LeaderboardPeriodScore.period == str(period),
+            LeaderboardPeriodScore.user_id == user_id,
+        )
+        .scalar()
+    )
+
+
+def test_leaderboard_visibility_from_settings():
+    assert leaderboard_visibility_from_settings(None) is True
+    assert leaderboard_visibility_from_settings({"privacy_settings": "x"}) is True
+    assert (
+        leaderboard_visibility_from_settings(
+            {"privacy_settings": {"show_in_leaderboards": False}}
+        )
+        is False
+    )
+
+
+def test_accessibility_settings_assignment_syncs_column():
+    user = User(username="u", email="u@t.com", hashed_password="x")
+    user.accessibility_settings = {"privacy_settings": {"show_in_leaderboards": False}}
+    assert user.show_in_leaderboards is False
+    user.accessibility_settings = {"privacy_settings": {"show_in_leaderboards": True}}
+    assert user.show_in_leaderboards is True
+
+
+def test_cursor_roundtrip_and_errors():
+    cursor = LeaderboardCursor(score=120, user_id=7, rank=50)
+    assert parse_leaderboard_cursor(encode_leaderboard_cursor(cursor)) == cursor
+    null_score = LeaderboardCursor(score=None, user_id=7, rank=3)
+    assert parse_leaderboard_cursor(encode_leaderboard_cursor(null_score)) == null_score
+    assert parse_leaderboard_cursor(None) is None
+    for raw in ("abc", "1:2", "1:x:3", "1:2:0"):
+        with pytest.raises(ValueError):
+            parse_leaderboard_cursor(raw)
+
+
+def test_apply_points_feeds_bucket_and_period_scores(tx):
+    user = _user(tx, "lbs_feed")
+    GamificationService.apply_points(
+        tx, user.id, 30, PointEventSourceType.EXERCISE_COMPLETED, source_id=1
+    )
+    GamificationService.apply_points(
+        tx, user.id, 12, PointEventSourceType.EXERCISE_COMPLETED, source_id=2
+    )
+
+    bucket = tx.get(UserDailyPoints, (user.id, utc_today()))
+    assert bucket.points == 42
+    assert _score(tx, LeaderboardPeriod.WEEK, user.id) == 42
+    assert _score(tx, LeaderboardPeriod.MONTH, user.id) == 42
+
+
+def test_roll_subtracts_days_leaving_the_window(tx):
+    today = utc_today()
+    user = _user(tx, "lbs_roll")
+    roll_leaderboard_windows(tx, today)
+    record_points(tx, user.id, 5, day=today - timedelta(days=6))
+    record_points(tx, user.id, 7, day=today)
+
+    roll_leaderboard_windows(tx, today)
+    assert _score(tx, LeaderboardPeriod.WEEK, user.id) == 12
+
+    roll_leaderboard_windows(tx, today + timedelta(days=1))
+    assert _score(tx, LeaderboardPeriod.WEEK, user.id) == 7
+    assert _score(tx, LeaderboardPeriod.MONTH, user.id) == 12
+
+    roll_leaderboard_windows(tx, today + timedelta(days=7))
+    assert _score(tx, LeaderboardPeriod.WEEK, user.id) is None
+    assert _score(tx, LeaderboardPeriod.MONTH, user.id) == 12
+
+
+def test_hidden_users_are_filtered_in_sql(tx):
+    points = random.randint(40_000, 60_000)
+    visible = _user(tx, "lbs_visible", total_points=points)
+    hidden = _user(tx, "lbs_hidden", total_points=points)
+    hidden.accessibility_settings = {
+        "privacy_settings": {"show_in_leaderboards": False}
+    }
+    tx.flush()
+
+    board = UserService.get_leaderboard_for_api(
+        tx,
+        current_user_id=visible.id,
+        limit=50,
+        after=LeaderboardCursor(score=points + 1, user_id=0, rank=1),
+    )
+    usernames = {e["username"] for e in board}
+    assert visible.username in usernames
+    assert hidden.username not in usernames
+
+
+def test_rank_ignores_hidden_users(tx):
+    points = random.randint(10**9, 2 * 10**9)
+    me = _user(tx, "lbs_rank_me", total_points=points)
+    _user(tx, "lbs_rank_ahead", total_points=points + 2)
+    hidden = _user(tx, "lbs_rank_hidden", total_points=points + 1)
+    hidden.accessibility_settings = {
+        "privacy_settings": {"show_in_leaderboards": False}
+    }
+    tx.flush()
+
+    out = UserService.get_user_rank_by_points_for_api(tx, me.id)
+    ahead = (
+        tx.query(User)
+        .filter(
+            User.is_active.is_(True),
+            User.show_in_leaderboards.is_(True),
+            User.total_points > points,
+        )
+        .count()
+    )
+    assert out["rank"] == ahead + 1
+    assert ahead >= 1
+
+
+@pytest.mark.parametrize("period", [LeaderboardPeriod.ALL, LeaderboardPeriod.WEEK])
+def test_keyset_pages_match_single_page(tx, period):
+    full, _ = UserService.get_leaderboard_page_for_api(tx, 0, limit=8, period=period)
+    first, cursor = UserService.get_leaderboard_page_for_api(
+        tx, 0, limit=4, period=period
+    )
+    if cursor is None:
+        assert first == full
+        return
+    second, _ = UserService.get_leaderboard_page_for_api(
+        tx, 0, limit=4, period=period, after=cursor
+    )
+    assert first + second == full
@@ -1194,7 +1194,8 @@ def test_create_challenge_with_mock(mock_db_adapter):
 @patch(
     "app.services.challenges.logic_challenge_service.LogicChallengeService.get_challenge"
 )
-def test_record_attempt_with_mock(mock_get_challenge):
+@patch("app.services.challenges.logic_challenge_service.record_logic_attempt_stats")
+def test_record_attempt_with_mock(mock_stats, mock_get_challenge):
     """
     Teste l'enregistrement d'une tentative de défi avec des mocks pour éviter
     les problèmes de compatibilité entre SQLite et PostgreSQL.
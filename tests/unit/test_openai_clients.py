@@ -0,0 +1,204 @@
+"""
+Transport OpenAI partagé : un pool httpx par (loop, base URL, profil, timeout),
+connexions keep-alive réutilisées entre appels et temps au premier token mesuré
+contre un faux serveur OpenAI local en streaming (aucun appel réseau externe).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.core.openai_clients import (
+    OpenAIClientRegistry,
+    openai_client,
+    openai_client_registry,
+)
+
+
+class _FakeOpenAIStreamHandler(BaseHTTPRequestHandler):
+    """SSE ``chat.completion.chunk`` en HTTP/1.1 keep-alive, coût par connexion."""
+
+    protocol_version = "HTTP/1.1"
+    # En-têtes puis corps : sans ça, Nagle + ACK différé (~40 ms par réponse).
+    disable_nagle_algorithm = True
+    # Simule la poignée de main TCP + TLS évitée par la réutilisation.
+    handshake_sec = 0.05
+
+    def setup(self):
+        time.sleep(self.handshake_sec)
+        super().setup()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        events = []
+        for piece in ("4", "2", None):
+            chunk = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": "fake",
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {"content": piece} if piece else {},
+                        "finish_reason": None if piece else "stop",
+                    }
+                ],
+            }
+            events.append(f"data: {json.dumps(chunk)}\n\n")
+        events.append("data: [DONE]\n\n")
+        body = "".join(events).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args):
+        pass
+
+
+@pytest.fixture
+def fake_openai_base_url(monkeypatch):
+    from openai._client import AsyncOpenAI
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOpenAIStreamHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    # Vrai client SDK à la place du blocage conftest.
+    monkeypatch.setattr("openai.AsyncOpenAI", AsyncOpenAI)
+    openai_client_registry.clear()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    finally:
+        openai_client_registry.clear()
+        server.shutdown()
+        server.server_close()
+
+
+async def _time_to_first_token(client) -> float:
+    started = time.perf_counter()
+    stream = await client.chat.completions.create(
+        model="fake",
+        messages=[{"role": "user", "content": "2+2 ?"}],
+        stream=True,
+    )
+    ttft = None
+    async for chunk in stream:
+        if ttft is None and chunk.choices and chunk.choices[0].delta.content:
+            ttft = time.perf_counter() - started
+    return ttft
+
+
+async def test_same_profile_shares_one_pool_per_loop():
+    registry = OpenAIClientRegistry()
+    exercises = registry.http_client(profile="exercises", timeout=60)
+    assert registry.http_client(profile="exercises", timeout=60.0) is exercises
+    assert registry.http_client(profile="challenges", timeout=60) is not exercises
+    assert registry.http_client(profile="exercises", timeout=90) is not exercises
+
+    await registry.aclose()
+    assert exercises.is_closed
+    assert registry.http_client(profile="exercises", timeout=60) is not exercises
+    await registry.aclose()
+
+
+def test_pools_of_closed_loops_are_forgotten():
+    registry = OpenAIClientRegistry()
+
+    async def _pool():
+        return registry.http_client(profile="exercises")
+
+    first = asyncio.run(_pool())
+    second = asyncio.run(_pool())
+    assert second is not first
+    assert len(registry._pools) == 1
+
+
+async def test_aclose_keeps_pools_of_other_loops():
+    registry = OpenAIClientRegistry()
+    ready, release = threading.Event(), threading.Event()
+    pools = {}
+
+    def _refiller_thread():
+        loop = asyncio.new_event_loop()
+
+        async def _run():
+            pools["other"] = registry.http_client(profile="exercises")
+            ready.set()
+            await asyncio.to_thread(release.wait, 5)
+            await registry.aclose()
+
+        try:
+            loop.run_until_complete(_run())
+        finally:
+            loop.close()
+
+    thread = threading.Thread(target=_refiller_thread)
+    thread.start()
+    try:
+        assert ready.wait(5)
+        mine = registry.http_client(profile="exercises")
+        await registry.aclose()
+        assert mine.is_closed
+        assert not pools["other"].is_closed
+        assert list(registry._pools.values()) == [pools["other"]]
+    finally:
+        release.set()
+        thread.join(5)
+    assert pools["other"].is_closed
+    assert registry._pools == {}
+
+
+async def test_sequential_calls_reuse_one_keepalive_connection(fake_openai_base_url):
+    for _ in range(5):
+        client = openai_client(
+            api_key="sk-fake-local",
+            profile="exercises",
+            timeout=10,
+            base_url=fake_openai_base_url,
+        )
+        assert await _time_to_first_token(client) is not None
+
+    assert openai_client_registry.stats()["exercises"] == {
+        "requests": 5,
+        "connections_opened": 1,
+    }
+
+
+async def test_shared_pool_lowers_time_to_first_token(fake_openai_base_url):
+    from openai._client import AsyncOpenAI
+
+    rounds = 6
+    fresh = []
+    for _ in range(rounds):
+        # Comportement historique : un client (donc une connexion) par génération.
+        async with AsyncOpenAI(
+            api_key="sk-fake-local", base_url=fake_openai_base_url, timeout=10
+        ) as client:
+            fresh.append(await _time_to_first_token(client))
+
+    shared = []
+    for _ in range(rounds):
+        client = openai_client(
+            api_key="sk-fake-local",
+            profile="exercises",
+            timeout=10,
+            base_url=fake_openai_base_url,
+        )
+        shared.append(await _time_to_first_token(client))
+
+    # Seul le premier appel partagé paie la connexion.
+    assert statistics.median(shared) < statistics.median(fresh)
+    print(
+        f"\nTTFT médian (faux serveur, connexion 50 ms) : client neuf "
+        f"{statistics.median(fresh) * 1000:.1f} ms, pool partagé "
+        f"{statistics.median(shared) * 1000:.1f} ms"
+    )
@@ -0,0 +1,243 @@
+"""
+Tests — file post-commit (app.core.post_commit) et effets de bord différés de
+submit_answer (SUBMIT_SIDE_EFFECTS_ASYNC).
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from app.core import post_commit
+from app.core.config import settings
+from app.core.post_commit import (
+    InProcessPostCommitQueue,
+    PostCommitQueue,
+    register_post_commit_handler,
+    run_post_commit_job,
+    set_post_commit_queue,
+)
+from app.models.attempt_side_effect import (
+    SIDE_EFFECTS_DONE,
+    SIDE_EFFECTS_FAILED,
+    SIDE_EFFECTS_PENDING,
+    AttemptSideEffect,
+)
+from app.models.exercise import DifficultyLevel, Exercise, ExerciseType
+from app.models.user import User, UserRole
+from app.services.exercises import exercise_attempt_service
+from app.services.exercises.exercise_attempt_service import (
+    ATTEMPT_SIDE_EFFECTS_JOB,
+    ATTEMPT_SIDE_EFFECTS_MAX_TRIES,
+    get_attempt_side_effects_for_user,
+    process_attempt_side_effects,
+    requeue_pending_attempt_side_effects,
+    submit_answer,
+)
+from app.utils.db_helpers import get_enum_value
+from tests.utils.test_helpers import unique_email, unique_username
+
+
+class _RecordingQueue(PostCommitQueue):
+    def __init__(self):
+        self.jobs = []
+        self.accept = True
+
+    def enqueue(self, job, key):
+        if self.accept:
+            self.jobs.append((job, key))
+        return self.accept
+
+
+@pytest.fixture
+def recording_queue():
+    queue = _RecordingQueue()
+    set_post_commit_queue(queue)
+    yield queue
+    set_post_commit_queue(None)
+
+
+def test_in_process_queue_dedups_pending_keys_and_drains():
+    seen = []
+    release = threading.Event()
+
+    def handler(key):
+        release.wait(5)
+        seen.append(key)
+        return True
+
+    register_post_commit_handler("test_dedup", handler)
+    queue = InProcessPostCommitQueue(workers=1, max_queue=10)
+    try:
+        queue.enqueue("test_dedup", 1)
+        queue.enqueue("test_dedup", 2)
+        queue.enqueue("test_dedup", 2)
+        release.set()
+        assert queue.drain(5)
+        assert sorted(seen) == [1, 2]
+    finally:
+        queue.shutdown()
+        post_commit._handlers.pop("test_dedup", None)
+
+
+def test_in_process_queue_refuses_when_full():
+    started = threading.Event()
+    release = threading.Event()
+
+    def handler(key):
+        started.set()
+        release.wait(5)
+        return True
+
+    register_post_commit_handler("test_full", handler)
+    queue = InProcessPostCommitQueue(workers=1, max_queue=1)
+    try:
+        assert queue.enqueue("test_full", 1) is True
+        assert started.wait(5)  # 1 en cours de traitement, file vide
+        assert queue.enqueue("test_full", 2) is True
+        assert queue.enqueue("test_full", 3) is False
+        assert queue.enqueue("test_full", 2) is True  # déjà en file
+        release.set()
+        assert queue.drain(5)
+        # Refusée, la clé 3 n'est pas marquée en file : le balayage la replanifie.
+        assert queue.enqueue("test_full", 3) is True
+        assert queue.drain(5)
+    finally:
+        release.set()
+        queue.shutdown()
+        post_commit._handlers.pop("test_full", None)
+
+
+def test_run_post_commit_job_never_raises():
+    def boom(_key):
+        raise RuntimeError("boom")
+
+    register_post_commit_handler("test_boom", boom)
+    try:
+        assert run_post_commit_job("test_boom", 1) == "failed"
+        assert run_post_commit_job("test_unknown_job", 1) == "failed"
+    finally:
+        post_commit._handlers.pop("test_boom", None)
+
+
+def _submit_async(db_session):
+    user = User(
+        username=unique_username(),
+        email=unique_email(),
+        hashed_password="hash",
+        role=get_enum_value(UserRole, UserRole.PADAWAN.value, db_session),
+    )
+    exercise = Exercise(
+        title=f"Test side effects {unique_username()}",
+        exercise_type=get_enum_value(
+            ExerciseType, ExerciseType.ADDITION.value, db_session
+        ),
+        difficulty=get_enum_value(
+            DifficultyLevel, DifficultyLevel.INITIE.value, db_session
+        ),
+        age_group="6-8",
+        question="2+2=?",
+        correct_answer="4",
+    )
+    db_session.add_all([user, exercise])
+    db_session.commit()
+    user_id, exercise_id = user.id, exercise.id
+
+    with patch.object(settings, "SUBMIT_SIDE_EFFECTS_ASYNC", True):
+        response = submit_answer(db_session, exercise_id, user_id, "4", 3.0)
+    return user_id, response
+
+
+def test_async_submit_defers_side_effects_idempotently(db_session, recording_queue):
+    user_id, response = _submit_async(db_session)
+
+    assert response.is_correct is True
+    assert response.side_effects_status == SIDE_EFFECTS_PENDING
+    assert response.new_badges is None
+    assert recording_queue.jobs == [(ATTEMPT_SIDE_EFFECTS_JOB, response.attempt_id)]
+    assert db_session.get(User, user_id).total_points in (0, None)
+
+    assert process_attempt_side_effects(response.attempt_id) is True
+    assert process_attempt_side_effects(response.attempt_id) is False
+
+    db_session.expire_all()
+    assert db_session.get(User, user_id).total_points == 10
+    outbox = db_session.get(AttemptSideEffect, response.attempt_id)
+    assert outbox.status == SIDE_EFFECTS_DONE
+
+    payload = get_attempt_side_effects_for_user(
+        db_session, response.attempt_id, user_id
+    )
+    assert payload["status"] == SIDE_EFFECTS_DONE
+    assert get_attempt_side_effects_for_user(
+        db_session, response.attempt_id, user_id + 1
+    ) is None
+
+
+def test_failed_side_effects_are_retried_with_backoff(db_session, recording_queue):
+    user_id, response = _submit_async(db_session)
+    attempt_id = response.attempt_id
+    recording_queue.jobs.clear()
+
+    with patch.object(
+        exercise_attempt_service,
+        "_apply_attempt_side_effects",
+        side_effect=RuntimeError("db hiccup"),
+    ):
+        assert run_post_commit_job(ATTEMPT_SIDE_EFFECTS_JOB, attempt_id) == "failed"
+
+    db_session.expire_all()
+    outbox = db_session.get(AttemptSideEffect, attempt_id)
+    assert (outbox.status, outbox.tries) == (SIDE_EFFECTS_PENDING, 1)
+    retry_at = outbox.next_attempt_at
+    assert retry_at > datetime.now(timezone.utc)
+
+    # Pas avant la fin du backoff, puis re-planifiée et appliquée.
+    requeue_pending_attempt_side_effects(now=retry_at - timedelta(seconds=1))
+    assert (ATTEMPT_SIDE_EFFECTS_JOB, attempt_id) not in recording_queue.jobs
+    requeue_pending_attempt_side_effects(now=retry_at)
+    assert (ATTEMPT_SIDE_EFFECTS_JOB, attempt_id) in recording_queue.jobs
+    assert process_attempt_side_effects(attempt_id) is True
+
+    db_session.expire_all()
+    assert db_session.get(AttemptSideEffect, attempt_id).status == SIDE_EFFECTS_DONE
+    assert db_session.get(User, user_id).total_points == 10
+
+
+def test_side_effects_fail_after_max_tries(db_session, recording_queue):
+    _, response = _submit_async(db_session)
+    attempt_id = response.attempt_id
+
+    with patch.object(
+        exercise_attempt_service,
+        "_apply_attempt_side_effects",
+        side_effect=RuntimeError("always"),
+    ):
+        for _ in range(ATTEMPT_SIDE_EFFECTS_MAX_TRIES):
+            run_post_commit_job(ATTEMPT_SIDE_EFFECTS_JOB, attempt_id)
+
+    db_session.expire_all()
+    outbox = db_session.get(AttemptSideEffect, attempt_id)
+    assert outbox.status == SIDE_EFFECTS_FAILED
+    recording_queue.jobs.clear()
+    tomorrow = datetime.now(timezone.utc) + timedelta(days=1)
+    requeue_pending_attempt_side_effects(now=tomorrow)
+    assert (ATTEMPT_SIDE_EFFECTS_JOB, attempt_id) not in recording_queue.jobs
+
+
+def test_sweep_requeues_jobs_refused_by_a_full_queue(db_session, recording_queue):
+    recording_queue.accept = False
+    _, response = _submit_async(db_session)
+    attempt_id = response.attempt_id
+    assert response.side_effects_status == SIDE_EFFECTS_PENDING
+
+    recording_queue.accept = True
+    now = datetime.now(timezone.utc)
+    # Ligne jamais traitée : laissée au job en vol pendant le délai de reprise.
+    requeue_pending_attempt_side_effects(now=now)
+    assert (ATTEMPT_SIDE_EFFECTS_JOB, attempt_id) not in recording_queue.jobs
+
+    later = now + timedelta(seconds=settings.ATTEMPT_SIDE_EFFECTS_RETRY_SECONDS + 1)
+    requeue_pending_attempt_side_effects(now=later)
+    assert (ATTEMPT_SIDE_EFFECTS_JOB, attempt_id) in recording_queue.jobs
@@ -0,0 +1,237 @@
+"""
+Tests — régénération différée des recommandations (debounce par utilisateur),
+cache de lecture, métadonnées de fraîcheur et job « tous les utilisateurs actifs ».
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.core.post_commit import PostCommitQueue, set_post_commit_queue
+from app.models.exercise import DifficultyLevel, Exercise, ExerciseType
+from app.models.progress import Progress
+from app.models.recommendation import Recommendation
+from app.models.user import User, UserRole
+from app.services.recommendation.recommendation_refresh import (
+    RECOMMENDATION_REFRESH_JOB,
+    RecommendationRefreshScheduler,
+    get_recommendation_freshness,
+    iter_active_user_ids,
+    notify_progress_changed,
+    recommendation_read_cache,
+    recommendation_refresh_scheduler,
+    refresh_active_users,
+    refresh_user_recommendations,
+)
+from app.services.recommendation.recommendation_service import RecommendationService
+from app.utils.db_helpers import get_enum_value
+from tests.utils.test_helpers import unique_email, unique_username
+
+
+class _RecordingQueue(PostCommitQueue):
+    def __init__(self):
+        self.jobs = []
+
+    def enqueue(self, job, key):
+        self.jobs.append((job, key))
+        return True
+
+
+@pytest.fixture
+def recording_queue():
+    queue = _RecordingQueue()
+    set_post_commit_queue(queue)
+    yield queue
+    set_post_commit_queue(None)
+    recommendation_refresh_scheduler.stop()
+
+
+@pytest.fixture
+def read_cache():
+    with patch.object(recommendation_read_cache, "ttl_sec", 60.0):
+        yield recommendation_read_cache
+    recommendation_read_cache.clear()
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def _learner(db, **fields):
+    user = User(
+        username=unique_username(),
+        email=unique_email(),
+        hashed_password="test_hash",
+        role=get_enum_value(UserRole, UserRole.PADAWAN.value, db),
+        **fields,
+    )
+    exercise = Exercise(
+        title=f"Refresh {unique_username()}",
+        exercise_type=get_enum_value(ExerciseType, ExerciseType.ADDITION.value, db),
+        difficulty=get_enum_value(DifficultyLevel, DifficultyLevel.PADAWAN.value, db),
+        age_group="6-8",
+        question="1+1=?",
+        correct_answer="2",
+        is_active=True,
+        is_archived=False,
+    )
+    db.add_all([user, exercise])
+    db.commit()
+    return user
+
+
+def test_scheduler_debounces_bursts_per_user(recording_queue):
+    scheduler = RecommendationRefreshScheduler(debounce_sec=0.1, max_delay_sec=10)
+    try:
+        for _ in range(5):
+            scheduler.schedule(1)
+        scheduler.schedule(2)
+        assert scheduler.is_pending(1)
+        assert recording_queue.jobs == []
+
+        assert _wait_for(lambda: len(recording_queue.jobs) == 2)
+        time.sleep(0.15)
+        assert sorted(recording_queue.jobs) == [
+            (RECOMMENDATION_REFRESH_JOB, 1),
+            (RECOMMENDATION_REFRESH_JOB, 2),
+        ]
+        # En file jusqu'à la fin du job, puis plus rien en attente.
+        assert scheduler.is_pending(1)
+        scheduler.mark_done(1)
+        assert not scheduler.is_pending(1)
+    finally:
+        scheduler.stop()
+
+
+def test_scheduler_caps_delay_under_continuous_activity(recording_queue):
+    scheduler = RecommendationRefreshScheduler(debounce_sec=0.2, max_delay_sec=0.3)
+    try:
+        started = time.monotonic()
+        while not recording_queue.jobs and time.monotonic() - started < 2:
+            scheduler.schedule(7)
+            time.sleep(0.05)
+        assert recording_queue.jobs == [(RECOMMENDATION_REFRESH_JOB, 7)]
+        assert time.monotonic() - started < 0.6
+    finally:
+        scheduler.stop()
+
+
+def test_async_mode_reads_persisted_rows_and_refreshes_off_request(
+    db_session, recording_queue
+):
+    user = _learner(db_session)
+
+    with patch.object(settings, "RECOMMENDATION_REFRESH_ASYNC", True):
+        # Aucune reco : pas de génération dans la requête, job planifié.
+        listed = RecommendationService.get_recommendations_for_api(db_session, user.id)
+        assert listed == []
+        assert recording_queue.jobs == [(RECOMMENDATION_REFRESH_JOB, user.id)]
+        assert get_recommendation_freshness(db_session, user.id)["refresh_pending"]
+
+        assert refresh_user_recommendations(user.id) is True
+        db_session.expire_all()
+        assert RecommendationService.get_recommendations_for_api(db_session, user.id)
+
+        # Progression : régénération debouncée, pas immédiate.
+        notify_progress_changed(user.id)
+        assert recommendation_refresh_scheduler.is_pending(user.id)
+        assert recommendation_refresh_scheduler.flush() == [user.id]
+
+
+def test_read_cache_serves_list_and_is_invalidated_by_progress(
+    db_session, read_cache
+):
+    user = _learner(db_session)
+    first = RecommendationService.get_recommendations_for_api(db_session, user.id)
+    assert first and len(read_cache) == 1
+
+    with patch.object(RecommendationService, "get_user_recommendations") as get_rows:
+        cached = RecommendationService.get_recommendations_for_api(db_session, user.id)
+    assert cached == first
+    get_rows.assert_not_called()
+
+    # Impression R4 comptée aussi sur lecture en cache.
+    shown = {
+        r.id: r.shown_count
+        for r in db_session.query(Recommendation).filter(
+            Recommendation.user_id == user.id
+        )
+    }
+    assert {shown[item["id"]] for item in first} == {2}
+
+    notify_progress_changed(user.id)
+    assert len(read_cache) == 0
+
+
+def test_freshness_reports_stale_after_progress_update(db_session):
+    user = _learner(db_session)
+    assert get_recommendation_freshness(db_session, user.id)["stale"] is True
+
+    RecommendationService.generate_recommendations(db_session, user.id)
+    freshness = get_recommendation_freshness(db_session, user.id)
+    assert freshness["generated_at"] is not None
+    assert freshness["stale"] is False
+    assert freshness["refresh_pending"] is False
+
+    db_session.add(
+        Progress(
+            user_id=user.id,
+            exercise_type="addition",
+            difficulty="PADAWAN",
+            last_updated=datetime.now(timezone.utc) + timedelta(seconds=5),
+        )
+    )
+    db_session.commit()
+    assert get_recommendation_freshness(db_session, user.id)["stale"] is True
+
+
+def test_refresh_active_users_across_processes(db_session):
+    today = datetime.now(timezone.utc).date()
+    active = _learner(db_session, last_activity_date=today)
+    dormant = _learner(db_session, last_activity_date=today - timedelta(days=90))
+
+    active_ids = [
+        uid for batch in iter_active_user_ids(db_session, 30, 1000) for uid in batch
+    ]
+    assert active.id in active_ids
+    assert dormant.id not in active_ids
+
+    with patch(
+        "app.services.recommendation.recommendation_refresh.iter_active_user_ids",
+        return_value=iter([[active.id], [dormant.id]]),
+    ):
+        totals = refresh_active_users(db_session, workers=2, batch_size=1)
+
+    assert totals == {"users": 2, "done": 2, "failed": 0}
+    db_session.expire_all()
+    assert (
+        db_session.query(Recommendation)
+        .filter(Recommendation.user_id.in_([active.id, dormant.id]))
+        .count()
+        > 0
+    )
+
+
+def test_refresh_counts_swallowed_db_errors_as_failed(db_session):
+    user = _learner(db_session, last_activity_date=datetime.now(timezone.utc).date())
+
+    with patch(
+        "app.services.recommendation.recommendation_refresh.iter_active_user_ids",
+        return_value=iter([[user.id]]),
+    ), patch(
+        "app.services.recommendation.recommendation_service."
+        "build_recommendation_user_context",
+        side_effect=SQLAlchemyError("db down"),
+    ):
+        totals = refresh_active_users(db_session, workers=1)
+
+    assert totals == {"users": 1, "done": 0, "failed": 1}
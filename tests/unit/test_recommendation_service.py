@@ -10,6 +10,7 @@ from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
+from sqlalchemy import event
 
 from app.core.constants import AgeGroups
 from app.core.security import get_password_hash
@@ -763,8 +764,8 @@ def test_r3_regenerate_prefers_unpenalized_alternative(db_session):
     our_exercise_ids = {e.id for e in exercises}
 
     with patch(
-        "app.services.users.user_service.UserService.get_user_stats",
-        return_value=stats_payload,
+        "app.services.recommendation.recommendation_service._recent_performance_by_type",
+        return_value=stats_payload["by_exercise_type"],
     ):
         first = RecommendationService.generate_recommendations(db_session, user.id)
     first_mult_ids = {
@@ -777,8 +778,8 @@ def test_r3_regenerate_prefers_unpenalized_alternative(db_session):
     assert first_mult_ids, "Première génération : reco amélioration mult attendue"
 
     with patch(
-        "app.services.users.user_service.UserService.get_user_stats",
-        return_value=stats_payload,
+        "app.services.recommendation.recommendation_service._recent_performance_by_type",
+        return_value=stats_payload["by_exercise_type"],
     ):
         second = RecommendationService.generate_recommendations(db_session, user.id)
     second_mult_ids = {
@@ -1132,7 +1133,7 @@ def test_r6_discovery_has_reason_code_and_params(db_session):
     db_session.commit()
 
     with patch(
-        "app.services.users.user_service.UserService.get_user_stats",
+        "app.services.recommendation.recommendation_service._recent_performance_by_type",
         return_value={},
     ):
         recommendations = RecommendationService.generate_recommendations(
@@ -1235,13 +1236,13 @@ def test_r6_discovery_prefers_unpenalized_alternative(db_session):
         return out
 
     with patch(
-        "app.services.users.user_service.UserService.get_user_stats",
+        "app.services.recommendation.recommendation_service._recent_performance_by_type",
         return_value={},
     ):
         first = RecommendationService.generate_recommendations(db_session, user.id)
     ids_first = _mult_discovery_exercise_ids(first)
     with patch(
-        "app.services.users.user_service.UserService.get_user_stats",
+        "app.services.recommendation.recommendation_service._recent_performance_by_type",
         return_value={},
     ):
         second = RecommendationService.generate_recommendations(db_session, user.id)
@@ -1297,7 +1298,7 @@ def test_r6_at_most_one_discovery_recommendation_per_new_type(db_session):
     db_session.commit()
 
     with patch(
-        "app.services.users.user_service.UserService.get_user_stats",
+        "app.services.recommendation.recommendation_service._recent_performance_by_type",
         return_value={},
     ):
         recommendations = RecommendationService.generate_recommendations(
@@ -1316,3 +1317,68 @@ def test_r6_at_most_one_discovery_recommendation_per_new_type(db_session):
         by_type[k] = by_type.get(k, 0) + 1
     assert by_type.get("multiplication", 0) <= 1
     assert by_type.get("division", 0) <= 1
+
+
+def test_generation_statements_do_not_grow_with_solved_exercises(db_session):
+    """Exclusion des réussis en SQL : même nombre de requêtes, réussis jamais recommandés."""
+    user = User(
+        username=unique_username(),
+        email=unique_email(),
+        hashed_password="test_hash",
+        role=get_enum_value(UserRole, UserRole.PADAWAN.value, db_session),
+    )
+    db_session.add(user)
+    add_type = get_enum_value(ExerciseType, ExerciseType.ADDITION.value, db_session)
+    padawan = get_enum_value(DifficultyLevel, DifficultyLevel.PADAWAN.value, db_session)
+    exercises = [
+        Exercise(
+            title=f"Batch {i}",
+            exercise_type=add_type,
+            difficulty=padawan,
+            age_group="6-8",
+            question=f"{i}+1=?",
+            correct_answer=str(i + 1),
+            is_active=True,
+            is_archived=False,
+        )
+        for i in range(40)
+    ]
+    db_session.add_all(exercises)
+    db_session.commit()
+
+    statements = []
+
+    def _count(*_args):
+        statements.append(1)
+
+    def _generate():
+        statements.clear()
+        bind = db_session.get_bind()
+        event.listen(bind, "before_cursor_execute", _count)
+        try:
+            recommendations = RecommendationService.generate_recommendations(
+                db_session, user.id
+            )
+        finally:
+            event.remove(bind, "before_cursor_execute", _count)
+        return len(statements), {r.exercise_id for r in recommendations}
+
+    before, _ = _generate()
+
+    solved = exercises[:30]
+    db_session.add_all(
+        Attempt(
+            user_id=user.id,
+            exercise_id=ex.id,
+            user_answer=ex.correct_answer,
+            is_correct=True,
+            time_spent=1.0,
+        )
+        for ex in solved
+    )
+    db_session.commit()
+
+    after, recommended_ids = _generate()
+    assert after == before
+    assert recommended_ids
+    assert not recommended_ids & {ex.id for ex in solved}
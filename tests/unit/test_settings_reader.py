@@ -0,0 +1,101 @@
+"""Tests unitaires pour app.utils.settings_reader (snapshot settings TTL + invalidation)."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.utils import settings_reader
+
+
+@pytest.fixture(autouse=True)
+def cold_snapshot():
+    """Chaque test démarre avec un snapshot froid."""
+    settings_reader.invalidate_settings_snapshot(broadcast=False)
+    yield
+    settings_reader.invalidate_settings_snapshot(broadcast=False)
+
+
+def test_get_setting_bool_loads_once_within_ttl():
+    loader = MagicMock(return_value={"maintenance_mode": "true"})
+    with patch.object(settings_reader, "_load_snapshot", loader):
+        assert settings_reader.get_setting_bool("maintenance_mode") is True
+        assert settings_reader.get_setting_bool("maintenance_mode") is True
+        assert settings_reader.get_setting_bool("registration_enabled", True) is True
+    assert loader.call_count == 1
+
+
+def test_get_setting_bool_reloads_after_ttl():
+    loader = MagicMock(return_value={"maintenance_mode": "false"})
+    with (
+        patch.object(settings_reader, "_load_snapshot", loader),
+        patch.object(settings_reader.settings, "SETTINGS_SNAPSHOT_TTL_SECONDS", 0),
+    ):
+        settings_reader.get_setting_bool("maintenance_mode")
+        settings_reader.get_setting_bool("maintenance_mode")
+    assert loader.call_count == 2
+
+
+def test_peek_setting_bool_cold_returns_none():
+    assert settings_reader.peek_setting_bool("maintenance_mode") is None
+
+
+def test_peek_setting_bool_uses_warm_snapshot():
+    with patch.object(
+        settings_reader, "_load_snapshot", return_value={"maintenance_mode": "1"}
+    ):
+        settings_reader.get_setting_bool("maintenance_mode")
+    assert settings_reader.peek_setting_bool("maintenance_mode") is True
+    assert settings_reader.peek_setting_bool("missing", default=True) is True
+
+
+def test_invalidate_forces_reload():
+    values = iter([{"maintenance_mode": "false"}, {"maintenance_mode": "true"}])
+    with patch.object(
+        settings_reader, "_load_snapshot", side_effect=lambda: next(values)
+    ):
+        assert settings_reader.get_setting_bool("maintenance_mode") is False
+        settings_reader.invalidate_settings_snapshot(broadcast=False)
+        assert settings_reader.get_setting_bool("maintenance_mode") is True
+
+
+def test_invalidate_without_redis_does_not_publish():
+    with (
+        patch.object(settings_reader.settings, "REDIS_URL", ""),
+        patch("redis.from_url") as from_url,
+    ):
+        settings_reader.invalidate_settings_snapshot()
+    from_url.assert_not_called()
+
+
+def test_invalidate_broadcasts_on_redis_channel():
+    client = MagicMock()
+    with (
+        patch.object(settings_reader.settings, "REDIS_URL", "redis://localhost:6379/0"),
+        patch("redis.from_url", return_value=client),
+    ):
+        settings_reader.invalidate_settings_snapshot()
+    client.publish.assert_called_once_with(
+        settings_reader.SETTINGS_INVALIDATION_CHANNEL, "1"
+    )
+
+
+def test_invalidate_broadcast_failure_is_swallowed():
+    with (
+        patch.object(settings_reader.settings, "REDIS_URL", "redis://localhost:6379/0"),
+        patch("redis.from_url", side_effect=OSError("down")),
+    ):
+        settings_reader.invalidate_settings_snapshot()
+
+
+def test_listener_noop_without_redis():
+    with patch.object(settings_reader.settings, "REDIS_URL", ""):
+        assert settings_reader.start_settings_invalidation_listener() is False
+
+
+def test_get_setting_bool_reads_settings_table(db_session):
+    """Intégration : le snapshot reflète la table settings après invalidation."""
+    from app.models.setting import Setting
+
+    row = db_session.query(Setting).filter(Setting.key == "maintenance_mode").first()
+    expected = bool(row and str(row.value).lower() in ("true", "1", "yes", "on"))
+    assert settings_reader.get_setting_bool("maintenance_mode", False) is expected
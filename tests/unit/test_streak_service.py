@@ -0,0 +1,149 @@
+"""
+Tests — streak incrémental (users.last_activity_date / current_streak / best_streak)
+et réconciliation depuis l'historique.
+
+Chaque test reste dans une transaction non commitée (rollback final).
+"""
+
+import time
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, insert
+
+from app.models.attempt import Attempt
+from app.models.exercise import DifficultyLevel, Exercise, ExerciseType
+from app.models.user import User, UserRole
+from app.services.progress.streak_service import (
+    _activity_dates_for_user,
+    advance_streak,
+    check_user_streak,
+    compute_streak,
+    reconcile_user_streak,
+    update_user_streak,
+)
+from app.utils.db_helpers import get_enum_value
+from tests.utils.test_helpers import unique_email, unique_username
+
+TODAY = date(2026, 10, 17)
+
+
+@pytest.fixture
+def tx(db_session):
+    try:
+        yield db_session
+    finally:
+        db_session.rollback()
+
+
+@pytest.fixture
+def learner(tx):
+    user = User(
+        username=unique_username(),
+        email=unique_email(),
+        hashed_password="hash",
+        role=get_enum_value(UserRole, UserRole.PADAWAN.value, tx),
+    )
+    exercise = Exercise(
+        title=f"streak_{unique_username()}",
+        exercise_type=get_enum_value(ExerciseType, ExerciseType.ADDITION.value, tx),
+        difficulty=get_enum_value(DifficultyLevel, DifficultyLevel.INITIE.value, tx),
+        age_group="6-8",
+        question="1+1=?",
+        correct_answer="2",
+    )
+    tx.add_all([user, exercise])
+    tx.flush()
+    return user, exercise
+
+
+def _attempts_on(db, user, exercise, days):
+    db.execute(
+        insert(Attempt),
+        [
+            {
+                "user_id": user.id,
+                "exercise_id": exercise.id,
+                "user_answer": "2",
+                "is_correct": True,
+                "created_at": datetime.combine(day, dt_time(12), timezone.utc),
+            }
+            for day in days
+        ],
+    )
+
+
+def test_advance_streak_rules():
+    yesterday = TODAY - timedelta(days=1)
+    assert advance_streak(0, 0, None, TODAY) == (1, 1)
+    assert advance_streak(4, 9, TODAY, TODAY) == (4, 9)
+    assert advance_streak(4, 4, yesterday, TODAY) == (5, 5)
+    assert advance_streak(7, 7, TODAY - timedelta(days=3), TODAY) == (1, 7)
+
+
+def test_incremental_updates_match_history(tx, learner):
+    user, exercise = learner
+    days = [TODAY - timedelta(days=n) for n in (6, 5, 4, 2, 1, 0)]
+    for day in days:
+        _attempts_on(tx, user, exercise, [day])
+        update_user_streak(tx, user.id, auto_commit=False, today=day)
+        update_user_streak(tx, user.id, auto_commit=False, today=day)
+
+    assert (user.current_streak, user.best_streak) == (3, 3)
+    assert user.last_activity_date == TODAY
+    assert check_user_streak(tx, user.id) == {}
+
+
+def test_reconcile_repairs_drift(tx, learner):
+    user, exercise = learner
+    _attempts_on(tx, user, exercise, [TODAY - timedelta(days=1), TODAY])
+    user.current_streak, user.best_streak, user.last_activity_date = 9, 9, TODAY
+    tx.flush()
+
+    assert check_user_streak(tx, user.id) == {
+        "current_streak": (9, 2),
+        "best_streak": (9, 2),
+    }
+    reconcile_user_streak(tx, user.id)
+    assert check_user_streak(tx, user.id) == {}
+    assert (user.current_streak, user.best_streak) == (2, 2)
+
+
+def test_three_years_of_daily_activity_updates_in_constant_queries(tx, learner):
+    user, exercise = learner
+    history = [TODAY - timedelta(days=n) for n in range(1, 3 * 365 + 1)]
+    _attempts_on(tx, user, exercise, history)
+    reconcile_user_streak(tx, user.id)
+    assert user.current_streak == 3 * 365
+
+    statements = []
+
+    def _count(*_args):
+        statements.append(1)
+
+    bind = tx.get_bind()
+    event.listen(bind, "before_cursor_execute", _count)
+    try:
+        _attempts_on(tx, user, exercise, [TODAY])
+        statements.clear()
+        started = time.perf_counter()
+        assert update_user_streak(tx, user.id, auto_commit=False, today=TODAY) == (
+            3 * 365 + 1,
+            3 * 365 + 1,
+        )
+        incremental_ms = (time.perf_counter() - started) * 1000
+    finally:
+        event.remove(bind, "before_cursor_execute", _count)
+
+    # Lecture de l'utilisateur + UPDATE, indépendamment de l'ancienneté du compte.
+    assert len(statements) <= 2
+
+    started = time.perf_counter()
+    dates = _activity_dates_for_user(tx, user.id)
+    assert compute_streak(dates, TODAY) == 3 * 365 + 1
+    scan_ms = (time.perf_counter() - started) * 1000
+    print(
+        f"\nStreak 3 ans : incrémental {incremental_ms:.2f} ms "
+        f"vs relecture de l'historique {scan_ms:.2f} ms"
+    )
+    assert check_user_streak(tx, user.id) == {}
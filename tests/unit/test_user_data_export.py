@@ -0,0 +1,86 @@
+"""Encodeurs streamés de l'export RGPD : json (format 1.1), ndjson et zip."""
+
+import io
+import json
+import zipfile
+
+import pytest
+
+from app.services.users.user_data_export import (
+    USER_EXPORT_SECTIONS,
+    json_export_stream,
+    ndjson_export_stream,
+    zip_export_stream,
+)
+
+_HEADER = {"export_date": "2026-10-18T00:00:00+00:00", "format_version": "1.1"}
+_PROFILE = {"id": 7, "username": "élève"}
+
+
+async def _records():
+    yield "exercise_attempts", [{"exercise_id": 1}, {"exercise_id": 2}]
+    yield "exercise_attempts", [{"exercise_id": 3}]
+    for section in list(USER_EXPORT_SECTIONS)[1:]:
+        yield section, []
+
+
+async def _body(encoder) -> bytes:
+    return b"".join([block async for block in encoder(_HEADER, _PROFILE, _records())])
+
+
+@pytest.mark.asyncio
+async def test_json_stream_matches_export_document():
+    data = json.loads(await _body(json_export_stream))
+
+    assert list(data) == [
+        "export_date",
+        "format_version",
+        "profile",
+        *USER_EXPORT_SECTIONS,
+        "statistics",
+    ]
+    assert data["profile"] == _PROFILE
+    assert [a["exercise_id"] for a in data["exercise_attempts"]] == [1, 2, 3]
+    assert data["badges_earned"] == []
+    assert data["statistics"] == {
+        "total_exercise_attempts": 3,
+        "total_challenge_attempts": 0,
+        "total_badges": 0,
+        "total_progress_records": 0,
+        "total_recommendations": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_ndjson_stream_has_one_line_per_record():
+    body = await _body(ndjson_export_stream)
+    lines = [json.loads(line) for line in body.splitlines()]
+
+    assert [line["section"] for line in lines] == [
+        "meta",
+        "profile",
+        "exercise_attempts",
+        "exercise_attempts",
+        "exercise_attempts",
+        "statistics",
+    ]
+    assert lines[0]["data"] == _HEADER
+    assert lines[-1]["data"]["total_exercise_attempts"] == 3
+
+
+@pytest.mark.asyncio
+async def test_zip_stream_is_a_readable_archive():
+    archive = zipfile.ZipFile(io.BytesIO(await _body(zip_export_stream)))
+
+    assert archive.namelist() == [
+        "profile.json",
+        *(f"{section}.ndjson" for section in USER_EXPORT_SECTIONS),
+        "statistics.json",
+    ]
+    assert archive.testzip() is None
+    assert json.loads(archive.read("profile.json"))["profile"] == _PROFILE
+    attempts = archive.read("exercise_attempts.ndjson").decode().splitlines()
+    assert [json.loads(line)["exercise_id"] for line in attempts] == [1, 2, 3]
+    assert archive.read("badges_earned.ndjson") == b""
+    statistics = json.loads(archive.read("statistics.json"))["statistics"]
+    assert statistics["total_exercise_attempts"] == 3
@@ -0,0 +1,151 @@
+"""
+Tests — rollup incrémental des stats badges (user_stats_rollup).
+
+Chaque test reste dans une transaction non commitée (rollback final).
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from app.models.attempt import Attempt
+from app.models.exercise import DifficultyLevel, Exercise, ExerciseType
+from app.models.user import User, UserRole
+from app.models.user_stats_rollup import UserStatsRollup
+from app.repositories.exercise_attempt_repository import create_attempt
+from app.services.badges.badge_stats_cache import build_stats_cache
+from app.services.badges.user_stats_rollup import (
+    activity_dates_from_bitmap,
+    check_user_stats_rollup,
+    mark_activity_day,
+    rebuild_user_stats_rollup,
+    record_logic_attempt_stats,
+)
+from app.utils.db_helpers import get_enum_value
+from tests.utils.test_helpers import unique_email, unique_username
+
+
+@pytest.fixture
+def tx(db_session):
+    try:
+        yield db_session
+    finally:
+        db_session.rollback()
+
+
+def _user(db):
+    user = User(
+        username=unique_username(),
+        email=unique_email(),
+        hashed_password="hash",
+        role=get_enum_value(UserRole, UserRole.PADAWAN.value, db),
+    )
+    db.add(user)
+    db.flush()
+    return user
+
+
+def _exercise(db, ex_type):
+    exercise = Exercise(
+        title=f"rollup_{ex_type.value}_{unique_username()}",
+        exercise_type=get_enum_value(ExerciseType, ex_type.value, db),
+        difficulty=get_enum_value(
+            DifficultyLevel, DifficultyLevel.INITIE.value, db
+        ),
+        age_group="6-8",
+        question="1+1=?",
+        correct_answer="2",
+    )
+    db.add(exercise)
+    db.flush()
+    return exercise
+
+
+def _submit(db, user, exercise, is_correct, time_spent=5.0):
+    attempt = create_attempt(
+        db,
+        {
+            "user_id": user.id,
+            "exercise_id": exercise.id,
+            "user_answer": "2" if is_correct else "3",
+            "is_correct": is_correct,
+            "time_spent": time_spent,
+        },
+    )
+    assert attempt is not None
+    return attempt
+
+
+def test_activity_bitmap_shift_and_window():
+    day = date(2026, 3, 10)
+    bitmap, last = mark_activity_day(0, None, day)
+    bitmap, last = mark_activity_day(bitmap, last, day + timedelta(days=2))
+    bitmap, last = mark_activity_day(bitmap, last, day + timedelta(days=1))
+    assert activity_dates_from_bitmap(bitmap, last) == [
+        day + timedelta(days=2),
+        day + timedelta(days=1),
+        day,
+    ]
+    bitmap, last = mark_activity_day(bitmap, last, day + timedelta(days=40))
+    assert activity_dates_from_bitmap(bitmap, last) == [day + timedelta(days=40)]
+
+
+def test_attempts_keep_rollup_consistent_with_raw_tables(tx):
+    user = _user(tx)
+    addition = _exercise(tx, ExerciseType.ADDITION)
+    division = _exercise(tx, ExerciseType.DIVISION)
+
+    _submit(tx, user, addition, True, 4.0)
+    assert tx.get(UserStatsRollup, user.id) is not None
+    _submit(tx, user, addition, True, 2.5)
+    _submit(tx, user, division, False)
+    _submit(tx, user, addition, False)
+    _submit(tx, user, division, True, 3.0)
+
+    assert check_user_stats_rollup(tx, user.id) == {}
+    cache = build_stats_cache(tx, user.id)
+    assert cache["attempts_total"] == 5
+    assert cache["attempts_correct"] == 3
+    assert cache["per_type_correct"] == {"addition": 2, "division": 1}
+    assert cache["user_exercise_types"] == {"addition", "division"}
+    assert cache["consecutive_by_type"]["addition"] == 0
+    assert cache["consecutive_by_type"]["division"] == 1
+    assert cache["min_fast_time"] == 2.5
+    assert cache["perfect_day_today"] == (5, 3)
+    assert len(cache["activity_dates"]) == 1
+
+
+def test_missing_row_is_seeded_from_history(tx):
+    user = _user(tx)
+    exercise = _exercise(tx, ExerciseType.ADDITION)
+    tx.add(
+        Attempt(
+            user_id=user.id, exercise_id=exercise.id, user_answer="2", is_correct=True
+        )
+    )
+    tx.flush()
+    assert build_stats_cache(tx, user.id)["attempts_total"] == 1
+
+    _submit(tx, user, exercise, True)
+    rollup = tx.get(UserStatsRollup, user.id)
+    assert rollup.attempts_total == 2
+    assert rollup.consecutive_by_type == {"addition": 2}
+
+
+def test_logic_attempts_and_checker_repair(tx):
+    user = _user(tx)
+    exercise = _exercise(tx, ExerciseType.ADDITION)
+    _submit(tx, user, exercise, True)
+    record_logic_attempt_stats(tx, user.id, True)
+
+    rollup = tx.get(UserStatsRollup, user.id)
+    assert rollup.logic_correct_count == 1
+    mismatches = check_user_stats_rollup(tx, user.id)
+    assert mismatches == {"logic_correct_count": (1, 0)}
+
+    rollup.attempts_correct = 9
+    tx.flush()
+    assert "attempts_correct" in check_user_stats_rollup(tx, user.id)
+
+    rebuild_user_stats_rollup(tx, user.id)
+    assert check_user_stats_rollup(tx, user.id) == {}